@@ -0,0 +1,361 @@
+"""Playback critical path throughput and latency, with fake voice and resolver.
+
+Drives the application services the way the bot does — enqueue, start,
+track-finished hand-overs, skips — plus raw session save/load, for 1, 100 and
+1000 guilds running concurrently. Each guild's operations run in order, as
+they would from one channel. Everything below the services is real and wired
+as the container wires it:
+
+- per-guild session actors over the cached SQLite session repository;
+- write-behind history;
+- an in-memory or file-backed ``Database``.
+
+Only the Discord voice client and the yt-dlp resolver are replaced, by the
+``StubVoiceAdapter`` / ``StubAudioResolver`` fakes from ``tests/conftest.py``,
+so the benchmark runs offline and measures the bot's own overhead rather than
+FFmpeg or the network.
+
+Session save/load goes straight to ``SQLiteSessionRepository``. The cache in
+front of it would otherwise answer every load from memory.
+
+Results are written as JSON, one record per scenario, backend and guild
+count. Keep the output of two commits and diff them to spot regressions.
+
+Usage::
+
+    PYTHONPATH=src:tests python benchmarks/bench_playback_path.py [--output FILE]
+        [--guilds 1 100 1000] [--queue-sizes 1 50 500] [--backends memory file]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from conftest import StubAudioResolver, StubVoiceAdapter
+
+from discord_music_player.application.services.playback_service import (
+    PlaybackApplicationService,
+)
+from discord_music_player.application.services.queue_service import QueueApplicationService
+from discord_music_player.application.services.session_actors import GuildSessionActors
+from discord_music_player.domain.music.entities import GuildPlaybackSession, Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.events import reset_event_bus
+from discord_music_player.infrastructure.persistence.database import Database
+from discord_music_player.infrastructure.persistence.repositories.buffered_history_repository import (
+    BufferedHistoryRepository,
+)
+from discord_music_player.infrastructure.persistence.repositories.cached_session_repository import (
+    CachedSessionRepository,
+)
+from discord_music_player.infrastructure.persistence.repositories.history_repository import (
+    SQLiteHistoryRepository,
+)
+from discord_music_player.infrastructure.persistence.repositories.session_repository import (
+    SQLiteSessionRepository,
+)
+
+_MS_PER_S = 1000.0
+# Guild IDs are snowflake-sized, like the real ones the repositories store.
+_GUILD_BASE = 100_000_000_000_000_000
+
+
+class _BenchVoiceAdapter(StubVoiceAdapter):
+    """The conftest stub, plus the ``is_playing`` check the queue-empty path makes."""
+
+    def is_playing(self, guild_id: int) -> bool:
+        return False
+
+
+def _track(n: int) -> Track:
+    video_id = f"bench{n:06d}"
+    return Track(
+        id=TrackId(value=video_id),
+        title=f"Benchmark Track {n}",
+        webpage_url=f"https://www.youtube.com/watch?v={video_id}",
+        duration_seconds=180,
+    )
+
+
+_RESOLVED = Track(
+    id=TrackId(value="resolved"),
+    title="Resolved",
+    webpage_url="https://www.youtube.com/watch?v=resolved",
+    stream_url="https://audio.example.com/resolved.webm",
+    duration_seconds=180,
+)
+
+
+class _Samples:
+    """Per-operation latencies for one scenario, across every guild.
+
+    Operations that raise are counted rather than timed: at the top of the
+    grid the write lock is contended enough for some to hit the pool's acquire
+    timeout, and that count is part of the result.
+    """
+
+    def __init__(self) -> None:
+        self.latencies_ms: list[float] = []
+        self.errors: dict[str, int] = {}
+
+    async def time(self, call: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await call
+        except Exception as exc:
+            name = type(exc).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+            return None
+        self.latencies_ms.append((time.perf_counter() - start) * _MS_PER_S)
+        return result
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _record(
+    scenario: str,
+    backend: str,
+    guilds: int,
+    samples: _Samples,
+    wall_s: float,
+    **extra: Any,
+) -> dict[str, Any]:
+    ordered = sorted(samples.latencies_ms)
+    latency = (
+        {
+            "mean": round(statistics.fmean(ordered), 4),
+            "p50": round(_percentile(ordered, 0.50), 4),
+            "p95": round(_percentile(ordered, 0.95), 4),
+            "p99": round(_percentile(ordered, 0.99), 4),
+            "max": round(ordered[-1], 4),
+        }
+        if ordered
+        else None
+    )
+    return {
+        "scenario": scenario,
+        "backend": backend,
+        "guilds": guilds,
+        **extra,
+        "ops": len(ordered),
+        "errors": samples.errors,
+        "wall_s": round(wall_s, 4),
+        "ops_per_s": round(len(ordered) / wall_s, 1) if wall_s else None,
+        "latency_ms": latency,
+    }
+
+
+async def _per_guild(guilds: int, run: Callable[[int], Awaitable[None]]) -> float:
+    """Run ``run`` for every guild concurrently; return the wall-clock seconds."""
+    start = time.perf_counter()
+    await asyncio.gather(*(run(_GUILD_BASE + index) for index in range(guilds)))
+    return time.perf_counter() - start
+
+
+@asynccontextmanager
+async def _database(backend: str) -> Any:
+    with tempfile.TemporaryDirectory(prefix="bench-playback-") as directory:
+        url = ":memory:" if backend == "memory" else str(Path(directory) / "bench.db")
+        database = Database(url)
+        await database.initialize()
+        try:
+            yield database
+        finally:
+            await database.close()
+
+
+class _Services:
+    """The playback path as the container wires it, over one database."""
+
+    def __init__(self, database: Database) -> None:
+        self.sessions = CachedSessionRepository(SQLiteSessionRepository(database))
+        self.history = BufferedHistoryRepository(SQLiteHistoryRepository(database))
+        actors = GuildSessionActors(self.sessions)
+        self.queue = QueueApplicationService(
+            session_repository=self.sessions, session_actors=actors
+        )
+        self.playback = PlaybackApplicationService(
+            session_repository=self.sessions,
+            history_repository=self.history,
+            voice_adapter=_BenchVoiceAdapter(),
+            audio_resolver=StubAudioResolver(resolved_track=_RESOLVED),
+            session_actors=actors,
+        )
+
+
+async def _bench_playback(
+    backend: str, guilds: int, *, enqueues: int, rounds: int
+) -> list[dict[str, Any]]:
+    """Enqueue, start playback, then ``rounds`` track-finished and ``rounds`` skip hand-overs."""
+    enqueue, start, finished, skip = _Samples(), _Samples(), _Samples(), _Samples()
+    # Every hand-over consumes a queued track; keep one spare so none hits an empty queue.
+    tracks = max(enqueues, 2 * rounds + 2)
+
+    async with _database(backend) as database:
+        services = _Services(database)
+        services.history.start()
+        try:
+
+            async def fill(guild_id: int) -> None:
+                for n in range(tracks):
+                    await enqueue.time(
+                        services.queue.enqueue(guild_id, _track(n), guild_id, "bench")
+                    )
+
+            async def play(guild_id: int) -> None:
+                await start.time(services.playback.start_playback(guild_id))
+
+            async def finish(guild_id: int) -> None:
+                for _ in range(rounds):
+                    session = await services.sessions.get(guild_id)
+                    assert session is not None and session.current_track is not None
+                    await finished.time(
+                        services.playback.handle_track_finished(guild_id, session.current_track)
+                    )
+
+            async def skip_ahead(guild_id: int) -> None:
+                for _ in range(rounds):
+                    await skip.time(services.playback.skip_track(guild_id))
+
+            enqueue_s = await _per_guild(guilds, fill)
+            start_s = await _per_guild(guilds, play)
+            finished_s = await _per_guild(guilds, finish)
+            skip_s = await _per_guild(guilds, skip_ahead)
+        finally:
+            await services.history.close()
+
+    return [
+        _record("enqueue", backend, guilds, enqueue, enqueue_s),
+        _record("start_playback", backend, guilds, start, start_s),
+        _record("handle_track_finished", backend, guilds, finished, finished_s),
+        _record("skip_track", backend, guilds, skip, skip_s),
+    ]
+
+
+async def _bench_session_store(backend: str, guilds: int, queue_size: int) -> list[dict[str, Any]]:
+    """Full-queue save then load of one session per guild, uncached."""
+    save, load = _Samples(), _Samples()
+    tracks = [_track(n) for n in range(queue_size)]
+
+    async with _database(backend) as database:
+        repository = SQLiteSessionRepository(database)
+
+        async def store(guild_id: int) -> None:
+            session = GuildPlaybackSession(
+                guild_id=guild_id, queue=list(tracks[1:]), current_track=tracks[0]
+            )
+            await save.time(repository.save(session))
+
+        async def fetch(guild_id: int) -> None:
+            session = await load.time(repository.get(guild_id))
+            # A save that timed out leaves nothing to load; that is already counted.
+            assert session is None or session.queue_length == queue_size - 1
+
+        save_s = await _per_guild(guilds, store)
+        load_s = await _per_guild(guilds, fetch)
+
+    return [
+        _record("session_save", backend, guilds, save, save_s, queue_size=queue_size),
+        _record("session_load", backend, guilds, load, load_s, queue_size=queue_size),
+    ]
+
+
+def _grid(args: argparse.Namespace) -> Iterator[Callable[[], Awaitable[list[dict[str, Any]]]]]:
+    for backend in args.backends:
+        for guilds in args.guilds:
+            yield lambda b=backend, g=guilds: _bench_playback(
+                b, g, enqueues=args.enqueues, rounds=args.rounds
+            )
+            for queue_size in args.queue_sizes:
+                yield lambda b=backend, g=guilds, q=queue_size: _bench_session_store(b, g, q)
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for bench in _grid(args):
+        reset_event_bus()
+        for record in await bench():
+            results.append(record)
+            latency = record["latency_ms"] or {"p50": math.nan, "p95": math.nan}
+            errors = sum(record["errors"].values())
+            print(
+                f"{record['scenario']:<22} {record['backend']:<6} "
+                f"guilds={record['guilds']:<5} queue={record.get('queue_size', '-')!s:<4} "
+                f"{record['ops_per_s']:>10} ops/s   "
+                f"p50 {latency['p50']:8.3f} ms   p95 {latency['p95']:8.3f} ms"
+                + (f"   {errors} failed" if errors else ""),
+                file=sys.stderr,
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backends", nargs="+", choices=("memory", "file"), default=["memory", "file"]
+    )
+    parser.add_argument("--guilds", nargs="+", type=int, default=[1, 100, 1000])
+    parser.add_argument("--queue-sizes", nargs="+", type=int, default=[1, 50, 500])
+    parser.add_argument("--enqueues", type=int, default=10, help="tracks enqueued per guild")
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="track-finished + skip hand-overs per guild"
+    )
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    # The services log every enqueue and hand-over at INFO.
+    logging.disable(logging.WARNING)
+    results = asyncio.run(_run(args))
+
+    report = {
+        "benchmark": "playback_path",
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "backends": args.backends,
+            "guilds": args.guilds,
+            "queue_sizes": args.queue_sizes,
+            "enqueues": args.enqueues,
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Per-resolve YoutubeDL overhead: fresh instance per call vs. the thread-local pool.
+
+Measures only what the pool removes — building, entering and closing a
+``YoutubeDL`` configured exactly like the resolver's — so it runs offline.
+The network round-trip that follows in a real extraction is unchanged, apart
+from connection reuse, which this benchmark does not capture.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_ydl_pool.py [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, cast
+
+from yt_dlp import YoutubeDL
+
+from discord_music_player.config.settings import AudioSettings
+from discord_music_player.infrastructure.audio.ydl_pool import YdlProfile
+from discord_music_player.infrastructure.audio.ytdlp_resolver import YtDlpResolver
+
+
+def _fresh_instance(params: dict[str, Any]) -> None:
+    with YoutubeDL(params=cast(Any, params)):
+        pass
+
+
+def _time_per_call(fn: Any, iterations: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(f"{label:<28} median {median:8.3f} ms   p95 {p95:8.3f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    resolver = YtDlpResolver(AudioSettings())
+    params = resolver._get_opts().model_dump()
+
+    before = _report(
+        "fresh YoutubeDL per call",
+        _time_per_call(lambda: _fresh_instance(params), args.iterations),
+    )
+
+    def pooled() -> None:
+        with resolver._ydl_pool.acquire(YdlProfile.SINGLE):
+            pass
+
+    pooled()  # the first call per thread builds the instance
+    after = _report("pooled YoutubeDL", _time_per_call(pooled, args.iterations))
+    resolver.close()
+
+    print(f"overhead saved per resolve: {before - after:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
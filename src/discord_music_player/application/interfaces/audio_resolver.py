@@ -3,25 +3,42 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from enum import IntEnum
 from typing import TYPE_CHECKING
 
 from ...domain.shared.types import HttpUrlStr, NonEmptyStr, PositiveInt
 
 if TYPE_CHECKING:
-    from ...domain.music.entities import PlaylistPreview, Track
+    from ...domain.music.entities import PlaylistEntry, PlaylistPreview, Track
+
+
+class ResolvePriority(IntEnum):
+    """Scheduling class for a resolution; lower values are served first."""
+
+    INTERACTIVE = 0
+    """A user is waiting: /play, or the track about to start."""
+    PREFETCH = 1
+    """Upcoming queue entries resolved ahead of time."""
+    BULK = 2
+    """Playlist imports and radio pool fills."""
 
 
 class AudioResolver(ABC):
     """Interface for resolving URLs and search queries to playable tracks."""
 
     @abstractmethod
-    async def resolve(self, query: NonEmptyStr) -> Track | None:
+    async def resolve(
+        self, query: NonEmptyStr, *, priority: ResolvePriority = ResolvePriority.INTERACTIVE
+    ) -> Track | None:
         """Resolve a query or URL to a playable track."""
         ...
 
     @abstractmethod
-    async def resolve_many(self, queries: list[NonEmptyStr]) -> list[Track]:
-        """Resolve multiple queries to tracks."""
+    def resolve_many(
+        self, queries: list[NonEmptyStr], *, priority: ResolvePriority = ResolvePriority.BULK
+    ) -> AsyncIterator[Track]:
+        """Yield tracks for *queries* in input order as each resolves, skipping failures."""
         ...
 
     @abstractmethod
@@ -31,7 +48,11 @@ class AudioResolver(ABC):
 
     @abstractmethod
     async def extract_playlist(self, url: HttpUrlStr) -> list[Track]:
-        """Extract all tracks from a playlist URL."""
+        """Extract all tracks from a playlist URL.
+
+        Tracks may come back without a ``stream_url``; playback resolves it
+        on demand (or the prefetcher does ahead of time).
+        """
         ...
 
     @abstractmethod
@@ -39,8 +60,21 @@ class AudioResolver(ABC):
         """Extract playlist title + lightweight track metadata, no stream resolution."""
         ...
 
+    @abstractmethod
+    def playlist_tracks(self, entries: list[PlaylistEntry]) -> list[Track]:
+        """Build tracks from preview entries without extracting them again.
+
+        The tracks have no ``stream_url``; playback resolves it on demand (or
+        the prefetcher does ahead of time). Unusable entries are skipped.
+        """
+        ...
+
     @abstractmethod
     def is_url(self, query: NonEmptyStr) -> bool: ...
 
     @abstractmethod
     def is_playlist(self, url: HttpUrlStr) -> bool: ...
+
+    def close(self) -> None:
+        """Release resources held between resolutions (e.g. pooled extractor instances)."""
+        return None
@@ -49,6 +49,14 @@ class VoiceAdapter(ABC):
         """Start playing a track, optionally seeking to *start_seconds*."""
         ...
 
+    async def preload(self, guild_id: DiscordSnowflake, track: Track) -> bool:
+        """Prepare *track* to follow the current one without a gap.
+
+        Optional: adapters that cannot preload return False and the next
+        ``play`` call starts the track from scratch.
+        """
+        return False
+
     @abstractmethod
     async def stop(self, guild_id: DiscordSnowflake) -> bool:
         """Stop current playback."""
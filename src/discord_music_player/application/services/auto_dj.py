@@ -17,9 +17,10 @@ from ...domain.shared.constants import TimeConstants
 from ...domain.shared.events import QueueExhausted, TrackStartedPlaying, get_event_bus
 from ...domain.shared.types import DiscordSnowflake
 from ...utils.logging import get_logger
+from .session_actors import GuildSessionActors
 
 if TYPE_CHECKING:
-    from ...domain.music.entities import Track
+    from ...domain.music.entities import GuildPlaybackSession, Track
     from ...domain.music.repository import SessionRepository, TrackHistoryRepository
     from ..interfaces.ai_client import AIClient
     from .playback_service import PlaybackApplicationService
@@ -46,10 +47,12 @@ class AutoDJ:
         session_repository: SessionRepository,
         history_repository: TrackHistoryRepository,
         ai_client: AIClient,
+        session_actors: GuildSessionActors | None = None,
     ) -> None:
         self._radio_service = radio_service
         self._playback_service = playback_service
         self._session_repo = session_repository
+        self._actors = session_actors or GuildSessionActors(session_repository)
         self._history_repo = history_repository
         self._ai_client = ai_client
         self._bus = get_event_bus()
@@ -133,12 +136,12 @@ class AutoDJ:
         if self._radio_service.is_enabled(guild_id):
             return
 
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        has_tracks = await self._actors.read(guild_id, lambda session: session.has_tracks)
+        if has_tracks is None:
             return
 
         # Don't activate if someone added tracks during the delay
-        if session.has_tracks:
+        if has_tracks:
             return
 
         if not await self._ai_client.is_available():
@@ -163,11 +166,15 @@ class AutoDJ:
             last_track.title,
         )
 
-        injected_seed = session.current_track is None
+        def inject_seed(session: GuildPlaybackSession) -> bool:
+            if session.current_track is not None:
+                return False
+            session.set_current_track(last_track)
+            return True
+
+        injected_seed = False
         try:
-            if injected_seed:
-                session.set_current_track(last_track)
-                await self._session_repo.save(session)
+            injected_seed = bool(await self._actors.execute(guild_id, inject_seed))
 
             result = await self._radio_service.toggle_radio(
                 guild_id=guild_id,
@@ -192,8 +199,9 @@ class AutoDJ:
 
     async def _clear_injected_seed(self, guild_id: DiscordSnowflake, seed: Track) -> None:
         """Remove the temporary seed track only if it's still the current track."""
-        session = await self._session_repo.get(guild_id)
-        if session is not None and session.current_track is not None:
-            if session.current_track.id == seed.id:
+
+        def clear_seed(session: GuildPlaybackSession) -> None:
+            if session.current_track is not None and session.current_track.id == seed.id:
                 session.set_current_track(None)
-                await self._session_repo.save(session)
+
+        await self._actors.execute(guild_id, clear_seed)
@@ -8,15 +8,20 @@ from typing import TYPE_CHECKING
 from ...domain.music.entities import GuildPlaybackSession, Track
 from ...domain.music.enums import PlaybackState
 from ...domain.shared.datetime_utils import utcnow
+from ...domain.shared.enums import TransitionOutcome, TransitionStage
 from ...domain.shared.events import QueueExhausted, TrackStartedPlaying, get_event_bus
 from ...domain.shared.types import DiscordSnowflake
 from ...utils.logging import get_logger
+from ...utils.stream_url import is_stream_url_stale
+from .session_actors import GuildSessionActors
+from .transition_tracer import TransitionTracer
 
 if TYPE_CHECKING:
     from ...domain.music.repository import SessionRepository, TrackHistoryRepository
     from ...domain.music.wrappers import StartSeconds
     from ..interfaces.audio_resolver import AudioResolver
     from ..interfaces.voice_adapter import VoiceAdapter
+    from .stream_prefetcher import StreamPrefetcher
 
 logger = get_logger(__name__)
 
@@ -31,11 +36,17 @@ class PlaybackApplicationService:
         history_repository: TrackHistoryRepository,
         voice_adapter: VoiceAdapter,
         audio_resolver: AudioResolver,
+        session_actors: GuildSessionActors | None = None,
+        stream_prefetcher: StreamPrefetcher | None = None,
+        transition_tracer: TransitionTracer | None = None,
     ) -> None:
         self._session_repo = session_repository
+        self._actors = session_actors or GuildSessionActors(session_repository)
         self._history_repo = history_repository
         self._voice_adapter = voice_adapter
         self._audio_resolver = audio_resolver
+        self._prefetcher = stream_prefetcher
+        self._tracer = transition_tracer or TransitionTracer()
 
         self._on_track_finished_callback: (
             Callable[[DiscordSnowflake, Track], Awaitable[None]] | None
@@ -48,31 +59,37 @@ class PlaybackApplicationService:
         # the "after" callback. Suppress the next event per guild to avoid double-advancing.
         self._ignore_next_voice_track_end: set[DiscordSnowflake] = set()
 
+        # History row of the track playing per guild, so finishing it updates
+        # by primary key. Absent when the repository defers the write.
+        self._history_ids: dict[DiscordSnowflake, int] = {}
+
         self._voice_adapter.set_on_track_end_callback(self._on_voice_track_end)
 
     async def _on_voice_track_end(self, guild_id: DiscordSnowflake) -> None:
         if guild_id in self._ignore_next_voice_track_end:
             self._ignore_next_voice_track_end.discard(guild_id)
+            self._tracer.discard(guild_id)
             logger.debug("Ignoring voice track-end callback for guild %s", guild_id)
             return
 
-        session = await self._session_repo.get(guild_id)
-        if session is None:
-            return
+        current_track = await self._actors.read(guild_id, self._playing_track)
+        if current_track:
+            await self.handle_track_finished(guild_id, current_track)
+        else:
+            self._tracer.discard(guild_id)
 
+    @staticmethod
+    def _playing_track(session: GuildPlaybackSession) -> Track | None:
         # Guard against double-advance: if skip/stop already transitioned the
         # session away from PLAYING, this callback is stale.
         if session.state != PlaybackState.PLAYING:
             logger.debug(
                 "Ignoring voice track-end for guild %s: session state is %s",
-                guild_id,
+                session.guild_id,
                 session.state,
             )
-            return
-
-        current_track = session.current_track
-        if current_track:
-            await self.handle_track_finished(guild_id, current_track)
+            return None
+        return session.current_track
 
     def set_track_finished_callback(
         self, callback: Callable[[DiscordSnowflake, Track], Awaitable[None]] | None
@@ -80,6 +97,8 @@ class PlaybackApplicationService:
         self._on_track_finished_callback = callback
 
     _MAX_RESOLVE_RETRIES: int = 3
+    # A stored stream URL is reused only if it outlives the track by this much.
+    _STREAM_URL_SAFETY_SECONDS: int = 60
 
     async def start_playback(
         self, guild_id: DiscordSnowflake, *, start_seconds: StartSeconds | None = None
@@ -94,41 +113,27 @@ class PlaybackApplicationService:
         logger.info("start_playback called for guild %s", guild_id)
 
         for attempt in range(self._MAX_RESOLVE_RETRIES):
-            session = await self._session_repo.get(guild_id)
-            if session is None:
+            claim = await self._actors.execute(guild_id, self._claim_next_track)
+            if claim is None:
                 logger.warning("No session found for guild %s", guild_id)
                 return False
 
-            logger.info(
-                "Session state=%s is_playing=%s has_current=%s queue_length=%s",
-                session.state,
-                session.is_playing,
-                session.current_track is not None,
-                session.queue_length,
-            )
-
-            if session.is_playing:
+            already_playing, track = claim
+            if already_playing:
                 logger.info("Already playing in guild %s, returning True", guild_id)
+                self._tracer.discard(guild_id)
                 return True
-
-            had_current = session.current_track is not None
-            track = await self._get_next_track(session)
             if track is None:
                 logger.warning("No tracks in queue for guild %s", guild_id)
                 return False
 
             logger.info("Got track to play: %s", track.title)
-
-            await self._persist_playback_state(
-                guild_id,
-                current_track=track,
-                state=PlaybackState.IDLE,
-                remove_from_queue=not had_current,
-            )
+            self._tracer.mark(guild_id, TransitionStage.CLAIM_NEXT)
 
             track_title = track.title
-            track = await self._ensure_stream_url(session, track, guild_id)
-            if track is None:
+            resolved = await self._ensure_stream_url(track, guild_id)
+            self._tracer.mark(guild_id, TransitionStage.STREAM_RESOLVE)
+            if resolved is None:
                 # Resolution failed — _ensure_stream_url already cleared current_track.
                 # Loop back to try the next track in the queue.
                 logger.warning(
@@ -140,7 +145,7 @@ class PlaybackApplicationService:
                 )
                 continue
 
-            return await self._start_voice_playback(session, track, guild_id)
+            return await self._start_voice_playback(resolved, guild_id)
 
         logger.error(
             "Exhausted %d resolve retries in guild %s, stopping",
@@ -149,7 +154,28 @@ class PlaybackApplicationService:
         )
         return False
 
-    async def _get_next_track(self, session: GuildPlaybackSession) -> Track | None:
+    def _claim_next_track(self, session: GuildPlaybackSession) -> tuple[bool, Track | None]:
+        """Make the next track current (dequeuing it if needed) in one actor step.
+
+        Returns ``(already_playing, track)``.
+        """
+        logger.info(
+            "Session state=%s is_playing=%s has_current=%s queue_length=%s",
+            session.state,
+            session.is_playing,
+            session.current_track is not None,
+            session.queue_length,
+        )
+        if session.is_playing:
+            return True, None
+
+        track = self._get_next_track(session)
+        if track is not None:
+            self._apply_playback_state(session, PlaybackState.IDLE)
+        return False, track
+
+    @staticmethod
+    def _get_next_track(session: GuildPlaybackSession) -> Track | None:
         if session.current_track is not None:
             return session.current_track
 
@@ -158,11 +184,21 @@ class PlaybackApplicationService:
             session.set_current_track(track)
         return track
 
-    async def _ensure_stream_url(
-        self, session: GuildPlaybackSession, track: Track, guild_id: DiscordSnowflake
-    ) -> Track | None:
-        """Resolve and attach a stream URL. Returns None on failure (caller retries)."""
-        if track.stream_url:
+    async def _ensure_stream_url(self, track: Track, guild_id: DiscordSnowflake) -> Track | None:
+        """Resolve and attach a stream URL. Returns None on failure (caller retries).
+
+        Uses a URL prefetched while the previous track played when there is one,
+        and keeps the track's own URL only if it will not expire mid-playback.
+        """
+        if self._prefetcher is not None:
+            prefetched = self._prefetcher.take(guild_id, track)
+            if prefetched is not None:
+                return track.with_resolved(prefetched)
+
+        if track.stream_url and not is_stream_url_stale(
+            track.stream_url,
+            margin_seconds=(track.duration_seconds or 0) + self._STREAM_URL_SAFETY_SECONDS,
+        ):
             return track
 
         try:
@@ -170,13 +206,10 @@ class PlaybackApplicationService:
             if resolved is None:
                 raise ValueError("Resolver returned None")
 
-            track = track.with_resolved(resolved)
-            session.set_current_track(track)
-            return track
+            return track.with_resolved(resolved)
 
         except Exception:
             logger.exception("Failed to resolve stream URL")
-            session.set_current_track(None)
             await self._persist_playback_state(
                 guild_id,
                 current_track=None,
@@ -184,15 +217,12 @@ class PlaybackApplicationService:
             )
             return None
 
-    async def _start_voice_playback(
-        self, session: GuildPlaybackSession, track: Track, guild_id: DiscordSnowflake
-    ) -> bool:
+    async def _start_voice_playback(self, track: Track, guild_id: DiscordSnowflake) -> bool:
         try:
             seek = self._pending_start_seconds.pop(guild_id, None)
             success = await self._voice_adapter.play(guild_id, track, start_seconds=seek)
             if not success:
                 logger.error("Voice adapter failed to play in guild %s", guild_id)
-                session.set_current_track(None)
                 await self._persist_playback_state(
                     guild_id,
                     current_track=None,
@@ -205,7 +235,11 @@ class PlaybackApplicationService:
                 current_track=track,
                 state=PlaybackState.PLAYING,
             )
-            await self._history_repo.record_play(guild_id=guild_id, track=track)
+            history_id = await self._history_repo.record_play(guild_id=guild_id, track=track)
+            if history_id is None:
+                self._history_ids.pop(guild_id, None)
+            else:
+                self._history_ids[guild_id] = history_id
             logger.info("Started playing: %s in guild %s", track.title, guild_id)
 
             await get_event_bus().publish(
@@ -220,7 +254,6 @@ class PlaybackApplicationService:
             return True
         except Exception:
             logger.exception("Error starting playback")
-            session.set_current_track(None)
             await self._persist_playback_state(
                 guild_id,
                 current_track=None,
@@ -229,19 +262,19 @@ class PlaybackApplicationService:
             return False
 
     async def stop_playback(self, guild_id: DiscordSnowflake) -> bool:
-        session = await self._session_repo.get(guild_id)
-        if session is None or not session.state.is_active:
+        is_active = await self._actors.read(guild_id, lambda session: session.state.is_active)
+        if not is_active:
             return False
 
         self._ignore_next_voice_track_end.add(guild_id)
         try:
             await self._voice_adapter.stop(guild_id)
-            session.stop()
             await self._persist_playback_state(
                 guild_id,
-                current_track=session.current_track,
-                state=session.state,
+                current_track=None,
+                state=PlaybackState.STOPPED,
             )
+            self._history_ids.pop(guild_id, None)
             logger.info("Stopped playback in guild %s", guild_id)
             return True
         except Exception:
@@ -252,18 +285,13 @@ class PlaybackApplicationService:
             return False
 
     async def pause_playback(self, guild_id: DiscordSnowflake) -> bool:
-        session = await self._session_repo.get(guild_id)
-        if session is None or not session.is_playing:
+        is_playing = await self._actors.read(guild_id, lambda session: session.is_playing)
+        if not is_playing:
             return False
 
         try:
             await self._voice_adapter.pause(guild_id)
-            session.pause()
-            await self._persist_playback_state(
-                guild_id,
-                current_track=session.current_track,
-                state=session.state,
-            )
+            await self._persist_state(guild_id, PlaybackState.PAUSED)
             logger.debug("Paused playback in guild %s", guild_id)
             return True
         except Exception:
@@ -271,18 +299,13 @@ class PlaybackApplicationService:
             return False
 
     async def resume_playback(self, guild_id: DiscordSnowflake) -> bool:
-        session = await self._session_repo.get(guild_id)
-        if session is None or not session.is_paused:
+        is_paused = await self._actors.read(guild_id, lambda session: session.is_paused)
+        if not is_paused:
             return False
 
         try:
             await self._voice_adapter.resume(guild_id)
-            session.resume()
-            await self._persist_playback_state(
-                guild_id,
-                current_track=session.current_track,
-                state=session.state,
-            )
+            await self._persist_state(guild_id, PlaybackState.PLAYING)
             logger.debug("Resumed playback in guild %s", guild_id)
             return True
         except Exception:
@@ -293,15 +316,13 @@ class PlaybackApplicationService:
         self, guild_id: DiscordSnowflake, *, start_seconds: StartSeconds
     ) -> bool:
         """Restart the current track at a specific timestamp."""
-        session = await self._session_repo.get(guild_id)
-        if session is None or session.current_track is None:
+        track = await self._actors.read(guild_id, lambda session: session.current_track)
+        if track is None:
             return False
 
-        track = session.current_track
-        if not track.stream_url:
-            track = await self._ensure_stream_url(session, track, guild_id)
-            if track is None:
-                return False
+        track = await self._ensure_stream_url(track, guild_id)
+        if track is None:
+            return False
 
         self._ignore_next_voice_track_end.add(guild_id)
         try:
@@ -328,35 +349,29 @@ class PlaybackApplicationService:
 
     async def skip_track(self, guild_id: DiscordSnowflake) -> Track | None:
         """Skip the current track and return it, or None if nothing was playing."""
-        session = await self._session_repo.get(guild_id)
-        if session is None or session.current_track is None:
+        skipped_track = await self._actors.read(guild_id, lambda session: session.current_track)
+        if skipped_track is None:
             return None
 
-        skipped_track = session.current_track
-
         self._ignore_next_voice_track_end.add(guild_id)
         try:
             await self._voice_adapter.stop(guild_id)
         except Exception:
             self._ignore_next_voice_track_end.discard(guild_id)
             logger.exception("Error stopping voice during skip")
-            if not session.is_idle:
-                session.transition_to(PlaybackState.IDLE)
-            next_track = session.advance_to_next_track()
-            await self._session_repo.save(session)
-            if next_track:
+            advanced = await self._actors.execute(guild_id, self._advance_queue)
+            if advanced is not None and advanced[0] is not None:
                 await self.start_playback(guild_id)
             return skipped_track
 
-        if not session.is_idle:
-            session.transition_to(PlaybackState.IDLE)
-        next_track = session.advance_to_next_track()
-        await self._session_repo.save(session)
+        advanced = await self._actors.execute(guild_id, self._advance_queue)
+        next_track = advanced[0] if advanced is not None else None
 
         await self._history_repo.mark_finished(
             guild_id=guild_id,
             track_id=skipped_track.id,
             skipped=True,
+            history_id=self._history_ids.pop(guild_id, None),
         )
 
         if next_track:
@@ -368,20 +383,20 @@ class PlaybackApplicationService:
     async def handle_track_finished(self, guild_id: DiscordSnowflake, track: Track) -> None:
         logger.debug("Track finished: %s in guild %s", track.title, guild_id)
 
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        advanced = await self._actors.execute(guild_id, self._advance_queue)
+        if advanced is None:
+            self._tracer.discard(guild_id)
             return
-
-        if not session.is_idle:
-            session.transition_to(PlaybackState.IDLE)
-        next_track = session.advance_to_next_track()
-        await self._session_repo.save(session)
+        next_track = advanced[0]
+        self._tracer.mark(guild_id, TransitionStage.SESSION_ADVANCE)
 
         await self._history_repo.mark_finished(
             guild_id=guild_id,
             track_id=track.id,
             skipped=False,
+            history_id=self._history_ids.pop(guild_id, None),
         )
+        self._tracer.mark(guild_id, TransitionStage.HISTORY_UPDATE)
 
         # Update the now-playing embed BEFORE starting the next track.
         # start_playback publishes TrackStartedPlaying which triggers the
@@ -393,11 +408,19 @@ class PlaybackApplicationService:
                 await self._on_track_finished_callback(guild_id, track)
             except Exception:
                 logger.exception("Error in track finished callback")
+            self._tracer.mark(guild_id, TransitionStage.NOW_PLAYING_UPDATE)
 
         if next_track:
-            await self.start_playback(guild_id)
+            if not await self.start_playback(guild_id):
+                self._tracer.finish(guild_id, TransitionOutcome.FAILED)
         else:
             logger.info("Queue empty in guild %s", guild_id)
+            self._tracer.finish(guild_id, TransitionOutcome.QUEUE_EMPTY)
+            if self._voice_adapter.is_playing(guild_id):
+                # A gapless source moved on to a track preloaded before the
+                # queue emptied; nothing should be playing now.
+                self._ignore_next_voice_track_end.add(guild_id)
+                await self._voice_adapter.stop(guild_id)
             await get_event_bus().publish(
                 QueueExhausted(
                     guild_id=guild_id,
@@ -406,22 +429,13 @@ class PlaybackApplicationService:
                 )
             )
 
-    def _tracks_match(self, left: Track, right: Track) -> bool:
-        """Check whether two tracks refer to the same queued entry."""
-        if left.requested_at and right.requested_at:
-            return left.id == right.id and left.requested_at == right.requested_at
-        return (
-            left.id == right.id
-            and left.webpage_url == right.webpage_url
-            and left.requested_by_id == right.requested_by_id
-        )
-
-    def _remove_first_matching_track(self, queue: list[Track], target: Track) -> bool:
-        for index, track in enumerate(queue):
-            if self._tracks_match(track, target):
-                queue.pop(index)
-                return True
-        return False
+    @staticmethod
+    def _advance_queue(session: GuildPlaybackSession) -> tuple[Track | None]:
+        """Move past the current track. Wrapped in a tuple so that "no session"
+        (``None`` from the actor) stays distinguishable from an empty queue."""
+        if not session.is_idle:
+            session.transition_to(PlaybackState.IDLE)
+        return (session.advance_to_next_track(),)
 
     async def _persist_playback_state(
         self,
@@ -429,22 +443,23 @@ class PlaybackApplicationService:
         *,
         current_track: Track | None,
         state: PlaybackState | None = None,
-        remove_from_queue: bool = False,
     ) -> None:
-        """Persist playback state without discarding concurrent queue updates."""
-        session = await self._session_repo.get(guild_id)
-        if session is None:
-            return
+        """Set the current track and playback state in a single actor step."""
 
-        if remove_from_queue and current_track is not None:
-            removed = self._remove_first_matching_track(session.queue, current_track)
-            if not removed:
-                logger.warning(
-                    "Expected track not found in queue for guild %s during playback start",
-                    guild_id,
-                )
+        def command(session: GuildPlaybackSession) -> None:
+            session.set_current_track(current_track)
+            self._apply_playback_state(session, state)
 
-        session.set_current_track(current_track)
+        await self._actors.execute(guild_id, command)
+
+    async def _persist_state(self, guild_id: DiscordSnowflake, state: PlaybackState) -> None:
+        """Change playback state, keeping whatever track is current."""
+        await self._actors.execute(
+            guild_id, lambda session: self._apply_playback_state(session, state)
+        )
+
+    @staticmethod
+    def _apply_playback_state(session: GuildPlaybackSession, state: PlaybackState | None) -> None:
         if state is not None and state != session.state:
             if session.state.can_transition_to(state):
                 session.transition_to(state)
@@ -453,7 +468,7 @@ class PlaybackApplicationService:
                     "Skipping invalid transition %s -> %s for guild %s",
                     session.state,
                     state,
-                    guild_id,
+                    session.guild_id,
                 )
 
         # Track when playback started so we can resume from the right position
@@ -463,7 +478,6 @@ class PlaybackApplicationService:
             session.playback_started_at = None
 
         session.touch()
-        await self._session_repo.save(session)
 
     async def cleanup_guild(self, guild_id: DiscordSnowflake) -> None:
         """Release voice and session resources for a guild."""
@@ -476,5 +490,8 @@ class PlaybackApplicationService:
         finally:
             self._ignore_next_voice_track_end.discard(guild_id)
 
-        await self._session_repo.delete(guild_id)
+        if self._prefetcher is not None:
+            self._prefetcher.forget(guild_id)
+        self._tracer.clear(guild_id)
+        await self._actors.delete(guild_id)
         logger.info("Cleaned up guild %s", guild_id)
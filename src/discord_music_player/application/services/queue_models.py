@@ -56,6 +56,7 @@ class BatchEnqueueResult(BaseModel):
 
     enqueued: NonNegativeInt = 0
     should_start: bool = False
+    queue_full: bool = False
 
 
 class QueueSnapshot(BaseModel):
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ...domain.music.entities import Track
+from ...domain.music.entities import GuildPlaybackSession, Track
 from ...domain.music.enums import LoopMode
+from ...domain.music.wrappers import QueuePosition
 from ...domain.shared.datetime_utils import utcnow
 from ...domain.shared.exceptions import BusinessRuleViolationError
 from ...domain.shared.types import DiscordSnowflake, NonEmptyStr, QueuePositionInt
 from ...utils.logging import get_logger
 from .queue_models import BatchEnqueueResult, EnqueueMeta, EnqueueResult, QueueSnapshot
+from .session_actors import GuildSessionActors
 
 if TYPE_CHECKING:
     from ...domain.music.repository import SessionRepository
@@ -23,8 +25,10 @@ class QueueApplicationService:
         self,
         *,
         session_repository: SessionRepository,
+        session_actors: GuildSessionActors | None = None,
     ) -> None:
         self._session_repo = session_repository
+        self._actors = session_actors or GuildSessionActors(session_repository)
 
     async def enqueue(
         self,
@@ -33,21 +37,24 @@ class QueueApplicationService:
         user_id: DiscordSnowflake | None,
         user_name: NonEmptyStr,
     ) -> EnqueueResult:
-        session = await self._session_repo.get_or_create(guild_id)
-        was_idle = session.current_track is None
-
         track_with_requester = track.with_requester(
             user_id=user_id,
             user_name=user_name,
             requested_at=utcnow(),
         )
 
-        try:
+        def command(session: GuildPlaybackSession) -> tuple[bool, QueuePosition, int]:
+            was_idle = session.current_track is None
             position = session.enqueue(track_with_requester)
+            return was_idle, position, session.queue_length
+
+        try:
+            was_idle, position, queue_length = await self._actors.execute_or_create(
+                guild_id, command
+            )
         except BusinessRuleViolationError as exc:
             return EnqueueResult.failure(exc.message)
 
-        await self._session_repo.save(session)
         logger.info(
             "Enqueued track '%s' at position %s in guild %s", track.title, position.value, guild_id
         )
@@ -60,7 +67,7 @@ class QueueApplicationService:
         meta = EnqueueMeta(
             track=track_with_requester,
             position=position.value,
-            queue_length=session.queue_length,
+            queue_length=queue_length,
             should_start=was_idle,
         )
         return EnqueueResult.ok(meta=meta, message=message)
@@ -72,26 +79,26 @@ class QueueApplicationService:
         user_id: DiscordSnowflake | None,
         user_name: NonEmptyStr,
     ) -> EnqueueResult:
-        session = await self._session_repo.get_or_create(guild_id)
-
         track_with_requester = track.with_requester(
             user_id=user_id,
             user_name=user_name,
             requested_at=utcnow(),
         )
 
+        def command(session: GuildPlaybackSession) -> tuple[QueuePosition, int]:
+            return session.enqueue_next(track_with_requester), session.queue_length
+
         try:
-            position = session.enqueue_next(track_with_requester)
+            position, queue_length = await self._actors.execute_or_create(guild_id, command)
         except BusinessRuleViolationError as exc:
             return EnqueueResult.failure(exc.message)
 
-        await self._session_repo.save(session)
         logger.info("Enqueued track '%s' to play next in guild %s", track.title, guild_id)
 
         meta = EnqueueMeta(
             track=track_with_requester,
             position=position.value,
-            queue_length=session.queue_length,
+            queue_length=queue_length,
         )
         return EnqueueResult.ok(meta=meta, message="Added to play next")
 
@@ -102,95 +109,97 @@ class QueueApplicationService:
         user_id: DiscordSnowflake | None,
         user_name: NonEmptyStr,
     ) -> BatchEnqueueResult:
-        """Enqueue multiple tracks in a single session load/save cycle."""
+        """Enqueue multiple tracks as a single command with one persist."""
         if not tracks:
             return BatchEnqueueResult(enqueued=0, should_start=False)
 
-        session = await self._session_repo.get_or_create(guild_id)
-        should_start = session.current_track is None
-
         now = utcnow()
-        count = 0
-        for track in tracks:
-            tagged = track.with_requester(user_id=user_id, user_name=user_name, requested_at=now)
-            try:
-                session.enqueue(tagged)
-                count += 1
-            except BusinessRuleViolationError:
-                continue
+        tagged = [
+            track.with_requester(user_id=user_id, user_name=user_name, requested_at=now)
+            for track in tracks
+        ]
+
+        def command(session: GuildPlaybackSession) -> tuple[int, bool, bool]:
+            should_start = session.current_track is None
+            count = 0
+            for track in tagged:
+                try:
+                    session.enqueue(track)
+                    count += 1
+                except BusinessRuleViolationError:
+                    continue
+            return count, should_start, not session.can_add_to_queue
+
+        count, should_start, queue_full = await self._actors.execute_or_create(guild_id, command)
 
         if count > 0:
-            await self._session_repo.save(session)
             logger.info("Batch-enqueued %d/%d tracks in guild %s", count, len(tracks), guild_id)
 
-        return BatchEnqueueResult(enqueued=count, should_start=should_start and count > 0)
+        return BatchEnqueueResult(
+            enqueued=count, should_start=should_start and count > 0, queue_full=queue_full
+        )
 
     async def remove(self, guild_id: DiscordSnowflake, position: QueuePositionInt) -> Track | None:
-        session = await self._session_repo.get(guild_id)
-        if session is None:
-            return None
-
-        track = session.remove_at(position)
+        track = await self._actors.execute(guild_id, lambda session: session.remove_at(position))
         if track:
-            await self._session_repo.save(session)
             logger.info("Removed track '%s' from queue in guild %s", track.title, guild_id)
-
         return track
 
     async def clear(self, guild_id: DiscordSnowflake) -> int:
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        count = await self._actors.execute(guild_id, lambda session: session.clear_queue())
+        if count is None:
             return 0
 
-        count = session.clear_queue()
-        await self._session_repo.save(session)
         logger.info("Cleared %s tracks from queue in guild %s", count, guild_id)
         return count
 
     async def clear_recommendations(self, guild_id: DiscordSnowflake) -> int:
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        count = await self._actors.execute(
+            guild_id, lambda session: session.clear_recommendations()
+        )
+        if count is None:
             return 0
 
-        count = session.clear_recommendations()
-        await self._session_repo.save(session)
         logger.info("Cleared %d AI recommendations from queue in guild %s", count, guild_id)
         return count
 
     async def shuffle(self, guild_id: DiscordSnowflake) -> bool:
-        session = await self._session_repo.get(guild_id)
-        if session is None or not session.queue:
-            return False
+        def command(session: GuildPlaybackSession) -> bool:
+            if not session.queue:
+                return False
+            session.shuffle()
+            return True
 
-        session.shuffle()
-        await self._session_repo.save(session)
-        logger.info("Shuffled queue in guild %s", guild_id)
-        return True
+        shuffled = bool(await self._actors.execute(guild_id, command))
+        if shuffled:
+            logger.info("Shuffled queue in guild %s", guild_id)
+        return shuffled
 
     async def move(
         self, guild_id: DiscordSnowflake, from_pos: QueuePositionInt, to_pos: QueuePositionInt
     ) -> bool:
-        session = await self._session_repo.get(guild_id)
-        if session is None:
-            return False
-
-        success = session.move_track(from_pos, to_pos)
+        success = bool(
+            await self._actors.execute(
+                guild_id, lambda session: session.move_track(from_pos, to_pos)
+            )
+        )
         if success:
-            await self._session_repo.save(session)
             logger.info("Moved track from %s to %s in guild %s", from_pos, to_pos, guild_id)
-
         return success
 
     async def get_queue(self, guild_id: DiscordSnowflake) -> QueueSnapshot:
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        snapshot = await self._actors.read(guild_id, self._snapshot)
+        if snapshot is None:
             return QueueSnapshot(
                 current_track=None,
                 tracks=[],
                 total_tracks=0,
                 total_duration=None,
             )
+        return snapshot
 
+    @staticmethod
+    def _snapshot(session: GuildPlaybackSession) -> QueueSnapshot:
         total_duration = 0
         has_all_durations = True
 
@@ -213,8 +222,8 @@ class QueueApplicationService:
         )
 
     async def toggle_loop(self, guild_id: DiscordSnowflake) -> LoopMode:
-        session = await self._session_repo.get_or_create(guild_id)
-        new_mode = session.toggle_loop()
-        await self._session_repo.save(session)
+        new_mode = await self._actors.execute_or_create(
+            guild_id, lambda session: session.toggle_loop()
+        )
         logger.info("Loop mode changed to %s in guild %s", new_mode.value, guild_id)
         return new_mode
@@ -27,7 +27,9 @@ from ...domain.shared.types import (
     NonEmptyStr,
 )
 from ...utils.logging import get_logger
+from ..interfaces.audio_resolver import ResolvePriority
 from .radio_models import RadioState, RadioToggleResult
+from .session_actors import GuildSessionActors
 
 if TYPE_CHECKING:
     from ...config.settings import RadioSettings
@@ -58,11 +60,13 @@ class RadioApplicationService:
         session_repository: SessionRepository,
         history_repository: TrackHistoryRepository,
         settings: RadioSettings,
+        session_actors: GuildSessionActors | None = None,
     ) -> None:
         self._ai_client = ai_client
         self._audio_resolver = audio_resolver
         self._queue_service = queue_service
         self._session_repo = session_repository
+        self._actors = session_actors or GuildSessionActors(session_repository)
         self._history_repo = history_repository
         self._settings = settings
         self._states: dict[DiscordSnowflake, RadioState] = {}
@@ -80,8 +84,8 @@ class RadioApplicationService:
 
     async def has_queued_tracks(self, guild_id: DiscordSnowflake) -> bool:
         """Check whether the guild's queue has any tracks waiting."""
-        session = await self._session_repo.get(guild_id)
-        return session is not None and session.queue_length > 0
+        queue_length = await self._actors.read(guild_id, lambda session: session.queue_length)
+        return bool(queue_length)
 
     # ── Toggle / disable ──────────────────────────────────────────────
 
@@ -119,15 +123,13 @@ class RadioApplicationService:
             self.disable_radio(guild_id)
             return RadioToggleResult(enabled=False, message="Radio disabled.")
 
-        session = await self._session_repo.get(guild_id)
-        if session is None or session.current_track is None:
+        current_track = await self._get_base_track(guild_id)
+        if current_track is None:
             return RadioToggleResult(enabled=False, message="No track is currently playing.")
 
         if not await self._ai_client.is_available():
             return RadioToggleResult(enabled=False, message="AI service unavailable.")
 
-        current_track = session.current_track
-
         # Create state with user/channel context for pool-exhaustion events
         state = RadioState(
             enabled=True,
@@ -342,12 +344,8 @@ class RadioApplicationService:
             await self._restore_removed_track(guild_id, removed, queue_position, user_id, user_name)
             return None
 
-        # Move the newly enqueued track (at the end) to the original position
-        new_session = await self._session_repo.get(guild_id)
-        if new_session is not None and new_session.queue_length > 0:
-            from_pos = new_session.queue_length - 1
-            if from_pos != queue_position:
-                await self._queue_service.move(guild_id, from_pos, queue_position)
+        # Move the newly enqueued track to the original position
+        await self._move_to_position(guild_id, track, queue_position)
 
         state.tracks_consumed += 1
         return track
@@ -369,11 +367,11 @@ class RadioApplicationService:
 
         logger.info("Radio refill triggered in guild %s", guild_id)
 
-        session = await self._session_repo.get(guild_id)
-        if session is None:
+        queue_length = await self._actors.read(guild_id, lambda session: session.queue_length)
+        if queue_length is None:
             return 0
 
-        remaining_capacity = session.MAX_QUEUE_SIZE - session.queue_length
+        remaining_capacity = GuildPlaybackSession.MAX_QUEUE_SIZE - queue_length
         if remaining_capacity <= 0:
             return 0
 
@@ -400,8 +398,8 @@ class RadioApplicationService:
         if state.tracks_consumed >= self._settings.max_tracks_per_session:
             return 0
 
-        session = await self._session_repo.get(guild_id)
-        if session is None or session.queue_length > 0:
+        queue_length = await self._actors.read(guild_id, lambda session: session.queue_length)
+        if queue_length is None or queue_length > 0:
             return 0
 
         if not state.pool:
@@ -446,7 +444,7 @@ class RadioApplicationService:
     ) -> Track | None:
         """Resolve a single recommendation and enqueue it. Returns the Track or None."""
         try:
-            track = await self._audio_resolver.resolve(rec.query)
+            track = await self._audio_resolver.resolve(rec.query, priority=ResolvePriority.BULK)
             if track is None:
                 logger.warning("Radio: could not resolve '%s'", rec.query)
                 return None
@@ -522,11 +520,7 @@ class RadioApplicationService:
                 user_name=restore_user_name,
             )
             if result.success:
-                session = await self._session_repo.get(guild_id)
-                if session is not None and session.queue_length > 1:
-                    from_pos = session.queue_length - 1
-                    if from_pos != position:
-                        await self._queue_service.move(guild_id, from_pos, position)
+                await self._move_to_position(guild_id, track, position)
                 logger.info("Restored removed track '%s' after failed reroll", track.title)
         except Exception:
             logger.warning("Failed to restore track '%s' after reroll failure", track.title)
@@ -540,10 +534,24 @@ class RadioApplicationService:
 
     async def _get_base_track(self, guild_id: DiscordSnowflake) -> Track | None:
         """Return the currently playing track, or None."""
-        session = await self._session_repo.get(guild_id)
-        if session is None:
-            return None
-        return session.current_track
+        return await self._actors.read(guild_id, lambda session: session.current_track)
+
+    async def _move_to_position(
+        self, guild_id: DiscordSnowflake, track: Track, position: int
+    ) -> None:
+        """Move the most recently enqueued copy of *track* to *position*.
+
+        Runs as a single actor command so a concurrent enqueue or skip cannot
+        shift the queue between locating the track and moving it.
+        """
+
+        def command(session: GuildPlaybackSession) -> bool:
+            for index in range(session.queue_length - 1, -1, -1):
+                if session.queue[index].id == track.id:
+                    return index != position and session.move_track(index, position)
+            return False
+
+        await self._actors.execute(guild_id, command)
 
     @staticmethod
     def _session_exclude_ids(session: GuildPlaybackSession) -> list[str]:
@@ -561,11 +569,8 @@ class RadioApplicationService:
         *extra_ids: str,
     ) -> list[str]:
         """Build exclusion list from session state plus any extra IDs."""
-        session = await self._session_repo.get(guild_id)
-        ids = list(extra_ids)
-        if session is not None:
-            ids.extend(self._session_exclude_ids(session))
-        return ids
+        session_ids = await self._actors.read(guild_id, self._session_exclude_ids)
+        return [*extra_ids, *(session_ids or [])]
 
     async def _fetch_recommendations(
         self,
@@ -0,0 +1,245 @@
+"""Per-guild session actors: serialized, batched mutations of GuildPlaybackSession.
+
+Every guild gets a mailbox of commands. A single drain task per guild loads the
+session once, runs every command queued so far against it in FIFO order, and
+persists the result once. Services submit synchronous commands instead of doing
+their own load-modify-save, so concurrent callers can no longer overwrite each
+other's changes and a burst of mutations costs a single write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from ...domain.shared.types import DiscordSnowflake, NonNegativeInt
+from ...utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from ...domain.music.entities import GuildPlaybackSession
+    from ...domain.music.repository import SessionRepository
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+SessionCommand = Callable[["GuildPlaybackSession"], T]
+"""A synchronous function run against the guild's session inside its actor.
+
+Commands must not await: everything that touches the network (voice, resolvers,
+AI) happens outside the actor, before or after submitting. A command that
+raises has its exception re-raised to the submitter; it should validate before
+mutating, as the domain methods on ``GuildPlaybackSession`` already do.
+"""
+
+
+class SessionActorStats(BaseModel):
+    """Counters for :class:`GuildSessionActors`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    active_guilds: NonNegativeInt = 0
+    commands: NonNegativeInt = 0
+    ticks: NonNegativeInt = 0
+    persists: NonNegativeInt = 0
+    max_batch: NonNegativeInt = 0
+
+
+class _Command:
+    __slots__ = ("fn", "future", "mutates", "create", "delete")
+
+    def __init__(
+        self,
+        fn: SessionCommand[Any] | None,
+        future: asyncio.Future[Any],
+        *,
+        mutates: bool,
+        create: bool = False,
+        delete: bool = False,
+    ) -> None:
+        self.fn = fn
+        self.future = future
+        self.mutates = mutates
+        self.create = create
+        self.delete = delete
+
+
+class GuildSessionActors:
+    """Routes session commands to one serialized actor per guild."""
+
+    def __init__(self, session_repository: SessionRepository) -> None:
+        self._session_repo = session_repository
+        self._mailboxes: dict[DiscordSnowflake, deque[_Command]] = {}
+        self._tasks: dict[DiscordSnowflake, asyncio.Task[None]] = {}
+        self._commands = 0
+        self._ticks = 0
+        self._persists = 0
+        self._max_batch = 0
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    async def execute(self, guild_id: DiscordSnowflake, command: SessionCommand[T]) -> T | None:
+        """Run a mutating command and return its result once the change is persisted.
+
+        Returns ``None`` without running the command when the guild has no session.
+        """
+        return await self._submit(guild_id, command, mutates=True)
+
+    async def execute_or_create(self, guild_id: DiscordSnowflake, command: SessionCommand[T]) -> T:
+        """Like :meth:`execute`, creating the guild's session first if it has none."""
+        result: T = await self._submit(guild_id, command, mutates=True, create=True)
+        return result
+
+    async def read(self, guild_id: DiscordSnowflake, query: SessionCommand[T]) -> T | None:
+        """Run a read-only query, ordered after every command submitted before it."""
+        return await self._submit(guild_id, query, mutates=False)
+
+    async def delete(self, guild_id: DiscordSnowflake) -> bool:
+        """Delete the guild's session once already-queued commands have run."""
+        result = await self._submit(guild_id, None, mutates=True, delete=True)
+        return bool(result)
+
+    async def drain(self) -> None:
+        """Wait until every queued command has been processed (used on shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    def stats(self) -> SessionActorStats:
+        return SessionActorStats(
+            active_guilds=len(self._tasks),
+            commands=self._commands,
+            ticks=self._ticks,
+            persists=self._persists,
+            max_batch=self._max_batch,
+        )
+
+    # ── Mailbox ───────────────────────────────────────────────────────
+
+    async def _submit(
+        self,
+        guild_id: DiscordSnowflake,
+        fn: SessionCommand[Any] | None,
+        *,
+        mutates: bool,
+        create: bool = False,
+        delete: bool = False,
+    ) -> Any:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        command = _Command(fn, future, mutates=mutates, create=create, delete=delete)
+        self._mailboxes.setdefault(guild_id, deque()).append(command)
+        self._commands += 1
+
+        if guild_id not in self._tasks:
+            self._tasks[guild_id] = asyncio.create_task(
+                self._run(guild_id), name=f"session-actor-{guild_id}"
+            )
+        return await future
+
+    async def _run(self, guild_id: DiscordSnowflake) -> None:
+        """Drain the guild's mailbox tick by tick; exit when it is empty."""
+        try:
+            while mailbox := self._mailboxes.get(guild_id):
+                batch = self._take_batch(mailbox)
+                await self._tick(guild_id, batch)
+        finally:
+            self._tasks.pop(guild_id, None)
+            # Only reached with work left if the actor itself was cancelled.
+            for command in self._mailboxes.pop(guild_id, ()):
+                command.future.cancel()
+
+    @staticmethod
+    def _take_batch(mailbox: deque[_Command]) -> list[_Command]:
+        # A delete ends the batch so later commands see the session gone.
+        batch: list[_Command] = []
+        while mailbox:
+            command = mailbox.popleft()
+            batch.append(command)
+            if command.delete:
+                break
+        return batch
+
+    async def _tick(self, guild_id: DiscordSnowflake, batch: list[_Command]) -> None:
+        self._ticks += 1
+        self._max_batch = max(self._max_batch, len(batch))
+        results: list[tuple[_Command, Any, BaseException | None]] = []
+
+        try:
+            if batch[-1].delete:
+                await self._run_before_delete(guild_id, batch[:-1], results)
+                deleted = await self._session_repo.delete(guild_id)
+                results.append((batch[-1], deleted, None))
+            else:
+                await self._run_batch(guild_id, batch, results)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                logger.exception("Session actor tick failed for guild %s", guild_id)
+            for command in batch:
+                if command.future.done():
+                    continue
+                if isinstance(exc, Exception):
+                    command.future.set_exception(exc)
+                else:
+                    command.future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        for command, value, error in results:
+            if command.future.done():
+                continue
+            if error is not None:
+                command.future.set_exception(error)
+            else:
+                command.future.set_result(value)
+
+    async def _run_before_delete(
+        self,
+        guild_id: DiscordSnowflake,
+        batch: list[_Command],
+        results: list[tuple[_Command, Any, BaseException | None]],
+    ) -> None:
+        # Commands queued ahead of a delete still see (and may act on) the
+        # session, but there is no point persisting what is about to go.
+        if not batch:
+            return
+        session = await self._session_repo.get(guild_id)
+        for command in batch:
+            results.append(self._apply(command, session))
+
+    async def _run_batch(
+        self,
+        guild_id: DiscordSnowflake,
+        batch: list[_Command],
+        results: list[tuple[_Command, Any, BaseException | None]],
+    ) -> None:
+        if any(command.create for command in batch):
+            session: GuildPlaybackSession | None = await self._session_repo.get_or_create(guild_id)
+        else:
+            session = await self._session_repo.get(guild_id)
+
+        dirty = False
+        for command in batch:
+            outcome = self._apply(command, session)
+            results.append(outcome)
+            ran = session is not None and command.fn is not None
+            if command.mutates and ran and outcome[2] is None:
+                dirty = True
+
+        if dirty and session is not None:
+            await self._session_repo.save(session)
+            self._persists += 1
+
+    @staticmethod
+    def _apply(
+        command: _Command, session: GuildPlaybackSession | None
+    ) -> tuple[_Command, Any, BaseException | None]:
+        if session is None or command.fn is None:
+            return command, None, None
+        try:
+            return command, command.fn(session), None
+        except Exception as exc:
+            return command, None, exc
@@ -0,0 +1,252 @@
+"""Stream-URL prefetcher: resolves the next few queued tracks while the current one plays.
+
+Subscribes to TrackStartedPlaying and, in a background task, resolves stream
+URLs for the first ``prefetch_count`` tracks waiting in the guild's queue.
+Resolved streams are held per guild and handed to ``start_playback`` through
+:meth:`StreamPrefetcher.take`, so a track transition no longer waits on a
+full yt-dlp extraction.
+
+When a voice adapter is given, the first upcoming track is also handed to
+``VoiceAdapter.preload`` so its audio can start without a gap.
+
+Signed googlevideo URLs carry their expiry in an ``expire=`` parameter; the
+prefetcher records it, refuses to hand out URLs that are about to go stale,
+and re-resolves the guild's window shortly before the earliest one expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Final
+
+from pydantic import BaseModel, ConfigDict
+
+from ...domain.shared.constants import TimeConstants
+from ...domain.shared.events import TrackStartedPlaying, get_event_bus
+from ...domain.shared.types import DiscordSnowflake, NonNegativeInt
+from ...utils.logging import get_logger
+from ...utils.stream_url import is_stream_url_stale, stream_url_expiry
+from ..interfaces.audio_resolver import ResolvePriority
+
+if TYPE_CHECKING:
+    from ...domain.music.entities import GuildPlaybackSession, Track
+    from ..interfaces.audio_resolver import AudioResolver
+    from ..interfaces.voice_adapter import VoiceAdapter
+    from .session_actors import GuildSessionActors
+
+logger = get_logger(__name__)
+
+# Floor for the refresh timer, so a URL issued with less than the refresh
+# margin left cannot turn the timer into a busy loop.
+_MIN_REFRESH_DELAY: Final[float] = 30.0
+
+
+class PrefetcherStats(BaseModel):
+    """Counters for :class:`StreamPrefetcher`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    cached: NonNegativeInt = 0
+    resolved: NonNegativeInt = 0
+    failures: NonNegativeInt = 0
+    hits: NonNegativeInt = 0
+    misses: NonNegativeInt = 0
+    stale: NonNegativeInt = 0
+    refreshes: NonNegativeInt = 0
+
+
+class _PrefetchedStream:
+    __slots__ = ("track", "expires_at")
+
+    def __init__(self, track: Track, expires_at: float) -> None:
+        self.track = track
+        self.expires_at = expires_at
+
+
+class StreamPrefetcher:
+    """Keeps fresh stream URLs ready for the next tracks in each guild's queue."""
+
+    def __init__(
+        self,
+        *,
+        audio_resolver: AudioResolver,
+        session_actors: GuildSessionActors,
+        voice_adapter: VoiceAdapter | None = None,
+        prefetch_count: int = 2,
+        refresh_margin_seconds: float = 600.0,
+    ) -> None:
+        self._audio_resolver = audio_resolver
+        self._actors = session_actors
+        self._voice_adapter = voice_adapter
+        self._prefetch_count = prefetch_count
+        self._refresh_margin = refresh_margin_seconds
+        self._bus = get_event_bus()
+        self._started = False
+        self._streams: dict[DiscordSnowflake, dict[str, _PrefetchedStream]] = {}
+        self._tasks: dict[DiscordSnowflake, asyncio.Task[int]] = {}
+        self._refresh_timers: dict[DiscordSnowflake, asyncio.Task[None]] = {}
+        self._resolved = 0
+        self._failures = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._refreshes = 0
+
+    def start(self) -> None:
+        if self._started or self._prefetch_count <= 0:
+            return
+        self._bus.subscribe(TrackStartedPlaying, self._on_track_started)
+        self._started = True
+        logger.info("Stream prefetcher started (next %d tracks)", self._prefetch_count)
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        self._bus.unsubscribe(TrackStartedPlaying, self._on_track_started)
+        for guild_id in list(self._streams.keys() | self._tasks.keys()):
+            self.forget(guild_id)
+        self._started = False
+
+    # ── Lookup ────────────────────────────────────────────────────────
+
+    def take(self, guild_id: DiscordSnowflake, track: Track) -> Track | None:
+        """Pop the prefetched resolution for *track*, or None if absent or about to expire."""
+        entry = self._streams.get(guild_id, {}).pop(track.webpage_url, None)
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires_at - self._refresh_margin <= time.time():
+            self._stale += 1
+            return None
+        self._hits += 1
+        return entry.track
+
+    def is_stale(self, stream_url: str) -> bool:
+        """True when *stream_url* will expire before the refresh margin elapses."""
+        return is_stream_url_stale(stream_url, margin_seconds=self._refresh_margin)
+
+    def forget(self, guild_id: DiscordSnowflake) -> None:
+        """Drop a guild's prefetched streams and cancel its background work."""
+        self._streams.pop(guild_id, None)
+        for tasks in (self._tasks, self._refresh_timers):
+            task = tasks.pop(guild_id, None)
+            if task is not None and not task.done():
+                task.cancel()
+
+    def stats(self) -> PrefetcherStats:
+        return PrefetcherStats(
+            cached=sum(len(streams) for streams in self._streams.values()),
+            resolved=self._resolved,
+            failures=self._failures,
+            hits=self._hits,
+            misses=self._misses,
+            stale=self._stale,
+            refreshes=self._refreshes,
+        )
+
+    # ── Prefetching ───────────────────────────────────────────────────
+
+    async def _on_track_started(self, event: TrackStartedPlaying) -> None:
+        # The bus awaits handlers, so never resolve inline: that would hold up
+        # start_playback for exactly the extraction time we are trying to hide.
+        self._schedule(event.guild_id)
+
+    def _schedule(self, guild_id: DiscordSnowflake) -> None:
+        previous = self._tasks.get(guild_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        self._tasks[guild_id] = asyncio.create_task(
+            self.prefetch(guild_id), name=f"stream-prefetch-{guild_id}"
+        )
+
+    async def prefetch(self, guild_id: DiscordSnowflake) -> int:
+        """Resolve the guild's upcoming tracks that have no fresh stream yet.
+
+        Returns the number of tracks resolved.
+        """
+        upcoming = await self._actors.read(guild_id, self._upcoming)
+        if not upcoming:
+            self._streams.pop(guild_id, None)
+            return 0
+
+        wanted = {track.webpage_url for track in upcoming}
+        streams = self._streams.setdefault(guild_id, {})
+        for url in list(streams):
+            if url not in wanted:
+                del streams[url]
+
+        now = time.time()
+        resolved = 0
+        for track in upcoming:
+            entry = streams.get(track.webpage_url)
+            if entry is not None and entry.expires_at - self._refresh_margin > now:
+                continue
+            if await self._resolve_into(streams, track):
+                resolved += 1
+
+        if resolved:
+            logger.debug("Prefetched %d stream(s) for guild %s", resolved, guild_id)
+        await self._preload_next(guild_id, upcoming[0], streams)
+        self._schedule_refresh(guild_id)
+        return resolved
+
+    def _upcoming(self, session: GuildPlaybackSession) -> list[Track]:
+        return session.upcoming_tracks(self._prefetch_count)
+
+    async def _preload_next(
+        self, guild_id: DiscordSnowflake, track: Track, streams: dict[str, _PrefetchedStream]
+    ) -> None:
+        entry = streams.get(track.webpage_url)
+        if self._voice_adapter is None or entry is None:
+            return
+        try:
+            await self._voice_adapter.preload(guild_id, track.with_resolved(entry.track))
+        except Exception:
+            logger.warning("Preloading '%s' failed in guild %s", track.title, guild_id)
+
+    async def _resolve_into(self, streams: dict[str, _PrefetchedStream], track: Track) -> bool:
+        try:
+            resolved = await self._audio_resolver.resolve(
+                track.webpage_url, priority=ResolvePriority.PREFETCH
+            )
+        except Exception:
+            logger.warning("Prefetch failed for '%s'", track.title, exc_info=True)
+            resolved = None
+
+        if resolved is None or resolved.stream_url is None:
+            # Drop any stale entry so the refresh timer does not spin on it.
+            streams.pop(track.webpage_url, None)
+            self._failures += 1
+            return False
+
+        expires_at = stream_url_expiry(resolved.stream_url)
+        if expires_at is None:
+            expires_at = time.time() + TimeConstants.DEFAULT_CACHE_TTL
+        streams[track.webpage_url] = _PrefetchedStream(resolved, expires_at)
+        self._resolved += 1
+        return True
+
+    def _schedule_refresh(self, guild_id: DiscordSnowflake) -> None:
+        """Re-run the prefetch just before the earliest held URL goes stale."""
+        timer = self._refresh_timers.pop(guild_id, None)
+        if timer is not None and not timer.done() and timer is not asyncio.current_task():
+            timer.cancel()
+
+        streams = self._streams.get(guild_id)
+        if not streams:
+            return
+
+        earliest = min(entry.expires_at for entry in streams.values())
+        delay = max(earliest - self._refresh_margin - time.time(), _MIN_REFRESH_DELAY)
+        self._refresh_timers[guild_id] = asyncio.create_task(
+            self._refresh_after(guild_id, delay), name=f"stream-refresh-{guild_id}"
+        )
+
+    async def _refresh_after(self, guild_id: DiscordSnowflake, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._refreshes += 1
+        try:
+            await self.prefetch(guild_id)
+        except Exception:
+            logger.exception("Stream refresh failed for guild %s", guild_id)
@@ -0,0 +1,250 @@
+"""Stage-by-stage tracing of the gap between one track ending and the next one sounding.
+
+A transition begins on the voice player thread when a track ends, picks up a
+mark at every step of the hand-over (session advance, history, stream resolve,
+FFmpeg spawn, ...) and finishes when the next track reads its first audio
+frame. Each mark records the time since the previous one, so the stages of a
+finished trace add up to its total. The last few traces per guild are kept for
+``!diag transitions`` and the detailed heartbeat.
+
+Marks for a guild with no transition in progress are no-ops, so the same calls
+cost one dict lookup on paths a user started (``/play``, ``/skip``).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ...domain.shared.datetime_utils import utcnow
+from ...domain.shared.enums import TransitionOutcome, TransitionStage
+from ...domain.shared.types import (
+    DiscordSnowflake,
+    NonNegativeFloat,
+    NonNegativeInt,
+    UtcDatetimeField,
+)
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_MS_PER_S = 1000.0
+
+
+class StageTiming(BaseModel):
+    """Time one stage of a transition took."""
+
+    model_config = ConfigDict(frozen=True)
+
+    stage: TransitionStage
+    duration_ms: NonNegativeFloat
+
+
+class TransitionTrace(BaseModel):
+    """One finished transition: its outcome and where its time went."""
+
+    model_config = ConfigDict(frozen=True)
+
+    guild_id: DiscordSnowflake
+    started_at: UtcDatetimeField
+    outcome: TransitionOutcome
+    total_ms: NonNegativeFloat
+    track_title: str | None = None
+    stages: list[StageTiming] = Field(default_factory=list)
+
+    @property
+    def dominant_stage(self) -> StageTiming | None:
+        return max(self.stages, key=lambda timing: timing.duration_ms, default=None)
+
+
+class StageStats(BaseModel):
+    """Latency of one stage across recent transitions."""
+
+    model_config = ConfigDict(frozen=True)
+
+    stage: TransitionStage
+    count: NonNegativeInt = 0
+    avg_ms: NonNegativeFloat = 0.0
+    p95_ms: NonNegativeFloat = 0.0
+    max_ms: NonNegativeFloat = 0.0
+
+
+class TransitionStats(BaseModel):
+    """Recent transitions across every guild, for the health file and diagnostics."""
+
+    model_config = ConfigDict(frozen=True)
+
+    traced: NonNegativeInt = 0
+    in_progress: NonNegativeInt = 0
+    avg_total_ms: NonNegativeFloat = 0.0
+    p95_total_ms: NonNegativeFloat = 0.0
+    max_total_ms: NonNegativeFloat = 0.0
+    outcomes: dict[TransitionOutcome, NonNegativeInt] = Field(default_factory=dict)
+    stages: list[StageStats] = Field(default_factory=list)
+    slowest: TransitionTrace | None = None
+
+
+def _p95(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)]
+
+
+def _summarize(stage: TransitionStage, durations: list[float]) -> StageStats:
+    return StageStats(
+        stage=stage,
+        count=len(durations),
+        avg_ms=round(sum(durations) / len(durations), 2),
+        p95_ms=round(_p95(durations), 2),
+        max_ms=round(max(durations), 2),
+    )
+
+
+class _ActiveTransition:
+    __slots__ = ("guild_id", "started_at", "started", "last", "durations")
+
+    def __init__(self, guild_id: DiscordSnowflake, now: float, started_at: datetime) -> None:
+        self.guild_id = guild_id
+        self.started_at = started_at
+        self.started = now
+        self.last = now
+        # Retries (a failed resolve falls through to the next track) revisit
+        # stages; their time is summed in first-seen order.
+        self.durations: dict[TransitionStage, float] = {}
+
+    def mark(self, stage: TransitionStage, now: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + (now - self.last)
+        self.last = now
+
+    def snapshot(
+        self, outcome: TransitionOutcome, now: float, track_title: str | None
+    ) -> TransitionTrace:
+        return TransitionTrace(
+            guild_id=self.guild_id,
+            started_at=self.started_at,
+            outcome=outcome,
+            total_ms=round((now - self.started) * _MS_PER_S, 2),
+            track_title=track_title,
+            stages=[
+                StageTiming(stage=stage, duration_ms=round(seconds * _MS_PER_S, 2))
+                for stage, seconds in self.durations.items()
+            ],
+        )
+
+
+class TransitionTracer:
+    """Per-guild transitions in progress plus a ring buffer of finished ones.
+
+    Thread-safe: transitions begin and finish on the voice player thread and
+    are marked from the event loop.
+    """
+
+    def __init__(self, *, history: int = 20) -> None:
+        self._history = history
+        self._active: dict[DiscordSnowflake, _ActiveTransition] = {}
+        self._recent: dict[DiscordSnowflake, deque[TransitionTrace]] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, guild_id: DiscordSnowflake) -> None:
+        """Start timing a transition; one still open for the guild is closed as superseded."""
+        now = time.perf_counter()
+        with self._lock:
+            previous = self._active.get(guild_id)
+            if previous is not None:
+                self._store(previous.snapshot(TransitionOutcome.SUPERSEDED, now, None))
+            self._active[guild_id] = _ActiveTransition(guild_id, now, utcnow())
+
+    def mark(self, guild_id: DiscordSnowflake, stage: TransitionStage) -> None:
+        """Record *stage* as finished, timed from the previous mark."""
+        if guild_id not in self._active:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            active = self._active.get(guild_id)
+            if active is not None:
+                active.mark(stage, now)
+
+    def finish(
+        self,
+        guild_id: DiscordSnowflake,
+        outcome: TransitionOutcome,
+        *,
+        track_title: str | None = None,
+    ) -> TransitionTrace | None:
+        if guild_id not in self._active:
+            return None
+        now = time.perf_counter()
+        with self._lock:
+            active = self._active.pop(guild_id, None)
+            if active is None:
+                return None
+            trace = active.snapshot(outcome, now, track_title)
+            self._store(trace)
+
+        dominant = trace.dominant_stage
+        logger.debug(
+            "Track transition in guild %s: %s after %.0f ms (slowest stage %s)",
+            guild_id,
+            outcome,
+            trace.total_ms,
+            dominant.stage if dominant is not None else "-",
+        )
+        return trace
+
+    def discard(self, guild_id: DiscordSnowflake) -> None:
+        """Drop the guild's open transition without recording it (the track was stopped)."""
+        with self._lock:
+            self._active.pop(guild_id, None)
+
+    def in_progress(self, guild_id: DiscordSnowflake) -> bool:
+        return guild_id in self._active
+
+    def recent(self, guild_id: DiscordSnowflake) -> list[TransitionTrace]:
+        """The guild's finished transitions, newest first."""
+        with self._lock:
+            return list(reversed(self._recent.get(guild_id, ())))
+
+    def stats(self) -> TransitionStats:
+        with self._lock:
+            traces = [trace for ring in self._recent.values() for trace in ring]
+            in_progress = len(self._active)
+        if not traces:
+            return TransitionStats(in_progress=in_progress)
+
+        per_stage: dict[TransitionStage, list[float]] = {}
+        for trace in traces:
+            for timing in trace.stages:
+                per_stage.setdefault(timing.stage, []).append(timing.duration_ms)
+        totals = [trace.total_ms for trace in traces]
+
+        return TransitionStats(
+            traced=len(traces),
+            in_progress=in_progress,
+            avg_total_ms=round(sum(totals) / len(totals), 2),
+            p95_total_ms=round(_p95(totals), 2),
+            max_total_ms=round(max(totals), 2),
+            outcomes=dict(Counter(trace.outcome for trace in traces)),
+            stages=[
+                _summarize(stage, per_stage[stage])
+                for stage in TransitionStage
+                if stage in per_stage
+            ],
+            slowest=max(traces, key=lambda trace: trace.total_ms),
+        )
+
+    def clear(self, guild_id: DiscordSnowflake) -> None:
+        with self._lock:
+            self._active.pop(guild_id, None)
+            self._recent.pop(guild_id, None)
+
+    def _store(self, trace: TransitionTrace) -> None:
+        ring = self._recent.get(trace.guild_id)
+        if ring is None:
+            ring = self._recent[trace.guild_id] = deque(maxlen=self._history)
+        ring.append(trace)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from ..utils.logging import get_logger
+
 if TYPE_CHECKING:
     from discord.ext.commands import Bot
 
@@ -19,8 +21,11 @@ if TYPE_CHECKING:
     from ..application.services.requester_leave_autoskip import (
         AutoSkipOnRequesterLeave,
     )
+    from ..application.services.session_actors import GuildSessionActors
+    from ..application.services.stream_prefetcher import StreamPrefetcher
+    from ..application.services.transition_tracer import TransitionTracer
     from ..application.services.voting_service import VotingApplicationService
-    from ..domain.music.repository import SessionRepository, TrackHistoryRepository
+    from ..domain.music.repository import SessionRepository
     from ..domain.recommendations.repository import RecommendationCacheRepository
     from ..domain.voting.repository import VoteSessionRepository
     from ..infrastructure.ai.genre_classifier import AIGenreClassifier
@@ -28,8 +33,12 @@ if TYPE_CHECKING:
     from ..infrastructure.charts.chart_generator import ChartGenerator
     from ..infrastructure.discord.services.message_state_manager import MessageStateManager
     from ..infrastructure.discord.services.voice_warmup import VoiceWarmupTracker
+    from ..infrastructure.metrics.exporter import MetricsExporter
     from ..infrastructure.persistence.cleanup import CleanupJob
     from ..infrastructure.persistence.database import Database
+    from ..infrastructure.persistence.repositories.buffered_history_repository import (
+        BufferedHistoryRepository,
+    )
     from ..infrastructure.persistence.repositories.favorites_repository import (
         SQLiteFavoritesRepository,
     )
@@ -39,8 +48,14 @@ if TYPE_CHECKING:
     from ..infrastructure.persistence.repositories.saved_queue_repository import (
         SQLiteSavedQueueRepository,
     )
+    from ..infrastructure.persistence.repositories.track_info_repository import (
+        SQLiteTrackInfoCacheRepository,
+    )
+    from ..utils.metrics import Collector
     from .settings import Settings
 
+logger = get_logger(__name__)
+
 
 class Container:
     def __init__(self, settings: Settings) -> None:
@@ -48,21 +63,25 @@ class Container:
         self._bot: Bot | None = None
         self._database: Database | None = None
         self._session_repository: SessionRepository | None = None
-        self._history_repository: TrackHistoryRepository | None = None
+        self._session_actors: GuildSessionActors | None = None
+        self._history_repository: BufferedHistoryRepository | None = None
         self._vote_repository: VoteSessionRepository | None = None
         self._cache_repository: RecommendationCacheRepository | None = None
         self._favorites_repository: SQLiteFavoritesRepository | None = None
         self._saved_queue_repository: SQLiteSavedQueueRepository | None = None
         self._genre_repository: SQLiteGenreCacheRepository | None = None
+        self._track_info_cache: SQLiteTrackInfoCacheRepository | None = None
         self._genre_classifier: AIGenreClassifier | None = None
         self._chart_generator: ChartGenerator | None = None
         self._audio_resolver: AudioResolver | None = None
         self._apple_music_client: AppleMusicClient | None = None
         self._voice_adapter: VoiceAdapter | None = None
+        self._transition_tracer: TransitionTracer | None = None
         self._ai_client: AIClient | None = None
         self._shuffle_ai_client: AIClient | None = None
         self._playback_service: PlaybackApplicationService | None = None
         self._queue_service: QueueApplicationService | None = None
+        self._stream_prefetcher: StreamPrefetcher | None = None
         self._voice_warmup_tracker: VoiceWarmupTracker | None = None
         self._message_state_manager: MessageStateManager | None = None
         self._auto_skip_on_requester_leave: AutoSkipOnRequesterLeave | None = None
@@ -72,6 +91,7 @@ class Container:
         self._follow_mode: FollowMode | None = None
         self._voting_service: VotingApplicationService | None = None
         self._cleanup_job: CleanupJob | None = None
+        self._metrics_exporter: MetricsExporter | None = None
 
     def set_bot(self, bot: Bot) -> None:
         self._bot = bot
@@ -93,21 +113,52 @@ class Container:
     @property
     def session_repository(self) -> SessionRepository:
         if self._session_repository is None:
+            from ..infrastructure.persistence.repositories.cached_session_repository import (
+                CachedSessionRepository,
+            )
             from ..infrastructure.persistence.repositories.session_repository import (
                 SQLiteSessionRepository,
             )
 
-            self._session_repository = SQLiteSessionRepository(self.database)
+            self._session_repository = CachedSessionRepository(
+                SQLiteSessionRepository(self.database)
+            )
         return self._session_repository
 
     @property
-    def history_repository(self) -> TrackHistoryRepository:
+    def session_actors(self) -> GuildSessionActors:
+        if self._session_actors is None:
+            from ..application.services.session_actors import GuildSessionActors
+
+            self._session_actors = GuildSessionActors(self.session_repository)
+        return self._session_actors
+
+    @property
+    def history_repository(self) -> BufferedHistoryRepository:
         if self._history_repository is None:
+            from ..infrastructure.persistence.repositories.buffered_history_repository import (
+                BufferedHistoryRepository,
+            )
+            from ..infrastructure.persistence.repositories.columnar_history_repository import (
+                ColumnarHistoryRepository,
+            )
             from ..infrastructure.persistence.repositories.history_repository import (
                 SQLiteHistoryRepository,
             )
 
-            self._history_repository = SQLiteHistoryRepository(self.database)
+            db_settings = self.settings.database
+            backend = (
+                ColumnarHistoryRepository(
+                    self.database, max_guilds=db_settings.analytics_cached_guilds
+                )
+                if db_settings.columnar_analytics
+                else SQLiteHistoryRepository(self.database)
+            )
+            self._history_repository = BufferedHistoryRepository(
+                backend,
+                flush_interval=self.settings.database.history_flush_interval_s,
+                max_pending=self.settings.database.history_flush_batch_size,
+            )
         return self._history_repository
 
     @property
@@ -160,6 +211,16 @@ class Container:
             self._genre_repository = SQLiteGenreCacheRepository(self.database)
         return self._genre_repository
 
+    @property
+    def track_info_cache(self) -> SQLiteTrackInfoCacheRepository:
+        if self._track_info_cache is None:
+            from ..infrastructure.persistence.repositories.track_info_repository import (
+                SQLiteTrackInfoCacheRepository,
+            )
+
+            self._track_info_cache = SQLiteTrackInfoCacheRepository(self.database)
+        return self._track_info_cache
+
     @property
     def genre_classifier(self) -> AIGenreClassifier:
         if self._genre_classifier is None:
@@ -181,7 +242,9 @@ class Container:
         if self._audio_resolver is None:
             from ..infrastructure.audio.ytdlp_resolver import YtDlpResolver
 
-            self._audio_resolver = YtDlpResolver(self.settings.audio)
+            self._audio_resolver = YtDlpResolver(
+                self.settings.audio, metadata_cache=self.track_info_cache
+            )
         return self._audio_resolver
 
     @property
@@ -199,9 +262,21 @@ class Container:
                 DiscordVoiceAdapter,
             )
 
-            self._voice_adapter = DiscordVoiceAdapter(self.bot, self.settings.audio)
+            self._voice_adapter = DiscordVoiceAdapter(
+                self.bot, self.settings.audio, tracer=self.transition_tracer
+            )
         return self._voice_adapter
 
+    @property
+    def transition_tracer(self) -> TransitionTracer:
+        if self._transition_tracer is None:
+            from ..application.services.transition_tracer import TransitionTracer
+
+            self._transition_tracer = TransitionTracer(
+                history=self.settings.audio.transition_trace_history
+            )
+        return self._transition_tracer
+
     @property
     def ai_enabled(self) -> bool:
         return self.settings.ai.enabled
@@ -244,12 +319,29 @@ class Container:
 
             self._playback_service = PlaybackApplicationService(
                 session_repository=self.session_repository,
+                session_actors=self.session_actors,
                 history_repository=self.history_repository,
                 voice_adapter=self.voice_adapter,
                 audio_resolver=self.audio_resolver,
+                stream_prefetcher=self.stream_prefetcher,
+                transition_tracer=self.transition_tracer,
             )
         return self._playback_service
 
+    @property
+    def stream_prefetcher(self) -> StreamPrefetcher:
+        if self._stream_prefetcher is None:
+            from ..application.services.stream_prefetcher import StreamPrefetcher
+
+            self._stream_prefetcher = StreamPrefetcher(
+                audio_resolver=self.audio_resolver,
+                session_actors=self.session_actors,
+                voice_adapter=self.voice_adapter,
+                prefetch_count=self.settings.audio.prefetch_count,
+                refresh_margin_seconds=self.settings.audio.stream_refresh_margin_seconds,
+            )
+        return self._stream_prefetcher
+
     @property
     def queue_service(self) -> QueueApplicationService:
         if self._queue_service is None:
@@ -257,6 +349,7 @@ class Container:
 
             self._queue_service = QueueApplicationService(
                 session_repository=self.session_repository,
+                session_actors=self.session_actors,
             )
         return self._queue_service
 
@@ -322,6 +415,7 @@ class Container:
                 ai_client=self.ai_client,
                 audio_resolver=self.audio_resolver,
                 queue_service=self.queue_service,
+                session_actors=self.session_actors,
                 settings=self.settings.radio,
                 **repo_deps,
             )
@@ -347,6 +441,7 @@ class Container:
                 radio_service=self.radio_service,
                 playback_service=self.playback_service,
                 session_repository=self.session_repository,
+                session_actors=self.session_actors,
                 history_repository=self.history_repository,
                 ai_client=self.ai_client,
             )
@@ -374,24 +469,128 @@ class Container:
                 history_repository=self.history_repository,
                 cache_repository=self.cache_repository,
                 vote_repository=self.vote_repository,
+                track_info_cache=self.track_info_cache,
                 settings=self.settings.cleanup,
+                database=self.database,
             )
         return self._cleanup_job
 
+    @property
+    def metrics_exporter(self) -> MetricsExporter:
+        if self._metrics_exporter is None:
+            from ..infrastructure.metrics.exporter import MetricsExporter
+            from ..utils.metrics import get_metrics
+
+            settings = self.settings.metrics
+            self._metrics_exporter = MetricsExporter(
+                get_metrics(),
+                host=settings.host,
+                port=settings.port,
+                collectors=self._metric_collectors(),
+            )
+        return self._metrics_exporter
+
+    def _metric_collectors(self) -> list[Collector]:
+        """Scrape-time collectors for the stats components already keep."""
+        from ..infrastructure.audio.ytdlp_resolver import YtDlpResolver
+        from ..infrastructure.metrics.collectors import (
+            AIUsageCollector,
+            DatabaseCollector,
+            QueueSizeCollector,
+            ResolverCollector,
+            collect_event_bus,
+        )
+        from ..infrastructure.persistence.repositories.cached_session_repository import (
+            CachedSessionRepository,
+        )
+
+        collectors: list[Collector] = [collect_event_bus, DatabaseCollector(self.database)]
+        if isinstance(self.session_repository, CachedSessionRepository):
+            collectors.append(QueueSizeCollector(self.session_repository))
+        if isinstance(self.audio_resolver, YtDlpResolver):
+            collectors.append(ResolverCollector(self.audio_resolver))
+        if self.ai_enabled:
+            collectors.append(
+                AIUsageCollector(
+                    {
+                        "recommend": lambda: self.ai_client.get_cache_stats().usage,
+                        "shuffle": lambda: self.shuffle_ai_client.get_cache_stats().usage,
+                        "classify_genres": self.genre_classifier.usage_stats,
+                    }
+                )
+            )
+        return collectors
+
+    def _configure_event_bus(self) -> None:
+        """Take playback and voice events off the publisher's critical path.
+
+        Track starts and radio pool refills only matter for the newest event
+        per guild, so stale ones are coalesced; queue-exhausted and voice
+        membership events are kept and apply backpressure when a queue fills.
+        """
+        from ..domain.shared.enums import DispatchMode, OverflowPolicy
+        from ..domain.shared.events import (
+            DispatchPolicy,
+            QueueExhausted,
+            RadioPoolExhausted,
+            TrackStartedPlaying,
+            VoiceMemberJoinedVoiceChannel,
+            VoiceMemberLeftVoiceChannel,
+            get_event_bus,
+        )
+
+        settings = self.settings.event_bus
+        bus = get_event_bus()
+        bus.configure_tracing(slow_handler_ms=settings.slow_handler_ms)
+        if not settings.async_dispatch:
+            return
+
+        bus.configure_queues(
+            max_queue=settings.queue_size,
+            lanes=settings.lanes_per_subscriber,
+            guild_ordered=settings.guild_ordered,
+        )
+        lossless = DispatchPolicy(mode=DispatchMode.QUEUED, overflow=OverflowPolicy.BLOCK)
+        latest_only = DispatchPolicy(mode=DispatchMode.QUEUED, overflow=OverflowPolicy.COALESCE)
+        for event_type in (TrackStartedPlaying, RadioPoolExhausted):
+            bus.configure(event_type, latest_only)
+        for event_type in (
+            QueueExhausted,
+            VoiceMemberJoinedVoiceChannel,
+            VoiceMemberLeftVoiceChannel,
+        ):
+            bus.configure(event_type, lossless)
+
     async def initialize(self) -> None:
+        self._configure_event_bus()
         await self.database.initialize()
+        self.history_repository.start()
         self.auto_skip_on_requester_leave.start()
         self.follow_mode.start()
+        self.stream_prefetcher.start()
         if self.ai_enabled:
             self.radio_auto_refill.start()
             self.auto_dj.start()
+        if self.settings.metrics.enabled:
+            try:
+                await self.metrics_exporter.start()
+            except OSError:
+                logger.exception("Could not start the metrics endpoint")
 
     async def shutdown(self) -> None:
+        from ..domain.shared.events import get_event_bus
+
+        try:
+            await get_event_bus().close()
+        except Exception:
+            pass
+
         for subscriber in (
             self._auto_skip_on_requester_leave,
             self._radio_auto_refill,
             self._auto_dj,
             self._follow_mode,
+            self._stream_prefetcher,
         ):
             if subscriber is not None:
                 try:
@@ -405,6 +604,30 @@ class Container:
             except Exception:
                 pass
 
+        if self._session_actors is not None:
+            try:
+                await self._session_actors.drain()
+            except Exception:
+                pass
+
+        if self._audio_resolver is not None:
+            try:
+                self._audio_resolver.close()
+            except Exception:
+                pass
+
+        if self._history_repository is not None:
+            try:
+                await self._history_repository.close()
+            except Exception:
+                pass
+
+        if self._metrics_exporter is not None:
+            try:
+                await self._metrics_exporter.stop()
+            except Exception:
+                pass
+
         if self._database is not None:
             await self._database.close()
 
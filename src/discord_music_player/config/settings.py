@@ -16,23 +16,44 @@ from pydantic import (
 )
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from ..domain.shared.enums import EnvironmentType, LogLevel, YtDlpPlayerClient
+from ..domain.shared.enums import (
+    EnvironmentType,
+    LogLevel,
+    SQLiteSynchronous,
+    YtDlpPlayerClient,
+)
 from ..domain.shared.types import (
+    AnalyticsCachedGuilds,
     BusyTimeoutMs,
     CommandPrefixStr,
     ConnectionTimeoutS,
+    CrossfadeSeconds,
     DiscordSnowflake,
+    EventLaneCount,
+    EventQueueSize,
+    ExtractorWorkerCount,
+    HistoryFlushBatchSize,
+    HistoryFlushIntervalS,
     HttpUrlStr,
     MaxQueueSize,
     MaxTokens,
+    MetricsPort,
     NonEmptyStr,
     NonNegativeInt,
     PoolSize,
     PositiveInt,
+    PrefetchCount,
     RadioBatchSize,
     RadioCount,
     RadioMaxTracks,
+    ResumeConcurrency,
+    ResumeConnectIntervalS,
+    SlowHandlerMs,
+    SQLiteCacheSizeMB,
+    SQLiteMmapSizeMB,
+    SQLiteStatementCacheSize,
     TemperatureFloat,
+    TransitionTraceHistory,
     UnitInterval,
     VolumeFloat,
 )
@@ -55,6 +76,57 @@ class DatabaseSettings(BaseModel):
         default=10,
         validation_alias=AliasChoices("connection_timeout_s", "connection_timeout"),
     )
+    acquire_timeout_s: ConnectionTimeoutS = Field(
+        default=10,
+        validation_alias=AliasChoices("acquire_timeout_s", "pool_timeout"),
+    )
+    history_flush_interval_s: HistoryFlushIntervalS = Field(
+        default=5.0,
+        description="Seconds between batched writes of buffered play history.",
+    )
+    history_flush_batch_size: HistoryFlushBatchSize = Field(
+        default=50,
+        description="Buffered play/finish events that trigger an early history flush.",
+    )
+    columnar_analytics: bool = Field(
+        default=True,
+        description=(
+            "Compute history analytics in memory instead of from the rollup tables. "
+            "The rollups only serve the SQL path; they are still written on every "
+            "history flush so turning this off needs no backfill."
+        ),
+    )
+    analytics_cached_guilds: AnalyticsCachedGuilds = Field(
+        default=32,
+        description="Guilds whose history columns are kept in memory for analytics.",
+    )
+    mmap_size_mb: SQLiteMmapSizeMB = Field(
+        default=128,
+        description="Memory-mapped I/O window per connection (0 disables mmap).",
+    )
+    cache_size_mb: SQLiteCacheSizeMB = Field(
+        default=16,
+        description="Page cache per pooled connection.",
+    )
+    synchronous: SQLiteSynchronous = Field(
+        default=SQLiteSynchronous.NORMAL,
+        description="Fsync level; NORMAL only syncs at WAL checkpoints.",
+    )
+    temp_store_memory: bool = Field(
+        default=True,
+        description="Keep temporary tables and sort spills in memory.",
+    )
+    statement_cache_size: SQLiteStatementCacheSize = Field(
+        default=256,
+        description="Prepared statements cached per pooled connection.",
+    )
+
+    @field_validator("synchronous", mode="before")
+    @classmethod
+    def _normalize_synchronous(cls, v: str | SQLiteSynchronous) -> SQLiteSynchronous:
+        if isinstance(v, str) and not isinstance(v, SQLiteSynchronous):
+            return SQLiteSynchronous(v.upper())
+        return v
 
     @field_validator("url")
     @classmethod
@@ -97,6 +169,14 @@ class DiscordSettings(BaseModel):
         validation_alias=AliasChoices("dj_role_id", "dj_role"),
         description="Optional role ID that gates destructive commands (skip, stop, clear, etc.)",
     )
+    resume_concurrency: ResumeConcurrency = Field(
+        default=8,
+        description="Guilds whose sessions are resumed in parallel after a restart.",
+    )
+    resume_connect_interval_s: ResumeConnectIntervalS = Field(
+        default=0.5,
+        description="Minimum spacing between voice connects while resuming sessions.",
+    )
 
     @field_validator("owner_ids", "guild_ids", "test_guild_ids", mode="before")
     @classmethod
@@ -147,6 +227,30 @@ class AudioSettings(BaseModel):
         default=False,
         description="Apply EBU R128 loudnorm filter to normalize audio volume across tracks.",
     )
+    prefetch_count: PrefetchCount = Field(
+        default=2,
+        description="Resolve stream URLs for this many upcoming tracks while one plays.",
+    )
+    stream_refresh_margin_seconds: PositiveInt = Field(
+        default=600,
+        description="Re-resolve prefetched stream URLs this long before they expire.",
+    )
+    gapless_playback: bool = Field(
+        default=True,
+        description="Pre-spawn the next track's FFmpeg and switch to it without a gap.",
+    )
+    crossfade_seconds: CrossfadeSeconds = Field(
+        default=0.0,
+        description="Blend consecutive tracks over this many seconds (0 = gapless cut).",
+    )
+    ytdlp_workers: ExtractorWorkerCount = Field(
+        default=4,
+        description="Threads dedicated to yt-dlp; interactive resolves jump the queue.",
+    )
+    transition_trace_history: TransitionTraceHistory = Field(
+        default=20,
+        description="Recent track transitions traced per guild for !diag transitions.",
+    )
 
 
 class AISettings(BaseModel):
@@ -226,6 +330,48 @@ class CleanupSettings(BaseModel):
     history_retention_days: PositiveInt = 30
 
 
+class EventBusSettings(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True)
+
+    async_dispatch: bool = Field(
+        default=True,
+        description="Queue playback and voice events per subscriber instead of awaiting handlers.",
+    )
+    queue_size: EventQueueSize = Field(
+        default=256,
+        description="Events buffered per subscriber lane before the overflow policy applies.",
+    )
+    lanes_per_subscriber: EventLaneCount = Field(
+        default=4,
+        description="Worker lanes per subscriber; events for different guilds run in parallel.",
+    )
+    guild_ordered: bool = Field(
+        default=True,
+        description="Route each guild to one lane so its events are handled in publish order.",
+    )
+    slow_handler_ms: SlowHandlerMs = Field(
+        default=250.0,
+        description="Warn when a single event handler call takes at least this long (0 disables).",
+    )
+
+
+class MetricsSettings(BaseModel):
+    model_config = ConfigDict(frozen=True, strict=True)
+
+    enabled: bool = Field(
+        default=False,
+        description="Serve Prometheus metrics over HTTP at /metrics.",
+    )
+    host: NonEmptyStr = Field(
+        default="127.0.0.1",
+        description="Interface the metrics endpoint binds to; keep it local or firewalled.",
+    )
+    port: MetricsPort = Field(
+        default=9464,
+        description="TCP port for the metrics endpoint (0 picks a free port).",
+    )
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -253,6 +399,8 @@ class Settings(BaseSettings):
     voting: VotingSettings = Field(default_factory=VotingSettings)
     cleanup: CleanupSettings = Field(default_factory=CleanupSettings)
     radio: RadioSettings = Field(default_factory=RadioSettings)
+    event_bus: EventBusSettings = Field(default_factory=EventBusSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
 
 
 @lru_cache(maxsize=1)
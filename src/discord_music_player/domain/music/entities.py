@@ -5,9 +5,9 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, ClassVar
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
-from .enums import LoopMode, PlaybackState
+from .enums import LoopMode, PlaybackState, QueueChangeKind
 from .wrappers import QueuePosition, TrackId
 from ..shared.constants import LimitConstants
 from ..shared.datetime_utils import UtcDateTime, utcnow
@@ -43,6 +43,7 @@ class PlaylistEntry(BaseModel):
     title: TrackTitleStr
     url: HttpUrlStr
     duration_seconds: DurationSeconds | None = None
+    uploader: NonEmptyStr | None = None
 
 
 class PlaylistPreview(BaseModel):
@@ -135,6 +136,21 @@ class Track(BaseModel):
         return self.requested_by_id == user_id
 
 
+class QueueChange(BaseModel):
+    """A single queue mutation, replayed by repositories to persist only what changed.
+
+    ``index`` is the queue position the change applies to at the time it was made;
+    ``to_index`` is only set for :attr:`QueueChangeKind.MOVE`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kind: QueueChangeKind
+    index: NonNegativeInt = 0
+    to_index: NonNegativeInt | None = None
+    track: Track | None = None
+
+
 class GuildPlaybackSession(BaseModel):
     model_config = ConfigDict(strict=True)
 
@@ -149,6 +165,11 @@ class GuildPlaybackSession(BaseModel):
     last_activity: UtcDatetimeField = Field(default_factory=utcnow)
     playback_started_at: UtcDatetimeField | None = None
 
+    # Queue changes since the last persist; ``None`` means the queue must be
+    # rewritten wholesale. A tuple so model copies never share a mutable log.
+    _queue_changes: tuple[QueueChange, ...] | None = PrivateAttr(default=None)
+    _queue_version: int | None = PrivateAttr(default=None)
+
     @property
     def elapsed_seconds(self) -> int:
         """Seconds elapsed since playback started, or 0 if not playing."""
@@ -183,6 +204,43 @@ class GuildPlaybackSession(BaseModel):
     def touch(self) -> None:
         self.last_activity = utcnow()
 
+    # ── Change tracking ───────────────────────────────────────────────
+
+    @property
+    def pending_queue_changes(self) -> tuple[QueueChange, ...] | None:
+        """Queue changes since the last persist, or ``None`` if a full rewrite is needed."""
+        return self._queue_changes
+
+    @property
+    def queue_version(self) -> int | None:
+        """Persisted queue version this session's change log is relative to."""
+        return self._queue_version
+
+    def mark_queue_persisted(self, version: int) -> None:
+        """Record that the queue now matches persisted ``version`` exactly."""
+        self._queue_changes = ()
+        self._queue_version = version
+
+    def _record_queue_change(
+        self,
+        kind: QueueChangeKind,
+        index: int = 0,
+        *,
+        to_index: int | None = None,
+        track: Track | None = None,
+    ) -> None:
+        if self._queue_changes is None:
+            return
+        if len(self._queue_changes) >= self.MAX_QUEUE_SIZE:
+            # Replaying this many changes costs more than rewriting the queue.
+            self._queue_changes = None
+            return
+        change = QueueChange(kind=kind, index=index, to_index=to_index, track=track)
+        self._queue_changes = (*self._queue_changes, change)
+
+    def _mark_queue_rewritten(self) -> None:
+        self._queue_changes = None
+
     def is_duplicate(self, track: Track) -> bool:
         if self.current_track and self.current_track.id == track.id:
             return True
@@ -203,12 +261,14 @@ class GuildPlaybackSession(BaseModel):
         self._assert_can_enqueue(track)
         position = QueuePosition(value=len(self.queue))
         self.queue.append(track)
+        self._record_queue_change(QueueChangeKind.APPEND, position.value, track=track)
         self.touch()
         return position
 
     def enqueue_next(self, track: Track) -> QueuePosition:
         self._assert_can_enqueue(track)
         self.queue.insert(0, track)
+        self._record_queue_change(QueueChangeKind.INSERT, 0, track=track)
         self.touch()
         return QueuePosition(value=0)
 
@@ -217,6 +277,7 @@ class GuildPlaybackSession(BaseModel):
             return None
 
         track = self.queue.pop(0)
+        self._record_queue_change(QueueChangeKind.POP_FRONT)
         self.touch()
         return track
 
@@ -226,6 +287,7 @@ class GuildPlaybackSession(BaseModel):
     def remove_at(self, position: QueuePositionInt) -> Track | None:
         if 0 <= position < len(self.queue):
             track = self.queue.pop(position)
+            self._record_queue_change(QueueChangeKind.REMOVE, position)
             self.touch()
             return track
         return None
@@ -233,6 +295,7 @@ class GuildPlaybackSession(BaseModel):
     def clear_queue(self) -> int:
         count = len(self.queue)
         self.queue.clear()
+        self._record_queue_change(QueueChangeKind.CLEAR)
         self.touch()
         return count
 
@@ -241,6 +304,7 @@ class GuildPlaybackSession(BaseModel):
         self.queue = [track for track in self.queue if not track.is_from_recommendation]
         removed_count = original_count - len(self.queue)
         if removed_count > 0:
+            self._mark_queue_rewritten()
             self.touch()
         return removed_count
 
@@ -279,6 +343,7 @@ class GuildPlaybackSession(BaseModel):
         self.state = PlaybackState.IDLE
         self.current_track = None
         self.queue.clear()
+        self._record_queue_change(QueueChangeKind.CLEAR)
         self.touch()
 
     def advance_to_next_track(self) -> Track | None:
@@ -288,6 +353,9 @@ class GuildPlaybackSession(BaseModel):
 
         if self.loop_mode == LoopMode.QUEUE and self.current_track:
             self.queue.append(self.current_track)
+            self._record_queue_change(
+                QueueChangeKind.APPEND, len(self.queue) - 1, track=self.current_track
+            )
 
         next_track = self.dequeue()
         self.current_track = next_track
@@ -297,6 +365,18 @@ class GuildPlaybackSession(BaseModel):
 
         return next_track
 
+    def upcoming_tracks(self, limit: int) -> list[Track]:
+        """The next *limit* tracks ``advance_to_next_track`` would play, in order."""
+        if limit <= 0:
+            return []
+        if self.loop_mode == LoopMode.TRACK and self.current_track:
+            return [self.current_track]
+
+        upcoming = self.queue[:limit]
+        if self.loop_mode == LoopMode.QUEUE and self.current_track and len(upcoming) < limit:
+            upcoming.append(self.current_track)
+        return upcoming
+
     def toggle_loop(self) -> LoopMode:
         self.loop_mode = self.loop_mode.next_mode()
         self.touch()
@@ -306,6 +386,7 @@ class GuildPlaybackSession(BaseModel):
         import random
 
         random.shuffle(self.queue)
+        self._mark_queue_rewritten()
         self.touch()
 
     def move_track(self, from_pos: QueuePositionInt, to_pos: QueuePositionInt) -> bool:
@@ -314,6 +395,7 @@ class GuildPlaybackSession(BaseModel):
 
         track = self.queue.pop(from_pos)
         self.queue.insert(to_pos, track)
+        self._record_queue_change(QueueChangeKind.MOVE, from_pos, to_index=to_pos)
         self.touch()
         return True
 
@@ -335,5 +417,6 @@ class GuildPlaybackSession(BaseModel):
         self.queue = [
             track.model_copy(update={"stream_url": None}) for track in self.queue
         ]
+        self._mark_queue_rewritten()
         self.touch()
         return elapsed
@@ -67,3 +67,14 @@ class LoopMode(StrEnum):
         current_index = modes.index(self)
         next_index = (current_index + 1) % len(modes)
         return modes[next_index]
+
+
+class QueueChangeKind(StrEnum):
+    """Queue mutations recorded by a session for incremental persistence."""
+
+    APPEND = "append"
+    INSERT = "insert"
+    POP_FRONT = "pop_front"
+    REMOVE = "remove"
+    MOVE = "move"
+    CLEAR = "clear"
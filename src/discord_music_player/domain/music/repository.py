@@ -32,6 +32,7 @@ class GenreTrackInfo(BaseModel):
     track_id: NonEmptyStr
     title: NonEmptyStr
     artist: NonEmptyStr | None = None
+    play_count: PositiveInt = 1
 
 
 class TrackForClassification(BaseModel):
@@ -97,8 +98,12 @@ class TrackHistoryRepository(ABC):
     @abstractmethod
     async def record_play(
         self, guild_id: DiscordSnowflake, track: Track, played_at: datetime | None = None
-    ) -> None:
-        """Record that a track was played."""
+    ) -> int | None:
+        """Record that a track was played.
+
+        Returns the history row id, or ``None`` when the write is deferred and
+        the id is not known yet.
+        """
         ...
 
     @abstractmethod
@@ -129,8 +134,10 @@ class TrackHistoryRepository(ABC):
         guild_id: DiscordSnowflake,
         track_id: TrackId,
         skipped: bool = False,
+        *,
+        history_id: int | None = None,
     ) -> None:
-        """Mark the most recent play of a track as finished."""
+        """Mark a play as finished: row ``history_id`` if given, else the track's latest play."""
         ...
 
     @abstractmethod
@@ -222,7 +229,7 @@ class TrackHistoryRepository(ABC):
     async def get_user_tracks_for_genre(
         self, guild_id: DiscordSnowflake, user_id: DiscordSnowflake
     ) -> list[GenreTrackInfo]:
-        """Get track metadata for genre classification."""
+        """Get each distinct track a user requested, with its play count, for genre classification."""
         ...
 
     @abstractmethod
@@ -45,6 +45,14 @@ class SQLPragmas:
     TABLE_INFO = "PRAGMA table_info({table})"
     PAGE_COUNT = "PRAGMA page_count"
     PAGE_SIZE = "PRAGMA page_size"
+    USER_VERSION = "PRAGMA user_version"
+    SET_USER_VERSION = "PRAGMA user_version={version}"
+    SYNCHRONOUS = "PRAGMA synchronous={level}"
+    MMAP_SIZE = "PRAGMA mmap_size={size}"
+    CACHE_SIZE = "PRAGMA cache_size={size}"
+    TEMP_STORE_MEMORY = "PRAGMA temp_store=MEMORY"
+    WAL_CHECKPOINT_TRUNCATE = "PRAGMA wal_checkpoint(TRUNCATE)"
+    OPTIMIZE = "PRAGMA optimize"
     EXPECTED_JOURNAL_MODE = "wal"
 
 
@@ -77,6 +85,11 @@ class AudioConstants:
     # Audio normalization (EBU R128 loudnorm)
     LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
 
+    # Gapless playback: spawn the next FFmpeg this long before the current
+    # track ends, and buffer this many 20 ms frames of it up front.
+    GAPLESS_PRELOAD_LEAD_SECONDS = 20
+    GAPLESS_PREBUFFER_FRAMES = 50
+
 
 class TimeConstants:
     """Time-related constants in seconds."""
@@ -206,6 +219,7 @@ class PlaylistConstants:
     MAX_PLAYLIST_TRACKS = 50  # Hard cap on tracks imported from a single playlist
     EXTERNAL_PLAYLIST_DEFAULT_COUNT = 10  # Tracks queued when no count is given
     VIEW_TIMEOUT = 120.0  # 2 minutes
+    IMPORT_PROGRESS_INTERVAL = 2.0  # Seconds between enqueue flushes / status edits
 
 
 class YouTubeDomains:
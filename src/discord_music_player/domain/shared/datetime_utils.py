@@ -47,6 +47,10 @@ class UtcDateTime(BaseModel):
     def from_unix_seconds(cls, seconds: int) -> UtcDateTime:
         return cls(datetime.fromtimestamp(int(seconds), tz=UTC))
 
+    @classmethod
+    def from_unix_millis(cls, millis: int) -> UtcDateTime:
+        return cls(datetime.fromtimestamp(millis / 1000, tz=UTC))
+
     # ---- Computed fields / formats ----
 
     @property
@@ -94,6 +94,63 @@ class Weekday(StrEnum):
     SAT = "Sat"
 
 
+class SQLiteSynchronous(StrEnum):
+    """SQLite ``synchronous`` levels; NORMAL is durable across app crashes under WAL."""
+
+    OFF = "OFF"
+    NORMAL = "NORMAL"
+    FULL = "FULL"
+    EXTRA = "EXTRA"
+
+
+class DispatchMode(StrEnum):
+    """How the event bus delivers an event type to its subscribers."""
+
+    INLINE = "inline"
+    QUEUED = "queued"
+
+
+class OverflowPolicy(StrEnum):
+    """What a full subscriber queue does with another queued event."""
+
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+class TransitionStage(StrEnum):
+    """Steps between one track ending and the next one producing audio, in order."""
+
+    TRACK_END_DISPATCH = "track_end_dispatch"
+    SESSION_ADVANCE = "session_advance"
+    HISTORY_UPDATE = "history_update"
+    NOW_PLAYING_UPDATE = "now_playing_update"
+    CLAIM_NEXT = "claim_next"
+    STREAM_RESOLVE = "stream_resolve"
+    FFMPEG_SPAWN = "ffmpeg_spawn"
+    VOICE_SETUP = "voice_setup"
+    FIRST_FRAME = "first_frame"
+
+
+class TransitionOutcome(StrEnum):
+    """How a traced track transition ended."""
+
+    PLAYING = "playing"
+    GAPLESS = "gapless"
+    QUEUE_EMPTY = "queue_empty"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+
+class MetricType(StrEnum):
+    """Prometheus metric family type, as written on its ``# TYPE`` line."""
+
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+
+
 class EnvironmentType(StrEnum):
     """Valid environment types."""
 
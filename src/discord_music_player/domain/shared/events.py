@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
-from collections.abc import Awaitable, Callable
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Hashable
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, TypeVar
+from typing import Any, Final, TypeVar
 from uuid import uuid4
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -14,10 +17,12 @@ from pydantic import BaseModel, ConfigDict, Field
 from ...utils.logging import get_logger
 from ..music.wrappers import TrackId
 from .datetime_utils import utcnow
+from .enums import DispatchMode, OverflowPolicy
 from .types import (
     ChannelIdField,
     DiscordSnowflake,
     NonEmptyStr,
+    NonNegativeFloat,
     NonNegativeInt,
     UserIdField,
 )
@@ -27,6 +32,28 @@ logger = get_logger(__name__)
 T = TypeVar("T", bound="DomainEvent")
 EventHandler = Callable[[T], Awaitable[None]]
 
+_DRAIN_TIMEOUT_S: Final[float] = 5.0
+
+HANDLER_LATENCY_BUCKETS_MS: Final[tuple[float, ...]] = (
+    1.0,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+"""Upper bounds of the handler latency histogram; slower calls land in an overflow bucket."""
+
+# Set inside queue workers: a handler that publishes must never wait for queue
+# space, or two subscribers feeding each other could deadlock.
+_IN_WORKER: ContextVar[bool] = ContextVar("event_bus_in_worker", default=False)
+
 
 class DomainEvent(BaseModel):
     """Base class for all domain events."""
@@ -90,55 +117,484 @@ class VoiceMemberLeftVoiceChannel(DomainEvent):
 # === Event Bus ===
 
 
+class DispatchPolicy(BaseModel):
+    """How the bus delivers one event type.
+
+    ``INLINE`` awaits every handler before ``publish`` returns. ``QUEUED``
+    hands the event to each subscriber's queue and returns at once unless
+    a queue is full and ``overflow`` is ``BLOCK``. ``COALESCE`` keeps only
+    the newest queued event per guild for each handler.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    mode: DispatchMode = DispatchMode.INLINE
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+
+
+_INLINE: Final = DispatchPolicy()
+
+
+class HandlerStats(BaseModel):
+    """Delivery counters and latency histogram for one subscribed handler.
+
+    ``latency_buckets`` holds one count per bound in
+    :data:`HANDLER_LATENCY_BUCKETS_MS` plus a final overflow bucket; the
+    quantiles are the upper bound of the bucket they fall in.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    event_type: NonEmptyStr
+    handler: NonEmptyStr
+    delivered: NonNegativeInt = 0
+    failed: NonNegativeInt = 0
+    in_flight: NonNegativeInt = 0
+    slow: NonNegativeInt = 0
+    total_latency_ms: NonNegativeFloat = 0.0
+    avg_latency_ms: NonNegativeFloat = 0.0
+    p50_latency_ms: NonNegativeFloat = 0.0
+    p95_latency_ms: NonNegativeFloat = 0.0
+    max_latency_ms: NonNegativeFloat = 0.0
+    latency_buckets: list[NonNegativeInt] = Field(default_factory=list)
+
+
+class SubscriberStats(BaseModel):
+    """Queue load for one subscriber (the object owning the handlers)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    subscriber: NonEmptyStr
+    lanes: NonNegativeInt = 0
+    queue_depth: NonNegativeInt = 0
+    max_queue_depth: NonNegativeInt = 0
+    dropped: NonNegativeInt = 0
+    coalesced: NonNegativeInt = 0
+    handlers: list[HandlerStats] = Field(default_factory=list)
+
+
+class EventBusStats(BaseModel):
+    """Snapshot of :class:`EventBus` queues and handler latency."""
+
+    model_config = ConfigDict(frozen=True)
+
+    queue_depth: NonNegativeInt = 0
+    in_flight: NonNegativeInt = 0
+    dropped: NonNegativeInt = 0
+    coalesced: NonNegativeInt = 0
+    max_latency_ms: NonNegativeFloat = 0.0
+    slow_handler_ms: NonNegativeFloat = 0.0
+    subscribers: list[SubscriberStats] = Field(default_factory=list)
+
+    @property
+    def handlers(self) -> list[HandlerStats]:
+        return [handler for subscriber in self.subscribers for handler in subscriber.handlers]
+
+
+def _bucket_quantile(buckets: list[int], count: int, q: float, max_ms: float) -> float:
+    if not count:
+        return 0.0
+    rank = q * count
+    seen = 0
+    for bound, n in zip(HANDLER_LATENCY_BUCKETS_MS, buckets, strict=False):
+        seen += n
+        if seen >= rank:
+            return min(bound, max_ms)
+    return max_ms
+
+
+class _Handler:
+    """One ``subscribe`` call: the callback, its owner's queue and its counters."""
+
+    __slots__ = (
+        "event_type",
+        "fn",
+        "name",
+        "subscriber",
+        "active",
+        "delivered",
+        "failed",
+        "in_flight",
+        "slow",
+        "total_latency",
+        "max_latency",
+        "buckets",
+    )
+
+    def __init__(
+        self, event_type: type[DomainEvent], fn: EventHandler[Any], subscriber: _Subscriber
+    ) -> None:
+        self.event_type = event_type
+        self.fn = fn
+        self.name = _handler_name(fn)
+        self.subscriber = subscriber
+        self.active = True
+        self.delivered = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.slow = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.buckets = [0] * (len(HANDLER_LATENCY_BUCKETS_MS) + 1)
+
+    async def __call__(self, event: DomainEvent) -> None:
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.fn(event)
+        except Exception as e:
+            self.failed += 1
+            logger.exception("Error in handler for %s: %s", type(event).__name__, e)
+        finally:
+            self.in_flight -= 1
+        self._record(time.perf_counter() - started, event)
+
+    def _record(self, elapsed: float, event: DomainEvent) -> None:
+        self.delivered += 1
+        self.total_latency += elapsed
+        if elapsed > self.max_latency:
+            self.max_latency = elapsed
+        elapsed_ms = elapsed * 1000
+        self.buckets[bisect_left(HANDLER_LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+        threshold_ms = self.subscriber.slow_handler_ms
+        if threshold_ms and elapsed_ms >= threshold_ms:
+            self.slow += 1
+            logger.warning(
+                "Slow event handler %s for %s took %.0f ms (guild %s)",
+                self.name,
+                self.event_type.__name__,
+                elapsed_ms,
+                getattr(event, "guild_id", None),
+            )
+
+    def snapshot(self) -> HandlerStats:
+        delivered = self.delivered
+        max_ms = round(self.max_latency * 1000, 2)
+        buckets = list(self.buckets)
+        return HandlerStats(
+            event_type=self.event_type.__name__,
+            handler=self.name,
+            delivered=delivered,
+            failed=self.failed,
+            in_flight=self.in_flight,
+            slow=self.slow,
+            total_latency_ms=round(self.total_latency * 1000, 2),
+            avg_latency_ms=round(self.total_latency / delivered * 1000, 2) if delivered else 0.0,
+            p50_latency_ms=_bucket_quantile(buckets, delivered, 0.5, max_ms),
+            p95_latency_ms=_bucket_quantile(buckets, delivered, 0.95, max_ms),
+            max_latency_ms=max_ms,
+            latency_buckets=buckets,
+        )
+
+
+class _Delivery:
+    __slots__ = ("handler", "event", "key")
+
+    def __init__(self, handler: _Handler, event: DomainEvent, key: Hashable) -> None:
+        self.handler = handler
+        self.event = event
+        self.key = key
+
+
+class _Lane:
+    """A bounded FIFO of deliveries drained by one worker task."""
+
+    __slots__ = (
+        "_subscriber",
+        "_index",
+        "_pending",
+        "_latest",
+        "_wakeup",
+        "_space",
+        "_idle",
+        "_task",
+    )
+
+    def __init__(self, subscriber: _Subscriber, index: int) -> None:
+        self._subscriber = subscriber
+        self._index = index
+        self._pending: deque[_Delivery] = deque()
+        self._latest: dict[Hashable, _Delivery] = {}
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def put(self, delivery: _Delivery, overflow: OverflowPolicy, max_queue: int) -> None:
+        subscriber = self._subscriber
+        pending = self._pending
+
+        if overflow is OverflowPolicy.COALESCE:
+            stale = self._latest.pop(delivery.key, None)
+            if stale is not None:
+                # Re-queue at the tail so the newer event keeps its place
+                # relative to the subscriber's other event types.
+                pending.remove(stale)
+                subscriber.coalesced += 1
+
+        while len(pending) >= max_queue:
+            if overflow is OverflowPolicy.BLOCK:
+                if _IN_WORKER.get():
+                    break
+                self._space.clear()
+                await self._space.wait()
+            elif overflow is OverflowPolicy.DROP_NEWEST or not self._drop_oldest(delivery.handler):
+                subscriber.dropped += 1
+                return
+
+        pending.append(delivery)
+        if overflow is OverflowPolicy.COALESCE:
+            self._latest[delivery.key] = delivery
+        if len(pending) > subscriber.max_depth:
+            subscriber.max_depth = len(pending)
+        self._idle.clear()
+        self._wakeup.set()
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run(), name=f"event-bus:{subscriber.name}:{self._index}"
+            )
+
+    def _drop_oldest(self, handler: _Handler) -> bool:
+        """Evict the oldest delivery for *handler*; other event types are left alone."""
+        for queued in self._pending:
+            if queued.handler is handler:
+                self._pending.remove(queued)
+                if self._latest.get(queued.key) is queued:
+                    del self._latest[queued.key]
+                self._subscriber.dropped += 1
+                return True
+        return False
+
+    async def _run(self) -> None:
+        _IN_WORKER.set(True)
+        pending = self._pending
+        while True:
+            if not pending:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delivery = pending.popleft()
+            if self._latest.get(delivery.key) is delivery:
+                del self._latest[delivery.key]
+            self._space.set()
+            if delivery.handler.active:
+                await delivery.handler(delivery.event)
+
+    async def wait_idle(self) -> None:
+        await self._idle.wait()
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+        self._latest.clear()
+        self._space.set()
+        self._idle.set()
+
+
+class _Subscriber:
+    """Per-owner queue: every handler of one subscriber shares its lanes.
+
+    Sharing keeps a subscriber's handlers in publish order across event
+    types (an idle timer armed on ``QueueExhausted`` must not outlive the
+    ``TrackStartedPlaying`` published after it), while lanes let work for
+    different guilds proceed in parallel.
+    """
+
+    __slots__ = ("_bus", "name", "handlers", "lanes", "max_depth", "dropped", "coalesced")
+
+    def __init__(self, bus: EventBus, name: str) -> None:
+        self._bus = bus
+        self.name = name
+        self.handlers: list[_Handler] = []
+        self.lanes: list[_Lane] = []
+        self.max_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def slow_handler_ms(self) -> float:
+        return self._bus._slow_handler_ms
+
+    async def enqueue(
+        self, handler: _Handler, event: DomainEvent, overflow: OverflowPolicy
+    ) -> None:
+        bus = self._bus
+        if not self.lanes:
+            self.lanes = [_Lane(self, i) for i in range(bus._lanes)]
+        guild_id = getattr(event, "guild_id", None)
+        if bus._guild_ordered or overflow is OverflowPolicy.COALESCE:
+            lane = self.lanes[hash(guild_id) % len(self.lanes)]
+        else:
+            lane = min(self.lanes, key=len)
+        await lane.put(_Delivery(handler, event, (id(handler), guild_id)), overflow, bus._max_queue)
+
+    def snapshot(self) -> SubscriberStats:
+        return SubscriberStats(
+            subscriber=self.name,
+            lanes=len(self.lanes),
+            queue_depth=sum(len(lane) for lane in self.lanes),
+            max_queue_depth=self.max_depth,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            handlers=[handler.snapshot() for handler in self.handlers],
+        )
+
+    def cancel(self) -> None:
+        for lane in self.lanes:
+            lane.cancel()
+        self.lanes = []
+
+
 class EventBus:
     """In-memory pub/sub event bus for domain events.
 
-    Handlers are called concurrently. Exceptions in handlers are logged
-    but do not prevent other handlers from running.
+    By default handlers are called concurrently and ``publish`` waits for
+    them. Event types configured as ``QUEUED`` are instead delivered through
+    a bounded queue per subscriber, so the publisher never waits on slow
+    handlers. Exceptions in handlers are logged but do not prevent other
+    handlers from running.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        max_queue: int = 256,
+        lanes: int = 4,
+        guild_ordered: bool = True,
+        slow_handler_ms: float = 250.0,
+    ) -> None:
         self._handlers: dict[type[DomainEvent], list[EventHandler[Any]]] = defaultdict(list)
+        self._subscriptions: dict[type[DomainEvent], list[_Handler]] = defaultdict(list)
+        self._subscribers: dict[int, _Subscriber] = {}
+        self._policies: dict[type[DomainEvent], DispatchPolicy] = {}
+        self._max_queue = max_queue
+        self._lanes = lanes
+        self._guild_ordered = guild_ordered
+        self._slow_handler_ms = slow_handler_ms
+
+    def configure(self, event_type: type[DomainEvent], policy: DispatchPolicy) -> None:
+        self._policies[event_type] = policy
+        logger.debug("Dispatch policy for %s: %s", event_type.__name__, policy)
+
+    def configure_queues(self, *, max_queue: int, lanes: int, guild_ordered: bool) -> None:
+        """Size subscriber queues; applies to queues created after the call."""
+        self._max_queue = max_queue
+        self._lanes = lanes
+        self._guild_ordered = guild_ordered
+
+    def configure_tracing(self, *, slow_handler_ms: float) -> None:
+        """Log a warning for handler calls taking at least *slow_handler_ms* (0 disables)."""
+        self._slow_handler_ms = slow_handler_ms
 
     def subscribe(self, event_type: type[T], handler: EventHandler[T]) -> None:
+        owner = getattr(handler, "__self__", handler)
+        subscriber = self._subscribers.get(id(owner))
+        if subscriber is None:
+            name = type(owner).__name__ if owner is not handler else _handler_name(handler)
+            subscriber = self._subscribers[id(owner)] = _Subscriber(self, name)
+        subscription = _Handler(event_type, handler, subscriber)
+        subscriber.handlers.append(subscription)
         self._handlers[event_type].append(handler)
+        self._subscriptions[event_type].append(subscription)
         logger.debug("Subscribed handler to: %s", event_type.__name__)
 
     def unsubscribe(self, event_type: type[T], handler: EventHandler[T]) -> None:
         handlers = self._handlers[event_type]
         if handler in handlers:
-            handlers.remove(handler)
+            index = handlers.index(handler)
+            del handlers[index]
+            subscription = self._subscriptions[event_type].pop(index)
+            subscription.active = False
+            subscriber = subscription.subscriber
+            subscriber.handlers.remove(subscription)
+            if not subscriber.handlers:
+                subscriber.cancel()
+                owner = getattr(handler, "__self__", handler)
+                self._subscribers.pop(id(owner), None)
             logger.debug("Unsubscribed handler from %s", event_type.__name__)
 
     async def publish(self, event: DomainEvent) -> None:
         event_type = type(event)
-        handlers = self._handlers.get(event_type, [])
+        subscriptions = self._subscriptions.get(event_type)
 
-        if not handlers:
+        if not subscriptions:
             logger.debug("No handlers for %s", event_type.__name__)
             return
 
-        logger.debug("Publishing %s to %d handlers", event_type.__name__, len(handlers))
+        policy = self._policies.get(event_type, _INLINE)
+        if policy.mode is DispatchMode.QUEUED:
+            for subscription in tuple(subscriptions):
+                await subscription.subscriber.enqueue(subscription, event, policy.overflow)
+            return
 
-        async def safe_call(handler: EventHandler[Any]) -> None:
-            try:
-                await handler(event)
-            except Exception as e:
-                logger.exception("Error in handler for %s: %s", event_type.__name__, e)
+        logger.debug("Publishing %s to %d handlers", event_type.__name__, len(subscriptions))
 
         try:
             async with asyncio.TaskGroup() as tg:
-                for handler in handlers:
-                    tg.create_task(safe_call(handler))
+                for subscription in subscriptions:
+                    tg.create_task(subscription(event))
         except* Exception as eg:
             logger.error("Unexpected errors in event bus TaskGroup: %s", eg.exceptions)
 
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been handled; ``False`` on timeout."""
+        waits = [
+            lane.wait_idle()
+            for subscriber in self._subscribers.values()
+            for lane in subscriber.lanes
+        ]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self, timeout: float = _DRAIN_TIMEOUT_S) -> None:
+        """Drain queued events, then stop the workers. Subscriptions are kept."""
+        if not await self.drain(timeout):
+            logger.warning("Event bus did not drain within %.1fs; dropping queued events", timeout)
+        for subscriber in self._subscribers.values():
+            subscriber.cancel()
+
+    def stats(self) -> EventBusStats:
+        subscribers = [subscriber.snapshot() for subscriber in self._subscribers.values()]
+        return EventBusStats(
+            queue_depth=sum(s.queue_depth for s in subscribers),
+            in_flight=sum(h.in_flight for s in subscribers for h in s.handlers),
+            dropped=sum(s.dropped for s in subscribers),
+            coalesced=sum(s.coalesced for s in subscribers),
+            max_latency_ms=max(
+                (h.max_latency_ms for s in subscribers for h in s.handlers), default=0.0
+            ),
+            slow_handler_ms=self._slow_handler_ms,
+            subscribers=subscribers,
+        )
+
     def clear(self) -> None:
-        """Remove all handlers."""
+        """Remove all handlers and stop any queue workers."""
+        for subscriber in self._subscribers.values():
+            subscriber.cancel()
         self._handlers.clear()
+        self._subscriptions.clear()
+        self._subscribers.clear()
         logger.debug("Cleared all event handlers")
 
 
+def _handler_name(handler: EventHandler[Any]) -> str:
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
 _event_bus: EventBus | None = None
 
 
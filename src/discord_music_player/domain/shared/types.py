@@ -144,6 +144,54 @@ RadioBatchSize = Annotated[int, Field(gt=0, le=10)]
 RadioMaxTracks = Annotated[int, Field(gt=0, le=200)]
 """Radio max tracks per session: 1 … 200."""
 
+PrefetchCount = Annotated[int, Field(ge=0, le=3)]
+"""Upcoming tracks whose stream URLs are prefetched: 0 (off) … 3."""
+
+CrossfadeSeconds = Annotated[float, Field(ge=0.0, le=12.0)]
+"""Crossfade between consecutive tracks: 0.0 (gapless cut) … 12.0 seconds."""
+
+ExtractorWorkerCount = Annotated[int, Field(ge=1, le=16)]
+"""Threads dedicated to yt-dlp extraction: 1 … 16."""
+
+HistoryFlushIntervalS = Annotated[float, Field(gt=0.0, le=60.0)]
+"""Seconds between write-behind history flushes: (0, 60]."""
+
+HistoryFlushBatchSize = Annotated[int, Field(ge=1, le=1000)]
+"""Buffered history events that force an early flush: 1 … 1000."""
+
+AnalyticsCachedGuilds = Annotated[int, Field(ge=1, le=1000)]
+"""Guilds whose columnar history is cached for analytics: 1 … 1000."""
+
+ResumeConcurrency = Annotated[int, Field(ge=1, le=64)]
+"""Guilds resumed in parallel after a restart: 1 … 64."""
+
+ResumeConnectIntervalS = Annotated[float, Field(ge=0.0, le=10.0)]
+"""Minimum spacing between voice connects during recovery: 0.0 … 10.0 seconds."""
+
+EventQueueSize = Annotated[int, Field(ge=1, le=10_000)]
+"""Events buffered per event-bus subscriber lane: 1 … 10 000."""
+
+EventLaneCount = Annotated[int, Field(ge=1, le=32)]
+"""Worker lanes per event-bus subscriber: 1 … 32."""
+
+SlowHandlerMs = Annotated[float, Field(ge=0.0, le=60_000.0)]
+"""Event handler duration that triggers a slow-handler warning: 0 (off) … 60 000 ms."""
+
+TransitionTraceHistory = Annotated[int, Field(ge=1, le=500)]
+"""Track transitions kept per guild for diagnostics: 1 … 500."""
+
+MetricsPort = Annotated[int, Field(ge=0, le=65_535)]
+"""TCP port for the ``/metrics`` endpoint: 0 (ephemeral) … 65 535."""
+
+SQLiteMmapSizeMB = Annotated[int, Field(ge=0, le=4096)]
+"""SQLite memory-mapped I/O window per connection: 0 (off) … 4 096 MB."""
+
+SQLiteStatementCacheSize = Annotated[int, Field(ge=0, le=4096)]
+"""Prepared statements cached per SQLite connection: 0 (off) … 4 096."""
+
+SQLiteCacheSizeMB = Annotated[int, Field(ge=1, le=1024)]
+"""SQLite page cache per connection: 1 … 1 024 MB."""
+
 
 # ── Datetime constraints ────────────────────────────────────────────
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING
 
 from ...utils.logging import get_logger
@@ -11,6 +12,8 @@ from pydantic_ai import Agent
 from pydantic_ai.settings import ModelSettings
 
 from ...domain.music.repository import TrackForClassification, TrackGenreMap
+from ..metrics.instruments import AI_REQUEST_SECONDS
+from .models import AIUsageStats
 
 if TYPE_CHECKING:
     from ...config.settings import AISettings
@@ -34,6 +37,10 @@ class AIGenreClassifier:
         self._settings = settings
         self._agent: Agent[None, GenreClassificationResponse] | None = None
         self._logger = get_logger(type(self).__module__)
+        self._total_input_tokens: int = 0
+        self._total_output_tokens: int = 0
+        self._total_requests: int = 0
+        self._total_calls: int = 0
 
     def is_available(self) -> bool:
         try:
@@ -42,6 +49,14 @@ class AIGenreClassifier:
         except Exception:
             return False
 
+    def usage_stats(self) -> AIUsageStats:
+        return AIUsageStats(
+            total_input_tokens=self._total_input_tokens,
+            total_output_tokens=self._total_output_tokens,
+            total_requests=self._total_requests,
+            total_calls=self._total_calls,
+        )
+
     def _get_agent(self) -> Agent[None, GenreClassificationResponse]:
         if self._agent is not None:
             return self._agent
@@ -78,6 +93,8 @@ class AIGenreClassifier:
         return results
 
     async def _classify_batch(self, batch: list[TrackForClassification]) -> TrackGenreMap:
+        model = self._settings.model
+        start = time.perf_counter()
         try:
             agent = self._get_agent()
 
@@ -90,6 +107,14 @@ class AIGenreClassifier:
                 temperature=self._settings.temperature,
             )
             ai_result = await agent.run(user_prompt, model_settings=settings)
+            AI_REQUEST_SECONDS.labels("classify_genres", model, "ok").observe(
+                time.perf_counter() - start
+            )
+            usage = ai_result.usage()
+            self._total_input_tokens += usage.input_tokens
+            self._total_output_tokens += usage.output_tokens
+            self._total_requests += usage.requests
+            self._total_calls += 1
 
             genres = ai_result.output.genres
 
@@ -101,5 +126,8 @@ class AIGenreClassifier:
             return result
 
         except Exception as e:
+            AI_REQUEST_SECONDS.labels("classify_genres", model, "error").observe(
+                time.perf_counter() - start
+            )
             self._logger.error("Genre classification failed: %s", e)
             return {t.track_id: _UNKNOWN_GENRE for t in batch}
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Final
 
 from ...utils.logging import get_logger
@@ -17,6 +18,7 @@ from ...domain.recommendations.entities import (
     RecommendationRequest,
 )
 from ...domain.shared.types import NonEmptyStr, PositiveInt
+from ..metrics.instruments import AI_REQUEST_SECONDS
 from .models import (
     AI_TIMEOUT,
     AICacheEntry,
@@ -117,6 +119,8 @@ class AIRecommendationClient(AIClient):
 
     async def _call_api(self, user_prompt: str) -> AIRecommendationResponse:
         agent = self._get_agent()
+        model = self._settings.model
+        start = time.perf_counter()
 
         try:
             settings = ModelSettings(
@@ -125,6 +129,7 @@ class AIRecommendationClient(AIClient):
                 timeout=AI_TIMEOUT,
             )
             result = await agent.run(user_prompt, model_settings=settings)
+            AI_REQUEST_SECONDS.labels("recommend", model, "ok").observe(time.perf_counter() - start)
 
             usage = result.usage()
             self._total_input_tokens += usage.input_tokens
@@ -134,6 +139,9 @@ class AIRecommendationClient(AIClient):
 
             return result.output
         except Exception as e:
+            AI_REQUEST_SECONDS.labels("recommend", model, "error").observe(
+                time.perf_counter() - start
+            )
             self._handle_api_error(e)
             raise
 
@@ -4,6 +4,7 @@ from .models import (
     AudioFormatInfo,
     CacheEntry,
     ExtractorArgs,
+    PersistedTrackInfo,
     YouTubeExtractorConfig,
     YtDlpOpts,
     YtDlpTrackInfo,
@@ -14,6 +15,7 @@ __all__ = [
     "AudioFormatInfo",
     "CacheEntry",
     "ExtractorArgs",
+    "PersistedTrackInfo",
     "YtDlpOpts",
     "YtDlpResolver",
     "YtDlpTrackInfo",
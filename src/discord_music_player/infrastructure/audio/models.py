@@ -25,15 +25,18 @@ NonEmptyStrList = Annotated[list[NonEmptyStr], Field(min_length=1)]
 
 CACHE_TTL: Final[int] = 3600
 CACHE_MAX_SIZE: Final[int] = 500
+METADATA_CACHE_TTL: Final[int] = 30 * 24 * 3600  # title/duration/artist barely ever change
+METADATA_CACHE_MAX_SIZE: Final[int] = 20_000
+STREAM_EXPIRY_MARGIN: Final[int] = 600  # a cached stream must outlive the track by this much
 DEFAULT_RETRIES: Final[int] = 3
 DEFAULT_SOCKET_TIMEOUT: Final[int] = 10
 DEFAULT_HTTP_CHUNK_SIZE: Final[int] = 1024 * 1024  # 1 MiB
 DEFAULT_SEARCH_LIMIT: Final[int] = 5
 HASH_ID_LENGTH: Final[int] = 16
 LOG_URL_TRUNCATE: Final[int] = 60
-RESOLVE_BATCH_SIZE: Final[int] = 5
-RESOLVE_BATCH_DELAY: Final[float] = 0.5
+RESOLVE_WINDOW: Final[int] = 8  # resolve_many: resolutions in flight at once
 EXTRACT_TIMEOUT: Final[int] = 30  # seconds — max time for a single yt-dlp extraction
+YDL_POOL_MAX_USES: Final[int] = 250  # extractions before a pooled YoutubeDL is recycled
 
 
 # ── Pydantic models for yt-dlp data ────────────────────────────────────
@@ -147,6 +150,32 @@ class CacheEntry(BaseModel):
     cached_at: NonNegativeFloat
 
 
+class PersistedTrackInfo(BaseModel):
+    """A row of the on-disk yt-dlp cache.
+
+    Stable metadata (title, duration, artist, thumbnail, ...) is kept apart
+    from the short-lived signed stream URL, which carries its own expiry.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    video_id: NonEmptyStr
+    metadata: YtDlpTrackInfo
+    cached_at: NonNegativeFloat
+    stream_url: NonEmptyStr | None = None
+    stream_expires_at: NonNegativeFloat | None = None
+
+    def has_fresh_stream(self, now: float, margin_seconds: float) -> bool:
+        """True when the stored stream URL stays valid for at least *margin_seconds*."""
+        if self.stream_url is None or self.stream_expires_at is None:
+            return False
+        return self.stream_expires_at - margin_seconds > now
+
+    def to_info(self) -> YtDlpTrackInfo:
+        """Recombine metadata and stream URL into an extraction result."""
+        return self.metadata.model_copy(update={"url": self.stream_url})
+
+
 # ── yt-dlp option models ───────────────────────────────────────────────
 
 
@@ -0,0 +1,161 @@
+"""Per-thread pool of pre-initialized ``YoutubeDL`` instances.
+
+Constructing a ``YoutubeDL`` loads the extractor registry and plugins
+(including the bgutil POT provider) and opens a fresh request director, so
+building one per extraction costs far more than the lookup itself on a warm
+cache. The pool keeps one instance per worker thread and option profile and
+hands it out again on the next call from that thread, which also keeps the
+underlying HTTP connections alive between extractions.
+
+``YoutubeDL`` is not thread-safe, hence one instance per thread rather than a
+shared free-list. The pool is bounded by ``threads × profiles``; instances
+are retired after ``max_uses`` extractions, or as soon as one raises, so a
+long-lived instance cannot accumulate state indefinitely.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+from yt_dlp import YoutubeDL
+
+from ...domain.shared.types import NonNegativeInt
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+YdlFactory = Callable[[dict[str, Any]], YoutubeDL]
+"""Builds a ``YoutubeDL`` from a params dict (injectable for tests)."""
+
+
+class YdlProfile(StrEnum):
+    """Option profiles the resolver extracts with."""
+
+    SINGLE = "single"
+    SEARCH = "search"
+    FLAT_PLAYLIST = "flat_playlist"
+
+
+class YdlPoolStats(BaseModel):
+    """Counters for :class:`YoutubeDLPool`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    instances: NonNegativeInt = 0
+    created: NonNegativeInt = 0
+    reused: NonNegativeInt = 0
+    retired: NonNegativeInt = 0
+
+
+class _PooledYdl:
+    __slots__ = ("ydl", "uses")
+
+    def __init__(self, ydl: YoutubeDL) -> None:
+        self.ydl = ydl
+        self.uses = 0
+
+
+class YoutubeDLPool:
+    def __init__(
+        self,
+        factory: YdlFactory,
+        profiles: Mapping[YdlProfile, dict[str, Any]],
+        *,
+        max_uses: int,
+    ) -> None:
+        self._factory = factory
+        self._profiles = dict(profiles)
+        self._max_uses = max_uses
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: set[_PooledYdl] = set()
+        self._created = 0
+        self._reused = 0
+        self._retired = 0
+
+    @contextmanager
+    def acquire(self, profile: YdlProfile) -> Iterator[YoutubeDL]:
+        """Borrow this thread's instance for *profile*, creating it on first use."""
+        slots = self._thread_slots()
+        pooled = slots.get(profile)
+        with self._lock:
+            # close() may have shut this thread's instance down from elsewhere.
+            reusable = pooled is not None and pooled in self._live
+            if reusable:
+                self._reused += 1
+        if pooled is None or not reusable:
+            pooled = self._create(profile)
+            slots[profile] = pooled
+
+        try:
+            yield pooled.ydl
+        except BaseException:
+            # An interrupted extraction can leave the instance half-way through
+            # a request; start over with a fresh one next time.
+            self._retire(slots, profile, pooled)
+            raise
+
+        pooled.uses += 1
+        if pooled.uses >= self._max_uses:
+            self._retire(slots, profile, pooled)
+
+    def _thread_slots(self) -> dict[YdlProfile, _PooledYdl]:
+        slots = getattr(self._local, "slots", None)
+        if slots is None:
+            slots = self._local.slots = {}
+        return slots
+
+    def _create(self, profile: YdlProfile) -> _PooledYdl:
+        # Enter the context once for the instance's whole lifetime; exiting
+        # it closes the request director and its keep-alive connections.
+        ydl = self._factory(dict(self._profiles[profile])).__enter__()
+        pooled = _PooledYdl(ydl)
+        with self._lock:
+            self._live.add(pooled)
+            self._created += 1
+        logger.debug(
+            "Created YoutubeDL instance (profile=%s, thread=%s)",
+            profile,
+            threading.current_thread().name,
+        )
+        return pooled
+
+    def _retire(
+        self, slots: dict[YdlProfile, _PooledYdl], profile: YdlProfile, pooled: _PooledYdl
+    ) -> None:
+        if slots.get(profile) is pooled:
+            del slots[profile]
+        with self._lock:
+            if pooled not in self._live:
+                return
+            self._live.discard(pooled)
+            self._retired += 1
+        self._close(pooled)
+
+    @staticmethod
+    def _close(pooled: _PooledYdl) -> None:
+        try:
+            pooled.ydl.__exit__(None, None, None)
+        except Exception:
+            logger.debug("Error closing YoutubeDL instance", exc_info=True)
+
+    def close(self) -> None:
+        """Close every live instance. Threads that still hold one recreate it on next use."""
+        with self._lock:
+            live, self._live = self._live, set()
+        for pooled in live:
+            self._close(pooled)
+
+    def stats(self) -> YdlPoolStats:
+        with self._lock:
+            return YdlPoolStats(
+                instances=len(self._live),
+                created=self._created,
+                reused=self._reused,
+                retired=self._retired,
+            )
@@ -0,0 +1,222 @@
+"""Dedicated, priority-ordered thread pool for blocking yt-dlp calls.
+
+``asyncio.to_thread`` shares the loop's default executor with everything
+else and serves jobs first come, first served, so a large playlist import
+could keep a ``/play`` in another guild waiting behind it. This executor
+owns a fixed set of worker threads that pull jobs from a priority queue:
+interactive resolutions always go before prefetches, and both before bulk
+work. Jobs whose caller gave up (timeout, cancellation) before a worker
+picked them up are skipped rather than run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Final, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ...application.interfaces.audio_resolver import ResolvePriority
+from ...domain.shared.types import NonNegativeFloat, NonNegativeInt
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_SHUTDOWN_PRIORITY: Final[int] = sys.maxsize
+
+EXECUTOR_SHUT_DOWN: Final[str] = "yt-dlp executor has been shut down"
+
+
+class PriorityLaneStats(BaseModel):
+    """Counters for one priority class."""
+
+    model_config = ConfigDict(frozen=True)
+
+    queued: NonNegativeInt = 0
+    submitted: NonNegativeInt = 0
+    started: NonNegativeInt = 0
+    cancelled: NonNegativeInt = 0
+    avg_wait_ms: NonNegativeFloat = 0.0
+    max_wait_ms: NonNegativeFloat = 0.0
+
+
+class ExecutorStats(BaseModel):
+    """Snapshot of :class:`PriorityThreadExecutor` load."""
+
+    model_config = ConfigDict(frozen=True)
+
+    workers: NonNegativeInt = 0
+    busy: NonNegativeInt = 0
+    queue_depth: NonNegativeInt = 0
+    lanes: dict[str, PriorityLaneStats] = Field(default_factory=dict)
+
+
+class _LaneCounters:
+    __slots__ = ("queued", "submitted", "started", "cancelled", "total_wait", "max_wait")
+
+    def __init__(self) -> None:
+        self.queued = 0
+        self.submitted = 0
+        self.started = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def snapshot(self) -> PriorityLaneStats:
+        started = self.started
+        return PriorityLaneStats(
+            queued=self.queued,
+            submitted=self.submitted,
+            started=self.started,
+            cancelled=self.cancelled,
+            avg_wait_ms=round(self.total_wait / started * 1000, 2) if started else 0.0,
+            max_wait_ms=round(self.max_wait * 1000, 2),
+        )
+
+
+class _Job:
+    __slots__ = ("priority", "fn", "args", "future", "loop", "enqueued_at")
+
+    def __init__(
+        self,
+        priority: ResolvePriority,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        future: asyncio.Future[Any],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.loop = loop
+        self.enqueued_at = time.monotonic()
+
+
+def _deliver(future: asyncio.Future[Any], result: Any, error: BaseException | None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class PriorityThreadExecutor:
+    def __init__(self, max_workers: int, *, thread_name_prefix: str = "ytdlp") -> None:
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._queue: queue.PriorityQueue[tuple[int, int, _Job | None]] = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._lanes = {priority: _LaneCounters() for priority in ResolvePriority}
+        self._busy = 0
+        self._shutdown = False
+
+    async def run(self, priority: ResolvePriority, fn: Callable[..., T], /, *args: Any) -> T:
+        """Run ``fn(*args)`` on a worker thread, ahead of any lower-priority work."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        job = _Job(priority, fn, args, future, loop)
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(EXECUTOR_SHUT_DOWN)
+            lane = self._lanes[priority]
+            lane.submitted += 1
+            lane.queued += 1
+            self._start_workers()
+        self._queue.put((int(priority), next(self._sequence), job))
+
+        return await future
+
+    def _start_workers(self) -> None:
+        """Spawn the worker threads on first use. Caller holds ``_lock``."""
+        while len(self._threads) < self._max_workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self._thread_name_prefix}-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+
+            waited = time.monotonic() - job.enqueued_at
+            with self._lock:
+                lane = self._lanes[job.priority]
+                lane.queued -= 1
+                if job.future.cancelled():
+                    lane.cancelled += 1
+                    continue
+                lane.started += 1
+                lane.total_wait += waited
+                lane.max_wait = max(lane.max_wait, waited)
+                self._busy += 1
+
+            result: Any = None
+            error: BaseException | None = None
+            try:
+                result = job.fn(*job.args)
+            except BaseException as e:
+                error = e
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+            try:
+                job.loop.call_soon_threadsafe(_deliver, job.future, result, error)
+            except RuntimeError:
+                # The caller's loop is gone (shutdown); nobody is waiting.
+                logger.debug("Dropped yt-dlp result for a closed event loop")
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            lanes = {p.name.lower(): counters.snapshot() for p, counters in self._lanes.items()}
+            return ExecutorStats(
+                workers=len(self._threads),
+                busy=self._busy,
+                queue_depth=sum(lane.queued for lane in lanes.values()),
+                lanes=lanes,
+            )
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop the workers once their current job is done."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            workers = len(self._threads)
+
+        while True:
+            try:
+                _, _, job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                continue
+            with self._lock:
+                lane = self._lanes[job.priority]
+                lane.queued -= 1
+                lane.cancelled += 1
+            try:
+                job.loop.call_soon_threadsafe(job.future.cancel)
+            except RuntimeError:
+                pass
+
+        for _ in range(workers):
+            self._queue.put((_SHUTDOWN_PRIORITY, next(self._sequence), None))
@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import itertools
 import re
 import threading
 import time
-from typing import Any, Final, cast
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, Final, cast
 
 from yt_dlp import YoutubeDL
 
-from ...application.interfaces.audio_resolver import AudioResolver
+from ...application.interfaces.audio_resolver import AudioResolver, ResolvePriority
 from ...config.settings import AudioSettings
 from ...domain.music.entities import PlaylistEntry, PlaylistPreview, Track
 from ...domain.music.wrappers import TrackId
@@ -21,6 +24,8 @@ from ...domain.shared.types import (
     PositiveInt,
 )
 from ...utils.logging import get_logger
+from ...utils.stream_url import is_stream_url_stale, stream_url_expiry
+from ..metrics.instruments import RESOLVER_CACHE_LOOKUPS, RESOLVER_EXTRACT_SECONDS
 from .models import (
     CACHE_MAX_SIZE,
     CACHE_TTL,
@@ -28,8 +33,10 @@ from .models import (
     EXTRACT_TIMEOUT,
     HASH_ID_LENGTH,
     LOG_URL_TRUNCATE,
-    RESOLVE_BATCH_DELAY,
-    RESOLVE_BATCH_SIZE,
+    METADATA_CACHE_TTL,
+    RESOLVE_WINDOW,
+    STREAM_EXPIRY_MARGIN,
+    YDL_POOL_MAX_USES,
     AudioFormatInfo,
     CacheEntry,
     ExtractorArgs,
@@ -38,13 +45,22 @@ from .models import (
     YtDlpOpts,
     YtDlpTrackInfo,
 )
+from .ydl_pool import YdlPoolStats, YdlProfile, YoutubeDLPool
+from .ytdlp_executor import ExecutorStats, PriorityThreadExecutor
+
+if TYPE_CHECKING:
+    from ..persistence.repositories.track_info_repository import (
+        SQLiteTrackInfoCacheRepository,
+    )
 
 logger = get_logger(__name__)
 
 
 # ── Module-level state and patterns ────────────────────────────────────
 
-_info_cache: dict[HttpUrlStr, CacheEntry] = {}
+# In-memory LRU keyed by canonical video ID (see ``_generate_track_id``);
+# the most recently used entry sits at the end.
+_info_cache: OrderedDict[str, CacheEntry] = OrderedDict()
 _cache_lock = threading.Lock()
 
 URL_PATTERNS: Final[list[re.Pattern[str]]] = [
@@ -63,6 +79,12 @@ YOUTUBE_ID_PATTERN: Final[re.Pattern[str]] = re.compile(
 )
 
 
+_MEMORY_HIT = RESOLVER_CACHE_LOOKUPS.labels("memory", "hit")
+_MEMORY_MISS = RESOLVER_CACHE_LOOKUPS.labels("memory", "miss")
+_DISK_HIT = RESOLVER_CACHE_LOOKUPS.labels("disk", "hit")
+_DISK_MISS = RESOLVER_CACHE_LOOKUPS.labels("disk", "miss")
+
+
 def _generate_track_id(url: HttpUrlStr) -> str:
     match = YOUTUBE_ID_PATTERN.search(url)
     if match:
@@ -71,9 +93,62 @@ def _generate_track_id(url: HttpUrlStr) -> str:
     return hashlib.sha256(url.encode()).hexdigest()[:HASH_ID_LENGTH]
 
 
+def _new_youtube_dl(params: dict[str, Any]) -> YoutubeDL:
+    return YoutubeDL(params=cast(Any, params))
+
+
+def _timed_extract(ydl: YoutubeDL, target: str, profile: YdlProfile) -> Any:
+    """``ydl.extract_info`` recorded in the extract latency histogram."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        data = ydl.extract_info(target, download=False)
+        outcome = "ok"
+        return data
+    finally:
+        RESOLVER_EXTRACT_SECONDS.labels(profile, outcome).observe(time.perf_counter() - start)
+
+
+def _stream_margin(info: YtDlpTrackInfo) -> float:
+    """How long a cached stream URL must stay valid to be worth handing out."""
+    return STREAM_EXPIRY_MARGIN + (info.duration or 0)
+
+
+def _cache_get(key: str, now: float) -> YtDlpTrackInfo | None:
+    """Return a fresh in-memory entry for *key*, marking it most recently used."""
+    with _cache_lock:
+        cached = _info_cache.get(key)
+        if cached is None:
+            return None
+        info = cached.info
+        expired = now - cached.cached_at >= CACHE_TTL
+        if not expired and info is not None and info.url:
+            expired = is_stream_url_stale(info.url, margin_seconds=_stream_margin(info), now=now)
+        if expired or info is None:
+            del _info_cache[key]
+            return None
+        _info_cache.move_to_end(key)
+        return info
+
+
+def _cache_put(key: str, info: YtDlpTrackInfo, cached_at: float) -> None:
+    """Insert *info* as the most recently used entry, evicting the least recent ones."""
+    with _cache_lock:
+        _info_cache[key] = CacheEntry(info=info, cached_at=cached_at)
+        _info_cache.move_to_end(key)
+        while len(_info_cache) > CACHE_MAX_SIZE:
+            _info_cache.popitem(last=False)
+
+
 class YtDlpResolver(AudioResolver):
-    def __init__(self, settings: AudioSettings | None = None) -> None:
+    def __init__(
+        self,
+        settings: AudioSettings | None = None,
+        *,
+        metadata_cache: SQLiteTrackInfoCacheRepository | None = None,
+    ) -> None:
         self._settings = settings or AudioSettings()
+        self._metadata_cache = metadata_cache
         self._format = (
             self._settings.ytdlp_format or "251/140/bestaudio[protocol^=http]/bestaudio/best"
         )
@@ -90,6 +165,17 @@ class YtDlpResolver(AudioResolver):
             extractor_args=self._extractor_args,
         )
 
+        self._ydl_pool = YoutubeDLPool(
+            _new_youtube_dl,
+            {
+                YdlProfile.SINGLE: self._get_opts().model_dump(),
+                YdlProfile.SEARCH: self._get_opts().model_dump(),
+                YdlProfile.FLAT_PLAYLIST: self._get_playlist_opts().model_dump(),
+            },
+            max_uses=YDL_POOL_MAX_USES,
+        )
+        self._executor = PriorityThreadExecutor(self._settings.ytdlp_workers)
+
         logger.info(
             "bgutil-ytdlp-pot-provider configured (server=%s)",
             self._settings.pot_server_url,
@@ -138,6 +224,27 @@ class YtDlpResolver(AudioResolver):
             logger.exception("Failed to convert info to track")
             return None
 
+    @staticmethod
+    def _flat_entry_to_track(entry: YtDlpTrackInfo) -> Track | None:
+        """Build a lazy track from flat playlist metadata, leaving ``stream_url`` unset.
+
+        In a flat extraction ``url`` is the entry's watch page, not a stream.
+        """
+        url = entry.webpage_url or entry.url
+        if not url:
+            return None
+        try:
+            return Track(
+                id=TrackId(value=_generate_track_id(url)),
+                title=entry.title,
+                webpage_url=url,
+                duration_seconds=entry.duration,
+                uploader=entry.uploader or entry.channel,
+            )
+        except Exception:
+            logger.debug("Skipping unusable playlist entry %r", url, exc_info=True)
+            return None
+
     def _extract_webpage_url(self, info: YtDlpTrackInfo) -> str | None:
         return info.webpage_url or info.url
 
@@ -171,47 +278,88 @@ class YtDlpResolver(AudioResolver):
 
     def _extract_info_sync(self, url: HttpUrlStr) -> YtDlpTrackInfo | None:
         now = time.time()
-        with _cache_lock:
-            cached = _info_cache.get(url)
-            if cached is not None:
-                if now - cached.cached_at < CACHE_TTL:
-                    logger.debug("Cache hit for URL: %s", url[:LOG_URL_TRUNCATE])
-                    return cached.info
-                _info_cache.pop(url, None)
+        key = _generate_track_id(url)
+        cached = _cache_get(key, now)
+        if cached is not None:
+            logger.debug("Cache hit for URL: %s", url[:LOG_URL_TRUNCATE])
+            return cached
 
         try:
-            with YoutubeDL(params=cast(Any, self._get_opts().model_dump())) as ydl:
-                data = ydl.extract_info(url, download=False)
+            with self._ydl_pool.acquire(YdlProfile.SINGLE) as ydl:
+                data = _timed_extract(ydl, url, YdlProfile.SINGLE)
                 result = self._parse_single_result(data)
 
                 if result is not None:
-                    with _cache_lock:
-                        _info_cache[url] = CacheEntry(info=result, cached_at=now)
-                        self._evict_cache(now)
+                    _cache_put(key, result, now)
 
                 return result
         except Exception:
             logger.exception("Failed to extract info from %s", url)
             return None
 
-    @staticmethod
-    def _evict_cache(now: float) -> None:
-        """Remove expired or oldest entries when the cache exceeds its size limit.
+    async def _extract_info(
+        self, url: HttpUrlStr, priority: ResolvePriority
+    ) -> YtDlpTrackInfo | None:
+        """Look *url* up in the memory tier, then on disk, then run yt-dlp."""
+        key = _generate_track_id(url)
+        cached = _cache_get(key, time.time())
+        if cached is not None:
+            _MEMORY_HIT.inc()
+            return cached
+        _MEMORY_MISS.inc()
+
+        store = self._metadata_cache
+        if store is None:
+            return await self._executor.run(priority, self._extract_info_sync, url)
+
+        persisted = await self._load_persisted(store, key)
+        if persisted is not None:
+            _DISK_HIT.inc()
+            return persisted
+        _DISK_MISS.inc()
+
+        info = await self._executor.run(priority, self._extract_info_sync, url)
+        if info is not None:
+            await self._persist(store, key, info)
+        return info
+
+    async def _load_persisted(
+        self, store: SQLiteTrackInfoCacheRepository, key: str
+    ) -> YtDlpTrackInfo | None:
+        try:
+            persisted = await store.get(key)
+        except Exception:
+            logger.warning("Persistent yt-dlp cache lookup failed for %s", key, exc_info=True)
+            return None
+        if persisted is None:
+            return None
 
-        Must be called while holding ``_cache_lock``.
-        """
-        if len(_info_cache) <= CACHE_MAX_SIZE:
-            return
-
-        expired = [k for k, entry in _info_cache.items() if now - entry.cached_at >= CACHE_TTL]
-        if expired:
-            for k in expired:
-                _info_cache.pop(k, None)
-            logger.debug("Cleaned %d expired cache entries", len(expired))
-        else:
-            # All entries are fresh — evict oldest
-            oldest_key = min(_info_cache, key=lambda k: _info_cache[k].cached_at)
-            _info_cache.pop(oldest_key, None)
+        now = time.time()
+        if now - persisted.cached_at >= METADATA_CACHE_TTL:
+            return None
+        if not persisted.has_fresh_stream(now, _stream_margin(persisted.metadata)):
+            # Metadata is still good, but yt-dlp has to sign a new stream URL.
+            return None
+
+        info = persisted.to_info()
+        logger.debug("Persistent cache hit for %s", key)
+        _cache_put(key, info, now)
+        return info
+
+    async def _persist(
+        self, store: SQLiteTrackInfoCacheRepository, key: str, info: YtDlpTrackInfo
+    ) -> None:
+        now = time.time()
+        stream_url = self._extract_stream_url(info)
+        expires_at: float | None = None
+        if stream_url is not None:
+            expires_at = stream_url_expiry(stream_url) or now + CACHE_TTL
+        try:
+            await store.save(
+                key, info, stream_url=stream_url, stream_expires_at=expires_at, cached_at=now
+            )
+        except Exception:
+            logger.warning("Failed to persist yt-dlp info for %s", key, exc_info=True)
 
     @staticmethod
     def _parse_extract_result(data: Any) -> YtDlpExtractResult:
@@ -223,8 +371,8 @@ class YtDlpResolver(AudioResolver):
     def _search_sync(self, query: NonEmptyStr, limit: PositiveInt = 1) -> list[YtDlpTrackInfo]:
         try:
             search_query = f"ytsearch{limit}:{query}"
-            with YoutubeDL(params=cast(Any, self._get_opts().model_dump())) as ydl:
-                data = ydl.extract_info(search_query, download=False)
+            with self._ydl_pool.acquire(YdlProfile.SEARCH) as ydl:
+                data = _timed_extract(ydl, search_query, YdlProfile.SEARCH)
                 return self._parse_extract_result(data).entries
         except Exception:
             logger.exception("Failed to search for %r", query)
@@ -232,20 +380,22 @@ class YtDlpResolver(AudioResolver):
 
     def _extract_playlist_sync(self, url: HttpUrlStr) -> YtDlpExtractResult:
         try:
-            with YoutubeDL(params=cast(Any, self._get_playlist_opts().model_dump())) as ydl:
-                data = ydl.extract_info(url, download=False)
+            with self._ydl_pool.acquire(YdlProfile.FLAT_PLAYLIST) as ydl:
+                data = _timed_extract(ydl, url, YdlProfile.FLAT_PLAYLIST)
                 return self._parse_extract_result(data)
         except Exception:
             logger.exception("Failed to extract playlist from %s", url)
             return YtDlpExtractResult(entries=[], title=None)
 
-    async def resolve(self, query: NonEmptyStr) -> Track | None:
+    async def resolve(
+        self, query: NonEmptyStr, *, priority: ResolvePriority = ResolvePriority.INTERACTIVE
+    ) -> Track | None:
         try:
             async with asyncio.timeout(EXTRACT_TIMEOUT):
                 if self.is_url(query):
-                    info = await asyncio.to_thread(self._extract_info_sync, query)
+                    info = await self._extract_info(query, priority)
                 else:
-                    results = await asyncio.to_thread(self._search_sync, query, 1)
+                    results = await self._executor.run(priority, self._search_sync, query, 1)
                     info = results[0] if results else None
 
             if not info:
@@ -259,39 +409,49 @@ class YtDlpResolver(AudioResolver):
             logger.exception("Failed to resolve %r", query)
             return None
 
-    async def resolve_many(self, queries: list[NonEmptyStr]) -> list[Track]:
-        tracks: list[Track] = []
-
-        # Process in batches to avoid overwhelming yt-dlp
-        for i in range(0, len(queries), RESOLVE_BATCH_SIZE):
-            batch = queries[i : i + RESOLVE_BATCH_SIZE]
+    async def resolve_many(
+        self, queries: list[NonEmptyStr], *, priority: ResolvePriority = ResolvePriority.BULK
+    ) -> AsyncIterator[Track]:
+        """Yield resolved tracks in input order as soon as each one is ready.
 
-            try:
-                async with asyncio.TaskGroup() as tg:
-                    batch_tasks = [tg.create_task(self.resolve(q)) for q in batch]
-
-                for task in batch_tasks:
-                    try:
-                        result = task.result()
-                        if result is not None:
-                            tracks.append(result)
-                    except Exception as e:
-                        logger.warning("Resolution failed: %s", e)
-            except* Exception as eg:
-                for exc in eg.exceptions:
-                    logger.warning("Resolution failed: %s", exc)
-
-            if i + RESOLVE_BATCH_SIZE < len(queries):
-                await asyncio.sleep(RESOLVE_BATCH_DELAY)
-
-        return tracks
+        Up to ``RESOLVE_WINDOW`` resolutions are in flight at once; a new one
+        starts whenever the oldest finishes, so a slow entry only delays
+        what comes after it, never what was already resolved. Failed entries
+        are skipped. Closing the generator early cancels the ones in flight.
+        """
+        remaining = iter(queries)
+        in_flight: deque[asyncio.Task[Track | None]] = deque(
+            asyncio.create_task(self.resolve(q, priority=priority))
+            for q in itertools.islice(remaining, RESOLVE_WINDOW)
+        )
+        try:
+            while in_flight:
+                try:
+                    track = await in_flight[0]
+                except Exception as e:
+                    logger.warning("Resolution failed: %s", e)
+                    track = None
+
+                in_flight.popleft()
+                next_query = next(remaining, None)
+                if next_query is not None:
+                    in_flight.append(
+                        asyncio.create_task(self.resolve(next_query, priority=priority))
+                    )
+                if track is not None:
+                    yield track
+        finally:
+            for task in in_flight:
+                task.cancel()
 
     async def search(
         self, query: NonEmptyStr, limit: PositiveInt = DEFAULT_SEARCH_LIMIT
     ) -> list[Track]:
         try:
             async with asyncio.timeout(EXTRACT_TIMEOUT):
-                results = await asyncio.to_thread(self._search_sync, query, limit)
+                results = await self._executor.run(
+                    ResolvePriority.INTERACTIVE, self._search_sync, query, limit
+                )
 
             tracks: list[Track] = []
             for info in results:
@@ -310,19 +470,17 @@ class YtDlpResolver(AudioResolver):
     async def extract_playlist(self, url: HttpUrlStr) -> list[Track]:
         try:
             async with asyncio.timeout(EXTRACT_TIMEOUT):
-                extract = await asyncio.to_thread(self._extract_playlist_sync, url)
-
-            # Flat extraction returns metadata only, so resolve each entry individually
-            tracks: list[Track] = []
-            for entry in extract.entries:
-                entry_url = entry.url or entry.webpage_url
-                if not entry_url:
-                    continue
-                track = await self.resolve(entry_url)
-                if track:
-                    tracks.append(track)
+                extract = await self._executor.run(
+                    ResolvePriority.INTERACTIVE, self._extract_playlist_sync, url
+                )
 
-            return tracks
+            # Flat extraction returns metadata only; stream URLs are resolved
+            # lazily by the prefetcher or right before playback.
+            return [
+                track
+                for track in map(self._flat_entry_to_track, extract.entries)
+                if track is not None
+            ]
         except TimeoutError:
             logger.error(
                 "yt-dlp playlist extraction timed out after %ds for %s", EXTRACT_TIMEOUT, url
@@ -335,7 +493,9 @@ class YtDlpResolver(AudioResolver):
     async def preview_playlist(self, url: HttpUrlStr) -> PlaylistPreview:
         try:
             async with asyncio.timeout(EXTRACT_TIMEOUT):
-                extract = await asyncio.to_thread(self._extract_playlist_sync, url)
+                extract = await self._executor.run(
+                    ResolvePriority.INTERACTIVE, self._extract_playlist_sync, url
+                )
 
             entries: list[PlaylistEntry] = []
             for entry in extract.entries:
@@ -347,6 +507,7 @@ class YtDlpResolver(AudioResolver):
                         title=entry.title,
                         url=entry_url,
                         duration_seconds=entry.duration,
+                        uploader=entry.uploader or entry.channel,
                     )
                 )
             title = (extract.title or "").strip() or None
@@ -358,6 +519,28 @@ class YtDlpResolver(AudioResolver):
             logger.error("Playlist preview failed for %s: %s", url, e)
             return PlaylistPreview(entries=[], title=None)
 
+    def playlist_tracks(self, entries: list[PlaylistEntry]) -> list[Track]:
+        flat = (
+            YtDlpTrackInfo(
+                webpage_url=entry.url,
+                title=entry.title,
+                duration=entry.duration_seconds,
+                uploader=entry.uploader,
+            )
+            for entry in entries
+        )
+        return [track for track in map(self._flat_entry_to_track, flat) if track is not None]
+
+    def pool_stats(self) -> YdlPoolStats:
+        return self._ydl_pool.stats()
+
+    def executor_stats(self) -> ExecutorStats:
+        return self._executor.stats()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self._ydl_pool.close()
+
     def is_url(self, query: NonEmptyStr) -> bool:
         return any(pattern.search(query) for pattern in URL_PATTERNS)
 
@@ -0,0 +1,246 @@
+"""Gapless audio source: switches to a pre-spawned FFmpeg stream at track end.
+
+discord.py pulls one 20 ms PCM frame at a time from the player thread. A plain
+``FFmpegPCMAudio`` ends the player when its stream runs out, and the next
+track only starts after the ``after`` callback has gone through the event
+loop, the application services and a fresh FFmpeg spawn. ``GaplessAudioSource``
+instead keeps a warmed-up, pre-buffered stream for the next track and hands
+out its frames the moment the current one is exhausted, optionally blending
+the two over a crossfade window.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Final
+
+import discord
+import numpy as np
+
+from ....utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from ....domain.music.entities import Track
+
+logger = get_logger(__name__)
+
+FRAME_SIZE: Final[int] = discord.opus.Encoder.FRAME_SIZE
+"""Bytes in one 20 ms frame of 48 kHz stereo s16le PCM."""
+
+FRAMES_PER_SECOND: Final[int] = 1000 // discord.opus.Encoder.FRAME_LENGTH
+
+
+class PreloadedTrack:
+    """The next track's audio stream, spawned early with its first frames buffered."""
+
+    def __init__(self, track: Track, source: discord.AudioSource) -> None:
+        self.track = track
+        self.source = source
+        self._buffer: deque[bytes] = deque()
+
+    def fill(self, frames: int) -> int:
+        """Read up to *frames* frames ahead (blocking; run off the event loop)."""
+        for _ in range(frames):
+            frame = self.source.read()
+            if not frame:
+                break
+            self._buffer.append(frame)
+        return len(self._buffer)
+
+    def read(self) -> bytes:
+        if self._buffer:
+            return self._buffer.popleft()
+        return self.source.read()
+
+    def cleanup(self) -> None:
+        self._buffer.clear()
+        self.source.cleanup()
+
+
+def crossfade_frames(outgoing: bytes, incoming: bytes, progress: float) -> bytes:
+    """Mix two PCM frames, fading *outgoing* out and *incoming* in at *progress* (0 … 1)."""
+    out = np.frombuffer(outgoing, dtype=np.int16).astype(np.float32)
+    inc = np.frombuffer(incoming, dtype=np.int16).astype(np.float32)
+    if out.size != inc.size:
+        size = max(out.size, inc.size)
+        out = np.pad(out, (0, size - out.size))
+        inc = np.pad(inc, (0, size - inc.size))
+    # Equal-power curve keeps perceived loudness steady through the blend.
+    angle = progress * (np.pi / 2)
+    mixed = out * np.cos(angle) + inc * np.sin(angle)
+    return np.clip(mixed, -32768, 32767).astype(np.int16).tobytes()
+
+
+def _cleanup_in_background(source: discord.AudioSource | PreloadedTrack) -> None:
+    # Killing FFmpeg can block on communicate(); keep it off the player thread.
+    threading.Thread(target=source.cleanup, name="gapless-cleanup", daemon=True).start()
+
+
+class GaplessAudioSource(discord.AudioSource):
+    """Plays a track and, when one is preloaded, continues into the next without a gap.
+
+    ``on_transition`` is called from the player thread with the track that
+    just became current, so the owner can advance its own bookkeeping.
+    ``on_first_frame`` is called from the player thread with the track whose
+    stream produced audio first, once after construction and once after each
+    :meth:`replace`; a preloaded track taking over does not fire it.
+    """
+
+    def __init__(
+        self,
+        track: Track,
+        source: discord.AudioSource,
+        *,
+        start_seconds: int = 0,
+        crossfade_seconds: float = 0.0,
+        on_transition: Callable[[Track], None] | None = None,
+        on_first_frame: Callable[[Track], None] | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._track = track
+        self._source: discord.AudioSource | PreloadedTrack = source
+        self._next: PreloadedTrack | None = None
+        self._frames_read = start_seconds * FRAMES_PER_SECOND
+        self._crossfade_frames = int(crossfade_seconds * FRAMES_PER_SECOND)
+        self._fade_position = 0
+        self._on_transition = on_transition
+        self._on_first_frame = on_first_frame
+        self._awaiting_first_frame = on_first_frame is not None
+        self.transitions = 0
+
+    # ── Control (event loop thread) ───────────────────────────────────
+
+    @property
+    def track(self) -> Track:
+        return self._track
+
+    @property
+    def current_source(self) -> discord.AudioSource | PreloadedTrack:
+        return self._source
+
+    @property
+    def preloaded_track(self) -> Track | None:
+        preloaded = self._next
+        return preloaded.track if preloaded is not None else None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._frames_read / FRAMES_PER_SECOND
+
+    def remaining_seconds(self) -> float | None:
+        """Seconds left in the current track, if its duration is known."""
+        duration = self._track.duration_seconds
+        if duration is None:
+            return None
+        return max(duration - self.elapsed_seconds, 0.0)
+
+    def set_next(self, preloaded: PreloadedTrack | None) -> None:
+        """Queue *preloaded* to follow the current track, replacing any earlier preload."""
+        with self._lock:
+            previous, self._next = self._next, preloaded
+            self._fade_position = 0
+        if previous is not None and previous is not preloaded:
+            _cleanup_in_background(previous)
+
+    def replace(self, track: Track, source: discord.AudioSource, *, start_seconds: int = 0) -> None:
+        """Switch to *track* immediately, keeping the voice player running."""
+        with self._lock:
+            previous = self._source
+            self._track = track
+            self._source = source
+            self._frames_read = start_seconds * FRAMES_PER_SECOND
+            self._fade_position = 0
+            self._awaiting_first_frame = self._on_first_frame is not None
+        _cleanup_in_background(previous)
+
+    # ── AudioSource (player thread) ───────────────────────────────────
+
+    def read(self) -> bytes:
+        frame = self._read_frame()
+        if frame and self._awaiting_first_frame:
+            self._awaiting_first_frame = False
+            self._notify_first_frame()
+        return frame
+
+    def _notify_first_frame(self) -> None:
+        if self._on_first_frame is None:
+            return
+        try:
+            self._on_first_frame(self._track)
+        except Exception:
+            logger.exception("First-frame callback failed")
+
+    def _read_frame(self) -> bytes:
+        with self._lock:
+            frame = self._source.read()
+            preloaded = self._next
+
+            if preloaded is None:
+                if frame:
+                    self._frames_read += 1
+                return frame
+
+            if frame and self._in_crossfade():
+                incoming = preloaded.read()
+                if incoming:
+                    self._fade_position += 1
+                    progress = self._fade_position / self._crossfade_frames
+                    if progress < 1.0:
+                        self._frames_read += 1
+                        return crossfade_frames(frame, incoming, progress)
+                # Fade complete (or next stream ended early): hand over now.
+                self._advance(preloaded)
+                return incoming or frame
+
+            if frame:
+                self._frames_read += 1
+                return frame
+
+            # Current stream exhausted: continue straight into the next one.
+            self._advance(preloaded)
+            frame = self._source.read()
+            if frame:
+                self._frames_read += 1
+            return frame
+
+    def _in_crossfade(self) -> bool:
+        if self._crossfade_frames <= 0:
+            return False
+        if self._fade_position > 0:
+            return True
+        remaining = self.remaining_seconds()
+        return remaining is not None and remaining * FRAMES_PER_SECOND <= self._crossfade_frames
+
+    def _advance(self, preloaded: PreloadedTrack) -> None:
+        previous = self._source
+        self._track = preloaded.track
+        self._source = preloaded
+        self._next = None
+        # Frames already mixed in during the fade count towards the new track.
+        self._frames_read = self._fade_position
+        self._fade_position = 0
+        self.transitions += 1
+        _cleanup_in_background(previous)
+
+        if self._on_transition is not None:
+            try:
+                self._on_transition(preloaded.track)
+            except Exception:
+                logger.exception("Gapless transition callback failed")
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self) -> None:
+        with self._lock:
+            sources: list[discord.AudioSource | PreloadedTrack] = [self._source]
+            if self._next is not None:
+                sources.append(self._next)
+            self._next = None
+        for source in sources:
+            try:
+                source.cleanup()
+            except Exception:
+                logger.debug("Error cleaning up audio source", exc_info=True)
@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
 import discord
 
 from ....application.interfaces.voice_adapter import VoiceAdapter
+from ....application.services.transition_tracer import TransitionTracer
 from ....config.settings import AudioSettings
 from ....domain.shared.constants import AudioConstants, TimeConstants
+from ....domain.shared.enums import TransitionOutcome, TransitionStage
 from ....utils.logging import get_logger
+from ...metrics.instruments import FFMPEG_SPAWN_SECONDS, TRACK_TRANSITION_SECONDS
+from .gapless_source import GaplessAudioSource, PreloadedTrack
 
 if TYPE_CHECKING:
     from ....domain.music.entities import Track
@@ -22,6 +27,10 @@ logger = get_logger(__name__)
 
 DEFAULT_VOLUME: float = 0.2
 
+# A track starting longer than this after the previous one ended is a fresh
+# request (the queue ran dry), not a transition worth timing.
+_TRANSITION_WINDOW_S: Final[float] = 60.0
+
 
 async def _safe_voice_op(label: str, coro: Awaitable[bool]) -> bool:
     """Execute a voice operation, logging failures and returning False on error."""
@@ -39,14 +48,26 @@ async def _safe_voice_op(label: str, coro: Awaitable[bool]) -> bool:
 
 
 class DiscordVoiceAdapter(VoiceAdapter):
-    def __init__(self, bot: discord.Client, settings: AudioSettings | None = None) -> None:
+    def __init__(
+        self,
+        bot: discord.Client,
+        settings: AudioSettings | None = None,
+        *,
+        tracer: TransitionTracer | None = None,
+    ) -> None:
         self._bot = bot
         self._settings = settings or AudioSettings()
+        self._tracer = tracer or TransitionTracer(history=self._settings.transition_trace_history)
         self._volume = self._settings.default_volume
         self._on_track_end: Callable[[int], Awaitable[None]] | None = None
         self._current_track: dict[int, Track] = {}
         self._ffmpeg_options = self._settings.ffmpeg_options
         self._normalize_audio = self._settings.normalize_audio
+        self._gapless = self._settings.gapless_playback
+        self._crossfade_seconds = self._settings.crossfade_seconds
+        self._sources: dict[int, GaplessAudioSource] = {}
+        self._preload_tasks: dict[int, asyncio.Task[None]] = {}
+        self._track_ended_at: dict[int, float] = {}
         # Resolve User-Agent from primary player_client
         primary_client = self._settings.player_client[0] if self._settings.player_client else "web"
         self._user_agent = (
@@ -105,6 +126,8 @@ class DiscordVoiceAdapter(VoiceAdapter):
 
         async def _do() -> bool:
             self._current_track.pop(guild_id, None)
+            self._track_ended_at.pop(guild_id, None)
+            self._drop_gapless_source(guild_id)
             await vc.disconnect(force=True)
             logger.info("Disconnected from voice in guild %s", guild_id)
             return True
@@ -166,26 +189,26 @@ class DiscordVoiceAdapter(VoiceAdapter):
             logger.error("No stream URL found for %s", track.title)
             return False
 
+        live = self._live_gapless_source(guild_id, vc)
+        if live is not None and guild_id not in self._current_track:
+            # The source already moved on by itself at the end of the last
+            # track; keep the player running instead of restarting it.
+            return self._continue_live_source(guild_id, live, track, start_seconds)
+
         if vc.is_playing():
             vc.stop()
 
         try:
-            # User-Agent must match yt-dlp's primary player_client to prevent YouTube 403
-            base_before_opts = self._ffmpeg_options.get("before_options", "")
-            before_opts = f'{base_before_opts} -headers "User-Agent: {self._user_agent}"'
-            if start_seconds is not None:
-                before_opts = f"-ss {start_seconds.value} {before_opts}"
-            base_opts = self._ffmpeg_options.get("options", "")
-
-            af_filters = [f"afade=t=in:ss=0:d={AudioConstants.FADE_IN_SECONDS}"]
-            if self._normalize_audio:
-                af_filters.append(AudioConstants.LOUDNORM_FILTER)
-            fade_opts = f'{base_opts} -af "{",".join(af_filters)}"'
-
-            source = discord.FFmpegPCMAudio(
-                track.stream_url,
-                before_options=before_opts,
-                options=fade_opts,
+            self._drop_gapless_source(guild_id)
+            ffmpeg_source = self._create_ffmpeg_source(track, start_seconds=start_seconds)
+            self._tracer.mark(guild_id, TransitionStage.FFMPEG_SPAWN)
+            source = GaplessAudioSource(
+                track,
+                ffmpeg_source,
+                start_seconds=start_seconds.value if start_seconds is not None else 0,
+                crossfade_seconds=self._crossfade_seconds,
+                on_transition=lambda _track, gid=guild_id: self._on_gapless_advance(gid),
+                on_first_frame=lambda playing, gid=guild_id: self._on_first_frame(gid, playing),
             )
 
             volume_source = discord.PCMVolumeTransformer(source, volume=self._volume)
@@ -195,26 +218,191 @@ class DiscordVoiceAdapter(VoiceAdapter):
                 logger.info("Track ended in guild %s (error: %s)", guild_id, error)
                 if error:
                     logger.warning("Playback error in guild %s: %s", guild_id, error)
-
-                future = asyncio.run_coroutine_threadsafe(
-                    self._handle_track_end(guild_id),
-                    self._bot.loop,
-                )
-                future.add_done_callback(
-                    lambda f, gid=guild_id: (
-                        logger.error("track-end handler raised in guild %s: %r", gid, f.exception())
-                        if not f.cancelled() and f.exception()
-                        else None
-                    )
-                )
-
+                # Runs on the voice player thread: only note whether this was
+                # still the current source; the loop does the cleanup.
+                ran_out = source if self._sources.get(guild_id) is source else None
+                self._schedule_track_end(guild_id, ran_out)
+
+            self._tracer.mark(guild_id, TransitionStage.VOICE_SETUP)
+            # Registered first, so a source that ends straight away is still
+            # recognised as the current one.
+            self._sources[guild_id] = source
             vc.play(volume_source, after=after_callback)
+            self._record_transition(guild_id, "restart")
             logger.info("Started playing '%s' in guild %s", track.title, guild_id)
             return True
 
+        except Exception as e:
+            self._drop_gapless_source(guild_id)
+            logger.error("Failed to start playback in guild %s: %r", guild_id, e)
+            return False
+
+    def _create_ffmpeg_source(
+        self,
+        track: Track,
+        *,
+        start_seconds: StartSeconds | None = None,
+        fade_in: bool = True,
+        operation: str = "play",
+    ) -> discord.FFmpegPCMAudio:
+        # User-Agent must match yt-dlp's primary player_client to prevent YouTube 403
+        base_before_opts = self._ffmpeg_options.get("before_options", "")
+        before_opts = f'{base_before_opts} -headers "User-Agent: {self._user_agent}"'
+        if start_seconds is not None:
+            before_opts = f"-ss {start_seconds.value} {before_opts}"
+        base_opts = self._ffmpeg_options.get("options", "")
+
+        af_filters: list[str] = []
+        if fade_in:
+            af_filters.append(f"afade=t=in:ss=0:d={AudioConstants.FADE_IN_SECONDS}")
+        if self._normalize_audio:
+            af_filters.append(AudioConstants.LOUDNORM_FILTER)
+        options = f'{base_opts} -af "{",".join(af_filters)}"' if af_filters else base_opts
+
+        start = time.perf_counter()
+        try:
+            return discord.FFmpegPCMAudio(
+                track.stream_url,
+                before_options=before_opts,
+                options=options,
+            )
+        finally:
+            FFMPEG_SPAWN_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+    def _record_transition(self, guild_id: int, operation: str) -> None:
+        ended_at = self._track_ended_at.pop(guild_id, None)
+        if ended_at is None:
+            return
+        gap = time.perf_counter() - ended_at
+        if gap <= _TRANSITION_WINDOW_S:
+            TRACK_TRANSITION_SECONDS.labels(operation).observe(gap)
+
+    def _on_gapless_advance(self, guild_id: int) -> None:
+        self._tracer.begin(guild_id)
+        self._schedule_track_end(guild_id)
+
+    def _on_first_frame(self, guild_id: int, track: Track) -> None:
+        self._tracer.mark(guild_id, TransitionStage.FIRST_FRAME)
+        self._tracer.finish(guild_id, TransitionOutcome.PLAYING, track_title=track.title)
+
+    def _schedule_track_end(self, guild_id: int, ran_out: GaplessAudioSource | None = None) -> None:
+        """Hand a track end from the player thread over to the event loop.
+
+        ``ran_out`` is the source that played to its end while still current.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._handle_track_end(guild_id, ran_out),
+            self._bot.loop,
+        )
+        future.add_done_callback(
+            lambda f, gid=guild_id: (
+                logger.error("track-end handler raised in guild %s: %r", gid, f.exception())
+                if not f.cancelled() and f.exception()
+                else None
+            )
+        )
+
+    # ── Gapless playback ──────────────────────────────────────────────
+
+    async def preload(self, guild_id: int, track: Track) -> bool:
+        """Warm up *track* so it follows the current one without a gap."""
+        if not self._gapless or not track.stream_url:
+            return False
+
+        vc = self._get_voice_client(guild_id)
+        live = self._live_gapless_source(guild_id, vc) if vc else None
+        if live is None:
+            return False
+
+        preloaded = live.preloaded_track
+        if preloaded is not None and preloaded.id == track.id:
+            return True
+
+        self._cancel_preload(guild_id)
+        self._preload_tasks[guild_id] = asyncio.create_task(
+            self._preload_when_due(guild_id, live, track), name=f"gapless-preload-{guild_id}"
+        )
+        return True
+
+    async def _preload_when_due(
+        self, guild_id: int, live: GaplessAudioSource, track: Track
+    ) -> None:
+        """Spawn and pre-buffer *track* shortly before *live*'s current track ends."""
+        playing = live.track
+        lead = AudioConstants.GAPLESS_PRELOAD_LEAD_SECONDS + self._crossfade_seconds
+        while (remaining := live.remaining_seconds()) is not None and remaining > lead:
+            await asyncio.sleep(remaining - lead)
+
+        if self._sources.get(guild_id) is not live or live.track is not playing:
+            return
+
+        try:
+            source = await asyncio.to_thread(
+                self._create_ffmpeg_source, track, fade_in=False, operation="preload"
+            )
+            preloaded = PreloadedTrack(track, source)
+            await asyncio.to_thread(preloaded.fill, AudioConstants.GAPLESS_PREBUFFER_FRAMES)
+        except Exception:
+            logger.warning("Could not preload '%s' in guild %s", track.title, guild_id)
+            return
+
+        if self._sources.get(guild_id) is not live or live.track is not playing:
+            preloaded.cleanup()
+            return
+
+        live.set_next(preloaded)
+        logger.debug("Preloaded '%s' in guild %s", track.title, guild_id)
+
+    def _live_gapless_source(
+        self, guild_id: int, vc: discord.VoiceClient
+    ) -> GaplessAudioSource | None:
+        source = self._sources.get(guild_id)
+        if source is None or not (vc.is_playing() or vc.is_paused()):
+            return None
+        return source
+
+    def _continue_live_source(
+        self,
+        guild_id: int,
+        live: GaplessAudioSource,
+        track: Track,
+        start_seconds: StartSeconds | None,
+    ) -> bool:
+        if start_seconds is None and live.track.id == track.id:
+            self._current_track[guild_id] = track
+            self._record_transition(guild_id, "gapless")
+            self._tracer.finish(guild_id, TransitionOutcome.GAPLESS, track_title=track.title)
+            logger.info("Continuing gapless into '%s' in guild %s", track.title, guild_id)
+            return True
+
+        # The preloaded track is not what the queue wants (it changed after
+        # the preload): swap in the right stream without stopping the player.
+        try:
+            ffmpeg_source = self._create_ffmpeg_source(
+                track, start_seconds=start_seconds, operation="replace"
+            )
+            self._tracer.mark(guild_id, TransitionStage.FFMPEG_SPAWN)
+            live.replace(
+                track,
+                ffmpeg_source,
+                start_seconds=start_seconds.value if start_seconds is not None else 0,
+            )
         except Exception as e:
             logger.error("Failed to start playback in guild %s: %r", guild_id, e)
             return False
+        self._current_track[guild_id] = track
+        self._record_transition(guild_id, "replace")
+        logger.info("Started playing '%s' in guild %s", track.title, guild_id)
+        return True
+
+    def _cancel_preload(self, guild_id: int) -> None:
+        task = self._preload_tasks.pop(guild_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def _drop_gapless_source(self, guild_id: int) -> None:
+        self._cancel_preload(guild_id)
+        self._sources.pop(guild_id, None)
 
     async def stop(self, guild_id: int) -> bool:
         vc = self._get_voice_client(guild_id)
@@ -222,6 +410,7 @@ class DiscordVoiceAdapter(VoiceAdapter):
             return True
 
         if vc.is_playing() or vc.is_paused():
+            self._drop_gapless_source(guild_id)
             vc.stop()
             self._current_track.pop(guild_id, None)
             logger.info("Stopped playback in guild %s", guild_id)
@@ -295,9 +484,18 @@ class DiscordVoiceAdapter(VoiceAdapter):
     ) -> None:
         self._on_track_end = callback
 
-    async def _handle_track_end(self, guild_id: int) -> None:
+    async def _handle_track_end(
+        self, guild_id: int, ran_out: GaplessAudioSource | None = None
+    ) -> None:
         """Called from the FFmpeg thread via run_coroutine_threadsafe for thread-safe cleanup."""
+        if ran_out is not None and self._sources.get(guild_id) is ran_out:
+            # It ran out rather than being stopped or replaced, and nothing has
+            # started since: time the hand-over.
+            self._tracer.begin(guild_id)
+            self._drop_gapless_source(guild_id)
         self._current_track.pop(guild_id, None)
+        self._track_ended_at[guild_id] = time.perf_counter()
+        self._tracer.mark(guild_id, TransitionStage.TRACK_END_DISPATCH)
 
         if self._on_track_end:
             logger.debug("Calling track end callback for guild %s", guild_id)
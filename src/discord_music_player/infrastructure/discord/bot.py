@@ -13,6 +13,7 @@ from ...domain.music.enums import PlaybackState
 from ...domain.music.wrappers import StartSeconds
 from ...utils.logging import get_logger
 from ...utils.reply import format_duration
+from .services.session_recovery import ConnectStagger, RecoveryProgress
 from .views.resume_playback_view import ResumePlaybackView
 
 if TYPE_CHECKING:
@@ -23,6 +24,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Log a recovery progress line every this many processed sessions.
+_RECOVERY_LOG_EVERY = 25
+
 
 class MusicBot(commands.Bot):
     def __init__(
@@ -50,6 +54,8 @@ class MusicBot(commands.Bot):
         self._shutdown_event: asyncio.Event = asyncio.Event()
         self._sessions_resumed: bool = False
         # on_ready fires on every reconnect; gate session resume to first ready only
+        self.recovery: RecoveryProgress | None = None
+        self._connect_stagger: ConnectStagger | None = None
         container.set_bot(self)
 
     async def setup_hook(self) -> None:
@@ -85,52 +91,86 @@ class MusicBot(commands.Bot):
     # ------------------------------------------------------------------
 
     async def _resume_sessions(self) -> None:
-        """Resume playback sessions that were active before bot restart."""
+        """Resume playback sessions that were active before bot restart.
+
+        Sessions are bulk-loaded, then recovered concurrently (bounded by
+        ``resume_concurrency``) with voice connects spaced out so a large
+        restart does not hit the gateway's rate limits.
+        """
         try:
             session_repo = self.container.session_repository
             sessions = await session_repo.get_all_active()
+        except Exception as e:
+            logger.warning("Failed to load sessions for recovery: %s", e)
+            return
 
-            logger.info("Session recovery: found %d active session(s)", len(sessions))
-
-            resumed_count = 0
-            reset_count = 0
+        logger.info("Session recovery: found %d active session(s)", len(sessions))
 
-            for session in sessions:
-                logger.info(
-                    "Session %s: state=%s has_tracks=%s current=%s queue_len=%d",
-                    session.guild_id,
-                    session.state.value,
-                    session.has_tracks,
-                    session.current_track.title if session.current_track else None,
-                    len(session.queue),
+        discord_settings = self.settings.discord
+        progress = RecoveryProgress(total=len(sessions))
+        self.recovery = progress
+        self._connect_stagger = ConnectStagger(discord_settings.resume_connect_interval_s)
+        semaphore = asyncio.Semaphore(discord_settings.resume_concurrency)
+        try:
+            await asyncio.gather(
+                *(
+                    self._recover_session(session, session_repo, semaphore, progress)
+                    for session in sessions
                 )
+            )
+        finally:
+            self._connect_stagger = None
+            progress.finish()
+
+        logger.info(
+            "Session recovery finished in %.0f ms: %d resumed, %d reset, %d skipped, %d failed",
+            progress.duration_ms,
+            progress.resumed,
+            progress.reset,
+            progress.skipped,
+            progress.failed,
+        )
+
+    async def _recover_session(
+        self,
+        session: GuildPlaybackSession,
+        session_repo: SessionRepository,
+        semaphore: asyncio.Semaphore,
+        progress: RecoveryProgress,
+    ) -> None:
+        """Resume or reset one session, recording the outcome in ``progress``."""
+        logger.info(
+            "Session %s: state=%s has_tracks=%s current=%s queue_len=%d",
+            session.guild_id,
+            session.state.value,
+            session.has_tracks,
+            session.current_track.title if session.current_track else None,
+            len(session.queue),
+        )
 
-                if session.state == PlaybackState.IDLE and not session.has_tracks:
-                    logger.info(
-                        "Skipping idle session with no tracks for guild %s", session.guild_id
-                    )
-                    continue
+        if session.state == PlaybackState.IDLE and not session.has_tracks:
+            logger.info("Skipping idle session with no tracks for guild %s", session.guild_id)
+            progress.skipped += 1
+            return
 
+        async with semaphore:
+            try:
                 guild = self.get_guild(session.guild_id)
                 if guild is None:
                     logger.debug("Guild %s not found, resetting session", session.guild_id)
                     await self._reset_session(session, session_repo)
-                    reset_count += 1
-                    continue
-
-                if await self._try_resume_session(session, guild):
-                    resumed_count += 1
+                    progress.reset += 1
+                elif await self._try_resume_session(session, guild):
+                    progress.resumed += 1
                 else:
                     await self._reset_session(session, session_repo)
-                    reset_count += 1
-
-            if resumed_count > 0:
-                logger.info("Resumed %d playback session(s)", resumed_count)
-            if reset_count > 0:
-                logger.info("Reset %d stale session(s)", reset_count)
+                    progress.reset += 1
+            except Exception as e:
+                logger.warning("Failed to recover session for guild %s: %s", session.guild_id, e)
+                progress.failed += 1
 
-        except Exception as e:
-            logger.warning("Failed to reset stale sessions: %s", e)
+        if progress.processed % _RECOVERY_LOG_EVERY == 0:
+            logger.info("Session recovery: %d/%d processed", progress.processed, progress.total)
 
     async def _try_resume_session(
         self, session: GuildPlaybackSession, guild: discord.Guild
@@ -155,6 +195,8 @@ class MusicBot(commands.Bot):
                 )
                 return False
 
+            if self._connect_stagger is not None:
+                await self._connect_stagger.wait()
             success = await self.container.voice_adapter.ensure_connected(
                 session.guild_id, voice_channel.id
             )
@@ -9,6 +9,7 @@ from discord.ext import commands
 
 from ....domain.shared.constants import DiscordEmbedLimits, SQLPragmas, UIConstants
 from ....domain.shared.enums import SyncScope
+from ....domain.shared.events import HandlerStats, get_event_bus
 from .base_cog import BaseCog
 
 _FAILED_RELOAD_LOG = "Failed to reload %s"
@@ -360,6 +361,29 @@ class AdminCog(BaseCog):
             db_name = Path(stats.db_path).name if stats.db_path else "Unknown"
             embed.add_field(name="Database", value=db_name, inline=True)
 
+            if stats.pool is not None:
+                pool = stats.pool
+                embed.add_field(
+                    name="Pool",
+                    value=(
+                        f"readers {pool.readers_in_use}/{pool.readers_open} "
+                        f"(max {pool.max_readers})\n"
+                        f"waits {pool.waits}, timeouts {pool.timeouts}, "
+                        f"max wait {pool.max_wait_ms} ms"
+                    ),
+                    inline=False,
+                )
+
+            if stats.wal_size_bytes is not None:
+                wal_info = f"{stats.wal_size_bytes} bytes, {stats.checkpoints} checkpoints"
+                if stats.last_checkpoint is not None:
+                    last = stats.last_checkpoint
+                    wal_info += (
+                        f"\nlast: {last.checkpointed_frames}/{last.wal_frames} frames"
+                        f"{' (busy)' if last.busy else ''} <t:{int(last.completed_at.timestamp())}:R>"
+                    )
+                embed.add_field(name="WAL", value=wal_info, inline=False)
+
             if stats.tables:
                 table_info = "\n".join(
                     f"{name}: {count} rows" for name, count in stats.tables.items()
@@ -446,6 +470,48 @@ class AdminCog(BaseCog):
 
         await self._reply(ctx, embed=embed)
 
+    @commands.command(name="event_stats", description="Show event handler latency.")
+    @require_owner()
+    async def event_stats(self, ctx: commands.Context) -> None:
+        stats = get_event_bus().stats()
+
+        embed = discord.Embed(title="Event Bus", color=discord.Color.teal())
+        embed.add_field(
+            name="Queues",
+            value=(
+                f"{stats.queue_depth} queued, {stats.in_flight} running, "
+                f"{stats.dropped} dropped, {stats.coalesced} coalesced"
+            ),
+            inline=False,
+        )
+
+        by_event: dict[str, list[HandlerStats]] = {}
+        for handler in stats.handlers:
+            by_event.setdefault(handler.event_type, []).append(handler)
+
+        for event_type, handlers in sorted(by_event.items()):
+            handlers.sort(key=lambda h: h.p95_latency_ms, reverse=True)
+            value = "\n".join(self._format_handler_stats(h) for h in handlers)
+            embed.add_field(
+                name=event_type,
+                value=value[: DiscordEmbedLimits.EMBED_FIELD_CHUNK_SAFE],
+                inline=False,
+            )
+        if not by_event:
+            embed.add_field(name="Handlers", value="No subscribers.", inline=False)
+
+        embed.set_footer(text=f"Slow-handler threshold: {stats.slow_handler_ms:.0f} ms")
+        await self._reply(ctx, embed=embed)
+
+    @staticmethod
+    def _format_handler_stats(handler: HandlerStats) -> str:
+        return (
+            f"`{handler.handler}` {handler.delivered} calls, "
+            f"p50 {handler.p50_latency_ms:.0f} / p95 {handler.p95_latency_ms:.0f} / "
+            f"max {handler.max_latency_ms:.0f} ms, "
+            f"{handler.failed} errors, {handler.slow} slow, {handler.in_flight} running"
+        )
+
     @commands.command(name="shutdown", description="Gracefully shutdown the bot.")
     @require_owner()
     async def shutdown(self, ctx: commands.Context) -> None:
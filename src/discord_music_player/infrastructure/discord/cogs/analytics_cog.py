@@ -320,7 +320,9 @@ class AnalyticsCog(BaseCog):
         cached: TrackGenreMap,
     ) -> dict[str, int] | None:
         """Count plays per genre from history rows and genre cache."""
-        track_id_counts: Counter[str] = Counter(row.track_id for row in rows)
+        track_id_counts: Counter[str] = Counter()
+        for row in rows:
+            track_id_counts[row.track_id] += row.play_count
 
         genre_counts: Counter[str] = Counter()
         for tid, count in track_id_counts.items():
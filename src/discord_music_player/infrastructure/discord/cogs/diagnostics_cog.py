@@ -17,7 +17,8 @@ class DiagnosticsCog(BaseCog):
     @commands.group(name="diag", invoke_without_command=True)
     async def diag(self, ctx: commands.Context) -> None:
         await ctx.reply(
-            "Subcommands: `!diag activities [@user]`, `!diag state`, `!diag listeners`",
+            "Subcommands: `!diag activities [@user]`, `!diag state`, `!diag listeners`, "
+            "`!diag transitions`",
             mention_author=False,
         )
 
@@ -148,5 +149,28 @@ class DiagnosticsCog(BaseCog):
             lines.append(f"  - `{user_id}` {label}")
         await ctx.reply("\n".join(lines)[:1900], mention_author=False)
 
+    @diag.command(name="transitions")
+    async def transitions(self, ctx: commands.Context) -> None:
+        """Where the time went in this guild's recent track-to-track hand-overs."""
+        if ctx.guild is None:
+            await ctx.reply("Guild only.", mention_author=False)
+            return
+
+        traces = self.container.transition_tracer.recent(ctx.guild.id)
+        if not traces:
+            await ctx.reply("No track transitions recorded yet.", mention_author=False)
+            return
+
+        lines = [f"**Transitions in guild {ctx.guild.id}** (newest first):"]
+        for trace in traces:
+            stages = ", ".join(
+                f"{timing.stage} {timing.duration_ms:.0f}" for timing in trace.stages
+            )
+            lines.append(
+                f"`{trace.started_at:%H:%M:%S}` `{trace.outcome}` "
+                f"**{trace.total_ms:.0f} ms** — {stages or 'no stages'}"
+            )
+        await ctx.reply("\n".join(lines)[:1900], mention_author=False)
+
 
 setup = DiagnosticsCog.setup
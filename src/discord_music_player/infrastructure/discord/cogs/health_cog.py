@@ -12,10 +12,13 @@ import discord
 from discord.ext import commands, tasks
 from pydantic import BaseModel, ConfigDict
 
+from ....application.services.transition_tracer import TransitionStats, TransitionTracer
 from ....domain.shared.constants import HealthConstants, UIConstants
 from ....domain.shared.datetime_utils import UtcDateTime
 from ....domain.shared.enums import BotStatus
+from ....domain.shared.events import EventBusStats, get_event_bus
 from ....domain.shared.types import BYTES_PER_MB
+from ..services.session_recovery import RecoveryProgress
 from .base_cog import BaseCog
 
 if TYPE_CHECKING:
@@ -58,6 +61,16 @@ class DetailedStats(BasicStats):
     vms_mb: float | None = None
     db_initialized: bool | None = None
     db_size_mb: float | None = None
+    ytdlp_queue_depth: int | None = None
+    ytdlp_busy_workers: int | None = None
+    ytdlp_max_wait_ms: float | None = None
+    recovery_total: int | None = None
+    recovery_processed: int | None = None
+    recovery_resumed: int | None = None
+    recovery_failed: int | None = None
+    recovery_duration_ms: float | None = None
+    event_bus: EventBusStats | None = None
+    transitions: TransitionStats | None = None
 
 
 class HealthCog(BaseCog):
@@ -200,6 +213,34 @@ class HealthCog(BaseCog):
         except Exception:
             pass
 
+        try:
+            from ...audio.ytdlp_resolver import YtDlpResolver
+
+            resolver = self.container.audio_resolver
+            if isinstance(resolver, YtDlpResolver):
+                executor = resolver.executor_stats()
+                payload.ytdlp_queue_depth = executor.queue_depth
+                payload.ytdlp_busy_workers = executor.busy
+                payload.ytdlp_max_wait_ms = max(
+                    (lane.max_wait_ms for lane in executor.lanes.values()), default=0.0
+                )
+        except Exception:
+            pass
+
+        recovery = getattr(self.bot, "recovery", None)
+        if isinstance(recovery, RecoveryProgress):
+            payload.recovery_total = recovery.total
+            payload.recovery_processed = recovery.processed
+            payload.recovery_resumed = recovery.resumed
+            payload.recovery_failed = recovery.failed
+            payload.recovery_duration_ms = recovery.duration_ms
+
+        payload.event_bus = get_event_bus().stats()
+
+        tracer = getattr(self.container, "transition_tracer", None)
+        if isinstance(tracer, TransitionTracer):
+            payload.transitions = tracer.stats()
+
         return payload
 
     # ─────────────────────────────────────────────────────────────────
@@ -333,6 +374,59 @@ class HealthCog(BaseCog):
             db_size = payload.db_size_mb or 0
             embed.add_field(name="Database", value=f"{db_status} ({db_size} MB)", inline=True)
 
+        if payload.ytdlp_queue_depth is not None:
+            embed.add_field(
+                name="yt-dlp",
+                value=(
+                    f"{payload.ytdlp_busy_workers} busy, {payload.ytdlp_queue_depth} queued, "
+                    f"max wait {payload.ytdlp_max_wait_ms:.0f} ms"
+                ),
+                inline=True,
+            )
+
+        if payload.recovery_total is not None:
+            timing = (
+                f"in {payload.recovery_duration_ms:.0f} ms"
+                if payload.recovery_duration_ms is not None
+                else "in progress"
+            )
+            embed.add_field(
+                name="Session Recovery",
+                value=(
+                    f"{payload.recovery_processed}/{payload.recovery_total} processed, "
+                    f"{payload.recovery_resumed} resumed, {payload.recovery_failed} failed {timing}"
+                ),
+                inline=True,
+            )
+
+        if payload.event_bus is not None:
+            bus = payload.event_bus
+            embed.add_field(
+                name="Event Bus",
+                value=(
+                    f"{bus.queue_depth} queued, {bus.in_flight} running, {bus.dropped} dropped, "
+                    f"slowest handler {bus.max_latency_ms:.0f} ms"
+                ),
+                inline=True,
+            )
+
+        if payload.transitions is not None and payload.transitions.traced:
+            transitions = payload.transitions
+            slowest_stage = max(transitions.stages, key=lambda s: s.avg_ms, default=None)
+            embed.add_field(
+                name="Track Transitions",
+                value=(
+                    f"{transitions.traced} traced, avg {transitions.avg_total_ms:.0f} ms, "
+                    f"p95 {transitions.p95_total_ms:.0f} ms"
+                    + (
+                        f", mostly {slowest_stage.stage} ({slowest_stage.avg_ms:.0f} ms)"
+                        if slowest_stage is not None
+                        else ""
+                    )
+                ),
+                inline=True,
+            )
+
     def _format_memory_stats(self, payload: DetailedStats) -> list[str]:
         mem_parts: list[str] = []
         if payload.rss_mb is not None:
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from ....domain.music.entities import PlaylistPreview, Track
+from ....domain.music.entities import PlaylistEntry, PlaylistPreview, Track
 from ....domain.shared.constants import PlaylistConstants, UIConstants
 from ....domain.shared.types import (
     DiscordSnowflake,
@@ -57,6 +60,8 @@ def _format_slice_status(
     source_label: str,
     info: PlaylistSlice,
     count_override: PlaylistImportCount | None,
+    *,
+    resolving: bool = True,
 ) -> str:
     """Render the "Queueing … from <source>" status message for an import."""
     parts = [f"Queueing **{info.kept}** of **{info.total}** tracks from {source_label}"]
@@ -72,7 +77,14 @@ def _format_slice_status(
         )
     else:
         status += "."
-    return status + " Resolving on YouTube…"
+    if resolving:
+        status += " Resolving on YouTube…"
+    return status
+
+
+async def _iterate(tracks: list[Track]) -> AsyncIterator[Track]:
+    for track in tracks:
+        yield track
 
 
 class PlaybackCog(BaseCog):
@@ -463,17 +475,29 @@ class PlaybackCog(BaseCog):
         self,
         interaction: discord.Interaction,
         *,
-        resolver_queries: list[str],
         source_label: str,
         suggested_name: str,
+        resolver_queries: list[str] | None = None,
+        entries: list[PlaylistEntry] | None = None,
         status_message: discord.WebhookMessage | None = None,
     ) -> None:
-        """Resolve → batch-enqueue → confirmation → save-prompt.
+        """Stream-resolve → enqueue as tracks arrive → confirmation → save-prompt.
 
         Single completion point for every playlist-style import so the save
         prompt fires consistently across Apple Music, YouTube auto-enqueue,
         and ``PlaylistView``.
 
+        Pass either ``resolver_queries`` (search queries, resolved one by one)
+        or YouTube preview ``entries``. Entries already carry their watch URL,
+        so they are enqueued as lazy tracks without extracting each one again;
+        the prefetcher or playback resolves stream URLs later.
+
+        The first resolved track is enqueued (and playback started) right
+        away; later ones are flushed into the queue every
+        ``PlaylistConstants.IMPORT_PROGRESS_INTERVAL`` seconds, with a progress
+        edit to ``status_message``. The import stops early once the queue is
+        full.
+
         ``status_message``: an existing ephemeral followup (e.g. the
         "Queueing X of Y… Resolving on YouTube…" one) that should be edited
         with the final result instead of dropping a second message. Falls
@@ -483,8 +507,55 @@ class PlaybackCog(BaseCog):
 
         assert interaction.guild is not None
 
-        tracks = await self.container.audio_resolver.resolve_many(resolver_queries)
-        if not tracks:
+        resolver = self.container.audio_resolver
+        if entries is not None:
+            total = len(entries)
+            stream = _iterate(resolver.playlist_tracks(entries))
+        else:
+            assert resolver_queries is not None
+            total = len(resolver_queries)
+            stream = resolver.resolve_many(resolver_queries)
+
+        resolved_any = False
+        enqueued_tracks: list[Track] = []
+        pending: list[Track] = []
+        interval = PlaylistConstants.IMPORT_PROGRESS_INTERVAL
+        last_flush = time.monotonic()
+
+        async def flush() -> bool:
+            """Enqueue the pending tracks; returns False once the queue is full."""
+            result = await self.enqueue_and_start(interaction, list(pending))
+            # enqueue_batch preserves order and rejects mostly at the tail
+            # (queue-size cap), so the first ``result.enqueued`` tracks match
+            # what landed in the queue.
+            enqueued_tracks.extend(pending[: result.enqueued])
+            pending.clear()
+            return not result.queue_full
+
+        async with aclosing(stream) as tracks:
+            async for track in tracks:
+                resolved_any = True
+                pending.append(track)
+                # The first track goes in immediately so playback starts;
+                # the rest are coalesced into one queue write per interval.
+                now = time.monotonic()
+                if enqueued_tracks and now - last_flush < interval:
+                    continue
+                last_flush = now
+                if not await flush():
+                    break
+                if status_message is not None:
+                    await self._send_or_edit_status(
+                        interaction,
+                        status_message,
+                        f"Queued **{len(enqueued_tracks)}/{total}** tracks from "
+                        f"{source_label} so far… still resolving.",
+                    )
+            else:
+                if pending:
+                    await flush()
+
+        if not resolved_any:
             await self._send_or_edit_status(
                 interaction,
                 status_message,
@@ -492,17 +563,12 @@ class PlaybackCog(BaseCog):
             )
             return
 
-        result = await self.enqueue_and_start(interaction, tracks)
         await self._send_or_edit_status(
             interaction,
             status_message,
-            f"Queued **{result.enqueued}/{len(resolver_queries)}** tracks from {source_label}.",
+            f"Queued **{len(enqueued_tracks)}/{total}** tracks from {source_label}.",
         )
 
-        # enqueue_batch preserves order and only rejects at the tail when the
-        # queue-size cap is hit, so the first ``result.enqueued`` tracks
-        # match what landed in the queue.
-        enqueued_tracks = tracks[: result.enqueued]
         if not enqueued_tracks:
             return
 
@@ -872,14 +938,14 @@ class PlaybackCog(BaseCog):
             interaction.guild.id,
         )
         status_msg = await interaction.followup.send(
-            _format_slice_status("YouTube playlist", slice_info, count),
+            _format_slice_status("YouTube playlist", slice_info, count, resolving=False),
             ephemeral=True,
             wait=True,
         )
 
         await self._finalize_playlist_import(
             interaction,
-            resolver_queries=[entry.url for entry in selected],
+            entries=selected,
             source_label="YouTube playlist",
             suggested_name=_suggest_save_name(preview.title, "YouTube playlist"),
             status_message=status_msg,
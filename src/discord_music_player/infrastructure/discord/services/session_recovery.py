@@ -0,0 +1,62 @@
+"""Progress tracking and voice-connect pacing for startup session recovery."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+from ....domain.shared.datetime_utils import utcnow
+from ....domain.shared.types import NonNegativeFloat, NonNegativeInt, UtcDatetimeField
+
+
+class RecoveryProgress(BaseModel):
+    """Running tally of a restart's session recovery, surfaced in logs and heartbeats."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    total: NonNegativeInt = 0
+    resumed: NonNegativeInt = 0
+    reset: NonNegativeInt = 0
+    skipped: NonNegativeInt = 0
+    failed: NonNegativeInt = 0
+    started_at: UtcDatetimeField = Field(default_factory=utcnow)
+    duration_ms: NonNegativeFloat | None = None
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def processed(self) -> int:
+        return self.resumed + self.reset + self.skipped + self.failed
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def done(self) -> bool:
+        return self.duration_ms is not None
+
+    def finish(self, now: datetime | None = None) -> None:
+        elapsed = (now or utcnow()) - self.started_at
+        self.duration_ms = round(elapsed.total_seconds() * 1000, 1)
+
+
+class ConnectStagger:
+    """Spaces voice connects at least ``interval_s`` apart across concurrent resumes.
+
+    Each caller reserves the next free slot under the lock and sleeps outside
+    it, so waiting callers never hold up the slot bookkeeping.
+    """
+
+    def __init__(self, interval_s: float) -> None:
+        self._interval = interval_s
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at)
+            self._next_at = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -1,8 +1,8 @@
 """View for previewing and selecting tracks from a YouTube playlist.
 
 All enqueue paths (Add All, Shuffle All, per-track Select) delegate to a
-single ``on_finalize`` callback so the downstream batch-resolve, summary,
-and save-prompt flow is shared with the slash-param auto-enqueue path.
+single ``on_finalize`` callback so the downstream enqueue, summary, and
+save-prompt flow is shared with the slash-param auto-enqueue path.
 """
 
 from __future__ import annotations
@@ -32,7 +32,7 @@ class FinalizeCallback(Protocol):
         self,
         interaction: discord.Interaction,
         *,
-        resolver_queries: list[str],
+        entries: list[PlaylistEntry],
         source_label: str,
         suggested_name: str,
     ) -> None: ...
@@ -200,7 +200,7 @@ class PlaylistView(BaseInteractiveView):
 
         self._disable_all_items()
         await interaction.response.edit_message(
-            content=f"Resolving **{len(entries)}** track(s)…",
+            content=f"Adding **{len(entries)}** track(s)…",
             embed=None,
             view=self,
         )
@@ -210,7 +210,7 @@ class PlaylistView(BaseInteractiveView):
 
         await self._on_finalize(
             interaction,
-            resolver_queries=[entry.url for entry in entries],
+            entries=entries,
             source_label="YouTube playlist",
             suggested_name=_suggest_name(self._playlist_title),
         )
@@ -0,0 +1,9 @@
+"""Metrics infrastructure - hot-path instruments and the Prometheus exporter."""
+
+from .exporter import MetricsExporter
+from .instruments import timed_repository
+
+__all__ = [
+    "MetricsExporter",
+    "timed_repository",
+]
@@ -0,0 +1,178 @@
+"""Scrape-time collectors for stats that other components already keep.
+
+These read existing snapshots (event-bus handler histograms, executor and
+pool counters, cached session queues) when ``/metrics`` is scraped, so
+exporting them adds nothing to the paths that produce them.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+from ...domain.shared.enums import MetricType
+from ...domain.shared.events import HANDLER_LATENCY_BUCKETS_MS, get_event_bus
+from ...utils.metrics import MetricFamily
+
+if TYPE_CHECKING:
+    from ..ai.models import AIUsageStats
+    from ..audio.ytdlp_resolver import YtDlpResolver
+    from ..persistence.database import Database
+    from ..persistence.repositories.cached_session_repository import CachedSessionRepository
+
+_MS_PER_S = 1000.0
+_HANDLER_BOUNDS_S = (*(bound / _MS_PER_S for bound in HANDLER_LATENCY_BUCKETS_MS), math.inf)
+
+
+def collect_event_bus() -> Iterator[MetricFamily]:
+    """Per-handler latency histograms and per-subscriber queue load."""
+    stats = get_event_bus().stats()
+
+    latency = MetricFamily(
+        "musicbot_event_handler_seconds",
+        "Event handler latency, by event type and handler.",
+        MetricType.HISTOGRAM,
+    )
+    failed = MetricFamily(
+        "musicbot_event_handler_failures_total",
+        "Event handler calls that raised, by event type and handler.",
+        MetricType.COUNTER,
+    )
+    for handler in stats.handlers:
+        labels = {"event": handler.event_type, "handler": handler.handler}
+        latency.add_histogram(
+            zip(_HANDLER_BOUNDS_S, handler.latency_buckets, strict=False),
+            handler.total_latency_ms / _MS_PER_S,
+            **labels,
+        )
+        failed.add(handler.failed, **labels)
+
+    depth = MetricFamily(
+        "musicbot_event_queue_depth",
+        "Events waiting in a subscriber's queues.",
+        MetricType.GAUGE,
+    )
+    dropped = MetricFamily(
+        "musicbot_event_dropped_total",
+        "Events a subscriber's full queues discarded.",
+        MetricType.COUNTER,
+    )
+    coalesced = MetricFamily(
+        "musicbot_event_coalesced_total",
+        "Queued events replaced by a newer event for the same guild.",
+        MetricType.COUNTER,
+    )
+    for subscriber in stats.subscribers:
+        depth.add(subscriber.queue_depth, subscriber=subscriber.subscriber)
+        dropped.add(subscriber.dropped, subscriber=subscriber.subscriber)
+        coalesced.add(subscriber.coalesced, subscriber=subscriber.subscriber)
+
+    yield from (latency, failed, depth, dropped, coalesced)
+
+
+class ResolverCollector:
+    """yt-dlp worker pool load and per-priority queue counters."""
+
+    def __init__(self, resolver: YtDlpResolver) -> None:
+        self._resolver = resolver
+
+    def __call__(self) -> Iterator[MetricFamily]:
+        executor = self._resolver.executor_stats()
+
+        busy = MetricFamily(
+            "musicbot_resolver_busy_workers",
+            "yt-dlp worker threads currently running a job.",
+            MetricType.GAUGE,
+        )
+        busy.add(executor.busy)
+        depth = MetricFamily(
+            "musicbot_resolver_queue_depth",
+            "yt-dlp jobs waiting for a worker, by priority.",
+            MetricType.GAUGE,
+        )
+        started = MetricFamily(
+            "musicbot_resolver_jobs_started_total",
+            "yt-dlp jobs handed to a worker, by priority.",
+            MetricType.COUNTER,
+        )
+        for priority, lane in executor.lanes.items():
+            depth.add(lane.queued, priority=priority)
+            started.add(lane.started, priority=priority)
+
+        yield from (busy, depth, started)
+
+
+class DatabaseCollector:
+    """SQLite connection pool usage and contention."""
+
+    def __init__(self, database: Database) -> None:
+        self._database = database
+
+    def __call__(self) -> Iterator[MetricFamily]:
+        pool = self._database.pool_stats()
+
+        in_use = MetricFamily(
+            "musicbot_db_connections_in_use",
+            "Pooled SQLite connections checked out, by role.",
+            MetricType.GAUGE,
+        )
+        in_use.add(pool.readers_in_use, role="reader")
+        in_use.add(int(pool.writer_in_use), role="writer")
+        waits = MetricFamily(
+            "musicbot_db_pool_waits_total",
+            "Connection acquisitions that had to wait for a free connection.",
+            MetricType.COUNTER,
+        )
+        waits.add(pool.waits)
+        timeouts = MetricFamily(
+            "musicbot_db_pool_timeouts_total",
+            "Connection acquisitions that timed out.",
+            MetricType.COUNTER,
+        )
+        timeouts.add(pool.timeouts)
+
+        yield from (in_use, waits, timeouts)
+
+
+class QueueSizeCollector:
+    """Queued track count per guild, read from the in-memory session cache."""
+
+    def __init__(self, sessions: CachedSessionRepository) -> None:
+        self._sessions = sessions
+
+    def __call__(self) -> Iterator[MetricFamily]:
+        tracks = MetricFamily(
+            "musicbot_queue_tracks",
+            "Tracks waiting in a guild's queue.",
+            MetricType.GAUGE,
+        )
+        for guild_id, length in self._sessions.queue_lengths().items():
+            tracks.add(length, guild=str(guild_id))
+        yield tracks
+
+
+class AIUsageCollector:
+    """Token and request totals per AI operation, from each client's usage counters."""
+
+    def __init__(self, sources: Mapping[str, Callable[[], AIUsageStats]]) -> None:
+        self._sources = dict(sources)
+
+    def __call__(self) -> Iterator[MetricFamily]:
+        tokens = MetricFamily(
+            "musicbot_ai_tokens_total",
+            "Tokens consumed by AI agent runs, by operation and direction.",
+            MetricType.COUNTER,
+        )
+        requests = MetricFamily(
+            "musicbot_ai_model_requests_total",
+            "Model requests made by AI agent runs, by operation.",
+            MetricType.COUNTER,
+        )
+        for operation, usage_stats in self._sources.items():
+            usage = usage_stats()
+            tokens.add(usage.total_input_tokens, operation=operation, direction="input")
+            tokens.add(usage.total_output_tokens, operation=operation, direction="output")
+            requests.add(usage.total_requests, operation=operation)
+
+        yield from (tokens, requests)
@@ -0,0 +1,79 @@
+"""Local HTTP server exposing the metrics registry at ``/metrics``."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from aiohttp import web
+
+from ...utils.logging import get_logger
+from ...utils.metrics import CONTENT_TYPE, Collector, MetricsRegistry
+
+logger = get_logger(__name__)
+
+
+class MetricsExporter:
+    """Serves :meth:`MetricsRegistry.render` for Prometheus to scrape.
+
+    *collectors* are registered for as long as the server runs, so a stopped
+    exporter leaves nothing behind in the process-wide registry.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        *,
+        host: str,
+        port: int,
+        collectors: Sequence[Collector] = (),
+    ) -> None:
+        self._registry = registry
+        self._host = host
+        self._port = port
+        self._collectors = tuple(collectors)
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    @property
+    def port(self) -> int:
+        """The bound port — differs from the configured one when that was 0."""
+        if self._runner is not None:
+            for address in self._runner.addresses:
+                return int(address[1])
+        return self._port
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self._host, self._port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+
+        for collector in self._collectors:
+            self._registry.register_collector(collector)
+        self._runner = runner
+        logger.info("Serving metrics on http://%s:%d/metrics", self._host, self.port)
+
+    async def stop(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        for collector in self._collectors:
+            self._registry.unregister_collector(collector)
+        await runner.cleanup()
+
+    async def _handle_metrics(self, _request: web.Request) -> web.Response:
+        return web.Response(
+            body=self._registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
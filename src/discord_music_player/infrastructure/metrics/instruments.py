@@ -0,0 +1,99 @@
+"""Metric instruments recorded on the bot's hot paths.
+
+Every instrument is registered on the process-wide registry at import, so
+recording is always on; serving them is what ``MetricsSettings.enabled``
+controls. Latencies are in seconds, following Prometheus convention.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+from ...utils.metrics import get_metrics
+
+_metrics = get_metrics()
+
+# ── yt-dlp resolver ─────────────────────────────────────────────────
+
+RESOLVER_EXTRACT_SECONDS: Final = _metrics.histogram(
+    "musicbot_resolver_extract_seconds",
+    "Time spent inside yt-dlp extract_info, by operation.",
+    ("operation", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
+
+RESOLVER_CACHE_LOOKUPS: Final = _metrics.counter(
+    "musicbot_resolver_cache_lookups_total",
+    "Track info cache lookups, by cache tier and result.",
+    ("tier", "result"),
+)
+
+# ── Database ────────────────────────────────────────────────────────
+
+DB_QUERY_SECONDS: Final = _metrics.histogram(
+    "musicbot_db_query_seconds",
+    "Latency of repository methods, including connection acquisition.",
+    ("repository", "method"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+# ── Voice / FFmpeg ──────────────────────────────────────────────────
+
+FFMPEG_SPAWN_SECONDS: Final = _metrics.histogram(
+    "musicbot_ffmpeg_spawn_seconds",
+    "Time to spawn an FFmpeg audio source, by operation.",
+    ("operation",),
+)
+
+TRACK_TRANSITION_SECONDS: Final = _metrics.histogram(
+    "musicbot_track_transition_gap_seconds",
+    "Gap between a track ending and the next one starting, by how playback continued.",
+    ("operation",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0),
+)
+
+# ── AI ──────────────────────────────────────────────────────────────
+
+AI_REQUEST_SECONDS: Final = _metrics.histogram(
+    "musicbot_ai_request_seconds",
+    "Latency of AI agent runs, by operation, model and outcome.",
+    ("operation", "model", "outcome"),
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
+
+
+def timed_repository[RepoT: type](cls: RepoT) -> RepoT:
+    """Class decorator recording every public async method in :data:`DB_QUERY_SECONDS`.
+
+    Methods inherited from a decorated base are labelled with the concrete
+    repository class they were called on.
+    """
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(member):
+            continue
+        setattr(cls, name, _timed_method(member, name))
+    return cls
+
+
+def _timed_method(
+    method: Callable[..., Awaitable[Any]], name: str
+) -> Callable[..., Awaitable[Any]]:
+    children: dict[type, Any] = {}
+
+    @functools.wraps(method)
+    async def wrapper(self: object, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            owner = type(self)
+            child = children.get(owner)
+            if child is None:
+                child = children[owner] = DB_QUERY_SECONDS.labels(owner.__name__, name)
+            child.observe(time.perf_counter() - start)
+
+    return wrapper
@@ -12,12 +12,15 @@ from pydantic import BaseModel, ConfigDict, computed_field
 from ...domain.shared.datetime_utils import utcnow
 from ...domain.shared.types import NonNegativeInt
 from ...utils.logging import get_logger
+from ..audio.models import METADATA_CACHE_MAX_SIZE, METADATA_CACHE_TTL
 
 if TYPE_CHECKING:
     from ...config.settings import CleanupSettings
     from ...domain.music.repository import SessionRepository, TrackHistoryRepository
     from ...domain.recommendations.repository import RecommendationCacheRepository
     from ...domain.voting.repository import VoteSessionRepository
+    from .database import Database
+    from .repositories.track_info_repository import SQLiteTrackInfoCacheRepository
 
 logger = get_logger(__name__)
 
@@ -31,11 +34,15 @@ class CleanupJob:
         cache_repository: RecommendationCacheRepository,
         vote_repository: VoteSessionRepository,
         settings: CleanupSettings,
+        track_info_cache: SQLiteTrackInfoCacheRepository | None = None,
+        database: Database | None = None,
     ) -> None:
         self._session_repo = session_repository
         self._history_repo = history_repository
         self._cache_repo = cache_repository
         self._vote_repo = vote_repository
+        self._track_info_cache = track_info_cache
+        self._database = database
         self._settings = settings
         self._running = False
         self._task: asyncio.Task[None] | None = None
@@ -102,18 +109,50 @@ class CleanupJob:
         await self._run_one(
             "vote sessions", stats, "votes_cleaned", self._vote_repo.cleanup_expired()
         )
+        if self._track_info_cache is not None:
+            await self._run_one(
+                "track info cache",
+                stats,
+                "track_info_cleaned",
+                self._prune_track_info(self._track_info_cache),
+            )
 
         if stats.total_cleaned > 0:
             logger.info(
-                "Cleanup completed: %s sessions, %s history entries, %s cache entries, %s vote sessions",
+                "Cleanup completed: %s sessions, %s history entries, %s cache entries, "
+                "%s vote sessions, %s cached track infos",
                 stats.sessions_cleaned,
                 stats.history_cleaned,
                 stats.cache_cleaned,
                 stats.votes_cleaned,
+                stats.track_info_cleaned,
             )
 
+        if self._database is not None:
+            # After the deletes, so the checkpoint also reclaims the WAL they grew.
+            await self._checkpoint(self._database)
+
         return stats
 
+    @staticmethod
+    async def _checkpoint(database: Database) -> None:
+        try:
+            result = await database.checkpoint()
+        except Exception as e:
+            logger.error("Failed to checkpoint database: %r", e)
+            return
+        logger.debug(
+            "WAL checkpoint: %s/%s frames%s",
+            result.checkpointed_frames,
+            result.wal_frames,
+            " (busy)" if result.busy else "",
+        )
+
+    @staticmethod
+    async def _prune_track_info(cache: SQLiteTrackInfoCacheRepository) -> int:
+        expired = await cache.cleanup_expired(METADATA_CACHE_TTL)
+        return expired + await cache.prune(METADATA_CACHE_MAX_SIZE)
+
     @property
     def is_running(self) -> bool:
         return self._running
@@ -128,10 +167,15 @@ class CleanupStats(BaseModel):
     history_cleaned: NonNegativeInt = 0
     cache_cleaned: NonNegativeInt = 0
     votes_cleaned: NonNegativeInt = 0
+    track_info_cleaned: NonNegativeInt = 0
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def total_cleaned(self) -> int:
         return (
-            self.sessions_cleaned + self.history_cleaned + self.cache_cleaned + self.votes_cleaned
+            self.sessions_cleaned
+            + self.history_cleaned
+            + self.cache_cleaned
+            + self.votes_cleaned
+            + self.track_info_cleaned
         )
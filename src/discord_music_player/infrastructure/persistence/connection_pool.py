@@ -0,0 +1,308 @@
+"""Long-lived aiosqlite connections: one serialized writer plus a bounded reader pool."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+import aiosqlite
+from pydantic import BaseModel, ConfigDict
+
+from ...domain.shared.types import NonNegativeFloat, NonNegativeInt
+from ...utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ConnectionFactory = Callable[[], Awaitable[aiosqlite.Connection]]
+"""Coroutine factory that opens and configures a new connection."""
+
+_HEALTH_CHECK_SQL = "SELECT 1"
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no connection became available within the acquire timeout."""
+
+    def __init__(self, role: str, timeout: float) -> None:
+        super().__init__(f"Timed out after {timeout:.1f}s waiting for a {role} connection")
+        self.role = role
+        self.timeout = timeout
+
+
+class PoolStats(BaseModel):
+    """Snapshot of connection pool counters — surfaced via ``Database.get_stats()``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_readers: NonNegativeInt = 0
+    readers_open: NonNegativeInt = 0
+    readers_idle: NonNegativeInt = 0
+    readers_in_use: NonNegativeInt = 0
+    writer_open: bool = False
+    writer_in_use: bool = False
+    read_acquisitions: NonNegativeInt = 0
+    write_acquisitions: NonNegativeInt = 0
+    waits: NonNegativeInt = 0
+    timeouts: NonNegativeInt = 0
+    connections_created: NonNegativeInt = 0
+    connections_replaced: NonNegativeInt = 0
+    avg_wait_ms: NonNegativeFloat = 0.0
+    max_wait_ms: NonNegativeFloat = 0.0
+
+
+class ConnectionPool:
+    """Hands out long-lived connections instead of opening one per operation.
+
+    All writes share a single connection guarded by a lock, so SQLite never
+    sees two writers contend for the WAL. Reads borrow one of up to
+    ``max_readers`` connections, created lazily on demand; a semaphore holds
+    one slot per borrowed reader, so when a dead reader is dropped its slot
+    goes to the next waiter, which opens a replacement. With
+    ``max_readers=0`` every operation goes through the writer connection —
+    required for shared-cache in-memory databases, whose table locks ignore
+    ``busy_timeout``.
+    """
+
+    def __init__(
+        self,
+        factory: ConnectionFactory,
+        *,
+        max_readers: int,
+        acquire_timeout: float,
+    ) -> None:
+        self._factory = factory
+        self._max_readers = max_readers
+        self._acquire_timeout = acquire_timeout
+
+        self._writer: aiosqlite.Connection | None = None
+        self._writer_lock = asyncio.Lock()
+        self._reader_slots = asyncio.Semaphore(max_readers)
+        self._idle: asyncio.LifoQueue[aiosqlite.Connection] = asyncio.LifoQueue()
+        self._readers: set[aiosqlite.Connection] = set()
+        self._closed = False
+
+        self._read_acquisitions = 0
+        self._write_acquisitions = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._created = 0
+        self._replaced = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+
+    @property
+    def max_readers(self) -> int:
+        return self._max_readers
+
+    # ── Acquire / release ─────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Borrow the writer connection exclusively for the duration of the block."""
+        started = time.perf_counter()
+        if self._writer_lock.locked():
+            self._waits += 1
+        try:
+            async with asyncio.timeout(self._acquire_timeout):
+                await self._writer_lock.acquire()
+        except TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeoutError("writer", self._acquire_timeout) from None
+
+        try:
+            self._record_wait(started)
+            self._write_acquisitions += 1
+            conn = await self._get_writer()
+            failed = False
+            try:
+                yield conn
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                await self._release(conn, failed=failed, is_writer=True)
+        finally:
+            self._writer_lock.release()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Borrow a reader connection, falling back to the writer when readers are disabled."""
+        if self._max_readers == 0:
+            async with self.writer() as conn:
+                yield conn
+            return
+
+        conn = await self._acquire_reader()
+        failed = False
+        try:
+            yield conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            try:
+                await self._release(conn, failed=failed, is_writer=False)
+            finally:
+                self._reader_slots.release()
+
+    async def _acquire_reader(self) -> aiosqlite.Connection:
+        """Take a reader slot, then an idle connection or a freshly opened one."""
+        self._ensure_open()
+        started = time.perf_counter()
+
+        if self._reader_slots.locked():
+            self._waits += 1
+        try:
+            async with asyncio.timeout(self._acquire_timeout):
+                await self._reader_slots.acquire()
+        except TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeoutError("reader", self._acquire_timeout) from None
+
+        try:
+            if self._idle.empty():
+                conn = await self._open()
+                self._readers.add(conn)
+            else:
+                conn = self._idle.get_nowait()
+        except BaseException:
+            self._reader_slots.release()
+            raise
+
+        self._record_wait(started)
+        self._read_acquisitions += 1
+        return conn
+
+    async def _release(self, conn: aiosqlite.Connection, *, failed: bool, is_writer: bool) -> None:
+        """Return a connection to the pool, replacing it if it is no longer usable."""
+        healthy = True
+        if failed or conn.in_transaction:
+            # Never hand out a connection with a dangling implicit transaction:
+            # on a reader it would pin an old WAL snapshot indefinitely.
+            try:
+                await conn.rollback()
+            except Exception:
+                healthy = False
+            if failed and healthy:
+                healthy = await self._ping(conn)
+
+        if is_writer:
+            if not healthy:
+                await self._discard(conn)
+                self._writer = None
+            return
+
+        if not healthy or self._closed:
+            self._readers.discard(conn)
+            await self._discard(conn)
+            return
+
+        self._idle.put_nowait(conn)
+
+    # ── Health checks ─────────────────────────────────────────────────
+
+    async def health_check(self) -> int:
+        """Ping every idle connection, replacing dead ones. Returns the number replaced."""
+        replaced = 0
+
+        async with self._writer_lock:
+            if self._writer is not None and not await self._ping(self._writer):
+                await self._discard(self._writer)
+                self._writer = None
+                replaced += 1
+
+        idle: list[aiosqlite.Connection] = []
+        while not self._idle.empty():
+            idle.append(self._idle.get_nowait())
+        for conn in idle:
+            if await self._ping(conn):
+                self._idle.put_nowait(conn)
+            else:
+                self._readers.discard(conn)
+                await self._discard(conn)
+                replaced += 1
+
+        if replaced:
+            logger.warning("Connection pool health check dropped %d dead connection(s)", replaced)
+        return replaced
+
+    @staticmethod
+    async def _ping(conn: aiosqlite.Connection) -> bool:
+        try:
+            async with conn.execute(_HEALTH_CHECK_SQL) as cursor:
+                await cursor.fetchone()
+            return True
+        except (sqlite3.Error, ValueError):
+            return False
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def _get_writer(self) -> aiosqlite.Connection:
+        self._ensure_open()
+        if self._writer is None:
+            self._writer = await self._open()
+        return self._writer
+
+    async def _open(self) -> aiosqlite.Connection:
+        conn = await self._factory()
+        self._created += 1
+        return conn
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        self._replaced += 1
+        try:
+            await conn.close()
+        except Exception:
+            logger.debug("Error closing discarded connection", exc_info=True)
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+    async def close(self) -> None:
+        """Close every pooled connection. Borrowed readers are closed when returned."""
+        self._closed = True
+
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            self._readers.discard(conn)
+            try:
+                await conn.close()
+            except Exception:
+                logger.debug("Error closing reader connection", exc_info=True)
+
+        async with self._writer_lock:
+            if self._writer is not None:
+                try:
+                    await self._writer.close()
+                finally:
+                    self._writer = None
+
+    # ── Metrics ───────────────────────────────────────────────────────
+
+    def _record_wait(self, started: float) -> None:
+        waited = time.perf_counter() - started
+        self._total_wait_s += waited
+        self._max_wait_s = max(self._max_wait_s, waited)
+
+    def stats(self) -> PoolStats:
+        acquisitions = self._read_acquisitions + self._write_acquisitions
+        idle = self._idle.qsize()
+        return PoolStats(
+            max_readers=self._max_readers,
+            readers_open=len(self._readers),
+            readers_idle=idle,
+            readers_in_use=len(self._readers) - idle,
+            writer_open=self._writer is not None,
+            writer_in_use=self._writer_lock.locked(),
+            read_acquisitions=self._read_acquisitions,
+            write_acquisitions=self._write_acquisitions,
+            waits=self._waits,
+            timeouts=self._timeouts,
+            connections_created=self._created,
+            connections_replaced=self._replaced,
+            avg_wait_ms=round(self._total_wait_s / acquisitions * 1000, 3) if acquisitions else 0.0,
+            max_wait_ms=round(self._max_wait_s * 1000, 3),
+        )
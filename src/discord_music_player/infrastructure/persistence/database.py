@@ -1,10 +1,10 @@
-"""SQLite database with per-operation connections and WAL mode."""
+"""SQLite database with pooled long-lived connections and WAL mode."""
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, Iterable
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
-from enum import StrEnum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Final, Literal
 
@@ -12,14 +12,20 @@ import aiosqlite
 from pydantic import BaseModel, ConfigDict, Field
 
 from ...domain.shared.constants import SQLPragmas
+from ...domain.shared.datetime_utils import utcnow
+from ...domain.shared.enums import SQLiteSynchronous
 from ...domain.shared.types import (
     BYTES_PER_MB,
     FileBytes,
     FileSizeMB,
     NonEmptyStr,
     NonNegativeInt,
+    UtcDatetimeField,
 )
 from ...utils.logging import get_logger
+from .connection_pool import ConnectionPool, PoolStats
+from .migrations import SCHEMA_VERSION_TABLE, MigrationRunner
+from .queries import Query
 
 if TYPE_CHECKING:
     from ...config.settings import DatabaseSettings
@@ -34,19 +40,24 @@ SqlParams = tuple[Any, ...] | dict[str, Any]
 # ── Constants ──────────────────────────────────────────────────────────
 
 _MEMORY_PATH: Final[str] = ":memory:"
+_WAL_SUFFIX: Final[str] = "-wal"
+_DEFAULT_FETCH_BATCH: Final[int] = 500
 
 _TABLE_QUEUE_TRACKS: Final[str] = "queue_tracks"
 _TABLE_TRACK_HISTORY: Final[str] = "track_history"
 
 
-class _SQLiteType(StrEnum):
-    """SQLite column type identifiers used in migration ALTER TABLE statements."""
+# ── Schema validation models ──────────────────────────────────────────
 
-    TEXT = "TEXT"
-    INTEGER = "INTEGER"
 
+class CheckpointResult(BaseModel):
+    """Outcome of a ``wal_checkpoint(TRUNCATE)`` run by :meth:`Database.checkpoint`."""
 
-# ── Schema validation models ──────────────────────────────────────────
+    model_config = ConfigDict(frozen=True)
+    busy: bool
+    wal_frames: int
+    checkpointed_frames: int
+    completed_at: UtcDatetimeField
 
 
 class DatabaseStats(BaseModel):
@@ -58,8 +69,12 @@ class DatabaseStats(BaseModel):
     tables: dict[str, NonNegativeInt] = Field(default_factory=dict)
     file_size_bytes: FileBytes | None = None
     file_size_mb: FileSizeMB | None = None
+    wal_size_bytes: FileBytes | None = None
+    checkpoints: NonNegativeInt = 0
+    last_checkpoint: CheckpointResult | None = None
     page_count: NonNegativeInt | None = None
     page_size: NonNegativeInt | None = None
+    pool: PoolStats | None = None
     error: str | None = None
 
 
@@ -125,6 +140,8 @@ EXPECTED_SCHEMA = ExpectedSchema(
             "created_at",
             "last_activity",
             "playback_started_at",
+            "queue_version",
+            "last_activity_ms",
         ],
         _TABLE_QUEUE_TRACKS: [
             "id",
@@ -161,6 +178,7 @@ EXPECTED_SCHEMA = ExpectedSchema(
             "played_at",
             "finished_at",
             "skipped",
+            "played_at_ms",
         ],
         "vote_sessions": [
             "id",
@@ -171,6 +189,7 @@ EXPECTED_SCHEMA = ExpectedSchema(
             "started_at",
             "completed_at",
             "result",
+            "started_at_ms",
         ],
         "votes": ["vote_session_id", "user_id"],
         "recommendation_cache": [
@@ -182,8 +201,51 @@ EXPECTED_SCHEMA = ExpectedSchema(
             "recommendations_json",
             "generated_at",
             "expires_at",
+            "generated_at_ms",
+            "expires_at_ms",
         ],
         "track_genres": ["track_id", "genre", "classified_at"],
+        "ytdlp_track_cache": [
+            "video_id",
+            "metadata_json",
+            "cached_at",
+            "stream_url",
+            "stream_expires_at",
+        ],
+        "history_track_totals": [
+            "guild_id",
+            "track_id",
+            "title",
+            "webpage_url",
+            "duration_seconds",
+            "artist",
+            "uploader",
+            "like_count",
+            "view_count",
+            "play_count",
+            "skip_count",
+            "last_played_at",
+        ],
+        "history_track_daily": ["guild_id", "day", "track_id", "play_count", "skip_count"],
+        "history_user_totals": [
+            "guild_id",
+            "user_id",
+            "user_name",
+            "play_count",
+            "skip_count",
+            "listen_seconds",
+            "last_played_at",
+        ],
+        "history_user_daily": ["guild_id", "day", "user_id", "play_count"],
+        "history_hourly": [
+            "guild_id",
+            "day",
+            "hour",
+            "play_count",
+            "skip_count",
+            "listen_seconds",
+        ],
+        SCHEMA_VERSION_TABLE: ["version", "name", "applied_at"],
         "saved_queues": [
             "id",
             "guild_id",
@@ -198,13 +260,20 @@ EXPECTED_SCHEMA = ExpectedSchema(
     indexes=[
         "idx_queue_tracks_guild_pos",
         "idx_queue_tracks_guild_current",
-        "idx_track_history_guild_played",
+        "idx_guild_sessions_last_activity_ms",
+        "idx_track_history_guild_played_ms",
+        "idx_track_history_played_ms",
         "idx_track_history_guild_track",
+        "idx_history_track_totals_plays",
+        "idx_history_track_totals_skips",
+        "idx_history_user_totals_plays",
         "idx_vote_sessions_guild",
         "idx_vote_sessions_guild_type",
         "idx_vote_sessions_completed",
-        "idx_reco_cache_expires",
+        "idx_vote_sessions_started_ms",
+        "idx_reco_cache_expires_ms",
         "idx_track_genres_genre",
+        "idx_ytdlp_track_cache_cached",
         "idx_saved_queues_guild",
     ],
 )
@@ -221,9 +290,19 @@ class Database:
             self._db_path = url
 
         self._initialized = False
-        self._keepalive_conn: aiosqlite.Connection | None = None
         self._busy_timeout = settings.busy_timeout_ms if settings else 5000
         self._connection_timeout = settings.connection_timeout_s if settings else 10
+        self._pool_size = settings.pool_size if settings else 5
+        self._acquire_timeout = settings.acquire_timeout_s if settings else 10
+        self._mmap_size_mb = settings.mmap_size_mb if settings else 128
+        self._cache_size_mb = settings.cache_size_mb if settings else 16
+        self._synchronous = settings.synchronous if settings else SQLiteSynchronous.NORMAL
+        self._temp_store_memory = settings.temp_store_memory if settings else True
+        self._statement_cache_size = settings.statement_cache_size if settings else 256
+        self._pool = self._create_pool()
+        self._checkpoints = 0
+        self._last_checkpoint: CheckpointResult | None = None
+        self._migration_task: asyncio.Task[None] | None = None
 
     @property
     def db_path(self) -> str:
@@ -233,6 +312,15 @@ class Database:
     def _is_memory(self) -> bool:
         return self._db_path == _MEMORY_PATH
 
+    def _create_pool(self) -> ConnectionPool:
+        # Shared-cache in-memory databases use table-level locks that ignore
+        # busy_timeout, so route everything through the single writer there.
+        return ConnectionPool(
+            self._connect,
+            max_readers=0 if self._is_memory else self._pool_size,
+            acquire_timeout=self._acquire_timeout,
+        )
+
     async def initialize(self) -> None:
         if self._initialized:
             return
@@ -241,228 +329,24 @@ class Database:
             db_dir = Path(self._db_path).parent
             db_dir.mkdir(parents=True, exist_ok=True)
 
-        # Keep one connection alive for in-memory DBs; otherwise the shared
-        # in-memory DB is destroyed once the last connection closes.
-        if self._is_memory and self._keepalive_conn is None:
-            self._keepalive_conn = await self._connect()
-
-        conn = self._keepalive_conn
-        if conn is None:
-            async with self.transaction() as conn2:
-                await self._ensure_schema(conn2)
-        else:
-            await self._ensure_schema(conn)
-            await conn.commit()
+        # The pooled writer connection stays open for the lifetime of the
+        # Database, which also keeps a shared in-memory DB from being destroyed.
+        runner = MigrationRunner(self)
+        if await runner.run():
+            self._migration_task = asyncio.create_task(
+                runner.run_online(), name="db-online-migrations"
+            )
+            self._migration_task.add_done_callback(self._log_migration_failure)
 
         self._initialized = True
         logger.info("Database initialized at %s", self._db_path)
 
-    async def _ensure_schema(self, conn: aiosqlite.Connection) -> None:
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS guild_sessions (
-                guild_id INTEGER PRIMARY KEY,
-                state TEXT NOT NULL,
-                loop_mode TEXT NOT NULL DEFAULT 'off',
-                created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
-                last_activity TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now'))
-            )
-            """
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS queue_tracks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                track_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                webpage_url TEXT NOT NULL,
-                stream_url TEXT,
-                duration_seconds INTEGER,
-                thumbnail_url TEXT,
-                artist TEXT,
-                uploader TEXT,
-                like_count INTEGER,
-                view_count INTEGER,
-                requested_by_id INTEGER,
-                requested_by_name TEXT,
-                requested_at TEXT,
-                position INTEGER NOT NULL,
-                is_current INTEGER NOT NULL DEFAULT 0,
-                FOREIGN KEY(guild_id) REFERENCES guild_sessions(guild_id) ON DELETE CASCADE
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_queue_tracks_guild_pos ON queue_tracks(guild_id, position)"
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_queue_tracks_guild_current ON queue_tracks(guild_id, is_current)"
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS track_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                track_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                webpage_url TEXT NOT NULL,
-                duration_seconds INTEGER,
-                artist TEXT,
-                uploader TEXT,
-                like_count INTEGER,
-                view_count INTEGER,
-                requested_by_id INTEGER,
-                requested_by_name TEXT,
-                played_at TEXT NOT NULL,
-                finished_at TEXT,
-                skipped INTEGER NOT NULL DEFAULT 0
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_track_history_guild_played ON track_history(guild_id, played_at)"
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_track_history_guild_track ON track_history(guild_id, track_id)"
-        )
-
-        # Migration: add columns that may not exist in older schemas
-        _migration_columns = [
-            ("guild_sessions", "playback_started_at", _SQLiteType.TEXT),
-            (_TABLE_QUEUE_TRACKS, "artist", _SQLiteType.TEXT),
-            (_TABLE_QUEUE_TRACKS, "uploader", _SQLiteType.TEXT),
-            (_TABLE_QUEUE_TRACKS, "like_count", _SQLiteType.INTEGER),
-            (_TABLE_QUEUE_TRACKS, "view_count", _SQLiteType.INTEGER),
-            (_TABLE_TRACK_HISTORY, "artist", _SQLiteType.TEXT),
-            (_TABLE_TRACK_HISTORY, "uploader", _SQLiteType.TEXT),
-            (_TABLE_TRACK_HISTORY, "like_count", _SQLiteType.INTEGER),
-            (_TABLE_TRACK_HISTORY, "view_count", _SQLiteType.INTEGER),
-        ]
-        for table, column, col_type in _migration_columns:
-            await self._ensure_column(conn, table, column, col_type)
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS vote_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                track_id TEXT NOT NULL,
-                vote_type TEXT NOT NULL,
-                threshold INTEGER NOT NULL,
-                started_at TEXT NOT NULL,
-                completed_at TEXT,
-                result TEXT
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_vote_sessions_guild ON vote_sessions(guild_id)"
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_vote_sessions_guild_type ON vote_sessions(guild_id, vote_type)"
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_vote_sessions_completed ON vote_sessions(completed_at)"
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS votes (
-                vote_session_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                PRIMARY KEY (vote_session_id, user_id),
-                FOREIGN KEY(vote_session_id) REFERENCES vote_sessions(id) ON DELETE CASCADE
-            )
-            """
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS recommendation_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cache_key TEXT NOT NULL UNIQUE,
-                base_track_id TEXT,
-                base_track_title TEXT NOT NULL,
-                base_track_artist TEXT,
-                recommendations_json TEXT NOT NULL,
-                generated_at TEXT NOT NULL,
-                expires_at TEXT
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_reco_cache_expires ON recommendation_cache(expires_at)"
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS track_genres (
-                track_id TEXT PRIMARY KEY,
-                genre TEXT NOT NULL,
-                classified_at TEXT NOT NULL
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_track_genres_genre ON track_genres(genre)"
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS user_favorites (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                track_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                webpage_url TEXT NOT NULL,
-                duration_seconds INTEGER,
-                artist TEXT,
-                uploader TEXT,
-                added_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
-                UNIQUE(user_id, track_id)
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_favorites_user ON user_favorites(user_id)"
-        )
-
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS saved_queues (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                tracks_json TEXT NOT NULL,
-                track_count INTEGER NOT NULL DEFAULT 0,
-                created_by_id INTEGER NOT NULL,
-                created_by_name TEXT NOT NULL,
-                created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
-                UNIQUE(guild_id, name)
-            )
-            """
-        )
-        await conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_saved_queues_guild ON saved_queues(guild_id)"
-        )
-
-    async def _ensure_column(
-        self,
-        conn: aiosqlite.Connection,
-        table: str,
-        column: str,
-        column_type_sql: str,
-    ) -> None:
-        rows = await conn.execute_fetchall(SQLPragmas.TABLE_INFO.format(table=table))
-        existing_columns = {r[1] for r in rows}
-        if column in existing_columns:
-            return
-
-        await conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type_sql}")
-        logger.info("Migrated table %s: added column %s", table, column)
+    @staticmethod
+    def _log_migration_failure(task: asyncio.Task[None]) -> None:
+        # Surface a failed backfill now rather than at close(); it resumes on
+        # the next startup.
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Online schema migration failed", exc_info=task.exception())
 
     async def _connect(self) -> aiosqlite.Connection:
         # SQLite ":memory:" is per-connection, so use a shared URI to allow
@@ -481,6 +365,8 @@ class Database:
             detect_types=0,
             uri=uri,
             timeout=self._connection_timeout,
+            # Typed queries reuse identical SQL text, so prepared statements stay hot.
+            cached_statements=self._statement_cache_size,
         )
         conn.row_factory = aiosqlite.Row
 
@@ -488,30 +374,29 @@ class Database:
         await conn.execute(SQLPragmas.JOURNAL_MODE_WAL)
         await conn.execute(SQLPragmas.FOREIGN_KEYS_ON)
         await conn.execute(SQLPragmas.BUSY_TIMEOUT.format(timeout=self._busy_timeout))
+        await conn.execute(SQLPragmas.SYNCHRONOUS.format(level=self._synchronous))
+        await conn.execute(SQLPragmas.MMAP_SIZE.format(size=self._mmap_size_mb * BYTES_PER_MB))
+        # A negative cache_size is in KiB rather than pages.
+        await conn.execute(SQLPragmas.CACHE_SIZE.format(size=-self._cache_size_mb * 1024))
+        if self._temp_store_memory:
+            await conn.execute(SQLPragmas.TEMP_STORE_MEMORY)
 
         return conn
 
     @asynccontextmanager
     async def connection(self) -> AsyncGenerator[aiosqlite.Connection, None]:
-        conn = await self._connect()
-        try:
+        """Borrow a pooled read connection. Writes belong in :meth:`transaction`."""
+        async with self._pool.reader() as conn:
             yield conn
-        except Exception:
-            try:
-                await conn.rollback()
-            except Exception:
-                pass
-            raise
-        finally:
-            await conn.close()
 
     @asynccontextmanager
     async def transaction(self) -> AsyncGenerator[aiosqlite.Connection, None]:
-        async with self.connection() as conn:
+        """Borrow the serialized writer connection and commit on success."""
+        async with self._pool.writer() as conn:
             try:
                 yield conn
                 await conn.commit()
-            except Exception:
+            except BaseException:
                 await conn.rollback()
                 raise
 
@@ -527,27 +412,104 @@ class Database:
         self, sql: str, parameters: SqlParams | None = None
     ) -> dict[str, Any] | None:
         async with self.connection() as conn:
-            if parameters is not None:
-                cursor = await conn.execute(sql, parameters)
-            else:
-                cursor = await conn.execute(sql)
-            row = await cursor.fetchone()
+            async with conn.execute(sql, parameters or ()) as cursor:
+                row = await cursor.fetchone()
             return dict(row) if row else None
 
     async def fetch_all(
         self, sql: str, parameters: SqlParams | None = None
     ) -> list[dict[str, Any]]:
         async with self.connection() as conn:
-            if parameters is not None:
-                cursor = await conn.execute(sql, parameters)
-            else:
-                cursor = await conn.execute(sql)
-            rows = await cursor.fetchall()
+            async with conn.execute(sql, parameters or ()) as cursor:
+                rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
+    # ── Typed queries ────────────────────────────────────────────────
+
+    async def fetch_row[RowT: tuple[Any, ...]](
+        self, query: Query[RowT], parameters: SqlParams = ()
+    ) -> RowT | None:
+        async with self.connection() as conn:
+            async with conn.execute(query.sql, parameters) as cursor:
+                cursor.row_factory = query.row_factory
+                return await cursor.fetchone()
+
+    async def fetch_rows[RowT: tuple[Any, ...]](
+        self, query: Query[RowT], parameters: SqlParams = ()
+    ) -> list[RowT]:
+        async with self.connection() as conn:
+            async with conn.execute(query.sql, parameters) as cursor:
+                cursor.row_factory = query.row_factory
+                return list(await cursor.fetchall())
+
+    async def fetch_many[RowT: tuple[Any, ...]](
+        self,
+        query: Query[RowT],
+        parameters: SqlParams = (),
+        *,
+        batch_size: int = _DEFAULT_FETCH_BATCH,
+    ) -> AsyncIterator[list[RowT]]:
+        """Stream results in batches of up to *batch_size* rows.
+
+        A pooled read connection is held until the iteration finishes, so
+        don't write from inside the loop (in-memory databases read through
+        the writer) and wrap early exits in ``contextlib.aclosing``.
+        """
+        async with self.connection() as conn:
+            async with conn.execute(query.sql, parameters) as cursor:
+                cursor.row_factory = query.row_factory
+                while batch := await cursor.fetchmany(batch_size):
+                    yield list(batch)
+
+    async def iterate[RowT: tuple[Any, ...]](
+        self,
+        query: Query[RowT],
+        parameters: SqlParams = (),
+        *,
+        batch_size: int = _DEFAULT_FETCH_BATCH,
+    ) -> AsyncIterator[RowT]:
+        """Stream results one row at a time; see :meth:`fetch_many` for the caveats."""
+        async for batch in self.fetch_many(query, parameters, batch_size=batch_size):
+            for row in batch:
+                yield row
+
+    async def health_check(self) -> int:
+        """Ping idle pooled connections, dropping dead ones. Returns the number dropped."""
+        return await self._pool.health_check()
+
+    def pool_stats(self) -> PoolStats:
+        """Connection pool counters, without the file and table queries of :meth:`get_stats`."""
+        return self._pool.stats()
+
+    async def checkpoint(self) -> CheckpointResult:
+        """Refresh planner statistics, then truncate the WAL back to zero bytes.
+
+        Runs on the writer so no write is in flight; readers holding an older
+        snapshot make the checkpoint report ``busy`` and it is retried next time.
+        """
+        async with self._pool.writer() as conn:
+            # optimize may write sqlite_stat1, so it goes first to be checkpointed too.
+            await conn.execute(SQLPragmas.OPTIMIZE)
+            async with conn.execute(SQLPragmas.WAL_CHECKPOINT_TRUNCATE) as cursor:
+                row = await cursor.fetchone()
+
+        busy, wal_frames, checkpointed = row if row else (0, -1, -1)
+        result = CheckpointResult(
+            busy=bool(busy),
+            wal_frames=wal_frames,
+            checkpointed_frames=checkpointed,
+            completed_at=utcnow(),
+        )
+        self._checkpoints += 1
+        self._last_checkpoint = result
+        if result.busy:
+            logger.debug("WAL checkpoint was blocked by active readers")
+        return result
+
     async def get_stats(self) -> DatabaseStats:
         file_size_bytes: int | None = None
         file_size_mb: float | None = None
+        wal_size_bytes: int | None = None
         tables: dict[str, int] = {}
         page_count: int | None = None
         page_size: int | None = None
@@ -559,6 +521,9 @@ class Database:
             file_size_bytes = st.st_size
             file_size_mb = round(st.st_size / BYTES_PER_MB, 2)
 
+            wal_file = db_file.with_name(db_file.name + _WAL_SUFFIX)
+            wal_size_bytes = wal_file.stat().st_size if wal_file.exists() else 0
+
         if self._initialized:
             try:
                 async with self.connection() as conn:
@@ -593,8 +558,12 @@ class Database:
             tables=tables,
             file_size_bytes=file_size_bytes,
             file_size_mb=file_size_mb,
+            wal_size_bytes=wal_size_bytes,
+            checkpoints=self._checkpoints,
+            last_checkpoint=self._last_checkpoint,
             page_count=page_count,
             page_size=page_size,
+            pool=self._pool.stats(),
             error=error,
         )
 
@@ -695,10 +664,20 @@ class Database:
             result.issues.append(f"foreign_keys is {result.pragmas.foreign_keys}, expected 1")
 
     async def close(self) -> None:
-        if self._keepalive_conn is not None:
+        if self._migration_task is not None:
+            # Online backfills are resumable; the next startup picks up where this left off.
+            self._migration_task.cancel()
             try:
-                await self._keepalive_conn.close()
-            finally:
-                self._keepalive_conn = None
+                await self._migration_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass  # Already logged by _log_migration_failure.
+            self._migration_task = None
+        try:
+            await self._pool.close()
+        finally:
+            # A fresh pool lets the Database be re-initialized after close().
+            self._pool = self._create_pool()
         self._initialized = False
         logger.info("Database manager closed")
@@ -0,0 +1,408 @@
+"""Columnar, in-memory copy of a guild's ``track_history`` for vectorized analytics.
+
+A guild's history is loaded once into parallel numpy arrays — one entry per
+play — and every analytics question becomes a ``bincount``/``argpartition``
+over them instead of a separate SQL ``GROUP BY``. Track and requester ids are
+dictionary-encoded to dense ``int32`` codes so counts index straight into the
+dictionaries.
+
+:class:`HistoryColumnStore` caches the columns for the most recently used
+guilds and keeps them current: new plays are appended and finishes flip the
+skip bit in place, so a cached guild is never reloaded just because a track
+started.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+import numpy as np
+
+from ...domain.music.entities import Track
+from ...domain.shared.datetime_utils import UtcDateTime
+from ...domain.shared.enums import LeaderboardTimeRange
+from ...utils.logging import get_logger
+from .migrations import iso_to_epoch_ms_sql
+from .models import HistoryFinish, HistoryRow, TrackRow
+from .queries import Query
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .database import Database
+
+logger = get_logger(__name__)
+
+_SECONDS_PER_HOUR: Final[int] = 3600
+_SECONDS_PER_DAY: Final[int] = 86_400
+# 1970-01-01 was a Thursday; shift so Sunday is 0, matching SQLite's strftime('%w').
+_EPOCH_WEEKDAY_OFFSET: Final[int] = 4
+_NO_REQUESTER: Final[int] = -1
+_INITIAL_CAPACITY: Final[int] = 64
+
+_RANGE_DAYS: Final[dict[LeaderboardTimeRange, int]] = {
+    LeaderboardTimeRange.LAST_7_DAYS: 7,
+    LeaderboardTimeRange.LAST_30_DAYS: 30,
+}
+
+
+class _HistoryLoadRow(NamedTuple):
+    id: int
+    played_epoch: int
+    track_id: str
+    title: str
+    webpage_url: str
+    duration_seconds: int | None
+    artist: str | None
+    uploader: str | None
+    like_count: int | None
+    view_count: int | None
+    requested_by_id: int | None
+    requested_by_name: str | None
+    skipped: int
+
+
+# Rows an online backfill hasn't reached yet still have a NULL played_at_ms.
+_LOAD_QUERY: Final = Query(
+    f"""
+    SELECT id, COALESCE(played_at_ms, {iso_to_epoch_ms_sql("played_at")}) / 1000 AS played_epoch,
+           track_id, title, webpage_url, duration_seconds, artist, uploader,
+           like_count, view_count, requested_by_id, requested_by_name, skipped
+    FROM track_history
+    WHERE guild_id = ?
+    ORDER BY id
+    """,
+    _HistoryLoadRow,
+)
+
+_TRACK_META_FIELDS: Final[tuple[str, ...]] = (
+    "track_id",
+    "title",
+    "webpage_url",
+    "duration_seconds",
+    "artist",
+    "uploader",
+    "like_count",
+    "view_count",
+)
+
+
+def _day_start_epoch(days_back: int) -> int:
+    """Epoch seconds of UTC midnight *days_back* days before today."""
+    today = UtcDateTime.now().unix_seconds // _SECONDS_PER_DAY
+    return (today - days_back) * _SECONDS_PER_DAY
+
+
+def _top_k(counts: NDArray[np.int64], limit: int) -> NDArray[np.intp]:
+    """Indices of the *limit* largest non-zero counts, largest first."""
+    candidates = np.flatnonzero(counts)
+    if candidates.size > limit:
+        partition = np.argpartition(-counts[candidates], limit - 1)[:limit]
+        candidates = candidates[partition]
+    return candidates[np.argsort(-counts[candidates], kind="stable")]
+
+
+class GuildHistoryColumns:
+    """One guild's plays as parallel arrays, in ``track_history.id`` order."""
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._ids = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._played_at = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._tracks = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._requesters = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._durations = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._skipped = np.empty(_INITIAL_CAPACITY, dtype=np.bool_)
+
+        self._track_codes: dict[str, int] = {}
+        self._track_meta: list[dict[str, Any]] = []
+        self._requester_codes: dict[int, int] = {}
+        self._requester_ids: list[int] = []
+        self._requester_names: list[str | None] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_id(self) -> int:
+        return int(self._ids[self._size - 1]) if self._size else 0
+
+    # ── Building ──────────────────────────────────────────────────────
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = self._ids.size
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_ids", "_played_at", "_tracks", "_requesters", "_durations", "_skipped"):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[: self._size] = old[: self._size]
+            setattr(self, name, grown)
+
+    def append(
+        self, history_id: int, played_epoch: int, row: Any, *, skipped: bool = False
+    ) -> None:
+        """Add one play; *row* is any object with ``track_history`` column attributes."""
+        self._reserve(1)
+        i = self._size
+
+        track_code = self._track_codes.get(row.track_id)
+        if track_code is None:
+            track_code = len(self._track_meta)
+            self._track_codes[row.track_id] = track_code
+            self._track_meta.append({})
+        # Rows arrive in id order, so the last one seen carries the newest metadata.
+        self._track_meta[track_code] = {field: getattr(row, field) for field in _TRACK_META_FIELDS}
+
+        requester_code = _NO_REQUESTER
+        user_id = row.requested_by_id
+        if user_id is not None:
+            requester_code = self._requester_codes.get(user_id, _NO_REQUESTER)
+            if requester_code == _NO_REQUESTER:
+                requester_code = len(self._requester_ids)
+                self._requester_codes[user_id] = requester_code
+                self._requester_ids.append(user_id)
+                self._requester_names.append(None)
+            if row.requested_by_name is not None:
+                self._requester_names[requester_code] = row.requested_by_name
+
+        self._ids[i] = history_id
+        self._played_at[i] = played_epoch
+        self._tracks[i] = track_code
+        self._requesters[i] = requester_code
+        self._durations[i] = row.duration_seconds or 0
+        self._skipped[i] = skipped
+        self._size += 1
+
+    def set_skipped(self, history_id: int, skipped: bool) -> None:
+        ids = self._ids[: self._size]
+        i = int(np.searchsorted(ids, history_id))
+        if i < self._size and ids[i] == history_id:
+            self._skipped[i] = skipped
+
+    # ── Column views ──────────────────────────────────────────────────
+
+    @property
+    def played_at(self) -> NDArray[np.int64]:
+        return self._played_at[: self._size]
+
+    @property
+    def tracks(self) -> NDArray[np.int32]:
+        return self._tracks[: self._size]
+
+    @property
+    def requesters(self) -> NDArray[np.int32]:
+        return self._requesters[: self._size]
+
+    @property
+    def durations(self) -> NDArray[np.int32]:
+        return self._durations[: self._size]
+
+    @property
+    def skipped(self) -> NDArray[np.bool_]:
+        return self._skipped[: self._size]
+
+    # ── Helpers ───────────────────────────────────────────────────────
+
+    def _since_mask(self, time_range: LeaderboardTimeRange) -> NDArray[np.bool_] | None:
+        # A rolling window, like the SQL leaderboards: the last N × 24 hours.
+        days = _RANGE_DAYS.get(time_range)
+        if days is None:
+            return None
+        return self.played_at >= UtcDateTime.now().unix_seconds - days * _SECONDS_PER_DAY
+
+    def _track_counts(self, mask: NDArray[np.bool_] | None = None) -> NDArray[np.int64]:
+        tracks = self.tracks if mask is None else self.tracks[mask]
+        return np.bincount(tracks, minlength=len(self._track_meta))
+
+    def _requester_counts(self, mask: NDArray[np.bool_] | None = None) -> NDArray[np.int64]:
+        valid = self.requesters != _NO_REQUESTER
+        if mask is not None:
+            valid &= mask
+        return np.bincount(self.requesters[valid], minlength=len(self._requester_ids))
+
+    def _track(self, code: int) -> Track:
+        return TrackRow.model_validate(self._track_meta[code]).to_track()
+
+    def _ranked_tracks(self, counts: NDArray[np.int64], limit: int) -> list[tuple[Track, int]]:
+        return [(self._track(int(c)), int(counts[c])) for c in _top_k(counts, limit)]
+
+    def _ranked_titles(self, counts: NDArray[np.int64], limit: int) -> list[tuple[str, int]]:
+        return [(self._track_meta[c]["title"], int(counts[c])) for c in _top_k(counts, limit)]
+
+    def _ranked_requesters(
+        self, counts: NDArray[np.int64], limit: int
+    ) -> list[tuple[int, str, int]]:
+        return [
+            (self._requester_ids[c], self._requester_names[c] or "Unknown", int(counts[c]))
+            for c in _top_k(counts, limit)
+        ]
+
+    # ── Analytics ─────────────────────────────────────────────────────
+
+    def play_count(self, track_id: str) -> int:
+        code = self._track_codes.get(track_id)
+        return 0 if code is None else int(np.count_nonzero(self.tracks == code))
+
+    def total_tracks(self) -> int:
+        return self._size
+
+    def unique_tracks(self) -> int:
+        return int(np.count_nonzero(self._track_counts()))
+
+    def total_listen_time(self) -> int:
+        return int(self.durations.sum(dtype=np.int64))
+
+    def skip_rate(self) -> float:
+        return float(self.skipped.mean()) if self._size else 0.0
+
+    def most_played(
+        self, limit: int, time_range: LeaderboardTimeRange = LeaderboardTimeRange.ALL_TIME
+    ) -> list[tuple[Track, int]]:
+        return self._ranked_tracks(self._track_counts(self._since_mask(time_range)), limit)
+
+    def most_skipped(
+        self, limit: int, time_range: LeaderboardTimeRange = LeaderboardTimeRange.ALL_TIME
+    ) -> list[tuple[str, int]]:
+        mask = self.skipped.copy()
+        since = self._since_mask(time_range)
+        if since is not None:
+            mask &= since
+        return self._ranked_titles(self._track_counts(mask), limit)
+
+    def top_requesters(
+        self, limit: int, time_range: LeaderboardTimeRange = LeaderboardTimeRange.ALL_TIME
+    ) -> list[tuple[int, str, int]]:
+        counts = self._requester_counts(self._since_mask(time_range))
+        return self._ranked_requesters(counts, limit)
+
+    def user_mask(self, user_id: int) -> NDArray[np.bool_] | None:
+        code = self._requester_codes.get(user_id)
+        return None if code is None else self.requesters == code
+
+    def user_totals(self, user_id: int) -> tuple[int, int, int, int]:
+        """(plays, unique tracks, listen seconds, skips) for one requester."""
+        mask = self.user_mask(user_id)
+        if mask is None:
+            return 0, 0, 0, 0
+        return (
+            int(np.count_nonzero(mask)),
+            int(np.count_nonzero(self._track_counts(mask))),
+            int(self.durations[mask].sum(dtype=np.int64)),
+            int(np.count_nonzero(self.skipped[mask])),
+        )
+
+    def user_top_tracks(self, user_id: int, limit: int) -> list[tuple[str, int]]:
+        mask = self.user_mask(user_id)
+        if mask is None:
+            return []
+        return self._ranked_titles(self._track_counts(mask), limit)
+
+    def activity_by_day(self, days: int) -> list[tuple[str, int]]:
+        played = self.played_at
+        day_numbers = played[played >= _day_start_epoch(days)] // _SECONDS_PER_DAY
+        buckets, counts = np.unique(day_numbers, return_counts=True)
+        return [
+            (datetime.fromtimestamp(int(d) * _SECONDS_PER_DAY, UTC).date().isoformat(), int(n))
+            for d, n in zip(buckets, counts, strict=True)
+        ]
+
+    def activity_by_hour(self) -> list[tuple[int, int]]:
+        counts = np.bincount((self.played_at // _SECONDS_PER_HOUR) % 24, minlength=24)
+        return [(int(h), int(counts[h])) for h in np.flatnonzero(counts)]
+
+    def activity_by_weekday(self) -> list[tuple[int, int]]:
+        weekdays = (self.played_at // _SECONDS_PER_DAY + _EPOCH_WEEKDAY_OFFSET) % 7
+        counts = np.bincount(weekdays, minlength=7)
+        return [(int(d), int(counts[d])) for d in np.flatnonzero(counts)]
+
+
+class HistoryColumnStore:
+    """LRU cache of :class:`GuildHistoryColumns`, kept in step with history writes."""
+
+    def __init__(self, database: Database, *, max_guilds: int = 32) -> None:
+        self._db = database
+        self._max_guilds = max_guilds
+        self._guilds: OrderedDict[int, GuildHistoryColumns] = OrderedDict()
+        # Guilds mid-load → whether a write raced the load and made it stale.
+        self._loading: dict[int, bool] = {}
+        # One load per guild at a time; concurrent first readers share it.
+        self._pending: dict[int, asyncio.Task[GuildHistoryColumns]] = {}
+
+    async def get(self, guild_id: int) -> GuildHistoryColumns:
+        columns = self._guilds.get(guild_id)
+        if columns is not None:
+            self._guilds.move_to_end(guild_id)
+            return columns
+
+        pending = self._pending.get(guild_id)
+        if pending is None:
+            pending = asyncio.create_task(
+                self._load_and_cache(guild_id), name=f"history-columns-{guild_id}"
+            )
+            self._pending[guild_id] = pending
+        # Shielded so one caller giving up doesn't cancel the load for the rest.
+        return await asyncio.shield(pending)
+
+    async def _load_and_cache(self, guild_id: int) -> GuildHistoryColumns:
+        self._loading[guild_id] = False
+        try:
+            columns = await self._load(guild_id)
+            stale = self._loading[guild_id]
+        finally:
+            del self._loading[guild_id]
+            del self._pending[guild_id]
+
+        # A write that committed mid-load may or may not be in the snapshot;
+        # serve it to the waiting callers but don't cache it.
+        if not stale:
+            self._guilds[guild_id] = columns
+            while len(self._guilds) > self._max_guilds:
+                self._guilds.popitem(last=False)
+        return columns
+
+    async def _load(self, guild_id: int) -> GuildHistoryColumns:
+        columns = GuildHistoryColumns()
+        async for batch in self._db.fetch_many(_LOAD_QUERY, (guild_id,)):
+            columns._reserve(len(batch))
+            for row in batch:
+                columns.append(row.id, row.played_epoch, row, skipped=bool(row.skipped))
+        logger.debug("Loaded %s history rows into columns for guild %s", len(columns), guild_id)
+        return columns
+
+    def _touch(self, guild_id: int) -> GuildHistoryColumns | None:
+        if guild_id in self._loading:
+            self._loading[guild_id] = True
+        return self._guilds.get(guild_id)
+
+    def record_plays(self, plays: Sequence[tuple[int, HistoryRow]]) -> None:
+        for history_id, play in plays:
+            columns = self._touch(play.guild_id)
+            if columns is None or history_id <= columns.last_id:
+                continue
+            played_epoch = play.played_at_ms // 1000
+            columns.append(history_id, played_epoch, play, skipped=play.skipped)
+
+    def record_finishes(self, finishes: Sequence[HistoryFinish]) -> None:
+        for finish in finishes:
+            columns = self._touch(finish.guild_id)
+            if columns is not None and finish.history_id is not None:
+                columns.set_skipped(finish.history_id, finish.skipped)
+
+    def invalidate(self, guild_id: int | None = None) -> None:
+        """Drop one guild's columns, or every guild's when ``guild_id`` is ``None``."""
+        if guild_id is None:
+            self._guilds.clear()
+            for loading in self._loading:
+                self._loading[loading] = True
+            return
+        self._guilds.pop(guild_id, None)
+        if guild_id in self._loading:
+            self._loading[guild_id] = True
@@ -0,0 +1,356 @@
+"""Incrementally maintained analytics rollups over ``track_history``.
+
+Analytics queries read these tables instead of scanning history:
+
+* ``history_track_totals`` — per guild × track play/skip counts plus the
+  metadata of the latest play, so leaderboards can build a ``Track``.
+* ``history_track_daily`` — the same counts bucketed by UTC day, for
+  time-ranged leaderboards.
+* ``history_user_totals`` / ``history_user_daily`` — per guild × requester
+  play counts and listen time.
+* ``history_hourly`` — per guild × UTC day × hour play/skip counts and
+  listen time, which also answers guild totals and the activity charts.
+
+Every write to ``track_history`` collects a :class:`HistoryRollupDelta` and
+applies it on the same connection before the transaction commits.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Final
+
+from ...utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+logger = get_logger(__name__)
+
+ROLLUP_TABLES: Final[tuple[str, ...]] = (
+    "history_track_totals",
+    "history_track_daily",
+    "history_user_totals",
+    "history_user_daily",
+    "history_hourly",
+)
+
+# Columns of ``track_history`` a delta needs to locate every rollup bucket.
+ROLLUP_SOURCE_COLUMNS: Final[str] = (
+    "id, guild_id, track_id, requested_by_id, played_at, duration_seconds, skipped"
+)
+
+_TRACK_META_FIELDS: Final[tuple[str, ...]] = (
+    "title",
+    "webpage_url",
+    "duration_seconds",
+    "artist",
+    "uploader",
+    "like_count",
+    "view_count",
+)
+
+# ── Upserts / updates ─────────────────────────────────────────────────
+
+_TRACK_TOTALS_UPSERT_SQL: Final[str] = """
+    INSERT INTO history_track_totals (
+        guild_id, track_id, title, webpage_url, duration_seconds, artist, uploader,
+        like_count, view_count, play_count, skip_count, last_played_at
+    ) VALUES (
+        :guild_id, :track_id, :title, :webpage_url, :duration_seconds, :artist, :uploader,
+        :like_count, :view_count, :plays, :skips, :last_played_at
+    )
+    ON CONFLICT(guild_id, track_id) DO UPDATE SET
+        play_count = play_count + excluded.play_count,
+        skip_count = skip_count + excluded.skip_count,
+        title = excluded.title,
+        webpage_url = excluded.webpage_url,
+        duration_seconds = excluded.duration_seconds,
+        artist = excluded.artist,
+        uploader = excluded.uploader,
+        like_count = excluded.like_count,
+        view_count = excluded.view_count,
+        last_played_at = MAX(last_played_at, excluded.last_played_at)
+"""
+
+_TRACK_TOTALS_UPDATE_SQL: Final[str] = """
+    UPDATE history_track_totals
+    SET play_count = play_count + :plays, skip_count = skip_count + :skips
+    WHERE guild_id = :guild_id AND track_id = :track_id
+"""
+
+_TRACK_DAILY_UPSERT_SQL: Final[str] = """
+    INSERT INTO history_track_daily (guild_id, day, track_id, play_count, skip_count)
+    VALUES (:guild_id, :day, :track_id, :plays, :skips)
+    ON CONFLICT(guild_id, day, track_id) DO UPDATE SET
+        play_count = play_count + excluded.play_count,
+        skip_count = skip_count + excluded.skip_count
+"""
+
+_USER_TOTALS_UPSERT_SQL: Final[str] = """
+    INSERT INTO history_user_totals (
+        guild_id, user_id, user_name, play_count, skip_count, listen_seconds, last_played_at
+    ) VALUES (
+        :guild_id, :user_id, :user_name, :plays, :skips, :listen_seconds, :last_played_at
+    )
+    ON CONFLICT(guild_id, user_id) DO UPDATE SET
+        play_count = play_count + excluded.play_count,
+        skip_count = skip_count + excluded.skip_count,
+        listen_seconds = listen_seconds + excluded.listen_seconds,
+        user_name = COALESCE(excluded.user_name, user_name),
+        last_played_at = MAX(last_played_at, excluded.last_played_at)
+"""
+
+_USER_TOTALS_UPDATE_SQL: Final[str] = """
+    UPDATE history_user_totals
+    SET play_count = play_count + :plays,
+        skip_count = skip_count + :skips,
+        listen_seconds = listen_seconds + :listen_seconds
+    WHERE guild_id = :guild_id AND user_id = :user_id
+"""
+
+_USER_DAILY_UPSERT_SQL: Final[str] = """
+    INSERT INTO history_user_daily (guild_id, day, user_id, play_count)
+    VALUES (:guild_id, :day, :user_id, :plays)
+    ON CONFLICT(guild_id, day, user_id) DO UPDATE SET
+        play_count = play_count + excluded.play_count
+"""
+
+_HOURLY_UPSERT_SQL: Final[str] = """
+    INSERT INTO history_hourly (guild_id, day, hour, play_count, skip_count, listen_seconds)
+    VALUES (:guild_id, :day, :hour, :plays, :skips, :listen_seconds)
+    ON CONFLICT(guild_id, day, hour) DO UPDATE SET
+        play_count = play_count + excluded.play_count,
+        skip_count = skip_count + excluded.skip_count,
+        listen_seconds = listen_seconds + excluded.listen_seconds
+"""
+
+# Buckets emptied by deletions are pruned so leaderboards never list them.
+_PRUNE_SQL: Final[dict[str, str]] = {
+    "history_track_totals": (
+        "DELETE FROM history_track_totals "
+        "WHERE guild_id = :guild_id AND track_id = :track_id AND play_count <= 0"
+    ),
+    "history_track_daily": (
+        "DELETE FROM history_track_daily "
+        "WHERE guild_id = :guild_id AND day = :day AND track_id = :track_id AND play_count <= 0"
+    ),
+    "history_user_totals": (
+        "DELETE FROM history_user_totals "
+        "WHERE guild_id = :guild_id AND user_id = :user_id AND play_count <= 0"
+    ),
+    "history_user_daily": (
+        "DELETE FROM history_user_daily "
+        "WHERE guild_id = :guild_id AND day = :day AND user_id = :user_id AND play_count <= 0"
+    ),
+    "history_hourly": (
+        "DELETE FROM history_hourly "
+        "WHERE guild_id = :guild_id AND day = :day AND hour = :hour AND play_count <= 0"
+    ),
+}
+
+# ── Backfill from existing history ────────────────────────────────────
+
+_REBUILD_SQL: Final[tuple[str, ...]] = (
+    # SQLite takes bare columns from the MAX(played_at) row, i.e. the latest play.
+    """
+    INSERT INTO history_track_totals (
+        guild_id, track_id, title, webpage_url, duration_seconds, artist, uploader,
+        like_count, view_count, play_count, skip_count, last_played_at
+    )
+    SELECT guild_id, track_id, title, webpage_url, duration_seconds, artist, uploader,
+           like_count, view_count, COUNT(*), COALESCE(SUM(skipped), 0), MAX(played_at)
+    FROM track_history
+    GROUP BY guild_id, track_id
+    """,
+    """
+    INSERT INTO history_track_daily (guild_id, day, track_id, play_count, skip_count)
+    SELECT guild_id, substr(played_at, 1, 10), track_id, COUNT(*), COALESCE(SUM(skipped), 0)
+    FROM track_history
+    GROUP BY guild_id, substr(played_at, 1, 10), track_id
+    """,
+    """
+    INSERT INTO history_user_totals (
+        guild_id, user_id, user_name, play_count, skip_count, listen_seconds, last_played_at
+    )
+    SELECT guild_id, requested_by_id, requested_by_name, COUNT(*), COALESCE(SUM(skipped), 0),
+           COALESCE(SUM(duration_seconds), 0), MAX(played_at)
+    FROM track_history
+    WHERE requested_by_id IS NOT NULL
+    GROUP BY guild_id, requested_by_id
+    """,
+    """
+    INSERT INTO history_user_daily (guild_id, day, user_id, play_count)
+    SELECT guild_id, substr(played_at, 1, 10), requested_by_id, COUNT(*)
+    FROM track_history
+    WHERE requested_by_id IS NOT NULL
+    GROUP BY guild_id, substr(played_at, 1, 10), requested_by_id
+    """,
+    """
+    INSERT INTO history_hourly (guild_id, day, hour, play_count, skip_count, listen_seconds)
+    SELECT guild_id, substr(played_at, 1, 10), CAST(substr(played_at, 12, 2) AS INTEGER),
+           COUNT(*), COALESCE(SUM(skipped), 0), COALESCE(SUM(duration_seconds), 0)
+    FROM track_history
+    GROUP BY guild_id, substr(played_at, 1, 10), CAST(substr(played_at, 12, 2) AS INTEGER)
+    """,
+)
+
+
+async def rebuild_history_rollups(conn: aiosqlite.Connection) -> None:
+    """Recompute every rollup table from ``track_history``."""
+    for table in ROLLUP_TABLES:
+        await conn.execute(f"DELETE FROM {table}")  # noqa: S608 — fixed table names
+    for sql in _REBUILD_SQL:
+        await conn.execute(sql)
+    logger.info("Rebuilt history analytics rollups")
+
+
+async def clear_guild_rollups(conn: aiosqlite.Connection, guild_id: int) -> None:
+    for table in ROLLUP_TABLES:
+        await conn.execute(
+            f"DELETE FROM {table} WHERE guild_id = ?",  # noqa: S608 — fixed table names
+            (guild_id,),
+        )
+
+
+def _day_hour(played_at: str) -> tuple[str, int]:
+    """Split a stored UTC ISO timestamp into its ``YYYY-MM-DD`` day and hour."""
+    return played_at[:10], int(played_at[11:13])
+
+
+class HistoryRollupDelta:
+    """Signed changes to the rollup tables, aggregated per bucket.
+
+    Rows are ``track_history``-shaped mappings. Plays carry the track
+    metadata and upsert their buckets; skip changes and deletions only
+    adjust buckets that already exist.
+    """
+
+    def __init__(self) -> None:
+        self._track_totals: dict[tuple[int, str], dict[str, Any]] = {}
+        self._track_daily: dict[tuple[int, str, str], dict[str, Any]] = {}
+        self._user_totals: dict[tuple[int, int], dict[str, Any]] = {}
+        self._user_daily: dict[tuple[int, str, int], dict[str, Any]] = {}
+        self._hourly: dict[tuple[int, str, int], dict[str, Any]] = {}
+        self._has_removals = False
+
+    def __bool__(self) -> bool:
+        return bool(self._track_totals or self._hourly)
+
+    def add_play(self, row: Mapping[str, Any]) -> None:
+        """Count a newly inserted history row (which may already be skipped)."""
+        self._add(row, plays=1, skips=int(bool(row["skipped"])), with_meta=True)
+
+    def remove_play(self, row: Mapping[str, Any]) -> None:
+        """Uncount a deleted history row."""
+        self._has_removals = True
+        self._add(row, plays=-1, skips=-int(bool(row["skipped"])), with_meta=False)
+
+    def change_skip(self, row: Mapping[str, Any], delta: int) -> None:
+        """Move an existing row's skip flag by ``delta`` (+1 skipped, -1 un-skipped)."""
+        if delta:
+            self._add(row, plays=0, skips=delta, with_meta=False, listen=False)
+
+    def _add(
+        self,
+        row: Mapping[str, Any],
+        *,
+        plays: int,
+        skips: int,
+        with_meta: bool,
+        listen: bool = True,
+    ) -> None:
+        guild_id, track_id = row["guild_id"], row["track_id"]
+        played_at = row["played_at"]
+        day, hour = _day_hour(played_at)
+        listen_seconds = (row["duration_seconds"] or 0) * plays if listen else 0
+
+        totals = self._bucket(self._track_totals, (guild_id, track_id), guild_id=guild_id)
+        totals["track_id"] = track_id
+        if with_meta and played_at >= totals.get("last_played_at", ""):
+            totals.update({field: row[field] for field in _TRACK_META_FIELDS})
+            totals["last_played_at"] = played_at
+        totals["plays"] += plays
+        totals["skips"] += skips
+
+        daily = self._bucket(self._track_daily, (guild_id, day, track_id), guild_id=guild_id)
+        daily.update(day=day, track_id=track_id)
+        daily["plays"] += plays
+        daily["skips"] += skips
+
+        hourly = self._bucket(self._hourly, (guild_id, day, hour), guild_id=guild_id)
+        hourly.update(day=day, hour=hour)
+        hourly["plays"] += plays
+        hourly["skips"] += skips
+        hourly["listen_seconds"] += listen_seconds
+
+        user_id = row["requested_by_id"]
+        if user_id is None:
+            return
+
+        user = self._bucket(self._user_totals, (guild_id, user_id), guild_id=guild_id)
+        user["user_id"] = user_id
+        if with_meta and played_at >= user.get("last_played_at", ""):
+            user["user_name"] = row["requested_by_name"]
+            user["last_played_at"] = played_at
+        user["plays"] += plays
+        user["skips"] += skips
+        user["listen_seconds"] += listen_seconds
+
+        user_daily = self._bucket(self._user_daily, (guild_id, day, user_id), guild_id=guild_id)
+        user_daily.update(day=day, user_id=user_id)
+        user_daily["plays"] += plays
+
+    @staticmethod
+    def _bucket(
+        buckets: dict[Any, dict[str, Any]], key: tuple[Any, ...], *, guild_id: int
+    ) -> dict[str, Any]:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = {"guild_id": guild_id, "plays": 0, "skips": 0, "listen_seconds": 0}
+            buckets[key] = bucket
+        return bucket
+
+    async def apply(self, conn: aiosqlite.Connection) -> None:
+        """Write the aggregated changes on ``conn`` (inside the caller's transaction)."""
+        await self._upsert_or_update(
+            conn, self._track_totals, _TRACK_TOTALS_UPSERT_SQL, _TRACK_TOTALS_UPDATE_SQL
+        )
+        await self._upsert_or_update(
+            conn, self._user_totals, _USER_TOTALS_UPSERT_SQL, _USER_TOTALS_UPDATE_SQL
+        )
+        for sql, buckets in (
+            (_TRACK_DAILY_UPSERT_SQL, self._track_daily),
+            (_USER_DAILY_UPSERT_SQL, self._user_daily),
+            (_HOURLY_UPSERT_SQL, self._hourly),
+        ):
+            if buckets:
+                await conn.executemany(sql, list(buckets.values()))
+
+        if self._has_removals:
+            for table, buckets in (
+                ("history_track_totals", self._track_totals),
+                ("history_track_daily", self._track_daily),
+                ("history_user_totals", self._user_totals),
+                ("history_user_daily", self._user_daily),
+                ("history_hourly", self._hourly),
+            ):
+                emptied = [b for b in buckets.values() if b["plays"] < 0]
+                if emptied:
+                    await conn.executemany(_PRUNE_SQL[table], emptied)
+
+    @staticmethod
+    async def _upsert_or_update(
+        conn: aiosqlite.Connection,
+        buckets: dict[Any, dict[str, Any]],
+        upsert_sql: str,
+        update_sql: str,
+    ) -> None:
+        # Buckets that saw a new play know the latest metadata and may be new;
+        # the rest only adjust counters on rows that already exist.
+        upserts = [b for b in buckets.values() if "last_played_at" in b]
+        updates = [b for b in buckets.values() if "last_played_at" not in b]
+        if upserts:
+            await conn.executemany(upsert_sql, upserts)
+        if updates:
+            await conn.executemany(update_sql, updates)
@@ -0,0 +1,580 @@
+"""Versioned, run-once schema migrations for the SQLite database.
+
+Each step in :data:`MIGRATIONS` has a version number. ``PRAGMA user_version``
+holds the highest version applied, so an up-to-date database costs a single
+PRAGMA read at startup. The ``schema_version`` table keeps a record of every
+step and when it ran.
+
+A :class:`SchemaMigration` runs inside the startup transaction. An
+:class:`OnlineBackfill` fills a column in fixed-size batches, each in its own
+short transaction, yielding to the event loop between batches. If the first
+batch doesn't finish the job, the rest of the backfill (and every later step)
+continues in the background, so a large ``track_history`` never blocks boot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import TYPE_CHECKING, Final
+
+import aiosqlite
+from pydantic import BaseModel, ConfigDict
+
+from ...domain.shared.constants import SQLPragmas
+from ...domain.shared.types import NonEmptyStr, PositiveInt
+from ...utils.logging import get_logger
+from .history_rollups import ROLLUP_TABLES, rebuild_history_rollups
+
+if TYPE_CHECKING:
+    from .database import Database
+
+logger = get_logger(__name__)
+
+_TABLE_GUILD_SESSIONS: Final[str] = "guild_sessions"
+_TABLE_QUEUE_TRACKS: Final[str] = "queue_tracks"
+_TABLE_TRACK_HISTORY: Final[str] = "track_history"
+_TABLE_VOTE_SESSIONS: Final[str] = "vote_sessions"
+_TABLE_RECOMMENDATION_CACHE: Final[str] = "recommendation_cache"
+
+SCHEMA_VERSION_TABLE: Final[str] = "schema_version"
+
+_SCHEMA_VERSION_DDL: Final[str] = f"""
+    CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now'))
+    )
+"""
+
+_BACKFILL_BATCH_SIZE: Final[int] = 5000
+
+
+class _SQLiteType(StrEnum):
+    """SQLite column type identifiers used in migration ALTER TABLE statements."""
+
+    TEXT = "TEXT"
+    INTEGER = "INTEGER"
+
+
+def iso_to_epoch_ms_sql(expr: str) -> str:
+    """SQL expression converting an ISO-8601 timestamp to epoch milliseconds."""
+    return f"CAST(ROUND((julianday({expr}) - 2440587.5) * 86400000) AS INTEGER)"
+
+
+# ── Migration steps ───────────────────────────────────────────────────
+
+MigrationStep = Callable[[aiosqlite.Connection], Awaitable[None]]
+"""A schema change applied on the writer connection inside one transaction."""
+
+
+class SchemaMigration(BaseModel):
+    """A step applied atomically during startup."""
+
+    model_config = ConfigDict(frozen=True)
+
+    version: PositiveInt
+    name: NonEmptyStr
+    apply: MigrationStep
+
+
+class OnlineBackfill(BaseModel):
+    """Fill ``table.column`` from ``expression`` in batches of ``batch_size`` rows.
+
+    Rows are picked while ``column`` is NULL and ``expression`` is not, so
+    the step is idempotent and resumes where it stopped after a restart.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    version: PositiveInt
+    name: NonEmptyStr
+    table: NonEmptyStr
+    column: NonEmptyStr
+    expression: NonEmptyStr
+    batch_size: PositiveInt = _BACKFILL_BATCH_SIZE
+
+    async def run_batch(self, conn: aiosqlite.Connection) -> bool:
+        """Backfill one batch; return ``True`` once no rows remain."""
+        cursor = await conn.execute(
+            f"""
+            UPDATE {self.table} SET {self.column} = {self.expression}
+            WHERE rowid IN (
+                SELECT rowid FROM {self.table}
+                WHERE {self.column} IS NULL AND ({self.expression}) IS NOT NULL
+                LIMIT ?
+            )
+            """,  # noqa: S608 — identifiers come from the static MIGRATIONS list
+            (self.batch_size,),
+        )
+        return cursor.rowcount < self.batch_size
+
+
+Migration = SchemaMigration | OnlineBackfill
+
+
+async def _add_column(
+    conn: aiosqlite.Connection, table: str, column: str, column_type_sql: str
+) -> None:
+    rows = await conn.execute_fetchall(SQLPragmas.TABLE_INFO.format(table=table))
+    existing_columns = {r[1] for r in rows}
+    if column in existing_columns:
+        return
+
+    await conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type_sql}")
+    logger.info("Migrated table %s: added column %s", table, column)
+
+
+async def _begin(conn: aiosqlite.Connection) -> None:
+    # sqlite3 only opens a transaction implicitly before DML; DDL would autocommit.
+    if not conn.in_transaction:
+        await conn.execute("BEGIN")
+
+
+# ── v1: baseline schema ───────────────────────────────────────────────
+
+
+async def _create_baseline_schema(conn: aiosqlite.Connection) -> None:
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS guild_sessions (
+            guild_id INTEGER PRIMARY KEY,
+            state TEXT NOT NULL,
+            loop_mode TEXT NOT NULL DEFAULT 'off',
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
+            last_activity TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
+            last_activity_ms INTEGER NOT NULL DEFAULT (
+                CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER)
+            )
+        )
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS queue_tracks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            track_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            webpage_url TEXT NOT NULL,
+            stream_url TEXT,
+            duration_seconds INTEGER,
+            thumbnail_url TEXT,
+            artist TEXT,
+            uploader TEXT,
+            like_count INTEGER,
+            view_count INTEGER,
+            requested_by_id INTEGER,
+            requested_by_name TEXT,
+            requested_at TEXT,
+            position INTEGER NOT NULL,
+            is_current INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY(guild_id) REFERENCES guild_sessions(guild_id) ON DELETE CASCADE
+        )
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_queue_tracks_guild_pos ON queue_tracks(guild_id, position)"
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_queue_tracks_guild_current ON queue_tracks(guild_id, is_current)"
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS track_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            track_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            webpage_url TEXT NOT NULL,
+            duration_seconds INTEGER,
+            artist TEXT,
+            uploader TEXT,
+            like_count INTEGER,
+            view_count INTEGER,
+            requested_by_id INTEGER,
+            requested_by_name TEXT,
+            played_at TEXT NOT NULL,
+            finished_at TEXT,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            played_at_ms INTEGER
+        )
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_track_history_guild_track ON track_history(guild_id, track_id)"
+    )
+
+    # Migration: add columns that may not exist in older schemas
+    _migration_columns = [
+        (_TABLE_GUILD_SESSIONS, "playback_started_at", _SQLiteType.TEXT),
+        (_TABLE_GUILD_SESSIONS, "queue_version", _SQLiteType.INTEGER),
+        (_TABLE_QUEUE_TRACKS, "artist", _SQLiteType.TEXT),
+        (_TABLE_QUEUE_TRACKS, "uploader", _SQLiteType.TEXT),
+        (_TABLE_QUEUE_TRACKS, "like_count", _SQLiteType.INTEGER),
+        (_TABLE_QUEUE_TRACKS, "view_count", _SQLiteType.INTEGER),
+        (_TABLE_TRACK_HISTORY, "artist", _SQLiteType.TEXT),
+        (_TABLE_TRACK_HISTORY, "uploader", _SQLiteType.TEXT),
+        (_TABLE_TRACK_HISTORY, "like_count", _SQLiteType.INTEGER),
+        (_TABLE_TRACK_HISTORY, "view_count", _SQLiteType.INTEGER),
+    ]
+    for table, column, col_type in _migration_columns:
+        await _add_column(conn, table, column, col_type)
+
+    await _create_history_rollups(conn)
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vote_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            track_id TEXT NOT NULL,
+            vote_type TEXT NOT NULL,
+            threshold INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            completed_at TEXT,
+            result TEXT,
+            started_at_ms INTEGER
+        )
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vote_sessions_guild ON vote_sessions(guild_id)"
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vote_sessions_guild_type ON vote_sessions(guild_id, vote_type)"
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_vote_sessions_completed ON vote_sessions(completed_at)"
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS votes (
+            vote_session_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (vote_session_id, user_id),
+            FOREIGN KEY(vote_session_id) REFERENCES vote_sessions(id) ON DELETE CASCADE
+        )
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recommendation_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cache_key TEXT NOT NULL UNIQUE,
+            base_track_id TEXT,
+            base_track_title TEXT NOT NULL,
+            base_track_artist TEXT,
+            recommendations_json TEXT NOT NULL,
+            generated_at TEXT NOT NULL,
+            expires_at TEXT,
+            generated_at_ms INTEGER,
+            expires_at_ms INTEGER
+        )
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS track_genres (
+            track_id TEXT PRIMARY KEY,
+            genre TEXT NOT NULL,
+            classified_at TEXT NOT NULL
+        )
+        """
+    )
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_track_genres_genre ON track_genres(genre)")
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ytdlp_track_cache (
+            video_id TEXT PRIMARY KEY,
+            metadata_json TEXT NOT NULL,
+            cached_at REAL NOT NULL,
+            stream_url TEXT,
+            stream_expires_at REAL
+        )
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ytdlp_track_cache_cached ON ytdlp_track_cache(cached_at)"
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_favorites (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            track_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            webpage_url TEXT NOT NULL,
+            duration_seconds INTEGER,
+            artist TEXT,
+            uploader TEXT,
+            added_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
+            UNIQUE(user_id, track_id)
+        )
+        """
+    )
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_favorites_user ON user_favorites(user_id)")
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS saved_queues (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            tracks_json TEXT NOT NULL,
+            track_count INTEGER NOT NULL DEFAULT 0,
+            created_by_id INTEGER NOT NULL,
+            created_by_name TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f','now')),
+            UNIQUE(guild_id, name)
+        )
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_saved_queues_guild ON saved_queues(guild_id)"
+    )
+
+
+async def _create_history_rollups(conn: aiosqlite.Connection) -> None:
+    rows = await conn.execute_fetchall(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (ROLLUP_TABLES[0],),
+    )
+    needs_backfill = not rows
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history_track_totals (
+            guild_id INTEGER NOT NULL,
+            track_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            webpage_url TEXT NOT NULL,
+            duration_seconds INTEGER,
+            artist TEXT,
+            uploader TEXT,
+            like_count INTEGER,
+            view_count INTEGER,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            skip_count INTEGER NOT NULL DEFAULT 0,
+            last_played_at TEXT NOT NULL,
+            PRIMARY KEY (guild_id, track_id)
+        ) WITHOUT ROWID
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_history_track_totals_plays "
+        "ON history_track_totals(guild_id, play_count DESC)"
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_history_track_totals_skips "
+        "ON history_track_totals(guild_id, skip_count DESC)"
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history_track_daily (
+            guild_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            track_id TEXT NOT NULL,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            skip_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, day, track_id)
+        ) WITHOUT ROWID
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history_user_totals (
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            user_name TEXT,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            skip_count INTEGER NOT NULL DEFAULT 0,
+            listen_seconds INTEGER NOT NULL DEFAULT 0,
+            last_played_at TEXT NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        ) WITHOUT ROWID
+        """
+    )
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_history_user_totals_plays "
+        "ON history_user_totals(guild_id, play_count DESC)"
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history_user_daily (
+            guild_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, day, user_id)
+        ) WITHOUT ROWID
+        """
+    )
+
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history_hourly (
+            guild_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            hour INTEGER NOT NULL,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            skip_count INTEGER NOT NULL DEFAULT 0,
+            listen_seconds INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, day, hour)
+        ) WITHOUT ROWID
+        """
+    )
+
+    # Databases that predate the rollups get them computed from existing history once.
+    if needs_backfill:
+        await rebuild_history_rollups(conn)
+
+
+# ── v2 / v3: integer epoch-millisecond timestamps ─────────────────────
+
+_EPOCH_MS_COLUMNS: Final[tuple[tuple[str, str, str], ...]] = (
+    (_TABLE_GUILD_SESSIONS, "last_activity", "last_activity_ms"),
+    (_TABLE_TRACK_HISTORY, "played_at", "played_at_ms"),
+    (_TABLE_VOTE_SESSIONS, "started_at", "started_at_ms"),
+    (_TABLE_RECOMMENDATION_CACHE, "generated_at", "generated_at_ms"),
+    (_TABLE_RECOMMENDATION_CACHE, "expires_at", "expires_at_ms"),
+)
+"""(table, ISO-8601 TEXT column, epoch-millisecond INTEGER shadow column)."""
+
+_EPOCH_MS_INDEXES: Final[tuple[str, ...]] = (
+    "CREATE INDEX IF NOT EXISTS idx_guild_sessions_last_activity_ms "
+    "ON guild_sessions(last_activity_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_track_history_guild_played_ms "
+    "ON track_history(guild_id, played_at_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_track_history_played_ms ON track_history(played_at_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_vote_sessions_started_ms ON vote_sessions(started_at_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_reco_cache_expires_ms ON recommendation_cache(expires_at_ms)",
+)
+
+# Text-timestamp indexes replaced by their ``*_ms`` counterparts.
+_SUPERSEDED_INDEXES: Final[tuple[str, ...]] = (
+    "idx_track_history_guild_played",
+    "idx_reco_cache_expires",
+)
+
+
+async def _add_epoch_ms_columns(conn: aiosqlite.Connection) -> None:
+    """Add the integer ``*_ms`` shadow of each ISO timestamp column.
+
+    The small tables are backfilled here; ``track_history`` is left to the
+    online backfill that follows.
+    """
+    for table, iso_column, epoch_column in _EPOCH_MS_COLUMNS:
+        await _add_column(conn, table, epoch_column, _SQLiteType.INTEGER)
+        if table == _TABLE_TRACK_HISTORY:
+            continue
+        await conn.execute(
+            f"UPDATE {table} SET {epoch_column} = {iso_to_epoch_ms_sql(iso_column)} "
+            f"WHERE {epoch_column} IS NULL AND {iso_column} IS NOT NULL"
+        )
+
+    for index in _SUPERSEDED_INDEXES:
+        await conn.execute(f"DROP INDEX IF EXISTS {index}")
+    for index_sql in _EPOCH_MS_INDEXES:
+        await conn.execute(index_sql)
+
+
+MIGRATIONS: Final[tuple[Migration, ...]] = (
+    SchemaMigration(version=1, name="baseline schema", apply=_create_baseline_schema),
+    SchemaMigration(version=2, name="epoch-ms timestamp columns", apply=_add_epoch_ms_columns),
+    OnlineBackfill(
+        version=3,
+        name="backfill track_history.played_at_ms",
+        table=_TABLE_TRACK_HISTORY,
+        column="played_at_ms",
+        expression=iso_to_epoch_ms_sql("played_at"),
+    ),
+)
+"""Every schema step, in the order it must be applied."""
+
+LATEST_SCHEMA_VERSION: Final[int] = MIGRATIONS[-1].version
+
+
+# ── Runner ────────────────────────────────────────────────────────────
+
+
+class MigrationRunner:
+    """Applies the steps of :data:`MIGRATIONS` newer than ``PRAGMA user_version``."""
+
+    def __init__(self, database: Database, migrations: tuple[Migration, ...] = MIGRATIONS) -> None:
+        self._db = database
+        self._migrations = migrations
+
+    @staticmethod
+    async def current_version(conn: aiosqlite.Connection) -> int:
+        row = await (await conn.execute(SQLPragmas.USER_VERSION)).fetchone()
+        return row[0] if row else 0
+
+    async def run(self) -> bool:
+        """Apply pending steps at startup.
+
+        Returns ``True`` if an online backfill is still in progress and
+        :meth:`run_online` should continue in the background.
+        """
+        async with self._db.transaction() as conn:
+            version = await self.current_version(conn)
+            if version >= self._migrations[-1].version:
+                return False
+
+            await _begin(conn)
+            await conn.execute(_SCHEMA_VERSION_DDL)
+            for migration in self._pending(version):
+                if isinstance(migration, OnlineBackfill):
+                    # Small tables finish in the first batch; don't spawn a task for them.
+                    if not await migration.run_batch(conn):
+                        return True
+                else:
+                    await migration.apply(conn)
+                await self._record(conn, migration)
+        return False
+
+    async def run_online(self) -> None:
+        """Finish the remaining steps, one short transaction per batch."""
+        async with self._db.connection() as conn:
+            version = await self.current_version(conn)
+
+        for migration in self._pending(version):
+            if isinstance(migration, OnlineBackfill):
+                batches = 0
+                done = False
+                while not done:
+                    async with self._db.transaction() as conn:
+                        done = await migration.run_batch(conn)
+                        if done:
+                            await self._record(conn, migration)
+                    batches += 1
+                    await asyncio.sleep(0)
+                logger.info("Online migration '%s' finished in %s batches", migration.name, batches)
+            else:
+                async with self._db.transaction() as conn:
+                    await _begin(conn)
+                    await migration.apply(conn)
+                    await self._record(conn, migration)
+
+    def _pending(self, version: int) -> list[Migration]:
+        return [m for m in self._migrations if m.version > version]
+
+    @staticmethod
+    async def _record(conn: aiosqlite.Connection, migration: Migration) -> None:
+        await conn.execute(
+            f"INSERT OR REPLACE INTO {SCHEMA_VERSION_TABLE} (version, name) VALUES (?, ?)",
+            (migration.version, migration.name),
+        )
+        await conn.execute(SQLPragmas.SET_USER_VERSION.format(version=migration.version))
+        logger.info("Applied schema migration %s: %s", migration.version, migration.name)
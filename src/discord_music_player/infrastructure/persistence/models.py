@@ -7,7 +7,7 @@ rows.  They exist so raw ``dict`` never leaks into repository code.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Final
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
@@ -22,6 +22,35 @@ from ...domain.shared.types import (
     NonNegativeInt,
 )
 
+# Column types a track row must still have to skip validation in
+# :meth:`TrackRow.hydrate`; constraints were checked when the row was written.
+_TRACK_TEXT_COLUMNS: Final[tuple[str, ...]] = ("track_id", "title", "webpage_url")
+_TRACK_OPTIONAL_TEXT_COLUMNS: Final[tuple[str, ...]] = (
+    "stream_url",
+    "thumbnail_url",
+    "artist",
+    "uploader",
+    "requested_by_name",
+    "requested_at",
+)
+_TRACK_OPTIONAL_INT_COLUMNS: Final[tuple[str, ...]] = (
+    "duration_seconds",
+    "like_count",
+    "view_count",
+    "requested_by_id",
+)
+
+
+def _is_trusted_track_row(row: dict[str, Any]) -> bool:
+    try:
+        return (
+            all(type(row[c]) is str and row[c] for c in _TRACK_TEXT_COLUMNS)
+            and all(row[c] is None or type(row[c]) is str for c in _TRACK_OPTIONAL_TEXT_COLUMNS)
+            and all(row[c] is None or type(row[c]) is int for c in _TRACK_OPTIONAL_INT_COLUMNS)
+        )
+    except KeyError:
+        return False
+
 
 class TrackRow(BaseModel):
     """Typed representation of a track row from ``queue_tracks`` or ``track_history``.
@@ -63,6 +92,36 @@ class TrackRow(BaseModel):
         data["id"] = TrackId.from_url(self.webpage_url) if id_from_url else track_id_str
         return Track.model_validate(data)
 
+    @classmethod
+    def hydrate(cls, row: dict[str, Any], *, id_from_url: bool = False) -> Track:
+        """Build a domain ``Track`` straight from a row this app wrote.
+
+        Rows inserted via :class:`QueueTrackRow` were validated on the way in,
+        so when every column still has its expected SQLite type the ``Track``
+        is assembled with ``model_construct`` and the stored ``track_id`` is
+        trusted.  Any other row (an older schema, a hand edit) falls back to
+        ``model_validate`` and :meth:`to_track` with ``id_from_url``.
+        """
+        if not _is_trusted_track_row(row):
+            return cls.model_validate(row).to_track(id_from_url=id_from_url)
+
+        requested_at = row["requested_at"]
+        return Track.model_construct(
+            id=TrackId.model_construct(value=row["track_id"]),
+            title=row["title"],
+            webpage_url=row["webpage_url"],
+            stream_url=row["stream_url"],
+            duration_seconds=row["duration_seconds"],
+            thumbnail_url=row["thumbnail_url"],
+            artist=row["artist"],
+            uploader=row["uploader"],
+            like_count=row["like_count"],
+            view_count=row["view_count"],
+            requested_by_id=row["requested_by_id"],
+            requested_by_name=row["requested_by_name"],
+            requested_at=UtcDateTime.from_iso(requested_at).dt if requested_at else None,
+        )
+
 
 class QueueTrackRow(BaseModel):
     """INSERT-ready representation of a track in the ``queue_tracks`` table.
@@ -150,3 +209,94 @@ QUEUE_TRACKS_INSERT_SQL: str = """
         :requested_at, :position, :is_current
     )
 """
+
+
+class HistoryRow(BaseModel):
+    """INSERT-ready representation of a play in the ``track_history`` table.
+
+    Constructed from a domain ``Track`` via :meth:`from_track`.  A play whose
+    finish is already known carries ``finished_at``/``skipped`` so it can be
+    written as a single row.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    guild_id: DiscordSnowflake
+    track_id: NonEmptyStr
+    title: NonEmptyStr
+    webpage_url: HttpUrlStr
+    duration_seconds: DurationSeconds | None = None
+    artist: NonEmptyStr | None = None
+    uploader: NonEmptyStr | None = None
+    like_count: NonNegativeInt | None = None
+    view_count: NonNegativeInt | None = None
+    requested_by_id: DiscordSnowflake | None = None
+    requested_by_name: NonEmptyStr | None = None
+    played_at: str
+    played_at_ms: int
+    finished_at: str | None = None
+    skipped: bool = False
+
+    @classmethod
+    def from_track(
+        cls, track: Track, *, guild_id: DiscordSnowflake, played_at: datetime
+    ) -> HistoryRow:
+        played = UtcDateTime(played_at)
+        return cls(
+            guild_id=guild_id,
+            track_id=track.id.value,
+            title=track.title,
+            webpage_url=track.webpage_url,
+            duration_seconds=track.duration_seconds,
+            artist=track.artist,
+            uploader=track.uploader,
+            like_count=track.like_count,
+            view_count=track.view_count,
+            requested_by_id=track.requested_by_id,
+            requested_by_name=track.requested_by_name,
+            played_at=played.iso,
+            played_at_ms=played.unix_millis,
+        )
+
+
+class HistoryFinish(BaseModel):
+    """A pending ``finished_at``/``skipped`` update for a ``track_history`` row.
+
+    ``history_id`` targets the row by primary key; without it the update falls
+    back to the latest play of ``track_id`` in the guild.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    guild_id: DiscordSnowflake
+    track_id: NonEmptyStr
+    finished_at: str
+    skipped: bool = False
+    history_id: int | None = None
+
+
+# ── SQL for HistoryRow inserts / HistoryFinish updates ────────────────
+
+TRACK_HISTORY_INSERT_SQL: str = """
+    INSERT INTO track_history (
+        guild_id, track_id, title, webpage_url, duration_seconds,
+        artist, uploader, like_count, view_count,
+        requested_by_id, requested_by_name, played_at, played_at_ms, finished_at, skipped
+    ) VALUES (
+        :guild_id, :track_id, :title, :webpage_url, :duration_seconds,
+        :artist, :uploader, :like_count, :view_count,
+        :requested_by_id, :requested_by_name, :played_at, :played_at_ms, :finished_at, :skipped
+    )
+"""
+
+TRACK_HISTORY_FINISH_BY_ID_SQL: str = """
+    UPDATE track_history SET finished_at = :finished_at, skipped = :skipped
+    WHERE id = :history_id
+"""
+
+TRACK_HISTORY_LATEST_ID_SQL: str = """
+    SELECT id FROM track_history
+    WHERE guild_id = :guild_id AND track_id = :track_id
+    ORDER BY played_at_ms DESC
+    LIMIT 1
+"""
@@ -0,0 +1,34 @@
+"""Typed queries: SQL statements registered once with the rows they decode into."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+
+class Query[RowT: tuple[Any, ...]]:
+    """A SQL statement paired with the ``NamedTuple`` its result rows decode into.
+
+    Declare queries as module-level constants: the identical statement text
+    then hits each pooled connection's sqlite3 statement cache instead of
+    being re-prepared, and rows are built by ``row_type._make`` inside the
+    cursor, with no ``sqlite3.Row`` or ``dict`` in between.
+    """
+
+    __slots__ = ("sql", "row_type", "_make")
+
+    def __init__(self, sql: str, row_type: type[RowT]) -> None:
+        self.sql = sql
+        self.row_type = row_type
+        self._make: Callable[[Iterable[Any]], RowT] = row_type._make  # type: ignore[attr-defined]
+
+    def row_factory(self, _cursor: sqlite3.Cursor, row: tuple[Any, ...]) -> RowT:
+        return self._make(row)
+
+    def __repr__(self) -> str:
+        return f"Query[{self.row_type.__name__}]({' '.join(self.sql.split())[:60]!r})"
+
+
+class CountRow(NamedTuple):
+    count: int
@@ -1,8 +1,17 @@
 """SQLite repository implementations."""
 
+from .buffered_history_repository import (
+    BufferedHistoryRepository,
+)
 from .cache_repository import (
     SQLiteCacheRepository,
 )
+from .cached_session_repository import (
+    CachedSessionRepository,
+)
+from .columnar_history_repository import (
+    ColumnarHistoryRepository,
+)
 from .history_repository import (
     SQLiteHistoryRepository,
 )
@@ -12,6 +21,9 @@ from .session_repository import (
 
 __all__ = [
     "SQLiteSessionRepository",
+    "CachedSessionRepository",
     "SQLiteHistoryRepository",
+    "BufferedHistoryRepository",
+    "ColumnarHistoryRepository",
     "SQLiteCacheRepository",
 ]
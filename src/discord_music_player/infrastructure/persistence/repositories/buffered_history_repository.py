@@ -0,0 +1,342 @@
+"""Write-behind buffer in front of the SQLite track history repository."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from ....domain.music.entities import Track
+from ....domain.music.repository import GenreTrackInfo, TrackHistoryRepository, UserStats
+from ....domain.music.wrappers import TrackId
+from ....domain.shared.datetime_utils import UtcDateTime
+from ....domain.shared.enums import LeaderboardTimeRange
+from ....domain.shared.types import DiscordSnowflake, NonNegativeInt
+from ....utils.logging import get_logger
+from ..models import HistoryFinish, HistoryRow
+from .history_repository import SQLiteHistoryRepository
+
+logger = get_logger(__name__)
+
+_PlayKey = tuple[DiscordSnowflake, str]
+"""(guild_id, track_id) — identifies the latest play of a track in a guild."""
+
+
+class HistoryBufferStats(BaseModel):
+    """Counters for :class:`BufferedHistoryRepository`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    pending_plays: NonNegativeInt = 0
+    pending_finishes: NonNegativeInt = 0
+    flushes: NonNegativeInt = 0
+    rows_written: NonNegativeInt = 0
+    coalesced: NonNegativeInt = 0
+
+
+class BufferedHistoryRepository(TrackHistoryRepository):
+    """Batches play/finish writes and flushes them in a single transaction.
+
+    ``record_play`` and ``mark_finished`` only touch memory. A finish whose
+    play is still buffered is folded into that row, so a short track costs
+    one INSERT instead of an INSERT plus a correlated UPDATE. Everything else
+    is written by :meth:`flush` with ``executemany``, either every
+    ``flush_interval`` seconds or as soon as ``max_pending`` events queue up.
+
+    Once a play has been flushed its row id is remembered, so the later
+    finish updates by primary key. A guild plays one track at a time, so only
+    its latest flushed play is remembered; recording the next play forgets
+    one that was never finished. Reads flush first, so callers always see
+    their own writes. :meth:`close` performs the final, durable flush.
+    """
+
+    def __init__(
+        self,
+        backend: SQLiteHistoryRepository,
+        *,
+        flush_interval: float = 5.0,
+        max_pending: int = 50,
+    ) -> None:
+        self._backend = backend
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+
+        self._plays: list[HistoryRow] = []
+        self._finishes: list[HistoryFinish] = []
+        # Buffered plays not yet finished → index into ``_plays``.
+        self._open_plays: dict[_PlayKey, int] = {}
+        # Guild → (track_id, row id) of its latest flushed, unfinished play.
+        self._row_ids: dict[DiscordSnowflake, tuple[str, int]] = {}
+
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+        self._flushes = 0
+        self._rows_written = 0
+        self._coalesced = 0
+
+    @property
+    def backend(self) -> SQLiteHistoryRepository:
+        return self._backend
+
+    @property
+    def pending(self) -> int:
+        return len(self._plays) + len(self._finishes)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run_loop(), name="history-write-behind")
+        logger.info("History write-behind started (every %.1fs)", self._flush_interval)
+
+    async def close(self) -> None:
+        """Stop the background flusher and write everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final history flush failed; %s events were not written", self.pending)
+            raise
+        logger.info("History write-behind stopped")
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # The batch was requeued by flush(); retry on the next tick.
+                logger.exception("Failed to flush %s buffered history events", self.pending)
+
+    def _maybe_wake(self) -> None:
+        if self.pending >= self._max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write all buffered plays and finishes in one transaction."""
+        async with self._flush_lock:
+            if not self._plays and not self._finishes:
+                return
+
+            plays, finishes, open_plays = self._plays, self._finishes, self._open_plays
+            self._plays, self._finishes, self._open_plays = [], [], {}
+
+            try:
+                row_ids = await self._backend.record_batch(plays, finishes)
+            except Exception:
+                self._requeue(plays, finishes, open_plays)
+                raise
+
+            # A newer play in the guild may have been buffered meanwhile.
+            replaced = {play.guild_id for play in self._plays}
+            for (guild_id, track_id), index in sorted(open_plays.items(), key=lambda kv: kv[1]):
+                if guild_id not in replaced:
+                    self._row_ids[guild_id] = (track_id, row_ids[index])
+
+            self._flushes += 1
+            self._rows_written += len(plays)
+
+    def _requeue(
+        self,
+        plays: list[HistoryRow],
+        finishes: list[HistoryFinish],
+        open_plays: dict[_PlayKey, int],
+    ) -> None:
+        """Put a failed batch back in front of anything buffered since."""
+        offset = len(plays)
+        self._open_plays = {
+            **{key: index for key, index in open_plays.items() if key not in self._open_plays},
+            **{key: index + offset for key, index in self._open_plays.items()},
+        }
+        self._plays = plays + self._plays
+        self._finishes = finishes + self._finishes
+
+    # ── Writes ────────────────────────────────────────────────────────
+
+    async def record_play(
+        self, guild_id: DiscordSnowflake, track: Track, played_at: datetime | None = None
+    ) -> int | None:
+        """Buffer the play; its row id is not known until the next flush."""
+        if played_at is None:
+            played_at = UtcDateTime.now().dt
+
+        self._row_ids.pop(guild_id, None)
+        self._open_plays[(guild_id, track.id.value)] = len(self._plays)
+        self._plays.append(HistoryRow.from_track(track, guild_id=guild_id, played_at=played_at))
+        self._maybe_wake()
+        return None
+
+    async def mark_finished(
+        self,
+        guild_id: DiscordSnowflake,
+        track_id: TrackId,
+        skipped: bool = False,
+        *,
+        history_id: int | None = None,
+    ) -> None:
+        key = (guild_id, track_id.value)
+        finished_at = UtcDateTime.now().iso
+
+        index = self._open_plays.pop(key, None) if history_id is None else None
+        if index is not None:
+            self._plays[index] = self._plays[index].model_copy(
+                update={"finished_at": finished_at, "skipped": skipped}
+            )
+            self._coalesced += 1
+            return
+
+        if history_id is None:
+            latest = self._row_ids.get(guild_id)
+            if latest is not None and latest[0] == track_id.value:
+                history_id = latest[1]
+                del self._row_ids[guild_id]
+        self._finishes.append(
+            HistoryFinish(
+                guild_id=guild_id,
+                track_id=track_id.value,
+                finished_at=finished_at,
+                skipped=skipped,
+                history_id=history_id,
+            )
+        )
+        self._maybe_wake()
+
+    async def clear_history(self, guild_id: DiscordSnowflake) -> int:
+        await self.flush()
+        self._row_ids.pop(guild_id, None)
+        return await self._backend.clear_history(guild_id)
+
+    async def cleanup_old(self, older_than: datetime) -> int:
+        await self.flush()
+        return await self._backend.cleanup_old(older_than)
+
+    # ── Reads (flush first so callers see their own writes) ───────────
+
+    async def get_recent(self, guild_id: DiscordSnowflake, limit: int = 10) -> list[Track]:
+        await self.flush()
+        return await self._backend.get_recent(guild_id, limit)
+
+    async def get_guild_history(self, guild_id: DiscordSnowflake, limit: int = 10) -> list[Track]:
+        await self.flush()
+        return await self._backend.get_guild_history(guild_id, limit)
+
+    async def get_recent_titles(self, guild_id: DiscordSnowflake, limit: int = 10) -> list[str]:
+        await self.flush()
+        return await self._backend.get_recent_titles(guild_id, limit)
+
+    async def get_play_count(self, guild_id: DiscordSnowflake, track_id: TrackId) -> int:
+        await self.flush()
+        return await self._backend.get_play_count(guild_id, track_id)
+
+    async def get_most_played(
+        self, guild_id: DiscordSnowflake, limit: int = 10
+    ) -> list[tuple[Track, int]]:
+        await self.flush()
+        return await self._backend.get_most_played(guild_id, limit)
+
+    async def get_total_tracks(self, guild_id: DiscordSnowflake) -> int:
+        await self.flush()
+        return await self._backend.get_total_tracks(guild_id)
+
+    async def get_unique_tracks(self, guild_id: DiscordSnowflake) -> int:
+        await self.flush()
+        return await self._backend.get_unique_tracks(guild_id)
+
+    async def get_total_listen_time(self, guild_id: DiscordSnowflake) -> int:
+        await self.flush()
+        return await self._backend.get_total_listen_time(guild_id)
+
+    async def get_top_requesters(
+        self, guild_id: DiscordSnowflake, limit: int = 10
+    ) -> list[tuple[int, str, int]]:
+        await self.flush()
+        return await self._backend.get_top_requesters(guild_id, limit)
+
+    async def get_skip_rate(self, guild_id: DiscordSnowflake) -> float:
+        await self.flush()
+        return await self._backend.get_skip_rate(guild_id)
+
+    async def get_most_skipped(
+        self, guild_id: DiscordSnowflake, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        await self.flush()
+        return await self._backend.get_most_skipped(guild_id, limit)
+
+    async def get_user_stats(
+        self, guild_id: DiscordSnowflake, user_id: DiscordSnowflake
+    ) -> UserStats:
+        await self.flush()
+        return await self._backend.get_user_stats(guild_id, user_id)
+
+    async def get_user_top_tracks(
+        self, guild_id: DiscordSnowflake, user_id: DiscordSnowflake, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        await self.flush()
+        return await self._backend.get_user_top_tracks(guild_id, user_id, limit)
+
+    async def get_activity_by_day(
+        self, guild_id: DiscordSnowflake, days: int = 30
+    ) -> list[tuple[str, int]]:
+        await self.flush()
+        return await self._backend.get_activity_by_day(guild_id, days)
+
+    async def get_activity_by_hour(self, guild_id: DiscordSnowflake) -> list[tuple[int, int]]:
+        await self.flush()
+        return await self._backend.get_activity_by_hour(guild_id)
+
+    async def get_activity_by_weekday(self, guild_id: DiscordSnowflake) -> list[tuple[int, int]]:
+        await self.flush()
+        return await self._backend.get_activity_by_weekday(guild_id)
+
+    async def get_recent_by_user(
+        self, guild_id: DiscordSnowflake, user_id: DiscordSnowflake, limit: int = 100
+    ) -> list[Track]:
+        await self.flush()
+        return await self._backend.get_recent_by_user(guild_id, user_id, limit)
+
+    async def get_user_tracks_for_genre(
+        self, guild_id: DiscordSnowflake, user_id: DiscordSnowflake
+    ) -> list[GenreTrackInfo]:
+        await self.flush()
+        return await self._backend.get_user_tracks_for_genre(guild_id, user_id)
+
+    async def get_most_played_since(
+        self, guild_id: DiscordSnowflake, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[Track, int]]:
+        await self.flush()
+        return await self._backend.get_most_played_since(guild_id, time_range, limit)
+
+    async def get_top_requesters_since(
+        self, guild_id: DiscordSnowflake, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[int, str, int]]:
+        await self.flush()
+        return await self._backend.get_top_requesters_since(guild_id, time_range, limit)
+
+    async def get_most_skipped_since(
+        self, guild_id: DiscordSnowflake, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        await self.flush()
+        return await self._backend.get_most_skipped_since(guild_id, time_range, limit)
+
+    def stats(self) -> HistoryBufferStats:
+        return HistoryBufferStats(
+            pending_plays=len(self._plays),
+            pending_finishes=len(self._finishes),
+            flushes=self._flushes,
+            rows_written=self._rows_written,
+            coalesced=self._coalesced,
+        )
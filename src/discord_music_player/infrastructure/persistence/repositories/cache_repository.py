@@ -14,6 +14,7 @@ from ....domain.recommendations.entities import (
 from ....domain.recommendations.repository import RecommendationCacheRepository
 from ....domain.shared.datetime_utils import UtcDateTime
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
 
 if TYPE_CHECKING:
     from ..database import Database
@@ -25,19 +26,18 @@ _recommendation_list_ta = TypeAdapter(list[Recommendation])
 _COUNT_COL = "count"
 
 
+@timed_repository
 class SQLiteCacheRepository(RecommendationCacheRepository):
     def __init__(self, database: Database) -> None:
         self._db = database
 
     async def get(self, cache_key: str) -> RecommendationSet | None:
-        now_iso = UtcDateTime.now().iso
-
         row = await self._db.fetch_one(
             """
             SELECT * FROM recommendation_cache
-            WHERE cache_key = ? AND expires_at > ?
+            WHERE cache_key = ? AND expires_at_ms > ?
             """,
-            (cache_key, now_iso),
+            (cache_key, UtcDateTime.now().unix_millis),
         )
 
         if row is None:
@@ -47,14 +47,14 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
             recommendations = _recommendation_list_ta.validate_json(row["recommendations_json"])
 
             expires_at = None
-            if row.get("expires_at"):
-                expires_at = UtcDateTime.from_iso(row["expires_at"]).dt
+            if row.get("expires_at_ms") is not None:
+                expires_at = UtcDateTime.from_unix_millis(row["expires_at_ms"]).dt
 
             return RecommendationSet(
                 base_track_title=row["base_track_title"],
                 base_track_artist=row.get("base_track_artist"),
                 recommendations=recommendations,
-                generated_at=UtcDateTime.from_iso(row["generated_at"]).dt,
+                generated_at=UtcDateTime.from_unix_millis(row["generated_at_ms"]).dt,
                 expires_at=expires_at,
             )
         except (ValueError, KeyError) as e:
@@ -67,19 +67,26 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
         recommendations_json = _recommendation_list_ta.dump_json(
             recommendation_set.recommendations
         ).decode()
+        generated_at = UtcDateTime(recommendation_set.generated_at)
+        expires_at = (
+            UtcDateTime(recommendation_set.expires_at) if recommendation_set.expires_at else None
+        )
 
         await self._db.execute(
             """
             INSERT INTO recommendation_cache (
                 cache_key, base_track_id, base_track_title,
-                base_track_artist, recommendations_json, generated_at, expires_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                base_track_artist, recommendations_json, generated_at, expires_at,
+                generated_at_ms, expires_at_ms
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(cache_key) DO UPDATE SET
                 base_track_title = excluded.base_track_title,
                 base_track_artist = excluded.base_track_artist,
                 recommendations_json = excluded.recommendations_json,
                 generated_at = excluded.generated_at,
-                expires_at = excluded.expires_at
+                expires_at = excluded.expires_at,
+                generated_at_ms = excluded.generated_at_ms,
+                expires_at_ms = excluded.expires_at_ms
             """,
             (
                 cache_key,
@@ -87,10 +94,10 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
                 recommendation_set.base_track_title,
                 recommendation_set.base_track_artist,
                 recommendations_json,
-                UtcDateTime(recommendation_set.generated_at).iso,
-                UtcDateTime(recommendation_set.expires_at).iso
-                if recommendation_set.expires_at
-                else None,
+                generated_at.iso,
+                expires_at.iso if expires_at else None,
+                generated_at.unix_millis,
+                expires_at.unix_millis if expires_at else None,
             ),
         )
 
@@ -106,10 +113,9 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
         return cursor.rowcount
 
     async def cleanup_expired(self) -> int:
-        now_iso = UtcDateTime.now().iso
         cursor = await self._db.execute(
-            "DELETE FROM recommendation_cache WHERE expires_at < ?",
-            (now_iso,),
+            "DELETE FROM recommendation_cache WHERE expires_at_ms < ?",
+            (UtcDateTime.now().unix_millis,),
         )
         return cursor.rowcount
 
@@ -124,7 +130,7 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
             DELETE FROM recommendation_cache
             WHERE id IN (
                 SELECT id FROM recommendation_cache
-                ORDER BY generated_at ASC
+                ORDER BY generated_at_ms ASC
                 LIMIT ?
             )
             """,
@@ -137,14 +143,14 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
         return row[_COUNT_COL] if row else 0
 
     async def get_stats(self) -> CacheStats:
-        now = UtcDateTime.now().iso
+        now = UtcDateTime.now().unix_millis
         row = await self._db.fetch_one(
             """
             SELECT
                 COUNT(*) as total,
-                COALESCE(SUM(CASE WHEN expires_at < ? THEN 1 ELSE 0 END), 0) as expired,
-                MIN(generated_at) as oldest,
-                MAX(generated_at) as newest
+                COALESCE(SUM(CASE WHEN expires_at_ms < ? THEN 1 ELSE 0 END), 0) as expired,
+                MIN(generated_at_ms) as oldest,
+                MAX(generated_at_ms) as newest
             FROM recommendation_cache
             """,
             (now,),
@@ -154,8 +160,8 @@ class SQLiteCacheRepository(RecommendationCacheRepository):
 
         total: int = row["total"]
         expired: int = row["expired"]
-        oldest = UtcDateTime.from_iso(row["oldest"]).dt if row.get("oldest") else None
-        newest = UtcDateTime.from_iso(row["newest"]).dt if row.get("newest") else None
+        oldest = UtcDateTime.from_unix_millis(row["oldest"]).dt if row.get("oldest") else None
+        newest = UtcDateTime.from_unix_millis(row["newest"]).dt if row.get("newest") else None
 
         return CacheStats(
             total_entries=total,
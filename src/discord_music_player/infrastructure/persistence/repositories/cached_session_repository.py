@@ -0,0 +1,195 @@
+"""Write-through in-memory cache in front of a persistent session repository."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from ....domain.music.entities import GuildPlaybackSession
+from ....domain.music.repository import SessionRepository
+from ....domain.shared.datetime_utils import UtcDateTime
+from ....domain.shared.types import DiscordSnowflake, NonNegativeInt
+from ....utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Negative entries are cheap to recompute (one indexed lookup), so only the
+# most recent are kept; the oldest are forgotten first.
+_MAX_ABSENT = 1024
+
+
+class SessionCacheStats(BaseModel):
+    """Hit/miss counters for :class:`CachedSessionRepository`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    size: NonNegativeInt = 0
+    hits: NonNegativeInt = 0
+    misses: NonNegativeInt = 0
+    writes: NonNegativeInt = 0
+    invalidations: NonNegativeInt = 0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedSessionRepository(SessionRepository):
+    """Authoritative per-guild session cache with write-through persistence.
+
+    After the first load of a guild, reads are served from memory and never
+    touch the backing store. Every ``save`` updates the cache and is written
+    through before returning, so the backing store stays crash-consistent.
+
+    Callers receive a private copy of the cached session: services mutate the
+    session they fetched and only publish changes via ``save``, exactly as
+    they do against the SQLite repository. ``Track`` is frozen, so copying
+    the queue list is enough to isolate them.
+
+    Guilds known to have no session are remembered too, so repeated
+    ``get`` calls for idle guilds don't hit the disk either, up to the
+    ``_MAX_ABSENT`` most recently seen. Entries are dropped explicitly via
+    :meth:`invalidate` / :meth:`invalidate_all` and on :meth:`cleanup_stale`.
+    """
+
+    def __init__(self, backend: SessionRepository) -> None:
+        self._backend = backend
+        self._sessions: dict[DiscordSnowflake, GuildPlaybackSession] = {}
+        # Insertion-ordered, so the oldest negative entry is evicted first.
+        self._absent: dict[DiscordSnowflake, None] = {}
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._invalidations = 0
+
+    @property
+    def backend(self) -> SessionRepository:
+        return self._backend
+
+    @staticmethod
+    def _copy(session: GuildPlaybackSession) -> GuildPlaybackSession:
+        return session.model_copy(update={"queue": list(session.queue)})
+
+    # ── SessionRepository ─────────────────────────────────────────────
+
+    async def get(self, guild_id: DiscordSnowflake) -> GuildPlaybackSession | None:
+        cached = self._sessions.get(guild_id)
+        if cached is not None:
+            self._hits += 1
+            return self._copy(cached)
+        if guild_id in self._absent:
+            self._hits += 1
+            return None
+
+        self._misses += 1
+        session = await self._backend.get(guild_id)
+        if session is None:
+            self._remember_absent(guild_id)
+            return None
+
+        self._sessions[guild_id] = self._copy(session)
+        return session
+
+    async def get_or_create(self, guild_id: DiscordSnowflake) -> GuildPlaybackSession:
+        session = await self.get(guild_id)
+        if session is not None:
+            return session
+
+        session = GuildPlaybackSession(guild_id=guild_id)
+        await self.save(session)
+        return session
+
+    async def save(self, session: GuildPlaybackSession) -> None:
+        guild_id = session.guild_id
+        self._writes += 1
+        try:
+            await self._backend.save(session)
+        except Exception:
+            # The backing store may no longer match what we cached; reload next time.
+            logger.warning("Session write-through failed for guild %s; evicting", guild_id)
+            self.invalidate(guild_id)
+            raise
+        # Cache after the backend has stamped the session as persisted, so
+        # later copies carry a clean change log against the stored version.
+        self._sessions[guild_id] = self._copy(session)
+        self._absent.pop(guild_id, None)
+
+    async def delete(self, guild_id: DiscordSnowflake) -> bool:
+        self._sessions.pop(guild_id, None)
+        self._remember_absent(guild_id)
+        try:
+            return await self._backend.delete(guild_id)
+        except Exception:
+            self.invalidate(guild_id)
+            raise
+
+    async def exists(self, guild_id: DiscordSnowflake) -> bool:
+        return await self.get(guild_id) is not None
+
+    async def get_all_active(self) -> list[GuildPlaybackSession]:
+        sessions = await self._backend.get_all_active()
+        for session in sessions:
+            # Unsaved state only ever lives in callers' copies, so the cache
+            # and backend agree; prefer the cached object to keep one source.
+            cached = self._sessions.get(session.guild_id)
+            if cached is None:
+                self._sessions[session.guild_id] = self._copy(session)
+                self._absent.pop(session.guild_id, None)
+        return [self._copy(self._sessions[s.guild_id]) for s in sessions]
+
+    async def cleanup_stale(
+        self,
+        older_than: datetime | None = None,
+        *,
+        max_age_hours: int | None = None,
+    ) -> int:
+        if older_than is None:
+            if max_age_hours is None:
+                raise TypeError("Either older_than or max_age_hours must be provided")
+            older_than = UtcDateTime.now().dt - timedelta(hours=max_age_hours)
+
+        stale = [gid for gid, s in self._sessions.items() if s.last_activity < older_than]
+        for guild_id in stale:
+            self.invalidate(guild_id)
+        # Rows removed on disk may belong to guilds we cached as absent-or-not;
+        # forget negative entries so the next lookup consults the backend.
+        self._absent.clear()
+        return await self._backend.cleanup_stale(older_than)
+
+    async def count(self) -> int:
+        return await self._backend.count()
+
+    # ── Cache management ──────────────────────────────────────────────
+
+    def _remember_absent(self, guild_id: DiscordSnowflake) -> None:
+        self._absent[guild_id] = None
+        if len(self._absent) > _MAX_ABSENT:
+            del self._absent[next(iter(self._absent))]
+
+    def invalidate(self, guild_id: DiscordSnowflake) -> None:
+        """Drop a guild's cached session so the next read reloads it from the backend."""
+        if self._sessions.pop(guild_id, None) is not None or guild_id in self._absent:
+            self._invalidations += 1
+        self._absent.pop(guild_id, None)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached session."""
+        self._invalidations += len(self._sessions)
+        self._sessions.clear()
+        self._absent.clear()
+
+    def queue_lengths(self) -> dict[DiscordSnowflake, int]:
+        """Queued track count for every guild session currently held in memory."""
+        return {guild_id: len(session.queue) for guild_id, session in self._sessions.items()}
+
+    def stats(self) -> SessionCacheStats:
+        return SessionCacheStats(
+            size=len(self._sessions),
+            hits=self._hits,
+            misses=self._misses,
+            writes=self._writes,
+            invalidations=self._invalidations,
+        )
@@ -0,0 +1,115 @@
+"""Track history repository that answers analytics from in-memory columns."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from ....domain.music.entities import Track
+from ....domain.music.repository import UserStats
+from ....domain.music.wrappers import TrackId
+from ....domain.shared.enums import LeaderboardTimeRange
+from ...metrics.instruments import timed_repository
+from ..history_columns import HistoryColumnStore
+from ..models import HistoryFinish, HistoryRow
+from .history_repository import SQLiteHistoryRepository
+
+if TYPE_CHECKING:
+    from ..database import Database
+
+
+@timed_repository
+class ColumnarHistoryRepository(SQLiteHistoryRepository):
+    """SQLite history whose analytics run as numpy reductions over cached columns.
+
+    Writes, recent-history lookups and the rollup tables are unchanged. The
+    first analytics call for a guild loads its history into a
+    :class:`HistoryColumnStore`; after that every stat is computed in memory
+    and the write hooks keep the columns current.
+    """
+
+    def __init__(self, database: Database, *, max_guilds: int = 32) -> None:
+        super().__init__(database)
+        self._columns = HistoryColumnStore(database, max_guilds=max_guilds)
+
+    @property
+    def columns(self) -> HistoryColumnStore:
+        return self._columns
+
+    def _history_written(
+        self, plays: Sequence[tuple[int, HistoryRow]], finishes: Sequence[HistoryFinish]
+    ) -> None:
+        self._columns.record_plays(plays)
+        self._columns.record_finishes(finishes)
+
+    def _history_removed(self, guild_id: int | None) -> None:
+        self._columns.invalidate(guild_id)
+
+    # === Analytics Methods ===
+
+    async def get_play_count(self, guild_id: int, track_id: TrackId) -> int:
+        return (await self._columns.get(guild_id)).play_count(track_id.value)
+
+    async def get_most_played(self, guild_id: int, limit: int = 10) -> list[tuple[Track, int]]:
+        return (await self._columns.get(guild_id)).most_played(limit)
+
+    async def get_total_tracks(self, guild_id: int) -> int:
+        return (await self._columns.get(guild_id)).total_tracks()
+
+    async def get_unique_tracks(self, guild_id: int) -> int:
+        return (await self._columns.get(guild_id)).unique_tracks()
+
+    async def get_total_listen_time(self, guild_id: int) -> int:
+        return (await self._columns.get(guild_id)).total_listen_time()
+
+    async def get_top_requesters(
+        self, guild_id: int, limit: int = 10
+    ) -> list[tuple[int, str, int]]:
+        return (await self._columns.get(guild_id)).top_requesters(limit)
+
+    async def get_skip_rate(self, guild_id: int) -> float:
+        return (await self._columns.get(guild_id)).skip_rate()
+
+    async def get_most_skipped(self, guild_id: int, limit: int = 10) -> list[tuple[str, int]]:
+        return (await self._columns.get(guild_id)).most_skipped(limit)
+
+    async def get_user_stats(self, guild_id: int, user_id: int) -> UserStats:
+        columns = await self._columns.get(guild_id)
+        total, unique, listen_time, skipped = columns.user_totals(user_id)
+        if total == 0:
+            return UserStats()
+        return UserStats(
+            total_tracks=total,
+            unique_tracks=unique,
+            total_listen_time=listen_time,
+            skip_rate=skipped / total,
+        )
+
+    async def get_user_top_tracks(
+        self, guild_id: int, user_id: int, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        return (await self._columns.get(guild_id)).user_top_tracks(user_id, limit)
+
+    async def get_activity_by_day(self, guild_id: int, days: int = 30) -> list[tuple[str, int]]:
+        return (await self._columns.get(guild_id)).activity_by_day(days)
+
+    async def get_activity_by_hour(self, guild_id: int) -> list[tuple[int, int]]:
+        return (await self._columns.get(guild_id)).activity_by_hour()
+
+    async def get_activity_by_weekday(self, guild_id: int) -> list[tuple[int, int]]:
+        return (await self._columns.get(guild_id)).activity_by_weekday()
+
+    async def get_most_played_since(
+        self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[Track, int]]:
+        return (await self._columns.get(guild_id)).most_played(limit, time_range)
+
+    async def get_top_requesters_since(
+        self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[int, str, int]]:
+        return (await self._columns.get(guild_id)).top_requesters(limit, time_range)
+
+    async def get_most_skipped_since(
+        self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
+    ) -> list[tuple[str, int]]:
+        return (await self._columns.get(guild_id)).most_skipped(limit, time_range)
@@ -17,6 +17,7 @@ from ....domain.shared.types import (
     PositiveInt,
 )
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
 
 if TYPE_CHECKING:
     from ..database import Database
@@ -71,6 +72,7 @@ class FavoriteRow(BaseModel):
         return cls.model_validate(dict(zip(_Col, row, strict=False)))
 
 
+@timed_repository
 class SQLiteFavoritesRepository:
     def __init__(self, database: Database) -> None:
         self._db = database
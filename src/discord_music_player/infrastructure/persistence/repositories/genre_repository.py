@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import json
+from typing import TYPE_CHECKING, Final, NamedTuple
 
 from ....domain.shared.datetime_utils import UtcDateTime
 from ....domain.music.repository import TrackGenreMap
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
+from ..queries import Query
 
 if TYPE_CHECKING:
     from ..database import Database
@@ -14,6 +17,23 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+class _GenreRow(NamedTuple):
+    track_id: str
+    genre: str
+
+
+# The ids travel as one JSON array so every lookup, whatever its size,
+# reuses the same prepared statement instead of an IN (?, ?, …) per length.
+_GENRES_FOR_TRACKS: Final = Query(
+    """
+    SELECT track_id, genre FROM track_genres
+    WHERE track_id IN (SELECT value FROM json_each(?))
+    """,
+    _GenreRow,
+)
+
+
+@timed_repository
 class SQLiteGenreCacheRepository:
     def __init__(self, database: Database) -> None:
         self._db = database
@@ -23,12 +43,8 @@ class SQLiteGenreCacheRepository:
         if not track_ids:
             return {}
 
-        placeholders = ",".join("?" for _ in track_ids)
-        rows = await self._db.fetch_all(
-            f"SELECT track_id, genre FROM track_genres WHERE track_id IN ({placeholders})",  # noqa: S608
-            tuple(track_ids),
-        )
-        return {row["track_id"]: row["genre"] for row in rows}
+        rows = await self._db.fetch_rows(_GENRES_FOR_TRACKS, (json.dumps(track_ids),))
+        return dict(rows)
 
     async def save_genres(self, classifications: TrackGenreMap) -> None:
         """Batch upsert genre classifications in a single transaction."""
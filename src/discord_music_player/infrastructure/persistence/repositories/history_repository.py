@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from collections.abc import Sequence
+from datetime import UTC, datetime, time, timedelta
+from typing import TYPE_CHECKING, Final, NamedTuple
 
 from ....domain.music.entities import Track
 from ....domain.music.repository import GenreTrackInfo, TrackHistoryRepository, UserStats
@@ -11,9 +12,21 @@ from ....domain.music.wrappers import TrackId
 from ....domain.shared.datetime_utils import UtcDateTime
 from ....domain.shared.enums import LeaderboardTimeRange
 from ....utils.logging import get_logger
-from ..models import TrackRow
+from ...metrics.instruments import timed_repository
+from ..history_rollups import ROLLUP_SOURCE_COLUMNS, HistoryRollupDelta, clear_guild_rollups
+from ..models import (
+    TRACK_HISTORY_FINISH_BY_ID_SQL,
+    TRACK_HISTORY_INSERT_SQL,
+    TRACK_HISTORY_LATEST_ID_SQL,
+    HistoryFinish,
+    HistoryRow,
+    TrackRow,
+)
+from ..queries import Query
 
 if TYPE_CHECKING:
+    import aiosqlite
+
     from ..database import Database
 
 logger = get_logger(__name__)
@@ -26,51 +39,144 @@ _TITLE: str = "title"
 _TOTAL_TRACKS: str = "total_tracks"
 
 
+class _GenreTrackRow(NamedTuple):
+    track_id: str
+    title: str
+    artist: str | None
+    play_count: int
+
+
+class _SinceWindow(NamedTuple):
+    first_day: str
+    since_ms: int
+    first_day_ms: int
+
+
+# One row per distinct track rather than per play, so a long history stays small.
+_USER_TRACKS_FOR_GENRE: Final = Query(
+    """
+    SELECT track_id, MAX(title), MAX(artist), COUNT(*)
+    FROM track_history
+    WHERE guild_id = ? AND requested_by_id = ?
+    GROUP BY track_id
+    """,
+    _GenreTrackRow,
+)
+
+
+@timed_repository
 class SQLiteHistoryRepository(TrackHistoryRepository):
     def __init__(self, database: Database) -> None:
         self._db = database
 
     async def record_play(
         self, guild_id: int, track: Track, played_at: datetime | None = None
-    ) -> None:
+    ) -> int:
         if played_at is None:
             played_at = UtcDateTime.now().dt
 
-        await self._db.execute(
-            """
-            INSERT INTO track_history (
-                guild_id, track_id, title, webpage_url, duration_seconds,
-                artist, uploader, like_count, view_count,
-                requested_by_id, requested_by_name, played_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                guild_id,
-                track.id.value,
-                track.title,
-                track.webpage_url,
-                track.duration_seconds,
-                track.artist,
-                track.uploader,
-                track.like_count,
-                track.view_count,
-                track.requested_by_id,
-                track.requested_by_name,
-                UtcDateTime(played_at).iso,
-            ),
-        )
+        row = HistoryRow.from_track(track, guild_id=guild_id, played_at=played_at)
+        delta = HistoryRollupDelta()
+        delta.add_play(row.model_dump())
+        async with self._db.transaction() as conn:
+            cursor = await conn.execute(TRACK_HISTORY_INSERT_SQL, row.model_dump())
+            await delta.apply(conn)
+        self._history_written([(cursor.lastrowid, row)], ())
         logger.debug(
             "Recorded play for track %s in guild %s",
             track.title,
             guild_id,
         )
+        return cursor.lastrowid
+
+    async def record_batch(
+        self, plays: Sequence[HistoryRow], finishes: Sequence[HistoryFinish] = ()
+    ) -> list[int]:
+        """Write *plays* and apply *finishes* in one transaction.
+
+        Returns the row ids assigned to *plays*, in order.  The inserts run on
+        the single writer connection inside one transaction, so AUTOINCREMENT
+        hands them consecutive ids ending at ``last_insert_rowid()``.
+        """
+        row_ids: list[int] = []
+        delta = HistoryRollupDelta()
+        async with self._db.transaction() as conn:
+            if plays:
+                params = [play.model_dump() for play in plays]
+                await conn.executemany(TRACK_HISTORY_INSERT_SQL, params)
+                async with conn.execute("SELECT last_insert_rowid()") as cursor:
+                    last_row = await cursor.fetchone()
+                last_id = last_row[0]
+                row_ids = list(range(last_id - len(plays) + 1, last_id + 1))
+                for play in params:
+                    delta.add_play(play)
+
+            # Untargeted finishes must see the rows inserted above, so run them last.
+            applied = await self._apply_finishes(conn, finishes, delta)
+            await delta.apply(conn)
+
+        self._history_written(list(zip(row_ids, plays, strict=True)), applied)
+        logger.debug("Wrote %s plays and %s finishes to history", len(plays), len(finishes))
+        return row_ids
+
+    async def _apply_finishes(
+        self,
+        conn: aiosqlite.Connection,
+        finishes: Sequence[HistoryFinish],
+        delta: HistoryRollupDelta,
+    ) -> list[HistoryFinish]:
+        """Update finished rows by primary key and record skip-flag changes in *delta*.
+
+        Returns the finishes that matched a row, with ``history_id`` resolved.
+        """
+        targeted: list[tuple[int, HistoryFinish]] = []
+        for finish in finishes:
+            history_id = finish.history_id
+            if history_id is None:
+                async with conn.execute(TRACK_HISTORY_LATEST_ID_SQL, finish.model_dump()) as cursor:
+                    latest = await cursor.fetchone()
+                if latest is None:
+                    continue
+                history_id = latest[0]
+            targeted.append((history_id, finish))
+        if not targeted:
+            return []
+
+        ids = sorted({history_id for history_id, _ in targeted})
+        placeholders = ", ".join("?" * len(ids))
+        async with conn.execute(
+            f"SELECT {ROLLUP_SOURCE_COLUMNS} FROM track_history WHERE id IN ({placeholders})",
+            ids,
+        ) as cursor:
+            rows = {row["id"]: dict(row) for row in await cursor.fetchall()}
+
+        applied: list[HistoryFinish] = []
+        for history_id, finish in targeted:
+            row = rows.get(history_id)
+            if row is None:
+                continue
+            delta.change_skip(row, int(finish.skipped) - int(row["skipped"]))
+            row["skipped"] = finish.skipped
+            applied.append(finish.model_copy(update={"history_id": history_id}))
+        await conn.executemany(
+            TRACK_HISTORY_FINISH_BY_ID_SQL, [finish.model_dump() for finish in applied]
+        )
+        return applied
+
+    def _history_written(
+        self, plays: Sequence[tuple[int, HistoryRow]], finishes: Sequence[HistoryFinish]
+    ) -> None:
+        """Hook run after a write commits, with new ``(row id, play)`` pairs and finishes."""
+
+    def _history_removed(self, guild_id: int | None) -> None:
+        """Hook run after rows are deleted: one guild's, or any guild's when ``None``."""
 
     async def get_guild_history(self, guild_id: int, limit: int = 10) -> list[Track]:
         return await self.get_recent(guild_id, limit=limit)
 
     async def get_recent_titles(self, guild_id: int, limit: int = 10) -> list[str]:
         rows = await self._db.fetch_all(
-            "SELECT title FROM track_history WHERE guild_id = ? ORDER BY played_at DESC LIMIT ?",
+            "SELECT title FROM track_history WHERE guild_id = ? ORDER BY played_at_ms DESC LIMIT ?",
             (guild_id, limit),
         )
         return [row[_TITLE] for row in rows]
@@ -86,11 +192,21 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
                 raise TypeError("Either older_than or max_age_days must be provided")
             older_than = UtcDateTime.now().dt - timedelta(days=max_age_days)
 
-        cursor = await self._db.execute(
-            "DELETE FROM track_history WHERE played_at < ?",
-            (older_than.isoformat(),),
-        )
-        count = cursor.rowcount
+        cutoff = UtcDateTime(older_than).unix_millis
+        delta = HistoryRollupDelta()
+        async with self._db.transaction() as conn:
+            async with conn.execute(
+                f"SELECT {ROLLUP_SOURCE_COLUMNS} FROM track_history WHERE played_at_ms < ?",
+                (cutoff,),
+            ) as cursor:
+                async for row in cursor:
+                    delta.remove_play(row)
+            cursor = await conn.execute(
+                "DELETE FROM track_history WHERE played_at_ms < ?", (cutoff,)
+            )
+            count = cursor.rowcount
+            await delta.apply(conn)
+        self._history_removed(None)
 
         if count > 0:
             logger.info("Cleaned up %s old history entries", count)
@@ -102,7 +218,7 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
             """
             SELECT * FROM track_history
             WHERE guild_id = ?
-            ORDER BY played_at DESC
+            ORDER BY played_at_ms DESC
             LIMIT ?
             """,
             (guild_id, limit),
@@ -112,7 +228,7 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_play_count(self, guild_id: int, track_id: TrackId) -> int:
         row = await self._db.fetch_one(
             """
-            SELECT COUNT(*) as count FROM track_history
+            SELECT play_count as count FROM history_track_totals
             WHERE guild_id = ? AND track_id = ?
             """,
             (guild_id, track_id.value),
@@ -122,10 +238,8 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_most_played(self, guild_id: int, limit: int = 10) -> list[tuple[Track, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT *, COUNT(*) as play_count
-            FROM track_history
+            SELECT * FROM history_track_totals
             WHERE guild_id = ?
-            GROUP BY track_id
             ORDER BY play_count DESC
             LIMIT ?
             """,
@@ -134,49 +248,58 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
         return [(TrackRow.model_validate(row).to_track(), row["play_count"]) for row in rows]
 
     async def clear_history(self, guild_id: int) -> int:
-        cursor = await self._db.execute(
-            "DELETE FROM track_history WHERE guild_id = ?",
-            (guild_id,),
-        )
-        count = cursor.rowcount
+        async with self._db.transaction() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM track_history WHERE guild_id = ?",
+                (guild_id,),
+            )
+            count = cursor.rowcount
+            await clear_guild_rollups(conn, guild_id)
+        self._history_removed(guild_id)
 
         logger.info("Cleared %s history entries for guild %s", count, guild_id)
         return count
 
-    async def mark_finished(self, guild_id: int, track_id: TrackId, skipped: bool = False) -> None:
-        await self._db.execute(
-            """
-            UPDATE track_history
-            SET finished_at = ?, skipped = ?
-            WHERE id = (
-                SELECT id FROM track_history
-                WHERE guild_id = ? AND track_id = ?
-                ORDER BY played_at DESC
-                LIMIT 1
-            )
-            """,
-            (UtcDateTime.now().iso, skipped, guild_id, track_id.value),
+    async def mark_finished(
+        self,
+        guild_id: int,
+        track_id: TrackId,
+        skipped: bool = False,
+        *,
+        history_id: int | None = None,
+    ) -> None:
+        finish = HistoryFinish(
+            guild_id=guild_id,
+            track_id=track_id.value,
+            finished_at=UtcDateTime.now().iso,
+            skipped=skipped,
+            history_id=history_id,
         )
+        delta = HistoryRollupDelta()
+        async with self._db.transaction() as conn:
+            applied = await self._apply_finishes(conn, [finish], delta)
+            await delta.apply(conn)
+        self._history_written((), applied)
 
     # === Analytics Methods ===
 
     async def get_total_tracks(self, guild_id: int) -> int:
         row = await self._db.fetch_one(
-            "SELECT COUNT(*) as count FROM track_history WHERE guild_id = ?",
+            "SELECT COALESCE(SUM(play_count), 0) as count FROM history_hourly WHERE guild_id = ?",
             (guild_id,),
         )
         return row[_COUNT] if row else 0
 
     async def get_unique_tracks(self, guild_id: int) -> int:
         row = await self._db.fetch_one(
-            "SELECT COUNT(DISTINCT track_id) as count FROM track_history WHERE guild_id = ?",
+            "SELECT COUNT(*) as count FROM history_track_totals WHERE guild_id = ?",
             (guild_id,),
         )
         return row[_COUNT] if row else 0
 
     async def get_total_listen_time(self, guild_id: int) -> int:
         row = await self._db.fetch_one(
-            "SELECT COALESCE(SUM(duration_seconds), 0) as total FROM track_history WHERE guild_id = ?",
+            "SELECT COALESCE(SUM(listen_seconds), 0) as total FROM history_hourly WHERE guild_id = ?",
             (guild_id,),
         )
         return row[_TOTAL] if row else 0
@@ -186,27 +309,23 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     ) -> list[tuple[int, str, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT requested_by_id, requested_by_name, COUNT(*) as count
-            FROM track_history
-            WHERE guild_id = ? AND requested_by_id IS NOT NULL
-            GROUP BY requested_by_id
-            ORDER BY count DESC
+            SELECT user_id, user_name, play_count as count
+            FROM history_user_totals
+            WHERE guild_id = ?
+            ORDER BY play_count DESC
             LIMIT ?
             """,
             (guild_id, limit),
         )
-        return [
-            (row["requested_by_id"], row["requested_by_name"] or "Unknown", row[_COUNT])
-            for row in rows
-        ]
+        return [(row["user_id"], row["user_name"] or "Unknown", row[_COUNT]) for row in rows]
 
     async def get_skip_rate(self, guild_id: int) -> float:
         row = await self._db.fetch_one(
             """
             SELECT
-                COUNT(*) as total,
-                COALESCE(SUM(skipped), 0) as skipped
-            FROM track_history
+                COALESCE(SUM(play_count), 0) as total,
+                COALESCE(SUM(skip_count), 0) as skipped
+            FROM history_hourly
             WHERE guild_id = ?
             """,
             (guild_id,),
@@ -218,11 +337,10 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_most_skipped(self, guild_id: int, limit: int = 10) -> list[tuple[str, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT title, COUNT(*) as count
-            FROM track_history
-            WHERE guild_id = ? AND skipped = 1
-            GROUP BY track_id
-            ORDER BY count DESC
+            SELECT title, skip_count as count
+            FROM history_track_totals
+            WHERE guild_id = ? AND skip_count > 0
+            ORDER BY skip_count DESC
             LIMIT ?
             """,
             (guild_id, limit),
@@ -271,9 +389,9 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_activity_by_day(self, guild_id: int, days: int = 30) -> list[tuple[str, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT DATE(played_at) as day, COUNT(*) as count
-            FROM track_history
-            WHERE guild_id = ? AND played_at >= DATE('now', ?)
+            SELECT day, SUM(play_count) as count
+            FROM history_hourly
+            WHERE guild_id = ? AND day >= DATE('now', ?)
             GROUP BY day
             ORDER BY day ASC
             """,
@@ -284,8 +402,8 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_activity_by_hour(self, guild_id: int) -> list[tuple[int, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT CAST(strftime('%H', played_at) AS INTEGER) as hour, COUNT(*) as count
-            FROM track_history
+            SELECT hour, SUM(play_count) as count
+            FROM history_hourly
             WHERE guild_id = ?
             GROUP BY hour
             ORDER BY hour ASC
@@ -297,8 +415,8 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
     async def get_activity_by_weekday(self, guild_id: int) -> list[tuple[int, int]]:
         rows = await self._db.fetch_all(
             """
-            SELECT CAST(strftime('%w', played_at) AS INTEGER) as weekday, COUNT(*) as count
-            FROM track_history
+            SELECT CAST(strftime('%w', day) AS INTEGER) as weekday, SUM(play_count) as count
+            FROM history_hourly
             WHERE guild_id = ?
             GROUP BY weekday
             ORDER BY weekday ASC
@@ -308,64 +426,122 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
         return [(row["weekday"], row[_COUNT]) for row in rows]
 
     @staticmethod
-    def _time_range_filter(time_range: LeaderboardTimeRange) -> tuple[str, tuple[str, ...]]:
-        """Return a (clause, params) pair for the given time range."""
-        if time_range == LeaderboardTimeRange.ALL_TIME:
-            return "", ()
-        days_str = "-7 days" if time_range == LeaderboardTimeRange.LAST_7_DAYS else "-30 days"
-        return " AND played_at >= datetime('now', ?)", (days_str,)
+    def _since_window(time_range: LeaderboardTimeRange) -> _SinceWindow:
+        """Split a rolling time range into whole day buckets and a partial first day.
+
+        Days after the window start are summed from the daily rollups; plays on
+        the day the window starts in are counted from ``track_history`` itself,
+        so "last 7 days" still means the last 7 × 24 hours.
+        """
+        days = 7 if time_range == LeaderboardTimeRange.LAST_7_DAYS else 30
+        since = UtcDateTime.now().dt - timedelta(days=days)
+        first_day = datetime.combine(since.date() + timedelta(days=1), time.min, tzinfo=UTC)
+        return _SinceWindow(
+            first_day=first_day.date().isoformat(),
+            since_ms=UtcDateTime(since).unix_millis,
+            first_day_ms=UtcDateTime(first_day).unix_millis,
+        )
+
+    @classmethod
+    def _window_params(
+        cls, guild_id: int, time_range: LeaderboardTimeRange
+    ) -> tuple[int, str, int, int, int]:
+        """Parameters for a rollup-days ``UNION ALL`` partial-first-day subquery."""
+        window = cls._since_window(time_range)
+        return guild_id, window.first_day, guild_id, window.since_ms, window.first_day_ms
 
     async def get_most_played_since(
         self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
     ) -> list[tuple[Track, int]]:
-        clause, time_params = self._time_range_filter(time_range)
+        if time_range == LeaderboardTimeRange.ALL_TIME:
+            return await self.get_most_played(guild_id, limit)
+
         rows = await self._db.fetch_all(
-            f"""
-            SELECT *, COUNT(*) as play_count
-            FROM track_history
-            WHERE guild_id = ?{clause}
-            GROUP BY track_id
-            ORDER BY play_count DESC
-            LIMIT ?
+            """
+            SELECT t.*, d.plays
+            FROM (
+                SELECT track_id, SUM(play_count) as plays
+                FROM (
+                    SELECT track_id, play_count
+                    FROM history_track_daily
+                    WHERE guild_id = ? AND day >= ?
+                    UNION ALL
+                    SELECT track_id, 1
+                    FROM track_history
+                    WHERE guild_id = ? AND played_at_ms >= ? AND played_at_ms < ?
+                )
+                GROUP BY track_id
+                ORDER BY plays DESC
+                LIMIT ?
+            ) d
+            JOIN history_track_totals t ON t.guild_id = ? AND t.track_id = d.track_id
+            ORDER BY d.plays DESC
             """,
-            (guild_id, *time_params, limit),
+            (*self._window_params(guild_id, time_range), limit, guild_id),
         )
-        return [(TrackRow.model_validate(row).to_track(), row["play_count"]) for row in rows]
+        return [(TrackRow.model_validate(row).to_track(), row["plays"]) for row in rows]
 
     async def get_top_requesters_since(
         self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
     ) -> list[tuple[int, str, int]]:
-        clause, time_params = self._time_range_filter(time_range)
+        if time_range == LeaderboardTimeRange.ALL_TIME:
+            return await self.get_top_requesters(guild_id, limit)
+
         rows = await self._db.fetch_all(
-            f"""
-            SELECT requested_by_id, requested_by_name, COUNT(*) as count
-            FROM track_history
-            WHERE guild_id = ? AND requested_by_id IS NOT NULL{clause}
-            GROUP BY requested_by_id
-            ORDER BY count DESC
-            LIMIT ?
+            """
+            SELECT d.user_id, u.user_name, d.plays as count
+            FROM (
+                SELECT user_id, SUM(play_count) as plays
+                FROM (
+                    SELECT user_id, play_count
+                    FROM history_user_daily
+                    WHERE guild_id = ? AND day >= ?
+                    UNION ALL
+                    SELECT requested_by_id, 1
+                    FROM track_history
+                    WHERE guild_id = ? AND played_at_ms >= ? AND played_at_ms < ?
+                        AND requested_by_id IS NOT NULL
+                )
+                GROUP BY user_id
+                ORDER BY plays DESC
+                LIMIT ?
+            ) d
+            LEFT JOIN history_user_totals u ON u.guild_id = ? AND u.user_id = d.user_id
+            ORDER BY d.plays DESC
             """,
-            (guild_id, *time_params, limit),
+            (*self._window_params(guild_id, time_range), limit, guild_id),
         )
-        return [
-            (row["requested_by_id"], row["requested_by_name"] or "Unknown", row[_COUNT])
-            for row in rows
-        ]
+        return [(row["user_id"], row["user_name"] or "Unknown", row[_COUNT]) for row in rows]
 
     async def get_most_skipped_since(
         self, guild_id: int, time_range: LeaderboardTimeRange, limit: int = 10
     ) -> list[tuple[str, int]]:
-        clause, time_params = self._time_range_filter(time_range)
+        if time_range == LeaderboardTimeRange.ALL_TIME:
+            return await self.get_most_skipped(guild_id, limit)
+
         rows = await self._db.fetch_all(
-            f"""
-            SELECT title, COUNT(*) as count
-            FROM track_history
-            WHERE guild_id = ? AND skipped = 1{clause}
-            GROUP BY track_id
-            ORDER BY count DESC
-            LIMIT ?
+            """
+            SELECT t.title, d.skips as count
+            FROM (
+                SELECT track_id, SUM(skip_count) as skips
+                FROM (
+                    SELECT track_id, skip_count
+                    FROM history_track_daily
+                    WHERE guild_id = ? AND day >= ?
+                    UNION ALL
+                    SELECT track_id, skipped
+                    FROM track_history
+                    WHERE guild_id = ? AND played_at_ms >= ? AND played_at_ms < ?
+                )
+                GROUP BY track_id
+                HAVING skips > 0
+                ORDER BY skips DESC
+                LIMIT ?
+            ) d
+            JOIN history_track_totals t ON t.guild_id = ? AND t.track_id = d.track_id
+            ORDER BY d.skips DESC
             """,
-            (guild_id, *time_params, limit),
+            (*self._window_params(guild_id, time_range), limit, guild_id),
         )
         return [(row[_TITLE], row[_COUNT]) for row in rows]
 
@@ -376,7 +552,7 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
             """
             SELECT * FROM track_history
             WHERE guild_id = ? AND requested_by_id = ?
-            ORDER BY played_at DESC
+            ORDER BY played_at_ms DESC
             LIMIT ?
             """,
             (guild_id, user_id, limit),
@@ -384,19 +560,7 @@ class SQLiteHistoryRepository(TrackHistoryRepository):
         return [TrackRow.model_validate(row).to_track() for row in rows]
 
     async def get_user_tracks_for_genre(self, guild_id: int, user_id: int) -> list[GenreTrackInfo]:
-        rows = await self._db.fetch_all(
-            """
-            SELECT track_id, title, artist
-            FROM track_history
-            WHERE guild_id = ? AND requested_by_id = ?
-            """,
-            (guild_id, user_id),
-        )
         return [
-            GenreTrackInfo(
-                track_id=row["track_id"],
-                title=row[_TITLE],
-                artist=row.get("artist"),
-            )
-            for row in rows
+            GenreTrackInfo.model_construct(**row._asdict())
+            async for row in self._db.iterate(_USER_TRACKS_FOR_GENRE, (guild_id, user_id))
         ]
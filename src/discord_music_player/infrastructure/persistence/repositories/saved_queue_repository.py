@@ -15,6 +15,7 @@ from ....domain.shared.types import (
     NonNegativeInt,
 )
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
 
 if TYPE_CHECKING:
     from ..database import Database
@@ -93,6 +94,7 @@ class SavedQueueInfo(BaseModel):
     created_at: NonEmptyStr
 
 
+@timed_repository
 class SQLiteSavedQueueRepository:
     def __init__(self, database: Database) -> None:
         self._db = database
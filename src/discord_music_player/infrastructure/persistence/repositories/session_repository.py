@@ -2,17 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any
+from itertools import groupby
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Final
 
 from pydantic import BaseModel, ConfigDict
 
-from ....domain.music.entities import GuildPlaybackSession, Track
-from ....domain.music.enums import LoopMode, PlaybackState
+from ....domain.music.entities import GuildPlaybackSession, QueueChange, Track
+from ....domain.music.enums import LoopMode, PlaybackState, QueueChangeKind
 from ....domain.music.repository import SessionRepository
 from ....domain.shared.datetime_utils import UtcDateTime
 from ....domain.shared.types import UtcDatetimeField
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
 from ..models import (
     QUEUE_TRACKS_INSERT_SQL,
     QueueTrackRow,
@@ -20,10 +24,31 @@ from ..models import (
 )
 
 if TYPE_CHECKING:
+    import aiosqlite
+
     from ..database import Database
 
 logger = get_logger(__name__)
 
+# Queued rows are spaced out so an insert or move between two neighbours
+# only rewrites the moved row; the queue is renumbered when a gap closes.
+_POSITION_STEP: Final[int] = 1024
+_CURRENT_POSITION: Final[int] = -1
+
+# One row per queued track (or a single all-NULL track row for an empty
+# queue), so a session and its queue load in one round-trip.
+_SESSION_WITH_QUEUE_SQL: Final[str] = """
+    SELECT
+        s.guild_id, s.state, s.loop_mode, s.created_at, s.last_activity_ms,
+        s.playback_started_at, s.queue_version,
+        q.track_id, q.title, q.webpage_url, q.stream_url, q.duration_seconds,
+        q.thumbnail_url, q.artist, q.uploader, q.like_count, q.view_count,
+        q.requested_by_id, q.requested_by_name, q.requested_at, q.is_current
+    FROM guild_sessions AS s
+    LEFT JOIN queue_tracks AS q ON q.guild_id = s.guild_id
+"""
+_SESSION_WITH_QUEUE_ORDER: Final[str] = "ORDER BY s.guild_id, q.position ASC, q.id ASC"
+
 
 class _SessionMetadata(BaseModel):
     model_config = ConfigDict(frozen=True)
@@ -41,54 +66,83 @@ class _SessionMetadata(BaseModel):
             state=PlaybackState(row["state"]),
             loop_mode=LoopMode(row["loop_mode"]),
             created_at=UtcDateTime.from_iso(row["created_at"]).dt,
-            last_activity=UtcDateTime.from_iso(row["last_activity"]).dt,
+            last_activity=UtcDateTime.from_unix_millis(row["last_activity_ms"]).dt,
             playback_started_at=UtcDateTime.from_iso(raw_started).dt if raw_started else None,
         )
 
 
+class _QueueSlot(BaseModel):
+    """Row id and sort position of one queued (non-current) track."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    position: int
+
+
+@timed_repository
 class SQLiteSessionRepository(SessionRepository):
     def __init__(self, database: Database) -> None:
         self._db = database
 
     async def get(self, guild_id: int) -> GuildPlaybackSession | None:
-        session_row = await self._db.fetch_one(
-            "SELECT * FROM guild_sessions WHERE guild_id = ?",
-            (guild_id,),
-        )
-
-        if session_row is None:
-            return None
-
-        queue_rows = await self._db.fetch_all(
-            """
-            SELECT * FROM queue_tracks
-            WHERE guild_id = ?
-            ORDER BY position ASC
-            """,
+        rows = await self._db.fetch_all(
+            f"{_SESSION_WITH_QUEUE_SQL} WHERE s.guild_id = ? {_SESSION_WITH_QUEUE_ORDER}",
             (guild_id,),
         )
+        return self._hydrate(rows) if rows else None
 
+    @staticmethod
+    def _hydrate(rows: Sequence[dict[str, Any]]) -> GuildPlaybackSession:
+        """Build one session from its joined rows (all sharing the same guild)."""
         queue: list[Track] = []
         current_track: Track | None = None
 
-        for raw_row in queue_rows:
-            row = TrackRow.model_validate(raw_row)
-            track = row.to_track(id_from_url=True)
-            if raw_row["is_current"]:
+        for row in rows:
+            if row["track_id"] is None:
+                continue
+            track = TrackRow.hydrate(row, id_from_url=True)
+            if row["is_current"]:
                 current_track = track
             else:
                 queue.append(track)
 
+        session_row = rows[0]
         meta = _SessionMetadata.from_row(session_row)
-        return GuildPlaybackSession(
-            guild_id=guild_id,
+        session = GuildPlaybackSession(
+            guild_id=session_row["guild_id"],
             queue=queue,
             current_track=current_track,
             **meta.model_dump(),
         )
+        session.mark_queue_persisted(session_row["queue_version"] or 0)
+        return session
 
     async def save(self, session: GuildPlaybackSession) -> None:
+        """Persist a session, replaying only its queue changes when possible.
+
+        The queue is written incrementally when the session was loaded from
+        (or last saved as) the version currently stored; otherwise — a new
+        session, a bulk change like shuffle, or a concurrent save in between —
+        the guild's queue rows are rewritten in full.
+        """
+        changes = session.pending_queue_changes
         async with self._db.transaction() as conn:
+            async with conn.execute(
+                "SELECT queue_version FROM guild_sessions WHERE guild_id = ?",
+                (session.guild_id,),
+            ) as cursor:
+                existing = await cursor.fetchone()
+
+            stored_version = (existing[0] or 0) if existing is not None else None
+            incremental = (
+                changes is not None
+                and stored_version is not None
+                and session.queue_version == stored_version
+            )
+            version = 0 if stored_version is None else stored_version + 1
+
+            last_activity = UtcDateTime(session.last_activity)
             started_at_iso = (
                 UtcDateTime(session.playback_started_at).iso
                 if session.playback_started_at is not None
@@ -96,48 +150,215 @@ class SQLiteSessionRepository(SessionRepository):
             )
             await conn.execute(
                 """
-                INSERT INTO guild_sessions (guild_id, state, loop_mode, created_at, last_activity, playback_started_at)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO guild_sessions (
+                    guild_id, state, loop_mode, created_at, last_activity, last_activity_ms,
+                    playback_started_at, queue_version
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(guild_id) DO UPDATE SET
                     state = excluded.state,
                     loop_mode = excluded.loop_mode,
                     last_activity = excluded.last_activity,
-                    playback_started_at = excluded.playback_started_at
+                    last_activity_ms = excluded.last_activity_ms,
+                    playback_started_at = excluded.playback_started_at,
+                    queue_version = excluded.queue_version
                 """,
                 (
                     session.guild_id,
                     session.state.value,
                     session.loop_mode.value,
                     UtcDateTime(session.created_at).iso,
-                    UtcDateTime(session.last_activity).iso,
+                    last_activity.iso,
+                    last_activity.unix_millis,
                     started_at_iso,
+                    version,
                 ),
             )
 
-            await conn.execute(
-                "DELETE FROM queue_tracks WHERE guild_id = ?",
-                (session.guild_id,),
+            await self._save_current_track(conn, session)
+            if incremental and changes is not None:
+                await self._apply_queue_changes(conn, session.guild_id, changes)
+            else:
+                await self._rewrite_queue(conn, session)
+
+        session.mark_queue_persisted(version)
+        logger.debug(
+            "Saved session for guild %s (%s)",
+            session.guild_id,
+            f"{len(changes or ())} queue changes" if incremental else "full queue rewrite",
+        )
+
+    # ── Queue persistence ─────────────────────────────────────────────
+
+    async def _save_current_track(
+        self, conn: aiosqlite.Connection, session: GuildPlaybackSession
+    ) -> None:
+        await conn.execute(
+            "DELETE FROM queue_tracks WHERE guild_id = ? AND is_current = 1",
+            (session.guild_id,),
+        )
+        if session.current_track:
+            row = QueueTrackRow.from_track(
+                session.current_track,
+                guild_id=session.guild_id,
+                position=_CURRENT_POSITION,
+                is_current=True,
             )
+            await conn.execute(QUEUE_TRACKS_INSERT_SQL, row.model_dump())
+
+    async def _rewrite_queue(
+        self, conn: aiosqlite.Connection, session: GuildPlaybackSession
+    ) -> None:
+        await conn.execute(
+            "DELETE FROM queue_tracks WHERE guild_id = ? AND is_current = 0",
+            (session.guild_id,),
+        )
+        await self._insert_tracks(conn, session.guild_id, session.queue, first_position=0)
 
-            if session.current_track:
-                row = QueueTrackRow.from_track(
-                    session.current_track,
-                    guild_id=session.guild_id,
-                    position=-1,
-                    is_current=True,
-                )
-                await conn.execute(QUEUE_TRACKS_INSERT_SQL, row.model_dump())
-
-            for position, track in enumerate(session.queue):
-                row = QueueTrackRow.from_track(
-                    track,
-                    guild_id=session.guild_id,
-                    position=position,
-                    is_current=False,
+    async def _apply_queue_changes(
+        self,
+        conn: aiosqlite.Connection,
+        guild_id: int,
+        changes: Sequence[QueueChange],
+    ) -> None:
+        # Consecutive appends (e.g. a playlist import) become one executemany.
+        appends: list[Track] = []
+        for change in changes:
+            if change.kind is QueueChangeKind.APPEND and change.track is not None:
+                appends.append(change.track)
+                continue
+            await self._append_tracks(conn, guild_id, appends)
+            appends = []
+
+            if change.kind is QueueChangeKind.CLEAR:
+                await conn.execute(
+                    "DELETE FROM queue_tracks WHERE guild_id = ? AND is_current = 0",
+                    (guild_id,),
                 )
-                await conn.execute(QUEUE_TRACKS_INSERT_SQL, row.model_dump())
+            elif change.kind in (QueueChangeKind.POP_FRONT, QueueChangeKind.REMOVE):
+                slot = await self._slot_at(conn, guild_id, change.index)
+                if slot is not None:
+                    await conn.execute("DELETE FROM queue_tracks WHERE id = ?", (slot.id,))
+            elif change.kind is QueueChangeKind.INSERT and change.track is not None:
+                position = await self._position_for(conn, guild_id, change.index)
+                await self._insert_tracks(conn, guild_id, [change.track], first_position=position)
+            elif change.kind is QueueChangeKind.MOVE and change.to_index is not None:
+                slot = await self._slot_at(conn, guild_id, change.index)
+                if slot is not None:
+                    position = await self._position_for(
+                        conn, guild_id, change.to_index, exclude_id=slot.id
+                    )
+                    await conn.execute(
+                        "UPDATE queue_tracks SET position = ? WHERE id = ?",
+                        (position, slot.id),
+                    )
+        await self._append_tracks(conn, guild_id, appends)
+
+    async def _append_tracks(
+        self, conn: aiosqlite.Connection, guild_id: int, tracks: Sequence[Track]
+    ) -> None:
+        if not tracks:
+            return
+        async with conn.execute(
+            "SELECT MAX(position) FROM queue_tracks WHERE guild_id = ? AND is_current = 0",
+            (guild_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        last = row[0] if row is not None else None
+        first = 0 if last is None else last + _POSITION_STEP
+        await self._insert_tracks(conn, guild_id, tracks, first_position=first)
 
-        logger.debug("Saved session for guild %s", session.guild_id)
+    async def _insert_tracks(
+        self,
+        conn: aiosqlite.Connection,
+        guild_id: int,
+        tracks: Sequence[Track],
+        *,
+        first_position: int,
+    ) -> None:
+        if not tracks:
+            return
+        rows = [
+            QueueTrackRow.from_track(
+                track,
+                guild_id=guild_id,
+                position=first_position + offset * _POSITION_STEP,
+                is_current=False,
+            ).model_dump()
+            for offset, track in enumerate(tracks)
+        ]
+        await conn.executemany(QUEUE_TRACKS_INSERT_SQL, rows)
+
+    async def _slots(
+        self,
+        conn: aiosqlite.Connection,
+        guild_id: int,
+        *,
+        offset: int,
+        limit: int,
+        exclude_id: int | None = None,
+    ) -> list[_QueueSlot]:
+        async with conn.execute(
+            """
+            SELECT id, position FROM queue_tracks
+            WHERE guild_id = ? AND is_current = 0 AND id IS NOT ?
+            ORDER BY position ASC, id ASC
+            LIMIT ? OFFSET ?
+            """,
+            (guild_id, exclude_id, limit, offset),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [_QueueSlot(id=row[0], position=row[1]) for row in rows]
+
+    async def _slot_at(
+        self, conn: aiosqlite.Connection, guild_id: int, index: int
+    ) -> _QueueSlot | None:
+        slots = await self._slots(conn, guild_id, offset=index, limit=1)
+        return slots[0] if slots else None
+
+    async def _position_for(
+        self,
+        conn: aiosqlite.Connection,
+        guild_id: int,
+        index: int,
+        *,
+        exclude_id: int | None = None,
+    ) -> int:
+        """Sort position that places a row at queue ``index``, renumbering if no gap is left."""
+        for _ in range(2):
+            if index == 0:
+                before = None
+                after_slots = await self._slots(
+                    conn, guild_id, offset=0, limit=1, exclude_id=exclude_id
+                )
+                after = after_slots[0] if after_slots else None
+            else:
+                pair = await self._slots(
+                    conn, guild_id, offset=index - 1, limit=2, exclude_id=exclude_id
+                )
+                before = pair[0] if pair else None
+                after = pair[1] if len(pair) > 1 else None
+
+            if before is None and after is None:
+                return 0
+            if before is None and after is not None:
+                return after.position - _POSITION_STEP
+            if after is None and before is not None:
+                return before.position + _POSITION_STEP
+            if before is not None and after is not None:
+                if after.position - before.position >= 2:
+                    return (before.position + after.position) // 2
+            await self._renumber_queue(conn, guild_id)
+
+        raise RuntimeError(f"Could not allocate a queue position for guild {guild_id}")
+
+    async def _renumber_queue(self, conn: aiosqlite.Connection, guild_id: int) -> None:
+        slots = await self._slots(conn, guild_id, offset=0, limit=-1)
+        await conn.executemany(
+            "UPDATE queue_tracks SET position = ? WHERE id = ?",
+            [(i * _POSITION_STEP, slot.id) for i, slot in enumerate(slots)],
+        )
+        logger.debug("Renumbered %s queued tracks for guild %s", len(slots), guild_id)
 
     async def delete(self, guild_id: int) -> bool:
         async with self._db.transaction() as conn:
@@ -172,13 +393,11 @@ class SQLiteSessionRepository(SessionRepository):
         return session
 
     async def get_all_active(self) -> list[GuildPlaybackSession]:
-        guild_ids = await self.get_all_guild_ids()
-        sessions = []
-        for guild_id in guild_ids:
-            session = await self.get(guild_id)
-            if session is not None:
-                sessions.append(session)
-        return sessions
+        rows = await self._db.fetch_all(f"{_SESSION_WITH_QUEUE_SQL} {_SESSION_WITH_QUEUE_ORDER}")
+        return [
+            self._hydrate(list(guild_rows))
+            for _, guild_rows in groupby(rows, key=itemgetter("guild_id"))
+        ]
 
     async def get_all_guild_ids(self) -> list[int]:
         rows = await self._db.fetch_all("SELECT guild_id FROM guild_sessions")
@@ -201,8 +420,8 @@ class SQLiteSessionRepository(SessionRepository):
             older_than = cutoff
 
         cursor = await self._db.execute(
-            "DELETE FROM guild_sessions WHERE last_activity < ?",
-            (older_than.isoformat(),),
+            "DELETE FROM guild_sessions WHERE last_activity_ms < ?",
+            (UtcDateTime(older_than).unix_millis,),
         )
         count = cursor.rowcount
 
@@ -212,7 +431,8 @@ class SQLiteSessionRepository(SessionRepository):
         return count
 
     async def update_activity(self, guild_id: int) -> None:
+        now = UtcDateTime.now()
         await self._db.execute(
-            "UPDATE guild_sessions SET last_activity = ? WHERE guild_id = ?",
-            (UtcDateTime.now().iso, guild_id),
+            "UPDATE guild_sessions SET last_activity = ?, last_activity_ms = ? WHERE guild_id = ?",
+            (now.iso, now.unix_millis, guild_id),
         )
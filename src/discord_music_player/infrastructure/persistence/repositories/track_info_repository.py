@@ -0,0 +1,132 @@
+"""SQLite second-tier cache for yt-dlp extraction results, keyed by video ID."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from pydantic import ValidationError
+
+from ....utils.logging import get_logger
+from ...audio.models import PersistedTrackInfo, YtDlpTrackInfo
+from ...metrics.instruments import timed_repository
+from ..queries import CountRow, Query
+
+if TYPE_CHECKING:
+    from ..database import Database
+
+logger = get_logger(__name__)
+
+# The signed stream lives in its own columns; formats are only needed to pick it.
+_VOLATILE_FIELDS = frozenset({"url", "formats"})
+
+
+class _CachedInfoRow(NamedTuple):
+    video_id: str
+    metadata_json: str
+    cached_at: float
+    stream_url: str | None
+    stream_expires_at: float | None
+
+
+_GET_CACHED_INFO: Final = Query(
+    """
+    SELECT video_id, metadata_json, cached_at, stream_url, stream_expires_at
+    FROM ytdlp_track_cache
+    WHERE video_id = ?
+    """,
+    _CachedInfoRow,
+)
+_COUNT_CACHED_INFO: Final = Query("SELECT COUNT(*) FROM ytdlp_track_cache", CountRow)
+
+
+@timed_repository
+class SQLiteTrackInfoCacheRepository:
+    def __init__(self, database: Database) -> None:
+        self._db = database
+
+    async def get(self, video_id: str) -> PersistedTrackInfo | None:
+        row = await self._db.fetch_row(_GET_CACHED_INFO, (video_id,))
+        if row is None:
+            return None
+
+        try:
+            return PersistedTrackInfo(
+                video_id=row.video_id,
+                metadata=YtDlpTrackInfo.model_validate_json(row.metadata_json),
+                cached_at=row.cached_at,
+                stream_url=row.stream_url,
+                stream_expires_at=row.stream_expires_at,
+            )
+        except ValidationError as e:
+            logger.warning("Dropping unreadable cached info for %s: %s", video_id, e)
+            await self.delete(video_id)
+            return None
+
+    async def save(
+        self,
+        video_id: str,
+        info: YtDlpTrackInfo,
+        *,
+        stream_url: str | None,
+        stream_expires_at: float | None,
+        cached_at: float | None = None,
+    ) -> None:
+        """Upsert metadata and the current stream URL for *video_id*."""
+        await self._db.execute(
+            """
+            INSERT INTO ytdlp_track_cache (
+                video_id, metadata_json, cached_at, stream_url, stream_expires_at
+            ) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(video_id) DO UPDATE SET
+                metadata_json = excluded.metadata_json,
+                cached_at = excluded.cached_at,
+                stream_url = excluded.stream_url,
+                stream_expires_at = excluded.stream_expires_at
+            """,
+            (
+                video_id,
+                info.model_dump_json(exclude=set(_VOLATILE_FIELDS)),
+                time.time() if cached_at is None else cached_at,
+                stream_url,
+                stream_expires_at,
+            ),
+        )
+
+    async def delete(self, video_id: str) -> bool:
+        cursor = await self._db.execute(
+            "DELETE FROM ytdlp_track_cache WHERE video_id = ?",
+            (video_id,),
+        )
+        return cursor.rowcount > 0
+
+    async def cleanup_expired(self, max_age_seconds: float) -> int:
+        """Delete entries whose metadata is older than *max_age_seconds*."""
+        cursor = await self._db.execute(
+            "DELETE FROM ytdlp_track_cache WHERE cached_at < ?",
+            (time.time() - max_age_seconds,),
+        )
+        return cursor.rowcount
+
+    async def prune(self, max_entries: int) -> int:
+        """Keep only the *max_entries* most recently extracted entries."""
+        count = await self.count()
+        if count <= max_entries:
+            return 0
+
+        cursor = await self._db.execute(
+            """
+            DELETE FROM ytdlp_track_cache
+            WHERE video_id IN (
+                SELECT video_id FROM ytdlp_track_cache
+                ORDER BY cached_at ASC
+                LIMIT ?
+            )
+            """,
+            (count - max_entries,),
+        )
+        return cursor.rowcount
+
+    async def count(self) -> int:
+        row = await self._db.fetch_row(_COUNT_CACHED_INFO)
+        return row.count if row else 0
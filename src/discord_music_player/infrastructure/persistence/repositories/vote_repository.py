@@ -10,6 +10,7 @@ from ....domain.voting.entities import VoteSession
 from ....domain.voting.enums import VoteType
 from ....domain.voting.repository import VoteSessionRepository
 from ....utils.logging import get_logger
+from ...metrics.instruments import timed_repository
 
 if TYPE_CHECKING:
     from ..database import Database
@@ -17,6 +18,7 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+@timed_repository
 class SQLiteVoteSessionRepository(VoteSessionRepository):
     def __init__(self, database: Database) -> None:
         self._db = database
@@ -56,7 +58,7 @@ class SQLiteVoteSessionRepository(VoteSessionRepository):
             "track_id": TrackId(value=row["track_id"]),
             "vote_type": VoteType(row["vote_type"]),
             "threshold": row["threshold"],
-            "started_at": UtcDateTime.from_iso(row["started_at"]).dt,
+            "started_at": UtcDateTime.from_unix_millis(row["started_at_ms"]).dt,
         }
         session = VoteSession(
             guild_id=guild_id,
@@ -110,18 +112,20 @@ class SQLiteVoteSessionRepository(VoteSessionRepository):
             )
             existing = await existing_row.fetchone()
 
+            started_at = UtcDateTime(session.started_at)
             if existing:
                 session_id = existing["id"]
                 await conn.execute(
                     """
                     UPDATE vote_sessions
-                    SET track_id = ?, threshold = ?, started_at = ?
+                    SET track_id = ?, threshold = ?, started_at = ?, started_at_ms = ?
                     WHERE id = ?
                     """,
                     (
                         session.track_id.value,
                         session.threshold,
-                        UtcDateTime(session.started_at).iso,
+                        started_at.iso,
+                        started_at.unix_millis,
                         session_id,
                     ),
                 )
@@ -132,15 +136,18 @@ class SQLiteVoteSessionRepository(VoteSessionRepository):
             else:
                 cursor = await conn.execute(
                     """
-                    INSERT INTO vote_sessions (guild_id, track_id, vote_type, threshold, started_at)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO vote_sessions (
+                        guild_id, track_id, vote_type, threshold, started_at, started_at_ms
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
                     """,
                     (
                         session.guild_id,
                         session.track_id.value,
                         session.vote_type.value,
                         session.threshold,
-                        UtcDateTime(session.started_at).iso,
+                        started_at.iso,
+                        started_at.unix_millis,
                     ),
                 )
                 session_id = cursor.lastrowid
@@ -203,14 +210,12 @@ class SQLiteVoteSessionRepository(VoteSessionRepository):
         from datetime import timedelta
 
         cutoff = UtcDateTime.now().dt - timedelta(minutes=VoteSession.DEFAULT_EXPIRATION_MINUTES)
-        cutoff_iso = UtcDateTime(cutoff).iso
-
         cursor = await self._db.execute(
             """
             DELETE FROM vote_sessions
-            WHERE completed_at IS NULL AND started_at < ?
+            WHERE completed_at IS NULL AND started_at_ms < ?
             """,
-            (cutoff_iso,),
+            (UtcDateTime(cutoff).unix_millis,),
         )
         count = cursor.rowcount
 
@@ -0,0 +1,374 @@
+"""Process-wide counters, gauges and histograms rendered in the Prometheus text format.
+
+Instruments are declared once at import time and resolve their label
+children up front (``labels(...)`` is a dict lookup after the first call),
+so recording on a hot path is a lock, an add and — for histograms — one
+bisect. Values that already live elsewhere (executor stats, event-bus
+histograms, queue sizes) are not duplicated: a *collector* callback reads
+them at scrape time and yields :class:`MetricFamily` snapshots instead.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, Final
+
+from ..domain.shared.enums import MetricType
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS_S: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+"""Default histogram upper bounds, in seconds."""
+
+CONTENT_TYPE: Final = "text/plain; version=0.0.4; charset=utf-8"
+
+type Labels = tuple[tuple[str, str], ...]
+type Collector = Callable[[], Iterable["MetricFamily"]]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+# ── Scrape-time snapshots ───────────────────────────────────────────
+
+
+class MetricFamily:
+    """One metric family's samples at scrape time.
+
+    Built by instruments when the registry renders, and by collectors for
+    values owned by other components.
+    """
+
+    __slots__ = ("name", "documentation", "type", "samples")
+
+    def __init__(self, name: str, documentation: str, type: MetricType) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.samples: list[tuple[str, Labels, float]] = []
+
+    def add(self, value: float, **labels: str) -> None:
+        """Add a counter or gauge sample."""
+        self.samples.append((self.name, tuple(labels.items()), value))
+
+    def add_histogram(
+        self,
+        buckets: Iterable[tuple[float, int]],
+        total: float,
+        **labels: str,
+    ) -> None:
+        """Add a histogram from ``(upper_bound, count)`` pairs that are *not* cumulative.
+
+        The last pair should use ``math.inf`` as its bound; the ``_count``
+        sample is the sum of all bucket counts.
+        """
+        base = tuple(labels.items())
+        cumulative = 0
+        for bound, count in buckets:
+            cumulative += count
+            le = (("le", _format_value(bound)),)
+            self.samples.append((f"{self.name}_bucket", base + le, cumulative))
+        self.samples.append((f"{self.name}_sum", base, total))
+        self.samples.append((f"{self.name}_count", base, cumulative))
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for name, labels, value in self.samples:
+            yield f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+
+# ── Instruments ─────────────────────────────────────────────────────
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def buckets(self) -> list[tuple[float, int]]:
+        with self._lock:
+            counts = list(self._counts)
+        return list(zip((*self._bounds, math.inf), counts, strict=True))
+
+
+class _Metric[ChildT](ABC):
+    """Shared label handling: one child per distinct label-value tuple."""
+
+    type: MetricType
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self) -> ChildT:
+        """Create the per-label-set child that holds this metric's value."""
+        ...
+
+    def labels(self, *values: str) -> ChildT:
+        """Return the child for *values*; bind it once and reuse it on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {len(values)} values"
+                )
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _labelled(self) -> list[tuple[Labels, ChildT]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(tuple(zip(self.labelnames, key, strict=True)), child) for key, child in items]
+
+    @abstractmethod
+    def collect(self) -> MetricFamily:
+        """Snapshot every child's samples for a scrape."""
+        ...
+
+
+class Counter(_Metric[_CounterChild]):
+    type = MetricType.COUNTER
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.documentation, self.type)
+        for labels, child in self._labelled():
+            family.samples.append((self.name, labels, child.value))
+        return family
+
+
+class Gauge(_Metric[_GaugeChild]):
+    type = MetricType.GAUGE
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.documentation, self.type)
+        for labels, child in self._labelled():
+            family.samples.append((self.name, labels, child.value))
+        return family
+
+
+class Histogram(_Metric[_HistogramChild]):
+    type = MetricType.HISTOGRAM
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS_S,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(b for b in buckets if not math.isinf(b)))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.documentation, self.type)
+        for labels, child in self._labelled():
+            family.add_histogram(child.buckets(), child.sum, **dict(labels))
+        return family
+
+
+# ── Registry ────────────────────────────────────────────────────────
+
+
+class MetricsRegistry:
+    """Named instruments plus scrape-time collectors, rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def _register[MetricT: _Metric[Any]](self, metric: MetricT) -> MetricT:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name!r} is already registered differently")
+                return existing  # type: ignore[return-value]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS_S,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                logger.warning("Metrics collector %r failed", collector, exc_info=True)
+        return families
+
+    def render(self) -> str:
+        """Every family in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for family in self.collect():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+_registry: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
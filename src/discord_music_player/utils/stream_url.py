@@ -0,0 +1,32 @@
+"""Helpers for signed media stream URLs (googlevideo and friends)."""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Final
+from urllib.parse import parse_qs, urlsplit
+
+# googlevideo also encodes signed parameters as path segments (``/expire/1700000000/``).
+_EXPIRE_PATH_PATTERN: Final[re.Pattern[str]] = re.compile(r"/expire/(\d+)(?:/|$)")
+
+
+def stream_url_expiry(url: str) -> float | None:
+    """Return the epoch time at which a signed stream URL expires, if it says."""
+    parts = urlsplit(url)
+    values = parse_qs(parts.query).get("expire")
+    raw = values[0] if values else None
+    if raw is None:
+        match = _EXPIRE_PATH_PATTERN.search(parts.path)
+        raw = match.group(1) if match else None
+    if raw is None or not raw.isdigit():
+        return None
+    return float(raw)
+
+
+def is_stream_url_stale(url: str, *, margin_seconds: float, now: float | None = None) -> bool:
+    """True when *url* expires within *margin_seconds* (URLs without an expiry never are)."""
+    expires_at = stream_url_expiry(url)
+    if expires_at is None:
+        return False
+    return expires_at - margin_seconds <= (time.time() if now is None else now)
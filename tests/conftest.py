@@ -180,9 +180,10 @@ class StubHistoryRepo:
 
     async def record_play(self, *, guild_id, track):
         self.plays.append((guild_id, track))
+        return len(self.plays)
 
-    async def mark_finished(self, *, guild_id, track_id, skipped):
-        self.marks_finished.append((guild_id, track_id, skipped))
+    async def mark_finished(self, *, guild_id, track_id, skipped, history_id=None):
+        self.marks_finished.append((guild_id, track_id, skipped, history_id))
 
 
 class StubVoiceAdapter:
@@ -249,7 +250,7 @@ class StubAudioResolver:
         self.raises = raises
         self.resolve_calls = []
 
-    async def resolve(self, query):
+    async def resolve(self, query, *, priority=None):
         self.resolve_calls.append(query)
         if self.raises:
             raise RuntimeError("StubAudioResolver.resolve forced error")
@@ -6,7 +6,7 @@ Tests for all prefix commands and functionality in the admin cog:
 - /reload, /reload_all - Cog management
 - /cache_status, /cache_clear, /cache_prune - Cache operations
 - /db_cleanup, /db_stats, /db_validate - Database operations
-- /status, /shutdown - System info and lifecycle
+- /status, /event_stats, /shutdown - System info and lifecycle
 - Permission checking (owner/admin only)
 - Error handling and validation
 - Discord context mocking
@@ -1031,6 +1031,46 @@ class TestSystemCommands:
         assert field_values["Cogs"] == "2"
         assert field_values["Environment"] == "testing"
 
+    @pytest.mark.asyncio
+    async def test_event_stats_lists_handlers_by_event(self, admin_cog, mock_owner_ctx):
+        """Should show one field per event type with handler latency."""
+        from discord_music_player.domain.music.wrappers import TrackId
+        from discord_music_player.domain.shared.events import (
+            TrackStartedPlaying,
+            get_event_bus,
+            reset_event_bus,
+        )
+
+        async def on_started(event):
+            pass
+
+        reset_event_bus()
+        try:
+            bus = get_event_bus()
+            bus.subscribe(TrackStartedPlaying, on_started)
+            await bus.publish(TrackStartedPlaying(guild_id=1, track_id=TrackId(value="t")))
+
+            await admin_cog.event_stats.callback(admin_cog, mock_owner_ctx)
+        finally:
+            reset_event_bus()
+
+        embed = mock_owner_ctx.send.call_args.kwargs["embed"]
+        fields = {f.name: f.value for f in embed.fields}
+        assert "Queues" in fields
+        assert "on_started" in fields["TrackStartedPlaying"]
+        assert "1 calls" in fields["TrackStartedPlaying"]
+
+    @pytest.mark.asyncio
+    async def test_event_stats_without_subscribers(self, admin_cog, mock_owner_ctx):
+        """Should say so when nothing is subscribed."""
+        from discord_music_player.domain.shared.events import reset_event_bus
+
+        reset_event_bus()
+        await admin_cog.event_stats.callback(admin_cog, mock_owner_ctx)
+
+        embed = mock_owner_ctx.send.call_args.kwargs["embed"]
+        assert any(f.value == "No subscribers." for f in embed.fields)
+
     @pytest.mark.asyncio
     async def test_shutdown_success(self, admin_cog, mock_admin_ctx, mock_bot, mock_container):
         """Should shutdown bot gracefully."""
@@ -1,5 +1,6 @@
 """Tests for analytics: repository queries, chart generator, genre classifier, genre repository, and cog commands."""
 
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
@@ -10,7 +11,13 @@ from discord.ext import commands
 from discord_music_player.domain.music.entities import Track
 from discord_music_player.domain.music.wrappers import TrackId
 from discord_music_player.domain.music.repository import TrackForClassification
+from discord_music_player.domain.shared.enums import LeaderboardTimeRange
 from discord_music_player.infrastructure.discord.cogs.analytics_cog import AnalyticsCog
+from discord_music_player.infrastructure.persistence.history_rollups import (
+    ROLLUP_TABLES,
+    rebuild_history_rollups,
+)
+from discord_music_player.infrastructure.persistence.models import HistoryRow
 from discord_music_player.infrastructure.persistence.repositories.history_repository import (
     GenreTrackInfo,
     UserStats,
@@ -168,6 +175,86 @@ class TestHistoryAnalytics:
         assert total == 6
 
 
+class TestHistoryRollups:
+    """The rollup tables stay equal to a from-scratch aggregation of track_history."""
+
+    async def _snapshot(self, database):
+        snapshot = {}
+        for table in ROLLUP_TABLES:
+            rows = await database.fetch_all(f"SELECT * FROM {table}")
+            snapshot[table] = sorted(tuple(sorted(row.items())) for row in rows)
+        return snapshot
+
+    async def _assert_matches_rebuild(self, database):
+        incremental = await self._snapshot(database)
+        async with database.transaction() as conn:
+            await rebuild_history_rollups(conn)
+        assert await self._snapshot(database) == incremental
+
+    async def test_incremental_writes_match_rebuild(
+        self, history_repository, in_memory_database, make_track
+    ):
+        t1 = make_track("t1", "Rock Anthem", "Band A", 200, 100, "Alice")
+        t2 = make_track("t2", "Pop Hit", "Singer B", 180, None, None)
+        old = datetime.now(UTC) - timedelta(days=40)
+
+        await history_repository.record_play(1, t1, played_at=old)
+        first = await history_repository.record_play(1, t1)
+        await history_repository.record_play(1, t2)
+        await history_repository.mark_finished(1, t2.id, skipped=True)
+        await history_repository.mark_finished(1, t1.id, skipped=True, history_id=first)
+        await history_repository.mark_finished(1, t1.id, skipped=False, history_id=first)
+        await history_repository.record_batch(
+            [HistoryRow.from_track(t2, guild_id=2, played_at=datetime.now(UTC))]
+        )
+
+        await self._assert_matches_rebuild(in_memory_database)
+        assert await history_repository.get_skip_rate(1) == 1 / 3
+
+    async def test_cleanup_prunes_emptied_buckets(
+        self, history_repository, in_memory_database, make_track
+    ):
+        t1 = make_track("t1", "Rock Anthem")
+        await history_repository.record_play(
+            1, t1, played_at=datetime.now(UTC) - timedelta(days=60)
+        )
+
+        assert await history_repository.cleanup_old(datetime.now(UTC) - timedelta(days=30)) == 1
+
+        assert await history_repository.get_most_played(1) == []
+        assert await history_repository.get_top_requesters(1) == []
+        await self._assert_matches_rebuild(in_memory_database)
+
+    async def test_clear_history_clears_rollups(self, history_repository, make_track):
+        await history_repository.record_play(1, make_track())
+
+        await history_repository.clear_history(1)
+
+        assert await history_repository.get_total_tracks(1) == 0
+        assert await history_repository.get_unique_tracks(1) == 0
+
+    async def test_time_ranged_leaderboards_ignore_older_days(self, history_repository, make_track):
+        t1 = make_track("t1", "Old Favourite", requester_id=100, requester_name="Alice")
+        t2 = make_track("t2", "New Single", requester_id=200, requester_name="Bob")
+        long_ago = datetime.now(UTC) - timedelta(days=20)
+        for _ in range(3):
+            await history_repository.record_play(1, t1, played_at=long_ago)
+        await history_repository.record_play(1, t2)
+        await history_repository.mark_finished(1, t2.id, skipped=True)
+
+        week = LeaderboardTimeRange.LAST_7_DAYS
+        tracks = await history_repository.get_most_played_since(1, week)
+        assert [(track.title, count) for track, count in tracks] == [("New Single", 1)]
+        assert await history_repository.get_top_requesters_since(1, week) == [(200, "Bob", 1)]
+        assert await history_repository.get_most_skipped_since(1, week) == [("New Single", 1)]
+
+        all_time = await history_repository.get_most_played_since(1, LeaderboardTimeRange.ALL_TIME)
+        assert [(track.title, count) for track, count in all_time] == [
+            ("Old Favourite", 3),
+            ("New Single", 1),
+        ]
+
+
 # ============================================================================
 # Genre Repository Tests
 # ============================================================================
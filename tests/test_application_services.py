@@ -8,6 +8,7 @@ Tests for:
 Uses mocking to isolate from infrastructure dependencies.
 """
 
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -1160,6 +1161,56 @@ class TestPlaybackApplicationServiceHandleTrackFinished:
 
         mock_session_repo.save.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_handle_track_finished_traces_queue_empty(
+        self, service, mock_session_repo, sample_track
+    ):
+        """Should close the open transition as queue-empty with its stages."""
+        from discord_music_player.domain.shared.enums import (
+            TransitionOutcome,
+            TransitionStage,
+        )
+
+        session = GuildPlaybackSession(guild_id=123456)
+        session.current_track = sample_track
+        mock_session_repo.get.return_value = session
+        service._tracer.begin(123456)
+
+        await service.handle_track_finished(guild_id=123456, track=sample_track)
+
+        (trace,) = service._tracer.recent(123456)
+        assert trace.outcome == TransitionOutcome.QUEUE_EMPTY
+        assert [t.stage for t in trace.stages] == [
+            TransitionStage.SESSION_ADVANCE,
+            TransitionStage.HISTORY_UPDATE,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_handle_track_finished_traces_failed_start(
+        self, service, mock_session_repo, mock_voice_adapter, sample_track
+    ):
+        """Should close the open transition as failed when the next track won't play."""
+        from discord_music_player.domain.shared.enums import TransitionOutcome
+
+        session = GuildPlaybackSession(guild_id=123456)
+        next_track = Track(
+            id=TrackId(value="next"),
+            title="Next Track",
+            webpage_url="https://youtube.com/watch?v=next",
+            stream_url="https://stream.example.com/next",
+        )
+        session.current_track = sample_track
+        session.enqueue(next_track)
+        mock_session_repo.get.return_value = session
+        mock_voice_adapter.play.return_value = False
+        service._tracer.begin(123456)
+
+        await service.handle_track_finished(guild_id=123456, track=sample_track)
+
+        (trace,) = service._tracer.recent(123456)
+        assert trace.outcome == TransitionOutcome.FAILED
+        assert not service._tracer.in_progress(123456)
+
     @pytest.mark.asyncio
     async def test_handle_track_finished_calls_sync_callback(
         self, service, mock_session_repo, sample_track
@@ -1274,9 +1325,7 @@ class TestPlaybackApplicationServiceEnsureStreamUrl:
     @pytest.mark.asyncio
     async def test_ensure_stream_url_already_has_url(self, service, track_with_stream):
         """Should return track unchanged if it has stream URL."""
-        session = GuildPlaybackSession(guild_id=123456)
-
-        result = await service._ensure_stream_url(session, track_with_stream, 123456)
+        result = await service._ensure_stream_url(track_with_stream, 123456)
 
         assert result == track_with_stream
 
@@ -1285,8 +1334,6 @@ class TestPlaybackApplicationServiceEnsureStreamUrl:
         self, service, mock_audio_resolver, track_without_stream
     ):
         """Should resolve stream URL when not present."""
-        session = GuildPlaybackSession(guild_id=123456)
-
         # Resolved Track with stream URL and metadata
         resolved = Track(
             id=TrackId(value="resolved123"),
@@ -1298,7 +1345,7 @@ class TestPlaybackApplicationServiceEnsureStreamUrl:
         )
         mock_audio_resolver.resolve.return_value = resolved
 
-        result = await service._ensure_stream_url(session, track_without_stream, 123456)
+        result = await service._ensure_stream_url(track_without_stream, 123456)
         assert result is not None
         assert result.stream_url == "https://resolved.stream.com/audio"
         assert result.title == "Resolved Title"
@@ -1312,7 +1359,7 @@ class TestPlaybackApplicationServiceEnsureStreamUrl:
         mock_audio_resolver.resolve.return_value = None
         mock_session_repo.get.return_value = session
 
-        result = await service._ensure_stream_url(session, track_without_stream, 123456)
+        result = await service._ensure_stream_url(track_without_stream, 123456)
 
         assert result is None
         mock_session_repo.save.assert_called_once()
@@ -1326,11 +1373,60 @@ class TestPlaybackApplicationServiceEnsureStreamUrl:
         mock_audio_resolver.resolve.side_effect = Exception("Network error")
         mock_session_repo.get.return_value = session
 
-        result = await service._ensure_stream_url(session, track_without_stream, 123456)
+        result = await service._ensure_stream_url(track_without_stream, 123456)
 
         assert result is None
         mock_session_repo.save.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_ensure_stream_url_re_resolves_expiring_url(
+        self, service, mock_audio_resolver, track_with_stream
+    ):
+        """Should not reuse a signed URL that would expire before the track ends."""
+        expire = int(time.time()) + 60
+        expiring = track_with_stream.model_copy(
+            update={"stream_url": f"https://rr1.googlevideo.com/videoplayback?expire={expire}"}
+        )
+        mock_audio_resolver.resolve.return_value = track_with_stream
+
+        result = await service._ensure_stream_url(expiring, 123456)
+
+        assert result is not None
+        assert result.stream_url == track_with_stream.stream_url
+        mock_audio_resolver.resolve.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ensure_stream_url_prefers_prefetched_stream(
+        self,
+        mock_session_repo,
+        mock_history_repo,
+        mock_voice_adapter,
+        mock_audio_resolver,
+        track_without_stream,
+        track_with_stream,
+    ):
+        """Should take the prefetched stream instead of resolving."""
+        from discord_music_player.application.services.playback_service import (
+            PlaybackApplicationService,
+        )
+
+        prefetcher = MagicMock()
+        prefetcher.take.return_value = track_with_stream
+        service = PlaybackApplicationService(
+            session_repository=mock_session_repo,
+            history_repository=mock_history_repo,
+            voice_adapter=mock_voice_adapter,
+            audio_resolver=mock_audio_resolver,
+            stream_prefetcher=prefetcher,
+        )
+
+        result = await service._ensure_stream_url(track_without_stream, 123456)
+
+        assert result is not None
+        assert result.stream_url == track_with_stream.stream_url
+        prefetcher.take.assert_called_once_with(123456, track_without_stream)
+        mock_audio_resolver.resolve.assert_not_awaited()
+
 
 class TestPlaybackApplicationServiceStartVoicePlayback:
     """Unit tests for PlaybackApplicationService._start_voice_playback method."""
@@ -1396,7 +1492,7 @@ class TestPlaybackApplicationServiceStartVoicePlayback:
         mock_session_repo.get.return_value = session
         mock_voice_adapter.play.return_value = True
 
-        result = await service._start_voice_playback(session, sample_track, 123456)
+        result = await service._start_voice_playback(sample_track, 123456)
 
         assert result is True
         mock_voice_adapter.play.assert_called_once_with(123456, sample_track, start_seconds=None)
@@ -1411,7 +1507,7 @@ class TestPlaybackApplicationServiceStartVoicePlayback:
         mock_session_repo.get.return_value = session
         mock_voice_adapter.play.return_value = False
 
-        result = await service._start_voice_playback(session, sample_track, 123456)
+        result = await service._start_voice_playback(sample_track, 123456)
 
         assert result is False
 
@@ -1424,7 +1520,7 @@ class TestPlaybackApplicationServiceStartVoicePlayback:
         mock_session_repo.get.return_value = session
         mock_voice_adapter.play.side_effect = Exception("Voice error")
 
-        result = await service._start_voice_playback(session, sample_track, 123456)
+        result = await service._start_voice_playback(sample_track, 123456)
 
         assert result is False
 
@@ -1960,6 +2056,36 @@ class TestPlaybackExceptionPaths:
         assert 1 not in svc._ignore_next_voice_track_end
 
 
+# --- history row ids -------------------------------------------------------
+
+
+class TestHistoryRowIds:
+    @pytest.mark.asyncio
+    async def test_finish_and_skip_update_the_recorded_row(self):
+        from discord_music_player.domain.music.entities import GuildPlaybackSession
+
+        first, second, third = _make_track("a"), _make_track("b"), _make_track("c")
+        session = GuildPlaybackSession(guild_id=1)
+        session.queue.extend([first, second, third])
+        repo = StubSessionRepo()
+        repo.seed(session)
+        history = StubHistoryRepo()
+        svc = _make_service(session_repo=repo, history_repo=history)
+
+        assert await svc.start_playback(guild_id=1) is True
+        await svc.handle_track_finished(guild_id=1, track=first)
+        await svc.skip_track(guild_id=1)
+
+        assert history.marks_finished == [
+            (1, first.id, False, 1),
+            (1, second.id, True, 2),
+        ]
+        assert svc._history_ids == {1: 3}
+
+        assert await svc.stop_playback(guild_id=1) is True
+        assert svc._history_ids == {}
+
+
 # --- _persist_playback_state and helpers -----------------------------------
 
 
@@ -1973,24 +2099,6 @@ class TestPersistPlaybackState:
         await svc._persist_playback_state(guild_id=1, current_track=None)
         assert repo.save_calls == []
 
-    @pytest.mark.asyncio
-    async def test_remove_from_queue_when_track_absent_logs_warning(self, caplog):
-        from discord_music_player.domain.music.entities import GuildPlaybackSession
-
-        session = GuildPlaybackSession(guild_id=1)
-        repo = StubSessionRepo()
-        repo.seed(session)
-        svc = _make_service(session_repo=repo)
-
-        target = _make_track("not-in-queue")
-        with caplog.at_level("WARNING"):
-            await svc._persist_playback_state(
-                guild_id=1, current_track=target, remove_from_queue=True
-            )
-
-        assert "Expected track not found" in caplog.text
-        assert repo.save_calls  # still saves
-
     @pytest.mark.asyncio
     async def test_invalid_state_transition_logs_warning_and_skips(self, caplog):
         from discord_music_player.domain.music.entities import GuildPlaybackSession
@@ -2012,53 +2120,6 @@ class TestPersistPlaybackState:
         assert repo._sessions[1].state == PlaybackState.IDLE
 
 
-class TestTrackMatching:
-    def test_tracks_match_uses_id_and_requested_at_when_present(self):
-        from datetime import UTC, datetime
-
-        svc = _make_service()
-        ts = datetime(2026, 1, 1, tzinfo=UTC)
-        a = Track(
-            id=TrackId(value="x"),
-            title="x",
-            webpage_url="https://yt/x",
-            requested_by_id=1,
-            requested_at=ts,
-        )
-        b = a.model_copy()
-        c = a.model_copy(update={"requested_at": datetime(2026, 1, 2, tzinfo=UTC)})
-
-        assert svc._tracks_match(a, b) is True
-        assert svc._tracks_match(a, c) is False
-
-    def test_tracks_match_falls_back_to_url_and_requester(self):
-        svc = _make_service()
-        a = Track(
-            id=TrackId(value="x"),
-            title="x",
-            webpage_url="https://yt/x",
-            requested_by_id=1,
-        )
-        b = a.model_copy()
-        d = a.model_copy(update={"requested_by_id": 2})
-
-        assert svc._tracks_match(a, b) is True
-        assert svc._tracks_match(a, d) is False
-
-    def test_remove_first_matching_returns_false_on_empty_queue(self):
-        svc = _make_service()
-        target = _make_track("x")
-        assert svc._remove_first_matching_track([], target) is False
-
-    def test_remove_first_matching_pops_match(self):
-        svc = _make_service()
-        a = _make_track("a")
-        b = _make_track("b")
-        queue = [a, b]
-        assert svc._remove_first_matching_track(queue, b) is True
-        assert queue == [a]
-
-
 # =============================================================================
 # QueueApplicationService — branches the existing tests don't reach.
 # =============================================================================
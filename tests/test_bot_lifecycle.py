@@ -79,6 +79,8 @@ def mock_settings():
     settings.discord.command_prefix = "!"
     settings.discord.sync_on_startup = False
     settings.discord.test_guild_ids = []
+    settings.discord.resume_concurrency = 4
+    settings.discord.resume_connect_interval_s = 0.0
     return settings
 
 
@@ -1416,3 +1418,81 @@ class TestResumeSessionsIntegration:
                 await bot._resume_sessions()
 
         assert mock_try.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resumes_guilds_concurrently_within_limit(self, mock_container, mock_settings):
+        """Should overlap resumes but never exceed resume_concurrency."""
+        from discord_music_player.infrastructure.discord.bot import MusicBot
+
+        sessions = [
+            _make_session(guild_id=gid, state="playing", with_track=True) for gid in range(1, 11)
+        ]
+        mock_container.session_repository.get_all_active.return_value = sessions
+        mock_settings.discord.resume_concurrency = 3
+        bot = MusicBot(container=mock_container, settings=mock_settings)
+
+        in_flight = peak = 0
+
+        async def slow_resume(session, guild):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        with patch.object(bot, "get_guild", side_effect=lambda gid: _make_guild_mock(gid)):
+            with patch.object(bot, "_try_resume_session", side_effect=slow_resume):
+                await bot._resume_sessions()
+
+        assert peak == 3
+        assert bot.recovery.resumed == 10
+        assert bot.recovery.done is True
+
+    @pytest.mark.asyncio
+    async def test_one_failing_guild_does_not_stop_recovery(self, mock_container, mock_settings):
+        """Should count a failed guild and still recover the others."""
+        from discord_music_player.infrastructure.discord.bot import MusicBot
+
+        session1 = _make_session(guild_id=111, state="playing", with_track=True)
+        session2 = _make_session(guild_id=222, state="playing", with_track=True)
+        mock_container.session_repository.get_all_active.return_value = [session1, session2]
+        bot = MusicBot(container=mock_container, settings=mock_settings)
+
+        async def resume(session, guild):
+            if session.guild_id == 111:
+                raise RuntimeError("gateway closed")
+            return True
+
+        with patch.object(bot, "get_guild", side_effect=lambda gid: _make_guild_mock(gid)):
+            with patch.object(bot, "_try_resume_session", side_effect=resume):
+                await bot._resume_sessions()
+
+        assert bot.recovery.failed == 1
+        assert bot.recovery.resumed == 1
+        assert bot.recovery.processed == bot.recovery.total == 2
+
+
+class TestConnectStagger:
+    """Tests for ConnectStagger voice-connect pacing."""
+
+    @pytest.mark.asyncio
+    async def test_spaces_concurrent_waiters(self):
+        """Should release concurrent waiters at least one interval apart."""
+        import time
+
+        from discord_music_player.infrastructure.discord.services.session_recovery import (
+            ConnectStagger,
+        )
+
+        stagger = ConnectStagger(0.05)
+        released: list[float] = []
+
+        async def waiter():
+            await stagger.wait()
+            released.append(time.monotonic())
+
+        await asyncio.gather(*(waiter() for _ in range(3)))
+
+        gaps = [b - a for a, b in zip(released[:-1], released[1:], strict=True)]
+        assert all(gap >= 0.04 for gap in gaps)
@@ -0,0 +1,186 @@
+"""Tests for the write-behind track history buffer."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.datetime_utils import utcnow
+from discord_music_player.infrastructure.persistence.models import HistoryRow
+from discord_music_player.infrastructure.persistence.repositories.buffered_history_repository import (
+    BufferedHistoryRepository,
+)
+
+GUILD_ID = 42
+
+
+@pytest.fixture
+def buffered_repo(history_repository):
+    return BufferedHistoryRepository(history_repository, flush_interval=60.0, max_pending=3)
+
+
+async def _history_rows(database) -> list[dict]:
+    return await database.fetch_all("SELECT * FROM track_history ORDER BY id")
+
+
+class TestBuffering:
+    async def test_play_is_not_written_until_flush(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        assert await buffered_repo.record_play(GUILD_ID, sample_track) is None
+
+        assert await _history_rows(in_memory_database) == []
+        assert buffered_repo.stats().pending_plays == 1
+
+        await buffered_repo.flush()
+
+        rows = await _history_rows(in_memory_database)
+        assert [row["track_id"] for row in rows] == [sample_track.id.value]
+        assert buffered_repo.pending == 0
+
+    async def test_reads_flush_first(self, buffered_repo, sample_track):
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+
+        assert await buffered_repo.get_total_tracks(GUILD_ID) == 1
+
+    async def test_finish_of_buffered_play_is_coalesced(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        buffered_repo.backend.record_batch = AsyncMock(wraps=buffered_repo.backend.record_batch)
+
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+        await buffered_repo.mark_finished(GUILD_ID, sample_track.id, skipped=True)
+        await buffered_repo.flush()
+
+        plays, finishes = buffered_repo.backend.record_batch.await_args.args
+        assert len(plays) == 1 and list(finishes) == []
+        rows = await _history_rows(in_memory_database)
+        assert len(rows) == 1
+        assert rows[0]["finished_at"] is not None
+        assert rows[0]["skipped"] == 1
+        assert buffered_repo.stats().coalesced == 1
+
+    async def test_finish_after_flush_updates_by_row_id(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        other = sample_track.model_copy(update={"id": TrackId(value="other")})
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+        await buffered_repo.record_play(GUILD_ID + 1, other)
+        await buffered_repo.flush()
+
+        await buffered_repo.mark_finished(GUILD_ID, sample_track.id)
+        assert buffered_repo._finishes[0].history_id is not None
+        await buffered_repo.flush()
+
+        rows = {row["track_id"]: row for row in await _history_rows(in_memory_database)}
+        assert rows[sample_track.id.value]["finished_at"] is not None
+        assert rows["other"]["finished_at"] is None
+
+    async def test_next_play_forgets_an_unfinished_row_id(self, buffered_repo, sample_track):
+        other = sample_track.model_copy(update={"id": TrackId(value="other")})
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+        await buffered_repo.record_play(GUILD_ID + 1, sample_track)
+        await buffered_repo.flush()
+        assert len(buffered_repo._row_ids) == 2
+
+        await buffered_repo.record_play(GUILD_ID, other)
+        assert GUILD_ID not in buffered_repo._row_ids
+
+        await buffered_repo.clear_history(GUILD_ID + 1)
+        assert GUILD_ID + 1 not in buffered_repo._row_ids
+
+    async def test_finish_without_known_play_falls_back_to_latest(
+        self, buffered_repo, history_repository, in_memory_database, sample_track
+    ):
+        await history_repository.record_play(GUILD_ID, sample_track)
+
+        await buffered_repo.mark_finished(GUILD_ID, sample_track.id)
+        assert buffered_repo._finishes[0].history_id is None
+        await buffered_repo.flush()
+
+        rows = await _history_rows(in_memory_database)
+        assert rows[0]["finished_at"] is not None
+
+
+class TestFlushing:
+    async def test_reaching_max_pending_wakes_the_flusher(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        buffered_repo.start()
+        try:
+            for i in range(3):
+                track = sample_track.model_copy(update={"id": TrackId(value=f"t{i}")})
+                await buffered_repo.record_play(GUILD_ID, track)
+
+            for _ in range(50):
+                if buffered_repo.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert len(await _history_rows(in_memory_database)) == 3
+        finally:
+            await buffered_repo.close()
+
+    async def test_close_flushes_pending_events(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        buffered_repo.start()
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+
+        await buffered_repo.close()
+
+        assert len(await _history_rows(in_memory_database)) == 1
+
+    async def test_failed_flush_requeues_batch(
+        self, buffered_repo, in_memory_database, sample_track
+    ):
+        real_record_batch = buffered_repo.backend.record_batch
+        buffered_repo.backend.record_batch = AsyncMock(side_effect=RuntimeError("disk full"))
+
+        await buffered_repo.record_play(GUILD_ID, sample_track)
+        with pytest.raises(RuntimeError):
+            await buffered_repo.flush()
+        assert buffered_repo.pending == 1
+
+        # The play is still open, so its finish is folded in once writes recover.
+        await buffered_repo.mark_finished(GUILD_ID, sample_track.id)
+        buffered_repo.backend.record_batch = real_record_batch
+        await buffered_repo.flush()
+
+        rows = await _history_rows(in_memory_database)
+        assert len(rows) == 1
+        assert rows[0]["finished_at"] is not None
+
+
+class TestSQLiteRowIds:
+    async def test_record_play_returns_row_id(self, history_repository, sample_track):
+        first = await history_repository.record_play(GUILD_ID, sample_track)
+        second = await history_repository.record_play(GUILD_ID, sample_track)
+
+        assert second == first + 1
+
+    async def test_mark_finished_by_history_id_targets_that_row(
+        self, history_repository, in_memory_database, sample_track
+    ):
+        first = await history_repository.record_play(GUILD_ID, sample_track)
+        await history_repository.record_play(GUILD_ID, sample_track)
+
+        await history_repository.mark_finished(GUILD_ID, sample_track.id, history_id=first)
+
+        rows = await _history_rows(in_memory_database)
+        assert rows[0]["finished_at"] is not None
+        assert rows[1]["finished_at"] is None
+
+    async def test_record_batch_returns_ids_in_order(self, history_repository, sample_track):
+        plays = [
+            HistoryRow.from_track(sample_track, guild_id=GUILD_ID, played_at=utcnow())
+            for _ in range(3)
+        ]
+        before = await history_repository.record_play(GUILD_ID, sample_track)
+
+        ids = await history_repository.record_batch(plays)
+
+        assert ids == [before + 1, before + 2, before + 3]
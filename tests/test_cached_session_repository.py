@@ -0,0 +1,136 @@
+"""Tests for the write-through session cache."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from discord_music_player.domain.music.entities import GuildPlaybackSession
+from discord_music_player.infrastructure.persistence.repositories.cached_session_repository import (
+    CachedSessionRepository,
+)
+
+
+@pytest.fixture
+def cached_repo(session_repository):
+    return CachedSessionRepository(session_repository)
+
+
+class TestReads:
+    async def test_second_get_is_served_from_memory(self, cached_repo, sample_session):
+        await cached_repo.save(sample_session)
+        cached_repo.invalidate_all()
+
+        cached_repo.backend.get = AsyncMock(wraps=cached_repo.backend.get)
+        first = await cached_repo.get(sample_session.guild_id)
+        second = await cached_repo.get(sample_session.guild_id)
+
+        assert first is not None and second is not None
+        assert first.current_track.webpage_url == sample_session.current_track.webpage_url
+        cached_repo.backend.get.assert_awaited_once()
+        stats = cached_repo.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.hit_rate == 0.5
+
+    async def test_missing_guild_is_remembered(self, cached_repo):
+        cached_repo.backend.get = AsyncMock(return_value=None)
+
+        assert await cached_repo.get(1) is None
+        assert await cached_repo.get(1) is None
+        assert await cached_repo.exists(1) is False
+        cached_repo.backend.get.assert_awaited_once()
+
+    async def test_absent_guilds_are_bounded(self, cached_repo, monkeypatch):
+        monkeypatch.setattr(
+            "discord_music_player.infrastructure.persistence.repositories."
+            "cached_session_repository._MAX_ABSENT",
+            2,
+        )
+        cached_repo.backend.get = AsyncMock(return_value=None)
+
+        for guild_id in (1, 2, 3):
+            await cached_repo.get(guild_id)
+        await cached_repo.get(1)
+
+        assert list(cached_repo._absent) == [3, 1]
+        assert cached_repo.backend.get.await_count == 4
+
+    async def test_callers_get_isolated_copies(self, cached_repo, sample_track):
+        await cached_repo.save(GuildPlaybackSession(guild_id=3))
+
+        session = await cached_repo.get(3)
+        session.enqueue(sample_track)
+
+        fresh = await cached_repo.get(3)
+        assert fresh.queue_length == 0
+
+
+class TestWrites:
+    async def test_save_writes_through(self, cached_repo, session_repository, sample_session):
+        await cached_repo.save(sample_session)
+
+        persisted = await session_repository.get(sample_session.guild_id)
+        assert persisted is not None
+        assert persisted.current_track.webpage_url == sample_session.current_track.webpage_url
+        assert cached_repo.stats().writes == 1
+
+    async def test_save_after_absent_lookup_is_visible(self, cached_repo):
+        assert await cached_repo.get(5) is None
+        await cached_repo.save(GuildPlaybackSession(guild_id=5))
+        assert await cached_repo.get(5) is not None
+
+    async def test_failed_write_evicts_entry(self, cached_repo, sample_session):
+        cached_repo.backend.save = AsyncMock(side_effect=RuntimeError("disk full"))
+
+        with pytest.raises(RuntimeError):
+            await cached_repo.save(sample_session)
+
+        assert cached_repo.stats().size == 0
+
+    async def test_delete_removes_from_cache_and_backend(self, cached_repo, sample_session):
+        await cached_repo.save(sample_session)
+
+        assert await cached_repo.delete(sample_session.guild_id) is True
+        assert await cached_repo.get(sample_session.guild_id) is None
+        assert await cached_repo.backend.get(sample_session.guild_id) is None
+
+    async def test_get_or_create_persists_new_session(self, cached_repo):
+        session = await cached_repo.get_or_create(77)
+
+        assert session.guild_id == 77
+        assert await cached_repo.backend.exists(77)
+
+
+class TestMaintenance:
+    async def test_cleanup_stale_evicts_old_entries(self, cached_repo):
+        old = GuildPlaybackSession(guild_id=1)
+        old.last_activity = datetime.now(UTC) - timedelta(hours=48)
+        await cached_repo.save(old)
+        await cached_repo.save(GuildPlaybackSession(guild_id=2))
+
+        removed = await cached_repo.cleanup_stale(max_age_hours=24)
+
+        assert removed == 1
+        assert await cached_repo.get(1) is None
+        assert await cached_repo.get(2) is not None
+
+    async def test_get_all_active_populates_cache(
+        self, cached_repo, session_repository, sample_session
+    ):
+        await session_repository.save(sample_session)
+
+        sessions = await cached_repo.get_all_active()
+
+        assert [s.guild_id for s in sessions] == [sample_session.guild_id]
+        assert cached_repo.stats().size == 1
+
+    async def test_invalidate_forces_reload(self, cached_repo, session_repository, sample_session):
+        await cached_repo.save(sample_session)
+        await session_repository.delete(sample_session.guild_id)
+
+        assert await cached_repo.get(sample_session.guild_id) is not None
+        cached_repo.invalidate(sample_session.guild_id)
+        assert await cached_repo.get(sample_session.guild_id) is None
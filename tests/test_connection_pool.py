@@ -0,0 +1,165 @@
+"""Tests for the pooled connection layer behind Database."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from discord_music_player.config.settings import DatabaseSettings
+from discord_music_player.infrastructure.persistence.connection_pool import (
+    ConnectionPool,
+    PoolTimeoutError,
+)
+from discord_music_player.infrastructure.persistence.database import Database
+
+
+@pytest_asyncio.fixture
+async def file_database(tmp_path):
+    settings = DatabaseSettings(url=f"sqlite:///{tmp_path / 'bot.db'}", pool_size=2)
+    db = Database(settings.url, settings=settings)
+    await db.initialize()
+    yield db
+    await db.close()
+
+
+class TestDatabasePooling:
+    async def test_connections_are_reused_across_operations(self, file_database):
+        for _ in range(20):
+            await file_database.fetch_one("SELECT COUNT(*) AS n FROM guild_sessions")
+            await file_database.execute(
+                "INSERT OR REPLACE INTO guild_sessions (guild_id, state) VALUES (?, ?)",
+                (1, "idle"),
+            )
+
+        stats = (await file_database.get_stats()).pool
+        assert stats is not None
+        # One writer plus at most pool_size readers, however many operations ran.
+        assert stats.connections_created <= 1 + 2
+        assert stats.read_acquisitions >= 20
+        assert stats.write_acquisitions >= 20
+
+    async def test_concurrent_reads_bounded_by_pool_size(self, file_database):
+        async def read() -> None:
+            async with file_database.connection() as conn:
+                await asyncio.sleep(0.01)
+                await conn.execute("SELECT 1")
+
+        await asyncio.gather(*(read() for _ in range(10)))
+
+        stats = (await file_database.get_stats()).pool
+        assert stats is not None
+        assert stats.readers_open <= 2
+        assert stats.waits > 0
+        assert stats.readers_in_use == 0
+
+    async def test_reader_sees_committed_writes(self, file_database):
+        await file_database.execute(
+            "INSERT INTO guild_sessions (guild_id, state) VALUES (?, ?)", (42, "idle")
+        )
+        row = await file_database.fetch_one(
+            "SELECT state FROM guild_sessions WHERE guild_id = ?", (42,)
+        )
+        assert row == {"state": "idle"}
+
+    async def test_reader_transaction_is_rolled_back_on_release(self, file_database):
+        async with file_database.connection() as conn:
+            await conn.execute(
+                "INSERT INTO guild_sessions (guild_id, state) VALUES (?, ?)", (7, "idle")
+            )
+
+        assert (
+            await file_database.fetch_one("SELECT 1 FROM guild_sessions WHERE guild_id = ?", (7,))
+            is None
+        )
+
+    async def test_health_check_drops_dead_reader(self, file_database):
+        async with file_database.connection() as conn:
+            dead = conn
+        await dead.close()
+
+        dropped = await file_database.health_check()
+        assert dropped == 1
+
+        # Pool transparently opens a replacement.
+        assert await file_database.fetch_one("SELECT 1 AS ok") == {"ok": 1}
+
+    async def test_reinitialize_after_close(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'again.db'}")
+        await db.initialize()
+        await db.close()
+        await db.initialize()
+        assert await db.fetch_one("SELECT 1 AS ok") == {"ok": 1}
+        await db.close()
+
+
+class TestConnectionPool:
+    async def test_memory_pool_routes_reads_through_writer(self, in_memory_database):
+        stats = (await in_memory_database.get_stats()).pool
+        assert stats is not None
+        assert stats.max_readers == 0
+        assert stats.readers_open == 0
+        assert stats.writer_open is True
+
+    async def test_writer_acquire_timeout(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'timeout.db'}")
+        pool = ConnectionPool(db._connect, max_readers=1, acquire_timeout=0.05)
+
+        async with pool.writer():
+            with pytest.raises(PoolTimeoutError):
+                async with pool.writer():
+                    pass
+
+        assert pool.stats().timeouts == 1
+        await pool.close()
+
+    async def test_reader_acquire_timeout(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'timeout.db'}")
+        pool = ConnectionPool(db._connect, max_readers=1, acquire_timeout=0.05)
+
+        async with pool.reader():
+            with pytest.raises(PoolTimeoutError):
+                async with pool.reader():
+                    pass
+
+        stats = pool.stats()
+        assert stats.timeouts == 1
+        assert stats.read_acquisitions == 1
+        await pool.close()
+
+    async def test_dropped_reader_frees_its_slot_for_a_waiter(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'replace.db'}")
+        pool = ConnectionPool(db._connect, max_readers=1, acquire_timeout=5)
+        waiter_started = asyncio.Event()
+
+        async def waiter():
+            waiter_started.set()
+            async with pool.reader() as conn:
+                return conn
+
+        with pytest.raises(RuntimeError):
+            async with pool.reader() as broken:
+                task = asyncio.create_task(waiter())
+                await waiter_started.wait()
+                await asyncio.sleep(0)
+                await broken.close()
+                raise RuntimeError("connection died")
+
+        async with asyncio.timeout(1):
+            replacement = await task
+
+        assert replacement is not broken
+        stats = pool.stats()
+        assert stats.connections_replaced == 1
+        assert stats.read_acquisitions == 2
+        await pool.close()
+
+    async def test_closed_pool_rejects_acquire(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'closed.db'}")
+        pool = ConnectionPool(db._connect, max_readers=1, acquire_timeout=1)
+        await pool.close()
+
+        with pytest.raises(RuntimeError):
+            async with pool.reader():
+                pass
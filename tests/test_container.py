@@ -23,7 +23,13 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import pytest
 
 from discord_music_player.config.container import Container, create_container
-from discord_music_player.config.settings import Settings
+from discord_music_player.config.settings import EventBusSettings, MetricsSettings, Settings
+from discord_music_player.infrastructure.persistence.repositories.buffered_history_repository import (
+    BufferedHistoryRepository,
+)
+from discord_music_player.infrastructure.persistence.repositories.cached_session_repository import (
+    CachedSessionRepository,
+)
 
 
 @pytest.fixture
@@ -37,6 +43,9 @@ def mock_settings():
     settings.audio.pot_server_url = "http://127.0.0.1:4416"
     settings.audio.ytdlp_format = "bestaudio/best"
     settings.audio.player_client = ["web", "android"]
+    settings.audio.prefetch_count = 2
+    settings.audio.stream_refresh_margin_seconds = 600
+    settings.audio.transition_trace_history = 20
     settings.ai = Mock()
     settings.ai.api_key = Mock()
     settings.ai.model = "gpt-4o-mini"
@@ -45,13 +54,18 @@ def mock_settings():
     settings.radio = Mock()
     settings.radio.default_count = 5
     settings.radio.max_tracks_per_session = 50
+    settings.event_bus = EventBusSettings()
+    settings.metrics = MetricsSettings()
     return settings
 
 
 @pytest.fixture
 def container(mock_settings):
     """Create container with mock settings."""
-    return Container(settings=mock_settings)
+    from discord_music_player.domain.shared.events import reset_event_bus
+
+    yield Container(settings=mock_settings)
+    reset_event_bus()
 
 
 @pytest.fixture
@@ -168,7 +182,8 @@ class TestSessionRepository:
         ) as MockRepo:
             repo = container.session_repository
             MockRepo.assert_called_once_with(container.database)
-            assert repo == MockRepo.return_value
+            assert isinstance(repo, CachedSessionRepository)
+            assert repo.backend == MockRepo.return_value
 
     def test_caching(self, container):
         """Should return same instance on subsequent calls."""
@@ -184,17 +199,31 @@ class TestSessionRepository:
 class TestHistoryRepository:
     """Unit tests for history_repository property."""
 
-    def test_lazy_initialization(self, container):
+    def test_lazy_initialization(self, container, mock_settings):
         """Should create repository on first access."""
+        mock_settings.database.columnar_analytics = False
         with patch(
             "discord_music_player.infrastructure.persistence.repositories.history_repository.SQLiteHistoryRepository"
         ) as MockRepo:
             repo = container.history_repository
             MockRepo.assert_called_once_with(container.database)
-            assert repo == MockRepo.return_value
+            assert isinstance(repo, BufferedHistoryRepository)
+            assert repo.backend == MockRepo.return_value
 
-    def test_caching(self, container):
+    def test_columnar_analytics_backend(self, container, mock_settings):
+        """Should put the columnar repository behind the buffer when enabled."""
+        mock_settings.database.columnar_analytics = True
+        mock_settings.database.analytics_cached_guilds = 8
+        with patch(
+            "discord_music_player.infrastructure.persistence.repositories.columnar_history_repository.ColumnarHistoryRepository"
+        ) as mock_repo:
+            repo = container.history_repository
+            mock_repo.assert_called_once_with(container.database, max_guilds=8)
+            assert repo.backend == mock_repo.return_value
+
+    def test_caching(self, container, mock_settings):
         """Should return same instance on subsequent calls."""
+        mock_settings.database.columnar_analytics = False
         with patch(
             "discord_music_player.infrastructure.persistence.repositories.history_repository.SQLiteHistoryRepository"
         ) as MockRepo:
@@ -264,7 +293,9 @@ class TestAudioResolver:
             "discord_music_player.infrastructure.audio.ytdlp_resolver.YtDlpResolver"
         ) as MockResolver:
             resolver = container.audio_resolver
-            MockResolver.assert_called_once_with(container.settings.audio)
+            MockResolver.assert_called_once_with(
+                container.settings.audio, metadata_cache=container.track_info_cache
+            )
             assert resolver == MockResolver.return_value
 
     def test_caching(self, container):
@@ -288,7 +319,9 @@ class TestVoiceAdapter:
             "discord_music_player.infrastructure.discord.adapters.voice_adapter.DiscordVoiceAdapter"
         ) as MockAdapter:
             adapter = container.voice_adapter
-            MockAdapter.assert_called_once_with(mock_bot, container.settings.audio)
+            MockAdapter.assert_called_once_with(
+                mock_bot, container.settings.audio, tracer=container.transition_tracer
+            )
             assert adapter == MockAdapter.return_value
 
     def test_caching(self, container, mock_bot):
@@ -485,7 +518,9 @@ class TestCleanupJob:
                 history_repository=container.history_repository,
                 cache_repository=container.cache_repository,
                 vote_repository=container.vote_repository,
+                track_info_cache=container.track_info_cache,
                 settings=container.settings.cleanup,
+                database=container.database,
             )
             assert job == MockJob.return_value
 
@@ -550,6 +585,95 @@ class TestLifecycleInitialize:
             mock_instance.start.assert_called_once()
 
 
+class TestEventBusConfiguration:
+    """Unit tests for the dispatch policies applied at startup."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_queues_playback_events(self, container, mock_bot):
+        """Should move playback events to queued dispatch."""
+        from discord_music_player.domain.shared.enums import DispatchMode, OverflowPolicy
+        from discord_music_player.domain.shared.events import (
+            QueueExhausted,
+            TrackStartedPlaying,
+            get_event_bus,
+        )
+
+        container.set_bot(mock_bot)
+        container._database = AsyncMock()
+        container._auto_skip_on_requester_leave = MagicMock()
+
+        await container.initialize()
+
+        policies = get_event_bus()._policies
+        assert policies[TrackStartedPlaying].mode is DispatchMode.QUEUED
+        assert policies[TrackStartedPlaying].overflow is OverflowPolicy.COALESCE
+        assert policies[QueueExhausted].overflow is OverflowPolicy.BLOCK
+
+    def test_async_dispatch_disabled_keeps_inline(self, container):
+        """Should leave the bus inline when async dispatch is turned off."""
+        from discord_music_player.domain.shared.events import get_event_bus
+
+        container.settings.event_bus = EventBusSettings(async_dispatch=False, slow_handler_ms=40)
+
+        container._configure_event_bus()
+
+        assert get_event_bus()._policies == {}
+        assert get_event_bus().stats().slow_handler_ms == 40
+
+
+class TestMetricsExporter:
+    """Unit tests for the metrics endpoint lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_leaves_exporter_off_by_default(self, container, mock_bot):
+        """Should not build or start the exporter unless metrics are enabled."""
+        container.set_bot(mock_bot)
+        container._database = AsyncMock()
+        container._auto_skip_on_requester_leave = MagicMock()
+
+        await container.initialize()
+
+        assert container._metrics_exporter is None
+
+    @pytest.mark.asyncio
+    async def test_initialize_starts_and_shutdown_stops_exporter(self, container, mock_bot):
+        """Should serve metrics while running and release the port on shutdown."""
+        container.set_bot(mock_bot)
+        container.settings.metrics = MetricsSettings(enabled=True, port=0)
+        container.settings.ai.enabled = False
+        container._database = AsyncMock()
+        container._auto_skip_on_requester_leave = MagicMock()
+
+        await container.initialize()
+        exporter = container._metrics_exporter
+        assert exporter is not None and exporter.running
+
+        await container.shutdown()
+
+        assert not exporter.running
+
+    def test_collectors_cover_built_components(self, container, mock_bot):
+        """Should read queue sizes, the resolver and the database at scrape time."""
+        from discord_music_player.infrastructure.metrics.collectors import (
+            DatabaseCollector,
+            QueueSizeCollector,
+            ResolverCollector,
+            collect_event_bus,
+        )
+
+        container.set_bot(mock_bot)
+        container.settings.ai.enabled = False
+
+        collectors = container._metric_collectors()
+
+        assert collectors[0] is collect_event_bus
+        assert {type(c) for c in collectors[1:]} == {
+            DatabaseCollector,
+            QueueSizeCollector,
+            ResolverCollector,
+        }
+
+
 class TestLifecycleShutdown:
     """Unit tests for container.shutdown method."""
 
@@ -583,6 +707,21 @@ class TestLifecycleShutdown:
 
         mock_db.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_history_before_closing_database(self, container):
+        """Should flush buffered history while the database is still open."""
+        calls = []
+        mock_history = AsyncMock()
+        mock_history.close.side_effect = lambda: calls.append("history")
+        mock_db = AsyncMock()
+        mock_db.close.side_effect = lambda: calls.append("database")
+        container._history_repository = mock_history
+        container._database = mock_db
+
+        await container.shutdown()
+
+        assert calls == ["history", "database"]
+
     @pytest.mark.asyncio
     async def test_shutdown_clears_instances(self, container):
         """Should clear instances dict."""
@@ -642,6 +781,16 @@ class TestContainerIntegration:
             assert container._audio_resolver is not None
             assert container._playback_service is not None
 
+    def test_voice_and_playback_share_transition_tracer(self, container, mock_bot):
+        """Should hand one transition tracer to both halves of a track hand-over."""
+        container.set_bot(mock_bot)
+
+        tracer = container.transition_tracer
+
+        assert container.voice_adapter._tracer is tracer
+        assert container.playback_service._tracer is tracer
+        assert container.transition_tracer is tracer
+
     def test_services_share_repositories(self, container, mock_bot):
         """Should share repository instances across services."""
         container.set_bot(mock_bot)
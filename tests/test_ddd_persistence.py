@@ -159,15 +159,15 @@ class TestDatabase:
         """Test that a freshly initialized DB passes validation."""
         result = await in_memory_database.validate_schema()
 
-        assert result.tables.expected == 8
-        assert result.tables.found == 8
+        assert result.tables.expected == 15
+        assert result.tables.found == 15
         assert result.tables.missing == []
 
         assert result.columns.expected == result.columns.found
         assert result.columns.missing == {}
 
-        assert result.indexes.expected == 10
-        assert result.indexes.found == 10
+        assert result.indexes.expected == 17
+        assert result.indexes.found == 17
         assert result.indexes.missing == []
 
         # In-memory SQLite uses journal_mode=memory instead of wal
@@ -186,7 +186,7 @@ class TestDatabase:
         result = await in_memory_database.validate_schema()
 
         assert "track_genres" in result.tables.missing
-        assert result.tables.found == 7
+        assert result.tables.found == 14
         assert len(result.issues) > 0
         assert any("track_genres" in issue for issue in result.issues)
 
@@ -198,9 +198,112 @@ class TestDatabase:
         result = await in_memory_database.validate_schema()
 
         assert "idx_track_genres_genre" in result.indexes.missing
-        assert result.indexes.found == 9
+        assert result.indexes.found == 16
         assert any("idx_track_genres_genre" in issue for issue in result.issues)
 
+    @pytest.mark.asyncio
+    async def test_connections_apply_performance_profile(self, tmp_path):
+        """Test the DatabaseSettings pragma profile is applied to pooled connections."""
+        from discord_music_player.config.settings import DatabaseSettings
+        from discord_music_player.infrastructure.persistence.database import Database
+
+        settings = DatabaseSettings(mmap_size_mb=8, cache_size_mb=4, synchronous="full")
+        db = Database(str(tmp_path / "bot.db"), settings=settings)
+        await db.initialize()
+        try:
+            pragmas = {
+                name: (await db.fetch_one(f"PRAGMA {name}"))[name]
+                for name in ("synchronous", "cache_size", "mmap_size", "temp_store")
+            }
+        finally:
+            await db.close()
+
+        assert pragmas == {
+            "synchronous": 2,
+            "cache_size": -4096,
+            "mmap_size": 8 * 1024 * 1024,
+            "temp_store": 2,
+        }
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_truncates_wal(self, tmp_path):
+        """Test checkpoint() empties the WAL file and is reported in get_stats()."""
+        from discord_music_player.infrastructure.persistence.database import Database
+
+        db = Database(str(tmp_path / "bot.db"))
+        await db.initialize()
+        try:
+            await db.execute(
+                "INSERT INTO guild_sessions (guild_id, state, created_at, last_activity) VALUES (?, ?, datetime('now'), datetime('now'))",
+                (1, "idle"),
+            )
+            assert (await db.get_stats()).wal_size_bytes > 0
+
+            result = await db.checkpoint()
+            stats = await db.get_stats()
+        finally:
+            await db.close()
+
+        assert result.busy is False
+        assert result.wal_frames == result.checkpointed_frames
+        assert stats.wal_size_bytes == 0
+        assert stats.checkpoints == 1
+        assert stats.last_checkpoint == result
+
+    @pytest.mark.asyncio
+    async def test_migrates_iso_timestamps_to_epoch_ms(self, tmp_path):
+        """Test a pre-epoch database gets backfilled *_ms columns and indexes once."""
+        import sqlite3
+
+        from discord_music_player.infrastructure.persistence.database import Database
+        from discord_music_player.infrastructure.persistence.migrations import (
+            LATEST_SCHEMA_VERSION,
+        )
+
+        db_path = tmp_path / "legacy.db"
+        legacy = sqlite3.connect(db_path)
+        legacy.executescript(
+            """
+            CREATE TABLE guild_sessions (
+                guild_id INTEGER PRIMARY KEY, state TEXT NOT NULL,
+                loop_mode TEXT NOT NULL DEFAULT 'off',
+                created_at TEXT NOT NULL, last_activity TEXT NOT NULL
+            );
+            CREATE TABLE track_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL,
+                track_id TEXT NOT NULL, title TEXT NOT NULL, webpage_url TEXT NOT NULL,
+                duration_seconds INTEGER, requested_by_id INTEGER, requested_by_name TEXT,
+                played_at TEXT NOT NULL, finished_at TEXT, skipped INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX idx_track_history_guild_played ON track_history(guild_id, played_at);
+            INSERT INTO guild_sessions VALUES
+                (1, 'idle', 'off', '2024-01-01T00:00:00+00:00', '2024-01-02T03:04:05.678+00:00');
+            INSERT INTO track_history (guild_id, track_id, title, webpage_url, played_at)
+            VALUES (1, 't1', 'Song', 'https://example.com/t1', '2024-01-02T03:04:05+00:00');
+            """
+        )
+        legacy.commit()
+        legacy.close()
+
+        db = Database(str(db_path))
+        await db.initialize()
+        try:
+            session = await db.fetch_one("SELECT last_activity_ms FROM guild_sessions")
+            history = await db.fetch_one("SELECT played_at_ms FROM track_history")
+            version = await db.fetch_one("PRAGMA user_version")
+            indexes = await db.fetch_all(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'track_history'"
+            )
+        finally:
+            await db.close()
+
+        assert session["last_activity_ms"] == 1704164645678
+        assert history["played_at_ms"] == 1704164645000
+        assert version["user_version"] == LATEST_SCHEMA_VERSION
+        index_names = {row["name"] for row in indexes}
+        assert "idx_track_history_guild_played_ms" in index_names
+        assert "idx_track_history_guild_played" not in index_names
+
 
 # === Session Repository Tests ===
 
@@ -267,6 +370,45 @@ class TestSessionRepository:
 
         assert len(sessions) >= 3
 
+    @pytest.mark.asyncio
+    async def test_get_all_active_loads_queues_in_one_query(self, session_repository, sample_track):
+        """Test bulk loading keeps each guild's queue and current track apart."""
+        from discord_music_player.domain.music.entities import GuildPlaybackSession
+
+        busy = GuildPlaybackSession(guild_id=100)
+        busy.set_current_track(sample_track)
+        busy.enqueue(_queued_track(1))
+        busy.enqueue(_queued_track(2))
+        await session_repository.save(busy)
+        await session_repository.save(GuildPlaybackSession(guild_id=200))
+
+        sessions = {s.guild_id: s for s in await session_repository.get_all_active()}
+
+        assert set(sessions) == {100, 200}
+        assert sessions[100].current_track == sample_track
+        assert [t.title for t in sessions[100].queue] == ["Track 1", "Track 2"]
+        assert sessions[200].current_track is None
+        assert sessions[200].queue == []
+
+    @pytest.mark.asyncio
+    async def test_get_validates_rows_with_unexpected_types(
+        self, session_repository, in_memory_database
+    ):
+        """Test a queue row that no longer matches the schema goes through validation."""
+        from pydantic import ValidationError
+
+        from discord_music_player.domain.music.entities import GuildPlaybackSession
+
+        session = GuildPlaybackSession(guild_id=100)
+        session.enqueue(_queued_track(1))
+        await session_repository.save(session)
+        await in_memory_database.execute(
+            "UPDATE queue_tracks SET duration_seconds = 'unknown' WHERE guild_id = 100"
+        )
+
+        with pytest.raises(ValidationError):
+            await session_repository.get(100)
+
     @pytest.mark.asyncio
     async def test_cleanup_stale_sessions(self, session_repository):
         """Test cleanup removes stale sessions."""
@@ -283,6 +425,179 @@ class TestSessionRepository:
         assert isinstance(deleted, int)
 
 
+class TestTrackRowHydrate:
+    """Tests for TrackRow.hydrate, the trusted-row fast path."""
+
+    def _row(self, track, **overrides):
+        from discord_music_player.infrastructure.persistence.models import QueueTrackRow
+
+        row = QueueTrackRow.from_track(track, guild_id=1, position=0, is_current=False)
+        return {**row.model_dump(), **overrides}
+
+    def test_trusted_row_matches_validated_track(self, sample_track):
+        from discord_music_player.infrastructure.persistence.models import TrackRow
+
+        row = self._row(sample_track)
+
+        assert TrackRow.hydrate(row) == TrackRow.model_validate(row).to_track()
+        assert TrackRow.hydrate(row, id_from_url=True) == sample_track
+
+    def test_mismatched_row_is_validated(self, sample_track):
+        from discord_music_player.infrastructure.persistence.models import TrackRow
+
+        row = self._row(sample_track, duration_seconds="180")
+
+        track = TrackRow.hydrate(row, id_from_url=True)
+
+        assert track.duration_seconds == 180
+        assert track.id == TrackId.from_url(sample_track.webpage_url)
+
+
+def _queued_track(n: int):
+    from discord_music_player.domain.music.entities import Track
+
+    return Track(
+        id=TrackId(value=f"vid{n:08d}"),
+        title=f"Track {n}",
+        webpage_url=f"https://youtube.com/watch?v=vid{n:08d}",
+    )
+
+
+class TestIncrementalQueuePersistence:
+    """Queue changes are replayed as targeted statements instead of a full rewrite."""
+
+    @staticmethod
+    def _titles(session):
+        return [t.title for t in session.queue]
+
+    @staticmethod
+    def _count_queue_writes(in_memory_database, monkeypatch):
+        """Count INSERT statements issued against queue_tracks during a save."""
+        import aiosqlite
+
+        counts = {"insert_rows": 0}
+        real_execute = aiosqlite.Connection.execute
+        real_executemany = aiosqlite.Connection.executemany
+
+        def execute(self, sql, parameters=None):
+            if "INSERT INTO queue_tracks" in sql:
+                counts["insert_rows"] += 1
+            return real_execute(self, sql, parameters)
+
+        async def executemany(self, sql, parameters):
+            parameters = list(parameters)
+            if "INSERT INTO queue_tracks" in sql:
+                counts["insert_rows"] += len(parameters)
+            return await real_executemany(self, sql, parameters)
+
+        monkeypatch.setattr(aiosqlite.Connection, "execute", execute)
+        monkeypatch.setattr(aiosqlite.Connection, "executemany", executemany)
+        return counts
+
+    async def _seed(self, session_repository, n: int):
+        from discord_music_player.domain.music.entities import GuildPlaybackSession
+
+        session = GuildPlaybackSession(guild_id=555)
+        for i in range(n):
+            session.enqueue(_queued_track(i))
+        await session_repository.save(session)
+        return await session_repository.get(555)
+
+    @pytest.mark.asyncio
+    async def test_loaded_session_has_clean_change_log(self, session_repository):
+        session = await self._seed(session_repository, 3)
+
+        assert session.pending_queue_changes == ()
+        assert session.queue_version == 0
+
+    @pytest.mark.asyncio
+    async def test_enqueue_inserts_only_new_row(
+        self, session_repository, in_memory_database, monkeypatch
+    ):
+        session = await self._seed(session_repository, 20)
+        counts = self._count_queue_writes(in_memory_database, monkeypatch)
+
+        session.enqueue(_queued_track(100))
+        await session_repository.save(session)
+
+        # Only the new row is written; the 20 existing rows are left alone.
+        assert counts["insert_rows"] == 1
+        reloaded = await session_repository.get(555)
+        assert self._titles(reloaded) == [f"Track {i}" for i in range(20)] + ["Track 100"]
+
+    @pytest.mark.asyncio
+    async def test_mixed_changes_round_trip(self, session_repository):
+        session = await self._seed(session_repository, 6)
+
+        session.dequeue()
+        session.enqueue_next(_queued_track(50))
+        session.move_track(0, 3)
+        session.remove_at(1)
+        session.enqueue(_queued_track(60))
+        session.enqueue(_queued_track(61))
+        expected = self._titles(session)
+        await session_repository.save(session)
+
+        reloaded = await session_repository.get(555)
+        assert self._titles(reloaded) == expected
+        assert reloaded.queue_version == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_inserts_renumber_when_gap_closes(self, session_repository):
+        session = await self._seed(session_repository, 2)
+
+        # Each insert halves the gap after the first row until it closes.
+        for i in range(15):
+            session.enqueue(_queued_track(200 + i))
+            session.move_track(len(session.queue) - 1, 1)
+            await session_repository.save(session)
+
+        reloaded = await session_repository.get(555)
+        assert self._titles(reloaded) == self._titles(session)
+
+    @pytest.mark.asyncio
+    async def test_clear_and_advance(self, session_repository):
+        session = await self._seed(session_repository, 4)
+
+        session.advance_to_next_track()
+        await session_repository.save(session)
+        reloaded = await session_repository.get(555)
+        assert reloaded.current_track is not None
+        assert reloaded.current_track.title == "Track 0"
+        assert self._titles(reloaded) == ["Track 1", "Track 2", "Track 3"]
+
+        reloaded.clear_queue()
+        await session_repository.save(reloaded)
+        assert (await session_repository.get(555)).queue == []
+
+    @pytest.mark.asyncio
+    async def test_stale_copy_falls_back_to_full_rewrite(self, session_repository):
+        first = await self._seed(session_repository, 3)
+        second = await session_repository.get(555)
+
+        first.dequeue()
+        await session_repository.save(first)
+
+        # ``second`` was loaded before ``first`` was saved; replaying its
+        # changes would apply them to the wrong baseline.
+        second.enqueue(_queued_track(9))
+        await session_repository.save(second)
+
+        reloaded = await session_repository.get(555)
+        assert self._titles(reloaded) == ["Track 0", "Track 1", "Track 2", "Track 9"]
+
+    @pytest.mark.asyncio
+    async def test_shuffle_forces_full_rewrite(self, session_repository):
+        session = await self._seed(session_repository, 8)
+
+        session.shuffle()
+        assert session.pending_queue_changes is None
+        await session_repository.save(session)
+
+        reloaded = await session_repository.get(555)
+        assert self._titles(reloaded) == self._titles(session)
+
+
 # === History Repository Tests ===
 
 
@@ -9,7 +9,7 @@ Tests for:
 import pytest
 
 from discord_music_player.domain.music.entities import GuildPlaybackSession, Track
-from discord_music_player.domain.music.enums import LoopMode, PlaybackState
+from discord_music_player.domain.music.enums import LoopMode, PlaybackState, QueueChangeKind
 from discord_music_player.domain.music.wrappers import QueuePosition, TrackId
 from discord_music_player.domain.shared.exceptions import (
     BusinessRuleViolationError,
@@ -624,6 +624,20 @@ class TestGuildPlaybackSession:
         assert next_track is None
         assert session.state == PlaybackState.IDLE
 
+    def test_upcoming_tracks_follows_loop_mode(self, session, sample_track, another_track):
+        """upcoming_tracks should predict what advance_to_next_track will return."""
+        session.current_track = sample_track
+        session.enqueue(another_track)
+
+        assert session.upcoming_tracks(3) == [another_track]
+
+        session.loop_mode = LoopMode.QUEUE
+        assert session.upcoming_tracks(3) == [another_track, sample_track]
+
+        session.loop_mode = LoopMode.TRACK
+        assert session.upcoming_tracks(3) == [sample_track]
+        assert session.upcoming_tracks(0) == []
+
     # --- Queue Manipulation ---
 
     def test_move_track_valid_positions(self, session):
@@ -684,3 +698,46 @@ class TestGuildPlaybackSession:
         session.touch()
 
         assert session.last_activity > original_time
+
+    def test_new_session_requires_full_queue_write(self, session):
+        """A session that was never persisted has no change log to replay."""
+        assert session.pending_queue_changes is None
+        assert session.queue_version is None
+
+    def test_records_queue_changes_after_persist(self, session, sample_track, another_track):
+        """Queue mutations are logged in order once the session is marked persisted."""
+        session.mark_queue_persisted(3)
+
+        session.enqueue(sample_track)
+        session.enqueue_next(another_track)
+        session.move_track(0, 1)
+        session.dequeue()
+        session.clear_queue()
+
+        kinds = [c.kind for c in session.pending_queue_changes]
+        assert kinds == [
+            QueueChangeKind.APPEND,
+            QueueChangeKind.INSERT,
+            QueueChangeKind.MOVE,
+            QueueChangeKind.POP_FRONT,
+            QueueChangeKind.CLEAR,
+        ]
+        assert session.queue_version == 3
+
+    def test_bulk_reorder_invalidates_change_log(self, session, sample_track):
+        """Shuffle cannot be expressed as a few targeted changes."""
+        session.enqueue(sample_track)
+        session.mark_queue_persisted(0)
+
+        session.shuffle()
+
+        assert session.pending_queue_changes is None
+
+    def test_copies_do_not_share_change_log(self, session, sample_track):
+        """Model copies handed out by caches must not see each other's changes."""
+        session.mark_queue_persisted(0)
+        copy = session.model_copy(update={"queue": list(session.queue)})
+
+        copy.enqueue(sample_track)
+
+        assert session.pending_queue_changes == ()
@@ -4,10 +4,17 @@ Additional Events Tests for Coverage
 Tests edge cases and uncovered code paths in events module.
 """
 
+import asyncio
+import logging
+
 from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.enums import DispatchMode, OverflowPolicy
 from discord_music_player.domain.shared.events import (
+    HANDLER_LATENCY_BUCKETS_MS,
+    DispatchPolicy,
     DomainEvent,
     EventBus,
+    QueueExhausted,
     TrackFinishedPlaying,
     TrackStartedPlaying,
     get_event_bus,
@@ -241,3 +248,292 @@ class TestGlobalEventBus:
 
         bus = get_event_bus()
         assert bus is not None
+
+
+def _started(guild_id: int, title: str = "Song") -> TrackStartedPlaying:
+    return TrackStartedPlaying(guild_id=guild_id, track_id=TrackId(value=title), track_title=title)
+
+
+def _queued(overflow: OverflowPolicy = OverflowPolicy.BLOCK) -> DispatchPolicy:
+    return DispatchPolicy(mode=DispatchMode.QUEUED, overflow=overflow)
+
+
+class _Recorder:
+    """Subscriber whose handlers park on ``gate`` until the test releases them."""
+
+    def __init__(self) -> None:
+        self.seen: list[tuple[str, int, str | None]] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def on_started(self, event: TrackStartedPlaying) -> None:
+        await self.gate.wait()
+        self.seen.append(("started", event.guild_id, event.track_title))
+
+    async def on_exhausted(self, event: QueueExhausted) -> None:
+        await self.gate.wait()
+        self.seen.append(("exhausted", event.guild_id, None))
+
+
+class TestQueuedDispatch:
+    """Tests for per-subscriber queued delivery."""
+
+    async def test_publish_returns_before_slow_handler(self):
+        bus = EventBus()
+        bus.configure(TrackStartedPlaying, _queued())
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await asyncio.wait_for(bus.publish(_started(1)), timeout=1)
+        assert recorder.seen == []
+        assert bus.stats().queue_depth == 1
+
+        recorder.gate.set()
+        assert await bus.drain(timeout=1)
+        assert recorder.seen == [("started", 1, "Song")]
+        bus.clear()
+
+    async def test_guild_order_kept_across_event_types(self):
+        bus = EventBus(lanes=4)
+        bus.configure(TrackStartedPlaying, _queued())
+        bus.configure(QueueExhausted, _queued())
+        recorder = _Recorder()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+        bus.subscribe(QueueExhausted, recorder.on_exhausted)
+
+        for guild_id in (1, 2):
+            await bus.publish(QueueExhausted(guild_id=guild_id))
+            await bus.publish(_started(guild_id))
+        await bus.drain(timeout=1)
+
+        for guild_id in (1, 2):
+            kinds = [kind for kind, guild, _ in recorder.seen if guild == guild_id]
+            assert kinds == ["exhausted", "started"]
+        bus.clear()
+
+    async def test_coalesce_keeps_newest_per_guild(self):
+        bus = EventBus(lanes=1)
+        bus.configure(TrackStartedPlaying, _queued(OverflowPolicy.COALESCE))
+        bus.configure(QueueExhausted, _queued())
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+        bus.subscribe(QueueExhausted, recorder.on_exhausted)
+
+        await bus.publish(_started(9, "blocker"))
+        await asyncio.sleep(0)  # worker takes the first event and parks on the gate
+        await bus.publish(_started(1, "old"))
+        await bus.publish(QueueExhausted(guild_id=1))
+        await bus.publish(_started(2, "other guild"))
+        await bus.publish(_started(1, "new"))
+        recorder.gate.set()
+        await bus.drain(timeout=1)
+
+        assert recorder.seen == [
+            ("started", 9, "blocker"),
+            ("exhausted", 1, None),
+            ("started", 2, "other guild"),
+            ("started", 1, "new"),
+        ]
+        assert bus.stats().coalesced == 1
+        bus.clear()
+
+    async def test_drop_newest_when_full(self):
+        bus = EventBus(max_queue=2, lanes=1)
+        bus.configure(TrackStartedPlaying, _queued(OverflowPolicy.DROP_NEWEST))
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1, "a"))
+        await asyncio.sleep(0)
+        for title in ("b", "c", "d"):
+            await bus.publish(_started(1, title))
+        recorder.gate.set()
+        await bus.drain(timeout=1)
+
+        # "a" was already taken by the worker, so "b" and "c" filled the queue.
+        assert [title for _, _, title in recorder.seen] == ["a", "b", "c"]
+        assert bus.stats().dropped == 1
+        bus.clear()
+
+    async def test_drop_oldest_when_full(self):
+        bus = EventBus(max_queue=2, lanes=1)
+        bus.configure(TrackStartedPlaying, _queued(OverflowPolicy.DROP_OLDEST))
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1, "a"))
+        await asyncio.sleep(0)
+        for title in ("b", "c", "d"):
+            await bus.publish(_started(1, title))
+        recorder.gate.set()
+        await bus.drain(timeout=1)
+
+        assert [title for _, _, title in recorder.seen] == ["a", "c", "d"]
+        assert bus.stats().dropped == 1
+        bus.clear()
+
+    async def test_block_applies_backpressure(self):
+        bus = EventBus(max_queue=1, lanes=1)
+        bus.configure(TrackStartedPlaying, _queued(OverflowPolicy.BLOCK))
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1, "a"))
+        await asyncio.sleep(0)
+        await bus.publish(_started(1, "b"))
+        blocked = asyncio.create_task(bus.publish(_started(1, "c")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        recorder.gate.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await bus.drain(timeout=1)
+        assert [title for _, _, title in recorder.seen] == ["a", "b", "c"]
+        assert bus.stats().dropped == 0
+        bus.clear()
+
+    async def test_handler_from_worker_does_not_block_on_own_queue(self):
+        bus = EventBus(max_queue=1, lanes=1)
+        bus.configure(TrackStartedPlaying, _queued(OverflowPolicy.BLOCK))
+        seen = []
+
+        async def republish(event: TrackStartedPlaying) -> None:
+            seen.append(event.track_title)
+            if len(seen) < 3:
+                await bus.publish(_started(1, f"echo {len(seen)}"))
+                await bus.publish(_started(1, f"extra {len(seen)}"))
+
+        bus.subscribe(TrackStartedPlaying, republish)
+        await bus.publish(_started(1, "first"))
+
+        assert await bus.drain(timeout=1)
+        assert seen[0] == "first"
+        assert len(seen) == 5
+        bus.clear()
+
+    async def test_stats_track_latency_and_failures(self):
+        bus = EventBus()
+        bus.configure(TrackStartedPlaying, _queued())
+
+        async def failing(event: TrackStartedPlaying) -> None:
+            raise RuntimeError("boom")
+
+        bus.subscribe(TrackStartedPlaying, failing)
+        await bus.publish(_started(1))
+        await bus.drain(timeout=1)
+
+        (subscriber,) = bus.stats().subscribers
+        (handler,) = subscriber.handlers
+        assert handler.event_type == "TrackStartedPlaying"
+        assert handler.delivered == 1
+        assert handler.failed == 1
+        assert handler.max_latency_ms >= 0
+        bus.clear()
+
+    async def test_unsubscribe_discards_pending_events(self):
+        bus = EventBus(lanes=1)
+        bus.configure(TrackStartedPlaying, _queued())
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1))
+        bus.unsubscribe(TrackStartedPlaying, recorder.on_started)
+        recorder.gate.set()
+        await asyncio.sleep(0.01)
+
+        assert recorder.seen == []
+        assert bus.stats().subscribers == []
+
+    async def test_close_drains_queued_events(self):
+        bus = EventBus()
+        bus.configure(TrackStartedPlaying, _queued())
+        recorder = _Recorder()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1))
+        await bus.close(timeout=1)
+
+        assert len(recorder.seen) == 1
+        assert bus.stats().subscribers[0].lanes == 0
+
+    async def test_inline_is_default(self):
+        bus = EventBus()
+        recorder = _Recorder()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1))
+
+        assert len(recorder.seen) == 1
+        assert bus.stats().subscribers[0].lanes == 0
+
+
+class TestHandlerInstrumentation:
+    """Tests for per-handler latency histograms and slow-handler tracing."""
+
+    async def test_histogram_counts_every_call(self):
+        bus = EventBus()
+
+        async def fast(event: TrackStartedPlaying) -> None:
+            pass
+
+        bus.subscribe(TrackStartedPlaying, fast)
+        for guild_id in (1, 2, 3):
+            await bus.publish(_started(guild_id))
+
+        (handler,) = bus.stats().handlers
+        assert handler.handler.endswith("fast")
+        assert len(handler.latency_buckets) == len(HANDLER_LATENCY_BUCKETS_MS) + 1
+        assert sum(handler.latency_buckets) == handler.delivered == 3
+        assert handler.p50_latency_ms <= handler.p95_latency_ms <= handler.max_latency_ms
+
+    async def test_in_flight_counts_running_handlers(self):
+        bus = EventBus()
+        bus.configure(TrackStartedPlaying, _queued())
+        recorder = _Recorder()
+        recorder.gate.clear()
+        bus.subscribe(TrackStartedPlaying, recorder.on_started)
+
+        await bus.publish(_started(1))
+        await asyncio.sleep(0)
+        assert bus.stats().in_flight == 1
+
+        recorder.gate.set()
+        await bus.drain(timeout=1)
+        assert bus.stats().in_flight == 0
+        bus.clear()
+
+    async def test_slow_handler_logs_guild(self, caplog):
+        bus = EventBus(slow_handler_ms=1.0)
+
+        async def slow(event: TrackStartedPlaying) -> None:
+            await asyncio.sleep(0.01)
+
+        bus.subscribe(TrackStartedPlaying, slow)
+        with caplog.at_level(logging.WARNING):
+            await bus.publish(_started(4242))
+
+        assert "Slow event handler" in caplog.text
+        assert "guild 4242" in caplog.text
+        (handler,) = bus.stats().handlers
+        assert handler.slow == 1
+        assert handler.latency_buckets[0] == 0
+
+    async def test_zero_threshold_disables_tracing(self, caplog):
+        bus = EventBus()
+        bus.configure_tracing(slow_handler_ms=0)
+
+        async def slow(event: TrackStartedPlaying) -> None:
+            await asyncio.sleep(0.005)
+
+        bus.subscribe(TrackStartedPlaying, slow)
+        with caplog.at_level(logging.WARNING):
+            await bus.publish(_started(1))
+
+        assert "Slow event handler" not in caplog.text
+        assert bus.stats().handlers[0].slow == 0
@@ -0,0 +1,246 @@
+"""Tests for gapless/crossfade playback in the voice adapter."""
+
+from unittest.mock import MagicMock
+
+import discord
+import numpy as np
+import pytest
+
+from discord_music_player.application.services.transition_tracer import TransitionTracer
+from discord_music_player.domain.music.entities import Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.enums import TransitionOutcome, TransitionStage
+from discord_music_player.infrastructure.discord.adapters.gapless_source import (
+    FRAME_SIZE,
+    GaplessAudioSource,
+    PreloadedTrack,
+    crossfade_frames,
+)
+from discord_music_player.infrastructure.discord.adapters.voice_adapter import DiscordVoiceAdapter
+
+
+def _track(n: int, duration: int | None = None) -> Track:
+    return Track(
+        id=TrackId(value=f"track-{n}"),
+        title=f"Track {n}",
+        webpage_url=f"https://youtube.com/watch?v=track{n}",
+        stream_url=f"https://audio.example.com/{n}.webm",
+        duration_seconds=duration,
+    )
+
+
+def _frame(value: int) -> bytes:
+    return np.full(FRAME_SIZE // 2, value, dtype=np.int16).tobytes()
+
+
+class FakeSource(discord.AudioSource):
+    def __init__(self, value: int, frames: int) -> None:
+        self.value = value
+        self.frames = frames
+        self.cleaned_up = False
+
+    def read(self) -> bytes:
+        if self.frames <= 0:
+            return b""
+        self.frames -= 1
+        return _frame(self.value)
+
+    def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+def _sample(frame: bytes) -> int:
+    return int(np.frombuffer(frame, dtype=np.int16)[0])
+
+
+class TestGaplessAudioSource:
+    def test_continues_into_preloaded_track_without_an_empty_frame(self):
+        transitions: list[Track] = []
+        source = GaplessAudioSource(
+            _track(1), FakeSource(100, frames=2), on_transition=transitions.append
+        )
+        source.set_next(PreloadedTrack(_track(2), FakeSource(200, frames=2)))
+
+        frames = [source.read() for _ in range(4)]
+
+        assert [_sample(f) for f in frames] == [100, 100, 200, 200]
+        assert transitions == [_track(2)]
+        assert source.track == _track(2)
+        assert source.read() == b""
+
+    def test_ends_when_nothing_is_preloaded(self):
+        source = GaplessAudioSource(_track(1), FakeSource(100, frames=1))
+
+        assert _sample(source.read()) == 100
+        assert source.read() == b""
+
+    def test_prebuffered_frames_are_served_first(self):
+        upstream = FakeSource(200, frames=3)
+        preloaded = PreloadedTrack(_track(2), upstream)
+
+        assert preloaded.fill(2) == 2
+        assert upstream.frames == 1
+        assert [_sample(preloaded.read()) for _ in range(3)] == [200, 200, 200]
+
+    def test_crossfade_blends_the_tail_of_the_current_track(self):
+        # 1 s track, 0.1 s (5 frame) crossfade: the last 5 frames are mixed.
+        source = GaplessAudioSource(
+            _track(1, duration=1), FakeSource(1000, frames=50), crossfade_seconds=0.1
+        )
+        source.set_next(PreloadedTrack(_track(2), FakeSource(-1000, frames=100)))
+
+        samples = [_sample(source.read()) for _ in range(50)]
+
+        assert samples[:45] == [1000] * 45
+        blended = samples[45:49]
+        assert all(-1000 < s < 1000 for s in blended)
+        assert blended == sorted(blended, reverse=True)
+        assert samples[49] == -1000
+        assert source.track == _track(2)
+
+    def test_replace_switches_immediately_and_releases_old_stream(self):
+        old = FakeSource(100, frames=10)
+        source = GaplessAudioSource(_track(1), old)
+
+        source.replace(_track(3), FakeSource(300, frames=1))
+
+        assert _sample(source.read()) == 300
+        assert source.track == _track(3)
+
+    def test_cleanup_releases_current_and_preloaded_streams(self):
+        current, upcoming = FakeSource(1, frames=1), FakeSource(2, frames=1)
+        source = GaplessAudioSource(_track(1), current)
+        source.set_next(PreloadedTrack(_track(2), upcoming))
+
+        source.cleanup()
+
+        assert current.cleaned_up and upcoming.cleaned_up
+
+    def test_first_frame_reported_once_per_stream(self):
+        started: list[Track] = []
+        source = GaplessAudioSource(
+            _track(1), FakeSource(100, frames=3), on_first_frame=started.append
+        )
+        source.set_next(PreloadedTrack(_track(2), FakeSource(200, frames=2)))
+
+        for _ in range(4):
+            source.read()
+        assert started == [_track(1)]
+
+        source.replace(_track(3), FakeSource(300, frames=1))
+        source.read()
+
+        assert started == [_track(1), _track(3)]
+
+    def test_crossfade_frames_uses_equal_power_curve(self):
+        mixed = crossfade_frames(_frame(1000), _frame(0), 0.5)
+
+        assert _sample(mixed) == pytest.approx(707, abs=1)
+
+
+class TestAdapterGaplessPlayback:
+    @pytest.fixture
+    def voice_client(self):
+        vc = MagicMock()
+        vc.is_playing.return_value = False
+        vc.is_paused.return_value = False
+        return vc
+
+    @pytest.fixture
+    def adapter(self, voice_client, monkeypatch):
+        bot = MagicMock()
+        adapter = DiscordVoiceAdapter(bot)
+        adapter._get_voice_client = MagicMock(return_value=voice_client)
+        monkeypatch.setattr(
+            adapter, "_create_ffmpeg_source", lambda track, **_: FakeSource(1, frames=5)
+        )
+        monkeypatch.setattr(adapter, "_schedule_track_end", MagicMock())
+        return adapter
+
+    async def test_play_after_gapless_transition_keeps_player_running(self, adapter, voice_client):
+        assert await adapter.play(1, _track(1)) is True
+        voice_client.is_playing.return_value = True
+        source = adapter._sources[1]
+        source.set_next(PreloadedTrack(_track(2), FakeSource(2, frames=5)))
+
+        for _ in range(6):
+            source.read()
+        adapter._current_track.pop(1)  # what _handle_track_end does
+
+        assert await adapter.play(1, _track(2)) is True
+        voice_client.stop.assert_not_called()
+        assert voice_client.play.call_count == 1
+        assert adapter.get_current_track(1) == _track(2)
+
+    async def test_play_swaps_in_place_when_preload_was_wrong(self, adapter, voice_client):
+        await adapter.play(1, _track(1))
+        voice_client.is_playing.return_value = True
+        source = adapter._sources[1]
+        source.set_next(PreloadedTrack(_track(2), FakeSource(2, frames=5)))
+        for _ in range(6):
+            source.read()
+        adapter._current_track.pop(1)
+
+        assert await adapter.play(1, _track(3)) is True
+        voice_client.stop.assert_not_called()
+        assert source.track == _track(3)
+
+    async def test_preload_requires_live_playback(self, adapter):
+        assert await adapter.preload(1, _track(2)) is False
+
+    async def test_preload_buffers_next_track(self, adapter, voice_client):
+        await adapter.play(1, _track(1))
+        voice_client.is_playing.return_value = True
+
+        assert await adapter.preload(1, _track(2)) is True
+        await adapter._preload_tasks[1]
+
+        assert adapter._sources[1].preloaded_track == _track(2)
+
+    async def test_source_that_ends_immediately_is_recognised(self, adapter, voice_client):
+        voice_client.play.side_effect = lambda source, *, after: after(None)
+
+        await adapter.play(1, _track(1))
+
+        adapter._schedule_track_end.assert_called_once_with(1, adapter._sources[1])
+
+    async def test_stop_drops_gapless_state(self, adapter, voice_client):
+        await adapter.play(1, _track(1))
+        voice_client.is_playing.return_value = True
+
+        await adapter.stop(1)
+
+        assert 1 not in adapter._sources
+
+    async def test_first_frame_finishes_the_open_transition(self, adapter, voice_client):
+        tracer = TransitionTracer()
+        adapter._tracer = tracer
+        tracer.begin(1)
+
+        await adapter.play(1, _track(2))
+        adapter._sources[1].read()
+
+        (trace,) = tracer.recent(1)
+        assert trace.outcome == TransitionOutcome.PLAYING
+        assert trace.track_title == "Track 2"
+        assert [t.stage for t in trace.stages] == [
+            TransitionStage.FFMPEG_SPAWN,
+            TransitionStage.VOICE_SETUP,
+            TransitionStage.FIRST_FRAME,
+        ]
+
+    async def test_gapless_advance_is_traced_as_gapless(self, adapter, voice_client):
+        tracer = TransitionTracer()
+        adapter._tracer = tracer
+        await adapter.play(1, _track(1))
+        voice_client.is_playing.return_value = True
+        source = adapter._sources[1]
+        source.set_next(PreloadedTrack(_track(2), FakeSource(2, frames=5)))
+        for _ in range(6):
+            source.read()
+        adapter._current_track.pop(1)
+
+        await adapter.play(1, _track(2))
+
+        (trace,) = tracer.recent(1)
+        assert trace.outcome == TransitionOutcome.GAPLESS
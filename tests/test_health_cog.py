@@ -570,6 +570,57 @@ class TestDetailedStatsCollection:
         assert stats.db_initialized is None
         assert stats.db_size_mb is None
 
+    @pytest.mark.asyncio
+    async def test_collect_detailed_stats_session_recovery(self, health_cog, mock_bot):
+        """Should report session recovery progress once the bot has started it."""
+        from discord_music_player.infrastructure.discord.services.session_recovery import (
+            RecoveryProgress,
+        )
+
+        mock_bot.recovery = RecoveryProgress(total=5, resumed=3, reset=1)
+
+        stats = await health_cog._collect_detailed_stats()
+
+        assert stats.recovery_total == 5
+        assert stats.recovery_processed == 4
+        assert stats.recovery_resumed == 3
+        assert stats.recovery_duration_ms is None
+
+    @pytest.mark.asyncio
+    async def test_collect_detailed_stats_event_bus(self, health_cog):
+        """Should report queued events from the global event bus."""
+        from discord_music_player.domain.shared.events import reset_event_bus
+
+        reset_event_bus()
+        try:
+            stats = await health_cog._collect_detailed_stats()
+        finally:
+            reset_event_bus()
+
+        assert stats.event_bus is not None
+        assert stats.event_bus.queue_depth == 0
+        assert stats.event_bus.dropped == 0
+        assert "subscribers" in stats.model_dump()["event_bus"]
+
+    @pytest.mark.asyncio
+    async def test_collect_detailed_stats_transitions(self, health_cog, mock_container):
+        """Should include the transition tracer summary when the container has one."""
+        from discord_music_player.application.services.transition_tracer import (
+            TransitionTracer,
+        )
+        from discord_music_player.domain.shared.enums import TransitionOutcome
+
+        tracer = TransitionTracer()
+        tracer.begin(1)
+        tracer.finish(1, TransitionOutcome.PLAYING)
+        mock_container.transition_tracer = tracer
+
+        stats = await health_cog._collect_detailed_stats()
+
+        assert stats.transitions is not None
+        assert stats.transitions.traced == 1
+        assert stats.model_dump(mode="json")["transitions"]["outcomes"] == {"playing": 1}
+
 
 # =============================================================================
 # Heartbeat Loop Tests
@@ -912,6 +963,41 @@ class TestEmbedBuilding:
         assert "Memory" in field_names
         assert "Database" in field_names
 
+    def test_build_health_embed_with_transitions(self, health_cog):
+        """Should summarize recent track transitions for admins."""
+        from discord_music_player.application.services.transition_tracer import (
+            StageStats,
+            TransitionStats,
+        )
+        from discord_music_player.domain.shared.enums import TransitionStage
+
+        payload = DetailedStats(
+            ts="2024-01-01T00:00:00Z",
+            uptime_s=3600,
+            uptime_human="1h 0m 0s",
+            latency_ms=50.0,
+            latency_human="50.0 ms",
+            queue_len=0,
+            current=None,
+            connected=True,
+            status="online",
+            transitions=TransitionStats(
+                traced=4,
+                avg_total_ms=420.0,
+                p95_total_ms=900.0,
+                stages=[
+                    StageStats(stage=TransitionStage.STREAM_RESOLVE, count=4, avg_ms=300.0),
+                    StageStats(stage=TransitionStage.FFMPEG_SPAWN, count=4, avg_ms=80.0),
+                ],
+            ),
+        )
+
+        embed = health_cog._build_health_embed(payload, True)
+
+        field = next(f for f in embed.fields if f.name == "Track Transitions")
+        assert "4 traced" in field.value
+        assert "stream_resolve" in field.value
+
     def test_is_admin_with_administrator(self, health_cog):
         """Should recognize administrator permission."""
         member = MagicMock(spec=discord.Member)
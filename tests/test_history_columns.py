@@ -0,0 +1,203 @@
+"""Tests for the columnar, in-memory history analytics."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from discord_music_player.domain.music.entities import Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.enums import LeaderboardTimeRange
+from discord_music_player.infrastructure.persistence.repositories.columnar_history_repository import (
+    ColumnarHistoryRepository,
+)
+
+GUILD_ID = 1
+
+
+def _track(track_id: str, title: str, duration: int | None, user_id: int | None, name: str | None):
+    return Track(
+        id=TrackId(value=track_id),
+        title=title,
+        webpage_url=f"https://youtube.com/watch?v={track_id}",
+        duration_seconds=duration,
+        artist="Artist",
+        requested_by_id=user_id,
+        requested_by_name=name,
+    )
+
+
+T1 = _track("t1", "Rock Anthem", 200, 100, "Alice")
+T2 = _track("t2", "Pop Hit", 180, 200, "Bob")
+T3 = _track("t3", "Jazz Night", None, None, None)
+
+
+@pytest.fixture
+def columnar_repository(in_memory_database):
+    return ColumnarHistoryRepository(in_memory_database, max_guilds=2)
+
+
+async def _seed(repo) -> None:
+    """t1 ×4 (one 20 days ago, one skipped), t2 ×2 (both skipped), t3 ×1."""
+    now = datetime.now(UTC)
+    await repo.record_play(GUILD_ID, T1, played_at=now - timedelta(days=20))
+    for _ in range(3):
+        await repo.record_play(GUILD_ID, T1, played_at=now - timedelta(hours=1))
+    await repo.mark_finished(GUILD_ID, T1.id, skipped=True)
+    for _ in range(2):
+        await repo.record_play(GUILD_ID, T2)
+        await repo.mark_finished(GUILD_ID, T2.id, skipped=True)
+    await repo.record_play(GUILD_ID, T3)
+    await repo.record_play(GUILD_ID + 1, T3)
+
+
+async def _analytics(repo) -> dict:
+    week = LeaderboardTimeRange.LAST_7_DAYS
+    most_played = await repo.get_most_played(GUILD_ID)
+    most_played_week = await repo.get_most_played_since(GUILD_ID, week)
+    return {
+        "play_count": await repo.get_play_count(GUILD_ID, T1.id),
+        "most_played": [(t.id.value, t.title, t.duration_seconds, n) for t, n in most_played],
+        "total": await repo.get_total_tracks(GUILD_ID),
+        "unique": await repo.get_unique_tracks(GUILD_ID),
+        "listen": await repo.get_total_listen_time(GUILD_ID),
+        "requesters": await repo.get_top_requesters(GUILD_ID),
+        "skip_rate": await repo.get_skip_rate(GUILD_ID),
+        "most_skipped": await repo.get_most_skipped(GUILD_ID),
+        "user_stats": await repo.get_user_stats(GUILD_ID, 100),
+        "no_user_stats": await repo.get_user_stats(GUILD_ID, 999),
+        "user_top": await repo.get_user_top_tracks(GUILD_ID, 100),
+        "by_day": await repo.get_activity_by_day(GUILD_ID, 30),
+        "by_day_short": await repo.get_activity_by_day(GUILD_ID, 7),
+        "by_hour": await repo.get_activity_by_hour(GUILD_ID),
+        "by_weekday": await repo.get_activity_by_weekday(GUILD_ID),
+        "most_played_week": [(t.id.value, n) for t, n in most_played_week],
+        "requesters_week": await repo.get_top_requesters_since(GUILD_ID, week),
+        "skipped_week": await repo.get_most_skipped_since(GUILD_ID, week),
+    }
+
+
+async def _assert_week_is_rolling(repo) -> None:
+    now = datetime.now(UTC)
+    week = LeaderboardTimeRange.LAST_7_DAYS
+    # Same calendar day as the window start, but before it: excluded.
+    await repo.record_play(GUILD_ID, T1, played_at=now - timedelta(days=7, minutes=30))
+    await repo.mark_finished(GUILD_ID, T1.id, skipped=True)
+    # One play in the partial first day, one in a whole day bucket.
+    await repo.record_play(GUILD_ID, T2, played_at=now - timedelta(days=6, hours=23))
+    await repo.mark_finished(GUILD_ID, T2.id, skipped=True)
+    await repo.record_play(GUILD_ID, T2, played_at=now - timedelta(days=3))
+
+    most_played = await repo.get_most_played_since(GUILD_ID, week)
+
+    assert [(t.id.value, n) for t, n in most_played] == [("t2", 2)]
+    assert await repo.get_top_requesters_since(GUILD_ID, week) == [(200, "Bob", 2)]
+    assert await repo.get_most_skipped_since(GUILD_ID, week) == [("Pop Hit", 1)]
+
+
+class TestRollingWindow:
+    async def test_rollups_keep_a_rolling_week(self, history_repository):
+        await _assert_week_is_rolling(history_repository)
+
+    async def test_columns_keep_a_rolling_week(self, columnar_repository):
+        await _assert_week_is_rolling(columnar_repository)
+
+
+class TestColumnarParity:
+    async def test_matches_rollup_analytics(self, columnar_repository, history_repository):
+        await _seed(history_repository)
+
+        assert await _analytics(columnar_repository) == await _analytics(history_repository)
+
+    async def test_incremental_writes_match_rollups(self, columnar_repository, history_repository):
+        # Load the columns first so every later write goes through the hooks.
+        assert await columnar_repository.get_total_tracks(GUILD_ID) == 0
+        await _seed(columnar_repository)
+
+        assert await _analytics(columnar_repository) == await _analytics(history_repository)
+
+    async def test_empty_guild(self, columnar_repository):
+        assert await columnar_repository.get_skip_rate(GUILD_ID) == 0.0
+        assert await columnar_repository.get_most_played(GUILD_ID) == []
+        assert await columnar_repository.get_activity_by_hour(GUILD_ID) == []
+
+
+class TestColumnStore:
+    async def test_cached_guild_is_not_reloaded(self, columnar_repository):
+        await columnar_repository.record_play(GUILD_ID, T1)
+        columns = await columnar_repository.columns.get(GUILD_ID)
+
+        await columnar_repository.record_play(GUILD_ID, T2)
+        await columnar_repository.mark_finished(GUILD_ID, T2.id, skipped=True)
+
+        assert await columnar_repository.columns.get(GUILD_ID) is columns
+        assert len(columns) == 2
+        assert await columnar_repository.get_skip_rate(GUILD_ID) == 0.5
+
+    async def test_record_batch_appends_to_cached_columns(self, columnar_repository):
+        from discord_music_player.infrastructure.persistence.models import HistoryRow
+
+        columns = await columnar_repository.columns.get(GUILD_ID)
+        now = datetime.now(UTC)
+        await columnar_repository.record_batch(
+            [HistoryRow.from_track(T1, guild_id=GUILD_ID, played_at=now) for _ in range(3)]
+        )
+
+        assert len(columns) == 3
+        assert await columnar_repository.get_play_count(GUILD_ID, T1.id) == 3
+
+    async def test_clear_and_cleanup_invalidate(self, columnar_repository):
+        await columnar_repository.record_play(
+            GUILD_ID, T1, played_at=datetime.now(UTC) - timedelta(days=60)
+        )
+        await columnar_repository.record_play(GUILD_ID, T2)
+        assert await columnar_repository.get_total_tracks(GUILD_ID) == 2
+
+        await columnar_repository.cleanup_old(datetime.now(UTC) - timedelta(days=30))
+        assert await columnar_repository.get_total_tracks(GUILD_ID) == 1
+
+        await columnar_repository.clear_history(GUILD_ID)
+        assert await columnar_repository.get_total_tracks(GUILD_ID) == 0
+
+    async def test_least_recently_used_guild_is_evicted(self, columnar_repository):
+        store = columnar_repository.columns
+        first = await store.get(1)
+        await store.get(2)
+        await store.get(3)
+
+        assert await store.get(1) is not first
+
+    async def test_concurrent_first_loads_share_one_load(self, columnar_repository, monkeypatch):
+        await columnar_repository.record_play(GUILD_ID, T1)
+        store = columnar_repository.columns
+        real_load = store._load
+        loads = []
+
+        async def counting_load(guild_id):
+            loads.append(guild_id)
+            return await real_load(guild_id)
+
+        monkeypatch.setattr(store, "_load", counting_load)
+        first, second = await asyncio.gather(store.get(GUILD_ID), store.get(GUILD_ID))
+
+        assert first is second
+        assert len(first) == 1
+        assert loads == [GUILD_ID]
+        assert await store.get(GUILD_ID) is first
+
+    async def test_write_during_load_is_not_cached(self, columnar_repository, monkeypatch):
+        store = columnar_repository.columns
+        real_load = store._load
+
+        async def racing_load(guild_id):
+            columns = await real_load(guild_id)
+            await columnar_repository.record_play(guild_id, T1)
+            return columns
+
+        monkeypatch.setattr(store, "_load", racing_load)
+        await store.get(GUILD_ID)
+        monkeypatch.setattr(store, "_load", real_load)
+
+        assert await columnar_repository.get_total_tracks(GUILD_ID) == 1
@@ -199,6 +199,28 @@ class TestCleanupJob:
         assert stats.votes_cleaned == 2
         assert stats.total_cleaned == 20
 
+    @pytest.mark.asyncio
+    async def test_run_cleanup_checkpoints_database(self, cleanup_job):
+        """Test the WAL checkpoint runs after the cleanup operations."""
+        database = AsyncMock()
+        cleanup_job._database = database
+
+        stats = await cleanup_job.run_cleanup()
+
+        database.checkpoint.assert_awaited_once()
+        assert stats.total_cleaned == 20
+
+    @pytest.mark.asyncio
+    async def test_run_cleanup_survives_checkpoint_failure(self, cleanup_job):
+        """Test a failed checkpoint is logged without failing the cycle."""
+        database = AsyncMock()
+        database.checkpoint = AsyncMock(side_effect=RuntimeError("database is locked"))
+        cleanup_job._database = database
+
+        stats = await cleanup_job.run_cleanup()
+
+        assert stats.total_cleaned == 20
+
     @pytest.mark.asyncio
     async def test_start_job(self, cleanup_job):
         """Test starting the cleanup job creates background task."""
@@ -0,0 +1,240 @@
+"""Tests for the metrics registry, hot-path instruments and the /metrics exporter."""
+
+from __future__ import annotations
+
+import math
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.enums import MetricType
+from discord_music_player.domain.shared.events import (
+    EventBus,
+    TrackStartedPlaying,
+    get_event_bus,
+    reset_event_bus,
+)
+from discord_music_player.infrastructure.audio.ytdlp_executor import (
+    ExecutorStats,
+    PriorityLaneStats,
+)
+from discord_music_player.infrastructure.metrics import MetricsExporter, timed_repository
+from discord_music_player.infrastructure.metrics.collectors import (
+    QueueSizeCollector,
+    ResolverCollector,
+    collect_event_bus,
+)
+from discord_music_player.infrastructure.metrics.instruments import DB_QUERY_SECONDS
+from discord_music_player.utils.metrics import CONTENT_TYPE, MetricFamily, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestInstruments:
+    def test_counter_renders_per_label_set(self, registry):
+        lookups = registry.counter("lookups_total", "Cache lookups.", ("tier", "result"))
+        lookups.labels("memory", "hit").inc()
+        lookups.labels("memory", "hit").inc(2)
+        lookups.labels("disk", "miss").inc()
+
+        text = registry.render()
+
+        assert "# HELP lookups_total Cache lookups." in text
+        assert "# TYPE lookups_total counter" in text
+        assert 'lookups_total{tier="memory",result="hit"} 3' in text
+        assert 'lookups_total{tier="disk",result="miss"} 1' in text
+
+    def test_counter_rejects_decrease(self, registry):
+        with pytest.raises(ValueError):
+            registry.counter("c_total", "c").inc(-1)
+
+    def test_labels_are_cached(self, registry):
+        gauge = registry.gauge("g", "g", ("guild",))
+
+        assert gauge.labels("1") is gauge.labels("1")
+
+    def test_wrong_label_count_rejected(self, registry):
+        with pytest.raises(ValueError):
+            registry.gauge("g", "g", ("guild",)).labels("1", "2")
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_sum 3.65" in text
+        assert "latency_seconds_count 4" in text
+
+    def test_histogram_time_context(self, registry):
+        histogram = registry.histogram("op_seconds", "Op.", ("operation",))
+
+        with histogram.labels("play").time():
+            pass
+
+        assert histogram.labels("play").count == 1
+
+    def test_reregistering_returns_existing(self, registry):
+        first = registry.counter("c_total", "c", ("a",))
+
+        assert registry.counter("c_total", "c", ("a",)) is first
+        with pytest.raises(ValueError):
+            registry.gauge("c_total", "c", ("a",))
+
+    def test_label_values_escaped(self, registry):
+        registry.gauge("g", "g", ("name",)).labels('a"b\\c').set(1)
+
+        assert 'g{name="a\\"b\\\\c"} 1' in registry.render()
+
+
+class TestCollectors:
+    def test_collector_families_rendered(self, registry):
+        def collector():
+            family = MetricFamily("queue_tracks", "Queued.", MetricType.GAUGE)
+            family.add(4, guild="7")
+            yield family
+
+        registry.register_collector(collector)
+        assert 'queue_tracks{guild="7"} 4' in registry.render()
+
+        registry.unregister_collector(collector)
+        assert "queue_tracks" not in registry.render()
+
+    def test_failing_collector_does_not_break_scrape(self, registry):
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.counter("ok_total", "ok").inc()
+        registry.register_collector(broken)
+
+        assert "ok_total 1" in registry.render()
+
+    async def test_event_bus_handler_histograms(self, registry):
+        reset_event_bus()
+        bus: EventBus = get_event_bus()
+
+        async def on_track(event):
+            return None
+
+        bus.subscribe(TrackStartedPlaying, on_track)
+        await bus.publish(TrackStartedPlaying(guild_id=1, track_id=TrackId(value="t")))
+        registry.register_collector(collect_event_bus)
+
+        try:
+            text = registry.render()
+        finally:
+            reset_event_bus()
+
+        assert "# TYPE musicbot_event_handler_seconds histogram" in text
+        assert 'event="TrackStartedPlaying"' in text
+        bucket_lines = [
+            line for line in text.splitlines() if line.startswith("musicbot_event_handler_seconds_")
+        ]
+        assert any(line.endswith(" 1") and 'le="+Inf"' in line for line in bucket_lines)
+        assert any(line.startswith("musicbot_event_handler_seconds_count") for line in bucket_lines)
+
+    def test_queue_sizes_per_guild(self, registry):
+        sessions = MagicMock()
+        sessions.queue_lengths.return_value = {1: 3, 2: 0}
+        registry.register_collector(QueueSizeCollector(sessions))
+
+        text = registry.render()
+
+        assert 'musicbot_queue_tracks{guild="1"} 3' in text
+        assert 'musicbot_queue_tracks{guild="2"} 0' in text
+
+    def test_resolver_executor_load(self, registry):
+        resolver = MagicMock()
+        resolver.executor_stats.return_value = ExecutorStats(
+            workers=4,
+            busy=2,
+            queue_depth=5,
+            lanes={"interactive": PriorityLaneStats(queued=5, started=10)},
+        )
+        registry.register_collector(ResolverCollector(resolver))
+
+        text = registry.render()
+
+        assert "musicbot_resolver_busy_workers 2" in text
+        assert 'musicbot_resolver_queue_depth{priority="interactive"} 5' in text
+        assert 'musicbot_resolver_jobs_started_total{priority="interactive"} 10' in text
+
+
+class TestTimedRepository:
+    async def test_public_async_methods_recorded_per_class(self):
+        @timed_repository
+        class FakeRepository:
+            async def get(self, key):
+                return key
+
+            async def _private(self):
+                return None
+
+            def sync(self):
+                return None
+
+        class DerivedRepository(FakeRepository):
+            pass
+
+        assert await FakeRepository().get(1) == 1
+        await DerivedRepository().get(2)
+        await FakeRepository()._private()
+
+        assert DB_QUERY_SECONDS.labels("FakeRepository", "get").count == 1
+        assert DB_QUERY_SECONDS.labels("DerivedRepository", "get").count == 1
+        assert DB_QUERY_SECONDS.labels("FakeRepository", "_private").count == 0
+        assert FakeRepository.get.__name__ == "get"
+
+    async def test_failures_still_recorded(self):
+        @timed_repository
+        class FailingRepository:
+            async def save(self):
+                raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError):
+            await FailingRepository().save()
+
+        assert DB_QUERY_SECONDS.labels("FailingRepository", "save").count == 1
+
+
+class TestExporter:
+    async def test_serves_metrics_and_registers_collectors(self, registry):
+        registry.counter("requests_total", "Requests.").inc(5)
+
+        def collector():
+            family = MetricFamily("up", "Up.", MetricType.GAUGE)
+            family.add(1)
+            yield family
+
+        exporter = MetricsExporter(registry, host="127.0.0.1", port=0, collectors=[collector])
+        await exporter.start()
+        try:
+            url = f"http://127.0.0.1:{exporter.port}/metrics"
+            async with aiohttp.ClientSession() as client, client.get(url) as response:
+                body = await response.text()
+                content_type = response.headers["Content-Type"]
+        finally:
+            await exporter.stop()
+
+        assert content_type == CONTENT_TYPE
+        assert "requests_total 5" in body
+        assert "up 1" in body
+        assert not exporter.running
+        assert "up 1" not in registry.render()
+
+    async def test_stop_without_start_is_noop(self, registry):
+        exporter = MetricsExporter(registry, host="127.0.0.1", port=0)
+
+        await exporter.stop()
+
+        assert not exporter.running
+        assert math.isfinite(exporter.port)
@@ -0,0 +1,159 @@
+"""Tests for the versioned schema migration runner."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from discord_music_player.infrastructure.persistence.database import Database
+from discord_music_player.infrastructure.persistence.migrations import (
+    LATEST_SCHEMA_VERSION,
+    MigrationRunner,
+    OnlineBackfill,
+    SchemaMigration,
+)
+
+
+async def _user_version(database) -> int:
+    row = await database.fetch_one("PRAGMA user_version")
+    return row["user_version"]
+
+
+async def _recorded_versions(database) -> list[int]:
+    rows = await database.fetch_all("SELECT version FROM schema_version ORDER BY version")
+    return [row["version"] for row in rows]
+
+
+class TestStartup:
+    async def test_fresh_database_is_at_latest_version(self, in_memory_database):
+        assert await _user_version(in_memory_database) == LATEST_SCHEMA_VERSION
+        assert await _recorded_versions(in_memory_database) == list(
+            range(1, LATEST_SCHEMA_VERSION + 1)
+        )
+
+    async def test_up_to_date_database_skips_migrations(self, tmp_path, monkeypatch):
+        db = Database(str(tmp_path / "bot.db"))
+        await db.initialize()
+        await db.close()
+
+        applied = []
+        monkeypatch.setattr(
+            MigrationRunner, "_record", staticmethod(lambda conn, m: applied.append(m))
+        )
+        await db.initialize()
+        try:
+            assert applied == []
+            assert await _user_version(db) == LATEST_SCHEMA_VERSION
+        finally:
+            await db.close()
+
+
+class TestRunner:
+    async def test_schema_steps_run_once_in_order(self, in_memory_database):
+        calls = []
+
+        def step(name):
+            async def apply(conn):
+                calls.append(name)
+
+            return apply
+
+        migrations = (
+            SchemaMigration(version=LATEST_SCHEMA_VERSION + 1, name="a", apply=step("a")),
+            SchemaMigration(version=LATEST_SCHEMA_VERSION + 2, name="b", apply=step("b")),
+        )
+        runner = MigrationRunner(in_memory_database, migrations)
+
+        assert await runner.run() is False
+        assert await runner.run() is False
+
+        assert calls == ["a", "b"]
+        assert await _user_version(in_memory_database) == LATEST_SCHEMA_VERSION + 2
+
+    async def test_failed_step_rolls_back_and_retries(self, in_memory_database):
+        attempts = []
+
+        async def flaky(conn):
+            await conn.execute("CREATE TABLE scratch (id INTEGER)")
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+
+        runner = MigrationRunner(
+            in_memory_database,
+            (SchemaMigration(version=LATEST_SCHEMA_VERSION + 1, name="flaky", apply=flaky),),
+        )
+
+        with pytest.raises(RuntimeError):
+            await runner.run()
+        assert await _user_version(in_memory_database) == LATEST_SCHEMA_VERSION
+
+        assert await runner.run() is False
+        assert await _user_version(in_memory_database) == LATEST_SCHEMA_VERSION + 1
+
+
+class TestOnlineBackfill:
+    @pytest.fixture
+    async def scratch(self, in_memory_database):
+        await in_memory_database.execute("CREATE TABLE scratch (src INTEGER, dst INTEGER)")
+        async with in_memory_database.transaction() as conn:
+            await conn.executemany(
+                "INSERT INTO scratch (src) VALUES (?)", [(i,) for i in range(5)] + [(None,)]
+            )
+        return in_memory_database
+
+    def _backfill(self, batch_size):
+        return OnlineBackfill(
+            version=LATEST_SCHEMA_VERSION + 1,
+            name="fill dst",
+            table="scratch",
+            column="dst",
+            expression="src * 10",
+            batch_size=batch_size,
+        )
+
+    async def test_small_table_finishes_at_startup(self, scratch):
+        runner = MigrationRunner(scratch, (self._backfill(batch_size=100),))
+
+        assert await runner.run() is False
+
+        rows = await scratch.fetch_all("SELECT dst FROM scratch WHERE src IS NOT NULL")
+        assert sorted(row["dst"] for row in rows) == [0, 10, 20, 30, 40]
+        assert await _user_version(scratch) == LATEST_SCHEMA_VERSION + 1
+
+    async def test_large_table_continues_in_background(self, scratch):
+        runner = MigrationRunner(scratch, (self._backfill(batch_size=2),))
+
+        assert await runner.run() is True
+        filled = await scratch.fetch_one("SELECT COUNT(dst) AS n FROM scratch")
+        assert filled["n"] == 2
+        assert await _user_version(scratch) == LATEST_SCHEMA_VERSION
+
+        await runner.run_online()
+
+        filled = await scratch.fetch_one("SELECT COUNT(dst) AS n FROM scratch")
+        assert filled["n"] == 5
+        assert await _user_version(scratch) == LATEST_SCHEMA_VERSION + 1
+        assert LATEST_SCHEMA_VERSION + 1 in await _recorded_versions(scratch)
+
+    async def test_background_failure_is_logged_without_close(self, tmp_path, monkeypatch, caplog):
+        from discord_music_player.infrastructure.persistence import database as database_module
+
+        async def has_pending(self):
+            return True
+
+        async def fail(self):
+            raise RuntimeError("backfill broke")
+
+        monkeypatch.setattr(database_module.MigrationRunner, "run", has_pending)
+        monkeypatch.setattr(database_module.MigrationRunner, "run_online", fail)
+        db = Database(str(tmp_path / "music.db"))
+        await db.initialize()
+        try:
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+            assert "Online schema migration failed" in caplog.text
+        finally:
+            await db.close()
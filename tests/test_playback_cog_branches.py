@@ -117,6 +117,16 @@ def _track(track_id: str = "abc") -> Track:
     )
 
 
+def _stream(tracks: list[Track]) -> MagicMock:
+    """Stand-in for ``resolve_many``: an async generator over *tracks*."""
+
+    async def resolve_many(queries, **_):
+        for track in tracks:
+            yield track
+
+    return MagicMock(side_effect=resolve_many)
+
+
 def _container(**overrides) -> FakeContainer:
     """Build a fake container with sensible defaults for cog tests."""
     playback_service = MagicMock()
@@ -1178,6 +1188,43 @@ class TestAutoEnqueueYouTubePlaylist:
         cog._finalize_playlist_import.assert_awaited_once()
 
 
+    @pytest.mark.asyncio
+    async def test_import_enqueues_preview_entries_without_resolving_them(self):
+        from discord_music_player.config.settings import AudioSettings
+        from discord_music_player.domain.music.entities import PlaylistEntry, PlaylistPreview
+        from discord_music_player.infrastructure.audio.ytdlp_resolver import YtDlpResolver
+
+        member, interaction = _interaction_in_voice()
+        resolver = YtDlpResolver(AudioSettings())
+        resolver.resolve = AsyncMock()
+        resolver.resolve_many = MagicMock()
+        container = _container(audio_resolver=resolver)
+        cog = _make_cog(container)
+        cog.enqueue_and_start = AsyncMock(
+            side_effect=lambda _, chunk: MagicMock(enqueued=len(chunk), queue_full=False)
+        )
+        preview = PlaylistPreview(
+            entries=[
+                PlaylistEntry(title=f"E{i}", url=f"https://www.youtube.com/watch?v=abcdefghij{i}")
+                for i in range(3)
+            ],
+            title="Mix",
+        )
+
+        try:
+            await cog._auto_enqueue_youtube_playlist(
+                interaction, preview=preview, count=3, start=None, shuffle=False
+            )
+        finally:
+            resolver.close()
+
+        resolver.resolve.assert_not_called()
+        resolver.resolve_many.assert_not_called()
+        queued = [t for call in cog.enqueue_and_start.await_args_list for t in call.args[1]]
+        assert [t.webpage_url for t in queued] == [e.url for e in preview.entries]
+        assert all(t.stream_url is None for t in queued)
+
+
 # =============================================================================
 # _finalize_playlist_import
 # =============================================================================
@@ -1188,7 +1235,7 @@ class TestFinalizePlaylistImport:
     async def test_no_resolved_tracks(self):
         member, interaction = _interaction_in_voice()
         container = _container()
-        container.audio_resolver.resolve_many = AsyncMock(return_value=[])
+        container.audio_resolver.resolve_many = _stream([])
         cog = _make_cog(container)
         await cog._finalize_playlist_import(
             interaction,
@@ -1204,7 +1251,7 @@ class TestFinalizePlaylistImport:
         member, interaction = _interaction_in_voice()
         tracks = [_track("a"), _track("b")]
         container = _container()
-        container.audio_resolver.resolve_many = AsyncMock(return_value=tracks)
+        container.audio_resolver.resolve_many = _stream(tracks)
         cog = _make_cog(container)
         cog.enqueue_and_start = AsyncMock(return_value=MagicMock(enqueued=0))
         await cog._finalize_playlist_import(
@@ -1221,7 +1268,7 @@ class TestFinalizePlaylistImport:
         member, interaction = _interaction_in_voice()
         tracks = [_track("a"), _track("b"), _track("c")]
         container = _container()
-        container.audio_resolver.resolve_many = AsyncMock(return_value=tracks)
+        container.audio_resolver.resolve_many = _stream(tracks)
         cog = _make_cog(container)
         cog.enqueue_and_start = AsyncMock(return_value=MagicMock(enqueued=2))
         sent = MagicMock()
@@ -1236,6 +1283,57 @@ class TestFinalizePlaylistImport:
         assert interaction.followup.send.await_count == 2
 
 
+    @pytest.mark.asyncio
+    async def test_first_track_is_enqueued_before_the_rest_resolve(self, monkeypatch):
+        member, interaction = _interaction_in_voice()
+        tracks = [_track("a"), _track("b"), _track("c")]
+        container = _container()
+        container.audio_resolver.resolve_many = _stream(tracks)
+        cog = _make_cog(container)
+        cog.enqueue_and_start = AsyncMock(
+            side_effect=lambda _, chunk: MagicMock(enqueued=len(chunk), queue_full=False)
+        )
+        # Freeze the clock so everything after the first track is coalesced.
+        monkeypatch.setattr(
+            "discord_music_player.infrastructure.discord.cogs.playback_cog.time.monotonic",
+            lambda: 100.0,
+        )
+        status = MagicMock()
+        status.edit = AsyncMock()
+
+        await cog._finalize_playlist_import(
+            interaction,
+            resolver_queries=["https://yt/a", "https://yt/b", "https://yt/c"],
+            source_label="Test",
+            suggested_name="test",
+            status_message=status,
+        )
+
+        chunks = [call.args[1] for call in cog.enqueue_and_start.await_args_list]
+        assert chunks == [[tracks[0]], tracks[1:]]
+        edits = [call.kwargs["content"] for call in status.edit.await_args_list]
+        assert "so far" in edits[0]
+        assert edits[-1].startswith("Queued **3/3**")
+
+    @pytest.mark.asyncio
+    async def test_full_queue_stops_the_import(self):
+        member, interaction = _interaction_in_voice()
+        container = _container()
+        container.audio_resolver.resolve_many = _stream([_track("a"), _track("b")])
+        cog = _make_cog(container)
+        cog.enqueue_and_start = AsyncMock(return_value=MagicMock(enqueued=1, queue_full=True))
+
+        await cog._finalize_playlist_import(
+            interaction,
+            resolver_queries=["https://yt/a", "https://yt/b"],
+            source_label="Test",
+            suggested_name="test",
+        )
+
+        cog.enqueue_and_start.assert_awaited_once()
+        assert "Queued **1/2**" in interaction.followup.send.await_args_list[0].args[0]
+
+
 # =============================================================================
 # _send_queued
 # =============================================================================
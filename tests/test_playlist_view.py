@@ -310,7 +310,7 @@ class TestAddAllButton:
         await view.add_all_button.callback(interaction)
 
         on_finalize.assert_awaited_once()
-        queries = on_finalize.await_args.kwargs["resolver_queries"]
+        queries = [e.url for e in on_finalize.await_args.kwargs["entries"]]
         assert len(queries) == 3
 
     @pytest.mark.asyncio
@@ -337,7 +337,7 @@ class TestShuffleAllButton:
 
         await view.shuffle_all_button.callback(interaction)
 
-        queries = on_finalize.await_args.kwargs["resolver_queries"]
+        queries = [e.url for e in on_finalize.await_args.kwargs["entries"]]
         assert sorted(queries) == sorted(e.url for e in entries)
 
 
@@ -390,7 +390,7 @@ class TestOnSelect:
                     await view._on_select(interaction)
                 break
 
-        queries = on_finalize.await_args.kwargs["resolver_queries"]
+        queries = [e.url for e in on_finalize.await_args.kwargs["entries"]]
         assert queries == ["https://youtu.be/0", "https://youtu.be/2"]
 
 
@@ -413,7 +413,7 @@ class TestFinalizeCallback:
 
         on_finalize.assert_awaited_once()
         kwargs = on_finalize.await_args.kwargs
-        assert kwargs["resolver_queries"] == ["https://youtu.be/a", "https://youtu.be/b"]
+        assert [e.url for e in kwargs["entries"]] == ["https://youtu.be/a", "https://youtu.be/b"]
         assert kwargs["source_label"] == "YouTube playlist"
         assert kwargs["suggested_name"] == "my mix"
 
@@ -428,7 +428,7 @@ class TestFinalizeCallback:
         await view.shuffle_all_button.callback(interaction)
 
         on_finalize.assert_awaited_once()
-        queries = on_finalize.await_args.kwargs["resolver_queries"]
+        queries = [e.url for e in on_finalize.await_args.kwargs["entries"]]
         assert sorted(queries) == sorted(e.url for e in entries)
 
     @pytest.mark.asyncio
@@ -0,0 +1,123 @@
+"""Tests for typed queries and the streaming fetch helpers on Database."""
+
+from __future__ import annotations
+
+from contextlib import aclosing
+from typing import NamedTuple
+
+import pytest
+
+from discord_music_player.domain.music.entities import Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.infrastructure.persistence.queries import CountRow, Query
+from discord_music_player.infrastructure.persistence.repositories.genre_repository import (
+    SQLiteGenreCacheRepository,
+)
+from discord_music_player.infrastructure.persistence.repositories.history_repository import (
+    SQLiteHistoryRepository,
+)
+
+
+class _ScratchRow(NamedTuple):
+    id: int
+    label: str
+
+
+_SELECT_SCRATCH = Query("SELECT id, label FROM scratch ORDER BY id", _ScratchRow)
+_SELECT_ONE = Query("SELECT id, label FROM scratch WHERE id = ?", _ScratchRow)
+_COUNT_SCRATCH = Query("SELECT COUNT(*) FROM scratch", CountRow)
+
+
+@pytest.fixture
+async def scratch(in_memory_database):
+    await in_memory_database.execute("CREATE TABLE scratch (id INTEGER PRIMARY KEY, label TEXT)")
+    async with in_memory_database.transaction() as conn:
+        await conn.executemany(
+            "INSERT INTO scratch (id, label) VALUES (?, ?)", [(i, f"row-{i}") for i in range(7)]
+        )
+    return in_memory_database
+
+
+class TestQuery:
+    def test_row_factory_builds_named_tuple(self):
+        row = _SELECT_SCRATCH.row_factory(None, (1, "a"))  # type: ignore[arg-type]
+
+        assert row == _ScratchRow(id=1, label="a")
+        assert row.label == "a"
+
+    def test_repr_names_row_type(self):
+        assert repr(_COUNT_SCRATCH).startswith("Query[CountRow]")
+
+
+class TestTypedFetch:
+    async def test_fetch_rows_returns_named_tuples(self, scratch):
+        rows = await scratch.fetch_rows(_SELECT_SCRATCH)
+
+        assert [row.id for row in rows] == list(range(7))
+        assert all(isinstance(row, _ScratchRow) for row in rows)
+
+    async def test_fetch_row(self, scratch):
+        assert await scratch.fetch_row(_SELECT_ONE, (3,)) == _ScratchRow(3, "row-3")
+        assert await scratch.fetch_row(_SELECT_ONE, (99,)) is None
+        assert (await scratch.fetch_row(_COUNT_SCRATCH)).count == 7
+
+    async def test_fetch_many_yields_bounded_batches(self, scratch):
+        batches = [batch async for batch in scratch.fetch_many(_SELECT_SCRATCH, batch_size=3)]
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [row.id for batch in batches for row in batch] == list(range(7))
+
+    async def test_iterate_streams_every_row(self, scratch):
+        labels = [row.label async for row in scratch.iterate(_SELECT_SCRATCH, batch_size=2)]
+
+        assert labels == [f"row-{i}" for i in range(7)]
+
+    async def test_early_exit_releases_connection(self, scratch):
+        async with aclosing(scratch.iterate(_SELECT_SCRATCH, batch_size=2)) as rows:
+            async for row in rows:
+                if row.id == 2:
+                    break
+
+        await scratch.execute("DELETE FROM scratch WHERE id = 0")
+        assert (await scratch.fetch_row(_COUNT_SCRATCH)).count == 6
+
+    async def test_dict_helpers_unaffected(self, scratch):
+        await scratch.fetch_rows(_SELECT_SCRATCH)
+
+        row = await scratch.fetch_one("SELECT id, label FROM scratch WHERE id = 1")
+        assert row == {"id": 1, "label": "row-1"}
+
+
+class TestConvertedRepositories:
+    async def test_get_genres_with_many_ids(self, in_memory_database):
+        repo = SQLiteGenreCacheRepository(in_memory_database)
+        await repo.save_genres({f"t{i}": "Rock" for i in range(0, 1500, 2)})
+
+        result = await repo.get_genres([f"t{i}" for i in range(1500)])
+
+        assert len(result) == 750
+        assert result["t0"] == "Rock"
+        assert "t1" not in result
+
+    async def test_user_tracks_for_genre_grouped_with_play_count(self, in_memory_database):
+        repo = SQLiteHistoryRepository(in_memory_database)
+
+        def track(track_id, title, user_id, artist=None):
+            return Track(
+                id=TrackId(value=track_id),
+                title=title,
+                webpage_url=f"https://u/{track_id}",
+                artist=artist,
+                requested_by_id=user_id,
+            )
+
+        song = track("t1", "Song", 42, artist="A")
+        for played in (song, song, song, track("t2", "Other", 42), track("t2", "Other", 7)):
+            await repo.record_play(1, played)
+
+        tracks = {t.track_id: t for t in await repo.get_user_tracks_for_genre(1, 42)}
+
+        assert tracks["t1"].play_count == 3
+        assert tracks["t1"].artist == "A"
+        assert tracks["t2"].play_count == 1
+        assert tracks["t2"].artist is None
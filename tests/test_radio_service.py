@@ -1070,8 +1070,8 @@ class TestRestoreRemovedTrack:
             guild_id=1, track=track, position=0, user_id=100, user_name="U"
         )
 
-        # from_pos=2 (queue_length-1), position=0, so move was called
-        mocks["queue_service"].move.assert_called_with(1, 2, 0)
+        # The restored copy is last in the queue (index 2), so it moves to 0
+        new_session.move_track.assert_called_with(2, 0)
 
     @pytest.mark.asyncio
     async def test_swallows_exception(self):
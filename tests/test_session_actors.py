@@ -0,0 +1,129 @@
+"""Tests for per-guild session actors."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from discord_music_player.application.services.session_actors import GuildSessionActors
+from discord_music_player.domain.music.entities import GuildPlaybackSession, Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.infrastructure.persistence.repositories.cached_session_repository import (
+    CachedSessionRepository,
+)
+
+
+def _track(n: int) -> Track:
+    return Track(
+        id=TrackId(value=f"track-{n}"),
+        title=f"Track {n}",
+        webpage_url=f"https://youtube.com/watch?v=track{n}",
+    )
+
+
+@pytest.fixture
+def repo(session_repository):
+    return CachedSessionRepository(session_repository)
+
+
+@pytest.fixture
+def actors(repo):
+    return GuildSessionActors(repo)
+
+
+class TestExecute:
+    async def test_concurrent_commands_share_one_persist(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+        repo.save = AsyncMock(wraps=repo.save)
+
+        results = await asyncio.gather(
+            *(actors.execute(1, lambda s, n=n: s.enqueue(_track(n)).value) for n in range(5))
+        )
+
+        assert results == [0, 1, 2, 3, 4]
+        repo.save.assert_awaited_once()
+        session = await repo.get(1)
+        assert [t.title for t in session.queue] == [f"Track {n}" for n in range(5)]
+        assert actors.stats().max_batch == 5
+
+    async def test_commands_run_in_submission_order(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+        seen: list[int] = []
+
+        await asyncio.gather(*(actors.execute(1, lambda s, n=n: seen.append(n)) for n in range(10)))
+
+        assert seen == list(range(10))
+
+    async def test_failing_command_raises_to_its_submitter_only(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+
+        def boom(session: GuildPlaybackSession) -> None:
+            raise ValueError("bad")
+
+        ok, failed = await asyncio.gather(
+            actors.execute(1, lambda s: s.enqueue(_track(1)).value),
+            actors.execute(1, boom),
+            return_exceptions=True,
+        )
+
+        assert ok == 0
+        assert isinstance(failed, ValueError)
+        assert (await repo.get(1)).queue_length == 1
+
+    async def test_missing_session_returns_none(self, actors, repo):
+        repo.save = AsyncMock(wraps=repo.save)
+
+        assert await actors.execute(42, lambda s: s.enqueue(_track(1))) is None
+        repo.save.assert_not_awaited()
+
+    async def test_execute_or_create_creates_session(self, actors, repo):
+        position = await actors.execute_or_create(7, lambda s: s.enqueue(_track(1)).value)
+
+        assert position == 0
+        assert (await repo.get(7)).queue_length == 1
+
+
+class TestReadAndDelete:
+    async def test_read_does_not_persist(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+        repo.save = AsyncMock(wraps=repo.save)
+
+        assert await actors.read(1, lambda s: s.queue_length) == 0
+        repo.save.assert_not_awaited()
+
+    async def test_read_sees_earlier_commands(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+
+        _, length = await asyncio.gather(
+            actors.execute(1, lambda s: s.enqueue(_track(1))),
+            actors.read(1, lambda s: s.queue_length),
+        )
+
+        assert length == 1
+
+    async def test_delete_runs_after_queued_commands(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+
+        position, deleted, after = await asyncio.gather(
+            actors.execute(1, lambda s: s.enqueue(_track(1)).value),
+            actors.delete(1),
+            actors.read(1, lambda s: s.queue_length),
+        )
+
+        assert position == 0
+        assert deleted is True
+        assert after is None
+        assert await repo.get(1) is None
+
+    async def test_drain_waits_for_pending_work(self, actors, repo):
+        await repo.save(GuildPlaybackSession(guild_id=1))
+        pending = asyncio.ensure_future(actors.execute(1, lambda s: s.enqueue(_track(1))))
+        await asyncio.sleep(0)
+
+        await actors.drain()
+
+        assert pending.done()
+        assert actors.stats().active_guilds == 0
+        assert (await repo.get(1)).queue_length == 1
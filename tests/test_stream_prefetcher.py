@@ -0,0 +1,159 @@
+"""Tests for the stream-URL prefetcher."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from discord_music_player.application.services.session_actors import GuildSessionActors
+from discord_music_player.application.services.stream_prefetcher import (
+    StreamPrefetcher,
+    is_stream_url_stale,
+    stream_url_expiry,
+)
+from discord_music_player.domain.music.entities import GuildPlaybackSession, Track
+from discord_music_player.domain.music.wrappers import TrackId
+from discord_music_player.domain.shared.events import TrackStartedPlaying, reset_event_bus
+
+
+def _track(n: int, stream_url: str | None = None) -> Track:
+    return Track(
+        id=TrackId(value=f"track-{n}"),
+        title=f"Track {n}",
+        webpage_url=f"https://youtube.com/watch?v=track{n}",
+        stream_url=stream_url,
+    )
+
+
+def _signed_url(n: int, expires_in: float) -> str:
+    expire = int(time.time() + expires_in)
+    return f"https://rr1.googlevideo.com/videoplayback?expire={expire}&id={n}"
+
+
+@pytest.fixture
+def resolver():
+    resolver = AsyncMock()
+
+    async def resolve(url: str, **_) -> Track:
+        n = int(url.rsplit("track", 1)[1])
+        return _track(n, stream_url=_signed_url(n, 6 * 3600))
+
+    resolver.resolve.side_effect = resolve
+    return resolver
+
+
+@pytest.fixture
+async def actors(session_repository):
+    session = GuildPlaybackSession(guild_id=1)
+    session.set_current_track(_track(0))
+    for n in range(1, 5):
+        session.enqueue(_track(n))
+    await session_repository.save(session)
+    return GuildSessionActors(session_repository)
+
+
+@pytest.fixture
+def prefetcher(resolver, actors):
+    reset_event_bus()
+    prefetcher = StreamPrefetcher(audio_resolver=resolver, session_actors=actors, prefetch_count=2)
+    yield prefetcher
+    prefetcher.stop()
+    reset_event_bus()
+
+
+class TestExpiryParsing:
+    def test_reads_expire_query_parameter(self):
+        assert stream_url_expiry(
+            "https://x.googlevideo.com/videoplayback?expire=1700000000&a=b"
+        ) == (1700000000.0)
+
+    def test_reads_expire_path_segment(self):
+        assert stream_url_expiry(
+            "https://x.googlevideo.com/videoplayback/expire/1700000000/id/1"
+        ) == (1700000000.0)
+
+    def test_unsigned_url_has_no_expiry(self):
+        assert stream_url_expiry("https://stream.example.com/audio.mp3") is None
+        assert not is_stream_url_stale("https://stream.example.com/audio.mp3", margin_seconds=60)
+
+    def test_staleness_respects_margin(self):
+        url = _signed_url(1, expires_in=300)
+        assert is_stream_url_stale(url, margin_seconds=600)
+        assert not is_stream_url_stale(url, margin_seconds=60)
+
+
+class TestPrefetch:
+    async def test_resolves_only_the_next_window(self, prefetcher, resolver):
+        assert await prefetcher.prefetch(1) == 2
+
+        resolved = [call.args[0] for call in resolver.resolve.await_args_list]
+        assert resolved == [_track(1).webpage_url, _track(2).webpage_url]
+        assert prefetcher.stats().cached == 2
+
+    async def test_fresh_entries_are_not_resolved_again(self, prefetcher, resolver):
+        await prefetcher.prefetch(1)
+        resolver.resolve.reset_mock()
+
+        assert await prefetcher.prefetch(1) == 0
+        resolver.resolve.assert_not_awaited()
+
+    async def test_take_hands_out_each_stream_once(self, prefetcher):
+        await prefetcher.prefetch(1)
+
+        first = prefetcher.take(1, _track(1))
+        assert first is not None and "googlevideo" in first.stream_url
+        assert prefetcher.take(1, _track(1)) is None
+        assert prefetcher.stats().hits == 1
+
+    async def test_near_expiry_stream_is_refused_and_refreshed(self, prefetcher, resolver):
+        async def short_lived(url: str, **_) -> Track:
+            n = int(url.rsplit("track", 1)[1])
+            return _track(n, stream_url=_signed_url(n, 120))
+
+        resolver.resolve.side_effect = short_lived
+        await prefetcher.prefetch(1)
+        assert prefetcher.take(1, _track(1)) is None
+        assert prefetcher.stats().stale == 1
+
+        # The remaining near-expiry entry is re-resolved on the next pass.
+        assert await prefetcher.prefetch(1) == 2
+
+    async def test_failed_resolution_is_counted(self, prefetcher, resolver):
+        resolver.resolve.side_effect = RuntimeError("yt-dlp down")
+
+        assert await prefetcher.prefetch(1) == 0
+        assert prefetcher.stats().failures == 2
+        assert prefetcher.stats().cached == 0
+
+    async def test_track_started_schedules_background_prefetch(self, prefetcher, resolver):
+        prefetcher.start()
+        await prefetcher._on_track_started(
+            TrackStartedPlaying(guild_id=1, track_id=TrackId(value="track-0"))
+        )
+
+        await prefetcher._tasks[1]
+        assert prefetcher.stats().cached == 2
+
+    async def test_forget_drops_guild_state(self, prefetcher):
+        await prefetcher.prefetch(1)
+        prefetcher.forget(1)
+
+        assert prefetcher.stats().cached == 0
+        assert 1 not in prefetcher._refresh_timers
+
+    async def test_first_upcoming_track_is_preloaded(self, resolver, actors):
+        voice_adapter = AsyncMock()
+        prefetcher = StreamPrefetcher(
+            audio_resolver=resolver, session_actors=actors, voice_adapter=voice_adapter
+        )
+
+        await prefetcher.prefetch(1)
+        prefetcher.forget(1)
+
+        voice_adapter.preload.assert_awaited_once()
+        guild_id, track = voice_adapter.preload.await_args.args
+        assert guild_id == 1
+        assert track.webpage_url == _track(1).webpage_url
+        assert "googlevideo" in track.stream_url
@@ -0,0 +1,90 @@
+"""Tests for SQLiteTrackInfoCacheRepository (persistent yt-dlp cache)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from discord_music_player.infrastructure.audio.models import YtDlpTrackInfo
+from discord_music_player.infrastructure.persistence.repositories.track_info_repository import (
+    SQLiteTrackInfoCacheRepository,
+)
+
+
+@pytest.fixture
+def repo(in_memory_database):
+    return SQLiteTrackInfoCacheRepository(in_memory_database)
+
+
+def _info(n: int) -> YtDlpTrackInfo:
+    return YtDlpTrackInfo(
+        webpage_url=f"https://youtube.com/watch?v=video{n:06d}",
+        url=f"https://stream.example.com/{n}",
+        title=f"Song {n}",
+        duration=200,
+        formats=[{"url": "https://stream.example.com/alt", "acodec": "opus"}],
+    )
+
+
+class TestTrackInfoCacheRepository:
+    async def test_metadata_is_stored_without_stream_fields(self, repo):
+        await repo.save(
+            "video000001",
+            _info(1),
+            stream_url="https://stream.example.com/1",
+            stream_expires_at=time.time() + 3600,
+        )
+
+        persisted = await repo.get("video000001")
+
+        assert persisted is not None
+        assert persisted.metadata.title == "Song 1"
+        assert persisted.metadata.url is None
+        assert persisted.metadata.formats == []
+        assert persisted.to_info().url == "https://stream.example.com/1"
+        assert persisted.has_fresh_stream(time.time(), margin_seconds=600)
+
+    async def test_save_upserts(self, repo):
+        await repo.save("video000001", _info(1), stream_url=None, stream_expires_at=None)
+        await repo.save("video000001", _info(2), stream_url="https://s/2", stream_expires_at=1.0)
+
+        persisted = await repo.get("video000001")
+
+        assert persisted is not None
+        assert persisted.metadata.title == "Song 2"
+        assert not persisted.has_fresh_stream(time.time(), margin_seconds=0)
+        assert await repo.count() == 1
+
+    async def test_get_missing_returns_none(self, repo):
+        assert await repo.get("nope") is None
+
+    async def test_cleanup_expired_uses_metadata_age(self, repo):
+        now = time.time()
+        await repo.save(
+            "old", _info(1), stream_url=None, stream_expires_at=None, cached_at=now - 100
+        )
+        await repo.save("new", _info(2), stream_url=None, stream_expires_at=None, cached_at=now)
+
+        assert await repo.cleanup_expired(max_age_seconds=50) == 1
+        assert await repo.get("old") is None
+        assert await repo.get("new") is not None
+
+    async def test_prune_keeps_most_recent(self, repo):
+        for n in range(5):
+            await repo.save(
+                f"v{n}", _info(n), stream_url=None, stream_expires_at=None, cached_at=float(n)
+            )
+
+        assert await repo.prune(max_entries=2) == 3
+        assert await repo.get("v4") is not None
+        assert await repo.get("v0") is None
+
+    async def test_unreadable_row_is_dropped(self, repo, in_memory_database):
+        await in_memory_database.execute(
+            "INSERT INTO ytdlp_track_cache (video_id, metadata_json, cached_at) VALUES (?, ?, ?)",
+            ("broken", "{not json", time.time()),
+        )
+
+        assert await repo.get("broken") is None
+        assert await repo.count() == 0
@@ -0,0 +1,129 @@
+"""Tests for stage-by-stage track transition tracing."""
+
+from __future__ import annotations
+
+import pytest
+
+from discord_music_player.application.services.transition_tracer import TransitionTracer
+from discord_music_player.domain.shared.enums import TransitionOutcome, TransitionStage
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive ``time.perf_counter`` by hand so stage durations are exact."""
+    now = [100.0]
+    monkeypatch.setattr(
+        "discord_music_player.application.services.transition_tracer.time.perf_counter",
+        lambda: now[0],
+    )
+
+    def advance(seconds: float) -> None:
+        now[0] += seconds
+
+    return advance
+
+
+class TestTransitionTracer:
+    def test_stages_are_timed_from_the_previous_mark(self, clock):
+        tracer = TransitionTracer()
+        tracer.begin(1)
+        clock(0.010)
+        tracer.mark(1, TransitionStage.TRACK_END_DISPATCH)
+        clock(0.200)
+        tracer.mark(1, TransitionStage.STREAM_RESOLVE)
+        clock(0.050)
+        tracer.mark(1, TransitionStage.FIRST_FRAME)
+
+        trace = tracer.finish(1, TransitionOutcome.PLAYING, track_title="Song")
+
+        assert trace is not None
+        assert trace.total_ms == pytest.approx(260.0)
+        assert [(t.stage, t.duration_ms) for t in trace.stages] == [
+            (TransitionStage.TRACK_END_DISPATCH, pytest.approx(10.0)),
+            (TransitionStage.STREAM_RESOLVE, pytest.approx(200.0)),
+            (TransitionStage.FIRST_FRAME, pytest.approx(50.0)),
+        ]
+        assert trace.dominant_stage.stage == TransitionStage.STREAM_RESOLVE
+        assert trace.track_title == "Song"
+        assert not tracer.in_progress(1)
+
+    def test_revisited_stages_are_summed(self, clock):
+        tracer = TransitionTracer()
+        tracer.begin(1)
+        for _ in range(2):
+            clock(0.1)
+            tracer.mark(1, TransitionStage.STREAM_RESOLVE)
+
+        trace = tracer.finish(1, TransitionOutcome.FAILED)
+
+        assert len(trace.stages) == 1
+        assert trace.stages[0].duration_ms == pytest.approx(200.0)
+
+    def test_marks_without_a_transition_are_ignored(self):
+        tracer = TransitionTracer()
+
+        tracer.mark(1, TransitionStage.CLAIM_NEXT)
+
+        assert tracer.finish(1, TransitionOutcome.PLAYING) is None
+        assert tracer.recent(1) == []
+
+    def test_begin_supersedes_an_open_transition(self, clock):
+        tracer = TransitionTracer()
+        tracer.begin(1)
+        clock(1.0)
+        tracer.begin(1)
+        tracer.finish(1, TransitionOutcome.GAPLESS)
+
+        outcomes = [trace.outcome for trace in tracer.recent(1)]
+
+        assert outcomes == [TransitionOutcome.GAPLESS, TransitionOutcome.SUPERSEDED]
+
+    def test_discard_drops_without_recording(self):
+        tracer = TransitionTracer()
+        tracer.begin(1)
+
+        tracer.discard(1)
+
+        assert not tracer.in_progress(1)
+        assert tracer.recent(1) == []
+
+    def test_history_is_bounded_per_guild(self):
+        tracer = TransitionTracer(history=3)
+        for _ in range(5):
+            tracer.begin(1)
+            tracer.finish(1, TransitionOutcome.PLAYING)
+        tracer.begin(2)
+        tracer.finish(2, TransitionOutcome.QUEUE_EMPTY)
+
+        assert len(tracer.recent(1)) == 3
+        assert len(tracer.recent(2)) == 1
+
+    def test_stats_summarize_stages_across_guilds(self, clock):
+        tracer = TransitionTracer()
+        for guild_id, resolve_s in ((1, 0.1), (2, 0.3)):
+            tracer.begin(guild_id)
+            clock(resolve_s)
+            tracer.mark(guild_id, TransitionStage.STREAM_RESOLVE)
+            tracer.finish(guild_id, TransitionOutcome.PLAYING)
+        tracer.begin(3)
+
+        stats = tracer.stats()
+
+        assert stats.traced == 2
+        assert stats.in_progress == 1
+        assert stats.avg_total_ms == pytest.approx(200.0)
+        assert stats.max_total_ms == pytest.approx(300.0)
+        assert stats.outcomes == {TransitionOutcome.PLAYING: 2}
+        assert [s.stage for s in stats.stages] == [TransitionStage.STREAM_RESOLVE]
+        assert stats.slowest.guild_id == 2
+
+    def test_clear_forgets_the_guild(self):
+        tracer = TransitionTracer()
+        tracer.begin(1)
+        tracer.finish(1, TransitionOutcome.PLAYING)
+        tracer.begin(1)
+
+        tracer.clear(1)
+
+        assert not tracer.in_progress(1)
+        assert tracer.stats().traced == 0
@@ -279,16 +279,20 @@ class TestVoiceAdapterErrorHandling:
         source = captured_play["source"]
         assert isinstance(source, FakeVolumeTransformer)
         assert source.volume == adapter._volume
-        assert source.source.url == sample_track.stream_url
-        assert "-ss 12" in source.source.before_options
-        assert "User-Agent:" in source.source.before_options
-        assert "afade=t=in:ss=0:d=0.5" in source.source.options
+        ffmpeg = source.source.current_source
+        assert ffmpeg.url == sample_track.stream_url
+        assert "-ss 12" in ffmpeg.before_options
+        assert "User-Agent:" in ffmpeg.before_options
+        assert "afade=t=in:ss=0:d=0.5" in ffmpeg.options
 
         after = captured_play["after"]
         assert callable(after)
         after(None)
+        # The player thread only schedules; the loop drops the finished source.
+        assert 123 in adapter._sources
         await asyncio.gather(*scheduled_tasks)
 
+        assert 123 not in adapter._sources
         assert adapter.get_current_track(123) is None
         callback.assert_awaited_once_with(123)
 
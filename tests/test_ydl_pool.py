@@ -0,0 +1,98 @@
+"""Tests for the per-thread YoutubeDL instance pool."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from discord_music_player.infrastructure.audio.ydl_pool import YdlProfile, YoutubeDLPool
+
+
+@pytest.fixture
+def factory():
+    def build(params):
+        ydl = MagicMock(name=f"ydl-{params['profile']}")
+        ydl.__enter__.return_value = ydl
+        ydl.params = params
+        return ydl
+
+    return MagicMock(side_effect=build)
+
+
+@pytest.fixture
+def pool(factory):
+    return YoutubeDLPool(
+        factory,
+        {profile: {"profile": profile.value} for profile in YdlProfile},
+        max_uses=3,
+    )
+
+
+class TestYoutubeDLPool:
+    def test_reuses_instance_within_a_thread(self, pool, factory):
+        with pool.acquire(YdlProfile.SINGLE) as first:
+            pass
+        with pool.acquire(YdlProfile.SINGLE) as second:
+            pass
+
+        assert first is second
+        assert factory.call_count == 1
+        assert pool.stats().reused == 1
+
+    def test_profiles_get_their_own_options(self, pool):
+        with pool.acquire(YdlProfile.SEARCH) as search:
+            pass
+        with pool.acquire(YdlProfile.FLAT_PLAYLIST) as playlist:
+            pass
+
+        assert search is not playlist
+        assert playlist.params == {"profile": "flat_playlist"}
+
+    def test_threads_do_not_share_instances(self, pool):
+        seen = []
+
+        def worker():
+            with pool.acquire(YdlProfile.SINGLE) as ydl:
+                seen.append(ydl)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert seen[0] is not seen[1]
+        assert pool.stats().instances == 2
+
+    def test_instance_is_recycled_after_max_uses(self, pool, factory):
+        for _ in range(4):
+            with pool.acquire(YdlProfile.SINGLE):
+                pass
+
+        stats = pool.stats()
+        assert factory.call_count == 2
+        assert stats.retired == 1
+        assert stats.instances == 1
+
+    def test_failed_extraction_discards_instance(self, pool, factory):
+        with pytest.raises(RuntimeError), pool.acquire(YdlProfile.SINGLE) as broken:
+            raise RuntimeError("HTTP 403")
+
+        with pool.acquire(YdlProfile.SINGLE) as fresh:
+            pass
+
+        assert fresh is not broken
+        broken.__exit__.assert_called_once()
+
+    def test_close_shuts_down_live_instances(self, pool):
+        with pool.acquire(YdlProfile.SINGLE) as ydl:
+            pass
+
+        pool.close()
+        with pool.acquire(YdlProfile.SINGLE) as replacement:
+            pass
+
+        ydl.__exit__.assert_called_once()
+        assert replacement is not ydl
@@ -0,0 +1,100 @@
+"""Tests for the priority-ordered yt-dlp executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from discord_music_player.application.interfaces.audio_resolver import ResolvePriority
+from discord_music_player.infrastructure.audio.ytdlp_executor import PriorityThreadExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = PriorityThreadExecutor(1, thread_name_prefix="test-ytdlp")
+    yield executor
+    executor.shutdown()
+
+
+async def _block_worker(executor: PriorityThreadExecutor) -> tuple[threading.Event, asyncio.Task]:
+    """Occupy the single worker until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def hold() -> str:
+        started.set()
+        release.wait(5)
+        return "held"
+
+    task = asyncio.create_task(executor.run(ResolvePriority.BULK, hold))
+    await asyncio.to_thread(started.wait, 5)
+    return release, task
+
+
+class TestPriorityThreadExecutor:
+    async def test_runs_function_on_worker_thread(self, executor):
+        name = await executor.run(
+            ResolvePriority.INTERACTIVE, lambda: threading.current_thread().name
+        )
+
+        assert name == "test-ytdlp-0"
+
+    async def test_interactive_jobs_jump_ahead_of_bulk(self, executor):
+        release, blocker = await _block_worker(executor)
+        order: list[str] = []
+
+        bulk = [
+            asyncio.create_task(executor.run(ResolvePriority.BULK, order.append, f"bulk-{i}"))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(
+            executor.run(ResolvePriority.INTERACTIVE, order.append, "play")
+        )
+        await asyncio.sleep(0)
+
+        assert executor.stats().queue_depth == 4
+        release.set()
+        await asyncio.gather(blocker, interactive, *bulk)
+
+        assert order == ["play", "bulk-0", "bulk-1", "bulk-2"]
+
+    async def test_exceptions_propagate_to_the_caller(self, executor):
+        def boom() -> None:
+            raise ValueError("bad url")
+
+        with pytest.raises(ValueError, match="bad url"):
+            await executor.run(ResolvePriority.INTERACTIVE, boom)
+
+    async def test_cancelled_job_is_skipped(self, executor):
+        release, blocker = await _block_worker(executor)
+        ran: list[str] = []
+
+        queued = asyncio.create_task(executor.run(ResolvePriority.PREFETCH, ran.append, "late"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await blocker
+        await executor.run(ResolvePriority.PREFETCH, ran.append, "next")
+
+        assert ran == ["next"]
+        assert executor.stats().lanes["prefetch"].cancelled == 1
+
+    async def test_stats_report_wait_times(self, executor):
+        release, blocker = await _block_worker(executor)
+        waiting = asyncio.create_task(executor.run(ResolvePriority.INTERACTIVE, lambda: None))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(blocker, waiting)
+
+        lane = executor.stats().lanes["interactive"]
+        assert lane.started == 1
+        assert lane.max_wait_ms >= 40
+
+    async def test_shutdown_rejects_new_work(self, executor):
+        executor.shutdown()
+
+        with pytest.raises(RuntimeError):
+            await executor.run(ResolvePriority.INTERACTIVE, lambda: None)
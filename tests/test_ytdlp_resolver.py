@@ -14,18 +14,20 @@ Tests for the yt-dlp based audio resolver infrastructure:
 Uses pytest with async/await patterns and proper mocking.
 """
 
+import asyncio
 import time
 from unittest.mock import patch
 
 import pytest
 
+from discord_music_player.application.interfaces.audio_resolver import ResolvePriority
 from discord_music_player.config.settings import AudioSettings
 from discord_music_player.domain.music.entities import Track
 from discord_music_player.domain.music.wrappers import TrackId
 from discord_music_player.infrastructure.audio.ytdlp_resolver import (
     CACHE_MAX_SIZE,
     CACHE_TTL,
-    RESOLVE_BATCH_SIZE,
+    RESOLVE_WINDOW,
     AudioFormatInfo,
     CacheEntry,
     YouTubeExtractorConfig,
@@ -364,6 +366,20 @@ class TestResolve:
 
         assert track is None
 
+    @pytest.mark.asyncio
+    async def test_resolve_runs_interactive_and_resolve_many_bulk(self, resolver, mock_info):
+        """/play jumps the yt-dlp queue; playlist batches wait behind it."""
+        run = resolver._executor.run
+        with (
+            patch.object(resolver._executor, "run", wraps=run) as spy,
+            patch.object(resolver, "_extract_info_sync", return_value=mock_info),
+        ):
+            await resolver.resolve("https://youtube.com/watch?v=abc")
+            [_ async for _ in resolver.resolve_many(["https://youtube.com/watch?v=def"])]
+
+        priorities = [call.args[0] for call in spy.call_args_list]
+        assert priorities == [ResolvePriority.INTERACTIVE, ResolvePriority.BULK]
+
     @pytest.mark.asyncio
     async def test_resolve_exception(self, resolver):
         """Should handle exceptions gracefully."""
@@ -422,7 +438,20 @@ class TestSearch:
 
 
 class TestResolveMany:
-    """Tests for resolve_many method."""
+    """Tests for the streaming resolve_many generator."""
+
+    @staticmethod
+    async def _collect(resolver, queries):
+        return [track async for track in resolver.resolve_many(queries)]
+
+    @staticmethod
+    def _track(n):
+        return Track(
+            id=TrackId(value=f"track{n}"),
+            title=f"Song {n}",
+            webpage_url=f"https://youtube.com/watch?v=abc{n}",
+            stream_url=f"https://example.com/stream{n}.m4a",
+        )
 
     @pytest.mark.asyncio
     async def test_resolve_many_success(self, resolver):
@@ -432,98 +461,114 @@ class TestResolveMany:
             "https://youtube.com/watch?v=abc2",
             "test song query",
         ]
-
-        mock_tracks = [
-            Track(
-                id=TrackId(value=f"track{i}"),
-                title=f"Song {i}",
-                webpage_url=f"https://youtube.com/watch?v=abc{i}",
-                stream_url=f"https://example.com/stream{i}.m4a",
-            )
-            for i in range(3)
-        ]
+        mock_tracks = [self._track(i) for i in range(3)]
 
         with patch.object(resolver, "resolve", side_effect=mock_tracks):
-            tracks = await resolver.resolve_many(queries)
+            tracks = await self._collect(resolver, queries)
 
-        assert len(tracks) == 3
-        assert all(isinstance(t, Track) for t in tracks)
+        assert tracks == mock_tracks
 
     @pytest.mark.asyncio
     async def test_resolve_many_partial_success(self, resolver):
-        """Should return only successfully resolved tracks."""
+        """Should yield only successfully resolved tracks."""
         queries = ["query1", "query2", "query3"]
-
-        # Second query returns None (failed)
-        mock_results = [
-            Track(
-                id=TrackId(value="track1"),
-                title="Song 1",
-                webpage_url="https://youtube.com/watch?v=abc1",
-                stream_url="https://example.com/stream1.m4a",
-            ),
-            None,  # Failed resolution
-            Track(
-                id=TrackId(value="track3"),
-                title="Song 3",
-                webpage_url="https://youtube.com/watch?v=abc3",
-                stream_url="https://example.com/stream3.m4a",
-            ),
-        ]
+        mock_results = [self._track(1), None, self._track(3)]
 
         with patch.object(resolver, "resolve", side_effect=mock_results):
-            tracks = await resolver.resolve_many(queries)
+            tracks = await self._collect(resolver, queries)
 
-        assert len(tracks) == 2
-        assert tracks[0].title == "Song 1"
-        assert tracks[1].title == "Song 3"
+        assert [t.title for t in tracks] == ["Song 1", "Song 3"]
 
     @pytest.mark.asyncio
     async def test_resolve_many_empty_list(self, resolver):
         """Should handle empty query list."""
-        tracks = await resolver.resolve_many([])
-        assert tracks == []
+        assert await self._collect(resolver, []) == []
 
     @pytest.mark.asyncio
-    async def test_resolve_many_batching(self, resolver):
-        """Should process queries in batches."""
-        # Create enough queries to span multiple batches
-        queries = [f"query{i}" for i in range(RESOLVE_BATCH_SIZE * 2 + 2)]
+    async def test_resolve_many_more_queries_than_window(self, resolver):
+        """Should keep refilling the window until every query is resolved."""
+        queries = [f"query{i}" for i in range(RESOLVE_WINDOW * 2 + 2)]
 
-        mock_track = Track(
-            id=TrackId(value="test"),
-            title="Test",
-            webpage_url="https://youtube.com/watch?v=test",
-            stream_url="https://example.com/stream.m4a",
-        )
-
-        with patch.object(resolver, "resolve", return_value=mock_track):
-            tracks = await resolver.resolve_many(queries)
+        with patch.object(resolver, "resolve", return_value=self._track(0)):
+            tracks = await self._collect(resolver, queries)
 
         assert len(tracks) == len(queries)
 
     @pytest.mark.asyncio
     async def test_resolve_many_with_exceptions(self, resolver):
-        """Should handle exceptions gracefully - batch with exceptions is lost."""
+        """A failing query is skipped without losing its neighbours."""
         queries = ["query1", "query2", "query3"]
 
-        # Second query raises exception
-        async def mock_resolve(query):
+        async def mock_resolve(query, **_):
             if query == "query2":
                 raise Exception("Resolution failed")
-            return Track(
-                id=TrackId(value=query),
-                title=f"Song {query}",
-                webpage_url=f"https://youtube.com/watch?v={query}",
-                stream_url=f"https://example.com/stream-{query}.m4a",
-            )
+            return self._track(query[-1])
 
         with patch.object(resolver, "resolve", side_effect=mock_resolve):
-            tracks = await resolver.resolve_many(queries)
+            tracks = await self._collect(resolver, queries)
+
+        assert [t.title for t in tracks] == ["Song 1", "Song 3"]
 
-        # When TaskGroup raises exception, entire batch is lost
-        # All 3 queries fit in one batch (RESOLVE_BATCH_SIZE), so all are lost
-        assert len(tracks) == 0
+    @pytest.mark.asyncio
+    async def test_yields_in_input_order_as_soon_as_ready(self, resolver):
+        """A fast later entry waits for its predecessors; the first is yielded immediately."""
+        slow_release = asyncio.Event()
+
+        async def mock_resolve(query, **_):
+            if query == "slow":
+                await slow_release.wait()
+            return self._track(query)
+
+        with patch.object(resolver, "resolve", side_effect=mock_resolve):
+            stream = resolver.resolve_many(["first", "slow", "fast"])
+            first = await anext(stream)
+            assert first.title == "Song first"
+
+            slow_release.set()
+            rest = [track.title async for track in stream]
+
+        assert rest == ["Song slow", "Song fast"]
+
+    @pytest.mark.asyncio
+    async def test_window_bounds_concurrency(self, resolver):
+        """No more than RESOLVE_WINDOW resolutions run at once."""
+        active = peak = 0
+
+        async def mock_resolve(query, **_):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return self._track(query)
+
+        with patch.object(resolver, "resolve", side_effect=mock_resolve):
+            await self._collect(resolver, [str(i) for i in range(RESOLVE_WINDOW * 3)])
+
+        assert peak <= RESOLVE_WINDOW
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_in_flight(self, resolver):
+        """Closing the generator cancels resolutions still in flight."""
+        never = asyncio.Event()
+        cancelled: list[str] = []
+
+        async def mock_resolve(query, **_):
+            if query != "0":
+                try:
+                    await never.wait()
+                except asyncio.CancelledError:
+                    cancelled.append(query)
+                    raise
+            return self._track(query)
+
+        with patch.object(resolver, "resolve", side_effect=mock_resolve):
+            stream = resolver.resolve_many([str(i) for i in range(4)])
+            await anext(stream)
+            await stream.aclose()
+            await asyncio.sleep(0)
+
+        assert sorted(cancelled) == ["1", "2", "3"]
 
 
 # =============================================================================
@@ -536,41 +581,57 @@ class TestPlaylistExtraction:
 
     @pytest.mark.asyncio
     async def test_extract_playlist_success(self, resolver, mock_info):
-        """Should extract playlist entries."""
+        """Should build lazy tracks from flat entries without resolving each one."""
         from discord_music_player.infrastructure.audio.models import YtDlpExtractResult
 
         extract_result = YtDlpExtractResult.model_construct(
             entries=[
-                YtDlpTrackInfo(url="https://youtube.com/watch?v=abc1"),
-                YtDlpTrackInfo(webpage_url="https://youtube.com/watch?v=abc2"),
+                YtDlpTrackInfo(
+                    url="https://www.youtube.com/watch?v=abcdefghij1", title="Song 1", duration=61
+                ),
+                YtDlpTrackInfo(
+                    webpage_url="https://youtube.com/watch?v=abcdefghij2", title="Song 2"
+                ),
+                YtDlpTrackInfo(title="No URL"),
             ],
             title="My Playlist",
         )
 
-        with patch.object(resolver, "_extract_playlist_sync", return_value=extract_result):
-            with patch.object(
-                resolver,
-                "resolve",
-                side_effect=[
-                    Track(
-                        id=TrackId(value="abc1"),
-                        title="Song 1",
-                        webpage_url="https://youtube.com/watch?v=abc1",
-                        stream_url="https://example.com/stream1.m4a",
-                    ),
-                    Track(
-                        id=TrackId(value="abc2"),
-                        title="Song 2",
-                        webpage_url="https://youtube.com/watch?v=abc2",
-                        stream_url="https://example.com/stream2.m4a",
-                    ),
-                ],
-            ):
-                tracks = await resolver.extract_playlist("https://youtube.com/playlist?list=PLxyz")
-
-        assert len(tracks) == 2
-        assert tracks[0].title == "Song 1"
-        assert tracks[1].title == "Song 2"
+        with (
+            patch.object(resolver, "_extract_playlist_sync", return_value=extract_result),
+            patch.object(resolver, "resolve") as mock_resolve,
+        ):
+            tracks = await resolver.extract_playlist("https://youtube.com/playlist?list=PLxyz")
+
+        mock_resolve.assert_not_called()
+        assert [t.title for t in tracks] == ["Song 1", "Song 2"]
+        assert [t.id.value for t in tracks] == ["abcdefghij1", "abcdefghij2"]
+        assert tracks[0].webpage_url == "https://www.youtube.com/watch?v=abcdefghij1"
+        assert tracks[0].duration_seconds == 61
+        assert all(t.stream_url is None for t in tracks)
+
+    def test_playlist_tracks_from_preview_entries(self, resolver):
+        """Should build lazy tracks from preview entries, skipping unusable ones."""
+        from discord_music_player.domain.music.entities import PlaylistEntry
+
+        entries = [
+            PlaylistEntry(
+                title="Song 1",
+                url="https://www.youtube.com/watch?v=abcdefghij1",
+                duration_seconds=61,
+                uploader="Channel",
+            ),
+            PlaylistEntry(title="Song 2", url="https://youtube.com/watch?v=abcdefghij2"),
+        ]
+
+        with patch.object(resolver, "resolve") as mock_resolve:
+            tracks = resolver.playlist_tracks(entries)
+
+        mock_resolve.assert_not_called()
+        assert [t.id.value for t in tracks] == ["abcdefghij1", "abcdefghij2"]
+        assert tracks[0].duration_seconds == 61
+        assert tracks[0].uploader == "Channel"
+        assert all(t.stream_url is None for t in tracks)
 
     @pytest.mark.asyncio
     async def test_extract_playlist_empty(self, resolver):
@@ -714,22 +775,20 @@ class TestCaching:
         mock_raw1 = {"webpage_url": url, "title": "Original", "url": "stream.m4a"}
         mock_raw2 = {"webpage_url": url, "title": "Updated", "url": "stream.m4a"}
 
-        # First call
         with patch(
             "discord_music_player.infrastructure.audio.ytdlp_resolver.YoutubeDL"
         ) as mock_ydl:
-            mock_ydl.return_value.__enter__.return_value.extract_info.return_value = mock_raw1
+            # The pooled instance is reused, so both calls go through the same mock.
+            extract_info = mock_ydl.return_value.__enter__.return_value.extract_info
+            extract_info.return_value = mock_raw1
             result1 = resolver._extract_info_sync(url)
 
-        # Simulate cache expiry
-        cached = _info_cache[url]
-        _info_cache[url] = CacheEntry(info=cached.info, cached_at=time.time() - CACHE_TTL - 1)
+            # Simulate cache expiry
+            key = _generate_track_id(url)
+            cached = _info_cache[key]
+            _info_cache[key] = CacheEntry(info=cached.info, cached_at=time.time() - CACHE_TTL - 1)
 
-        # Second call after expiry
-        with patch(
-            "discord_music_player.infrastructure.audio.ytdlp_resolver.YoutubeDL"
-        ) as mock_ydl:
-            mock_ydl.return_value.__enter__.return_value.extract_info.return_value = mock_raw2
+            extract_info.return_value = mock_raw2
             result2 = resolver._extract_info_sync(url)
 
         assert result1.title == "Original"
@@ -751,7 +810,9 @@ class TestCaching:
                 # Make first batch of entries expired
                 if i < expired_count:
                     info = YtDlpTrackInfo.model_validate(mock_raw)
-                    _info_cache[url] = CacheEntry(info=info, cached_at=time.time() - CACHE_TTL - 1)
+                    _info_cache[_generate_track_id(url)] = CacheEntry(
+                        info=info, cached_at=time.time() - CACHE_TTL - 1
+                    )
                 else:
                     resolver._extract_info_sync(url)
 
@@ -813,6 +874,143 @@ class TestCaching:
         assert result == []
 
 
+class TestMemoryLRU:
+    """Tests for the in-memory LRU tier."""
+
+    def _extract(self, resolver, url):
+        raw = {"webpage_url": url, "title": url[-4:], "url": "stream.m4a"}
+        with patch(
+            "discord_music_player.infrastructure.audio.ytdlp_resolver.YoutubeDL"
+        ) as mock_ydl:
+            mock_ydl.return_value.__enter__.return_value.extract_info.return_value = raw
+            return resolver._extract_info_sync(url)
+
+    def test_evicts_least_recently_used(self, resolver):
+        """A hit moves the entry to the end, so the oldest untouched one is evicted."""
+        with patch("discord_music_player.infrastructure.audio.ytdlp_resolver.CACHE_MAX_SIZE", 2):
+            self._extract(resolver, "https://youtube.com/watch?v=aaaaaaaaaaa")
+            self._extract(resolver, "https://youtube.com/watch?v=bbbbbbbbbbb")
+            self._extract(resolver, "https://youtube.com/watch?v=aaaaaaaaaaa")  # hit
+            self._extract(resolver, "https://youtube.com/watch?v=ccccccccccc")
+
+        assert list(_info_cache) == ["aaaaaaaaaaa", "ccccccccccc"]
+
+    def test_url_variants_share_one_entry(self, resolver):
+        """Entries are keyed by video ID, not by the exact URL."""
+        self._extract(resolver, "https://youtube.com/watch?v=dQw4w9WgXcQ")
+
+        with patch(
+            "discord_music_player.infrastructure.audio.ytdlp_resolver.YoutubeDL"
+        ) as mock_ydl:
+            result = resolver._extract_info_sync("https://youtu.be/dQw4w9WgXcQ")
+
+        mock_ydl.assert_not_called()
+        assert result is not None
+
+    def test_near_expiry_stream_is_a_miss(self, resolver):
+        """A cached signed URL that expires before the track could finish is refetched."""
+        url = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+        expire = int(time.time()) + 120
+        info = YtDlpTrackInfo(
+            webpage_url=url, url=f"https://rr1.googlevideo.com/videoplayback?expire={expire}"
+        )
+        _info_cache["dQw4w9WgXcQ"] = CacheEntry(info=info, cached_at=time.time())
+
+        result = self._extract(resolver, url)
+
+        assert result is not None
+        assert result.url == "stream.m4a"
+
+
+class TestPersistentCache:
+    """Tests for the SQLite-backed second cache tier."""
+
+    URL = "https://youtube.com/watch?v=dQw4w9WgXcQ"
+
+    @pytest.fixture
+    def track_info_cache(self, in_memory_database):
+        from discord_music_player.infrastructure.persistence.repositories.track_info_repository import (
+            SQLiteTrackInfoCacheRepository,
+        )
+
+        return SQLiteTrackInfoCacheRepository(in_memory_database)
+
+    @pytest.fixture
+    def persistent_resolver(self, track_info_cache):
+        return YtDlpResolver(AudioSettings(), metadata_cache=track_info_cache)
+
+    def _info(self, expires_in: float) -> YtDlpTrackInfo:
+        expire = int(time.time() + expires_in)
+        return YtDlpTrackInfo(
+            webpage_url=self.URL,
+            url=f"https://rr1.googlevideo.com/videoplayback?expire={expire}&id=1",
+            title="Never Gonna Give You Up",
+            duration=213,
+            artist="Rick Astley",
+        )
+
+    @pytest.mark.asyncio
+    async def test_extraction_is_persisted_with_stream_expiry(
+        self, persistent_resolver, track_info_cache
+    ):
+        info = self._info(expires_in=6 * 3600)
+        with patch.object(persistent_resolver, "_extract_info_sync", return_value=info):
+            await persistent_resolver.resolve(self.URL)
+
+        persisted = await track_info_cache.get("dQw4w9WgXcQ")
+        assert persisted is not None
+        assert persisted.metadata.title == "Never Gonna Give You Up"
+        assert persisted.metadata.url is None
+        assert persisted.stream_url == info.url
+        assert persisted.stream_expires_at == pytest.approx(time.time() + 6 * 3600, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_restart_skips_extraction(self, persistent_resolver, track_info_cache):
+        info = self._info(expires_in=6 * 3600)
+        with patch.object(persistent_resolver, "_extract_info_sync", return_value=info):
+            await persistent_resolver.resolve(self.URL)
+        _info_cache.clear()  # simulate a restart
+
+        with patch.object(persistent_resolver, "_extract_info_sync") as extract:
+            track = await persistent_resolver.resolve(self.URL)
+
+        extract.assert_not_called()
+        assert track is not None
+        assert track.stream_url == info.url
+        assert track.artist == "Rick Astley"
+
+    @pytest.mark.asyncio
+    async def test_expired_stream_is_re_extracted(self, persistent_resolver, track_info_cache):
+        await track_info_cache.save(
+            "dQw4w9WgXcQ",
+            self._info(expires_in=0),
+            stream_url="https://rr1.googlevideo.com/videoplayback?expire=1",
+            stream_expires_at=1.0,
+        )
+        fresh = self._info(expires_in=6 * 3600)
+
+        with patch.object(persistent_resolver, "_extract_info_sync", return_value=fresh) as extract:
+            track = await persistent_resolver.resolve(self.URL)
+
+        extract.assert_called_once()
+        assert track is not None and track.stream_url == fresh.url
+        persisted = await track_info_cache.get("dQw4w9WgXcQ")
+        assert persisted is not None and persisted.stream_url == fresh.url
+
+    @pytest.mark.asyncio
+    async def test_store_failure_falls_back_to_extraction(self, persistent_resolver):
+        info = self._info(expires_in=6 * 3600)
+        with (
+            patch.object(
+                persistent_resolver._metadata_cache, "get", side_effect=RuntimeError("locked")
+            ),
+            patch.object(persistent_resolver, "_extract_info_sync", return_value=info),
+        ):
+            track = await persistent_resolver.resolve(self.URL)
+
+        assert track is not None
+
+
 # =============================================================================
 # POT Provider Configuration Tests
 # =============================================================================